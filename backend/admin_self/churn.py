@@ -0,0 +1,125 @@
+# admin_self/churn.py
+# Churn scores for the whole user base. The feature matrix is the ML training dataset (the
+# 'all' export columns, read in annotated batches), scored in one vectorized call per batch
+# and upserted into ChurnScore. `manage.py score_churn` or the 'churn_scoring' background
+# task refreshes the table; the analytics page and the at-risk list only read it.
+
+import pickle
+
+import numpy as np
+from django.utils import timezone
+
+from home.db_utils import bulk_upsert
+from xg_boost.training_data import FEATURE_NAMES
+
+from .exports import EXPORT_BATCH_SIZE, user_feature_rows
+from .models import ChurnScore, MLModel
+
+HIGH_RISK = 70    # churn_score above this is 'High'
+MEDIUM_RISK = 40  # ... and above this 'Medium'
+
+COLUMNS = {name: i for i, name in enumerate(FEATURE_NAMES)}
+SCORE_UPDATE_FIELDS = [
+    'name', 'email', 'churn_score', 'risk_level', 'days_inactive', 'total_bookings',
+    'completion_rate', 'model_version', 'scored_at',
+]
+
+
+def heuristic_churn_probability(matrix):
+    """
+    Logistic score used until a churn model is deployed. Inactivity dominates (about 30 days
+    without activity is a coin flip for a user who never booked); never booking, a poor
+    completion record and a non-active account push the score up.
+    """
+    days_inactive = np.minimum(matrix[:, COLUMNS['days_since_last_active']], 120)
+    z = (
+        -3.0
+        + 0.08 * days_inactive
+        + 1.0 * (matrix[:, COLUMNS['total_bookings']] == 0)
+        - 1.0 * matrix[:, COLUMNS['completion_rate']] / 100
+        + 1.5 * matrix[:, COLUMNS['cancellation_rate']] / 100
+        + 2.0 * (matrix[:, COLUMNS['account_status']] != 1)
+    )
+    return 1 / (1 + np.exp(-z))
+
+
+def load_churn_model():
+    """
+    (estimator, version) for the active deployed 'churn' MLModel, if it is a classifier with
+    predict_proba over the training columns; (None, 'heuristic') otherwise.
+    """
+    ml_model = MLModel.objects.filter(model_type='churn', status='deployed', is_active=True).first()
+    if ml_model and ml_model.model_file:
+        try:
+            with ml_model.model_file.open('rb') as f:
+                estimator = pickle.load(f)
+            if isinstance(estimator, dict):
+                estimator = estimator.get('model')
+            if hasattr(estimator, 'predict_proba'):
+                return estimator, f'model-{ml_model.model_id}-{ml_model.version}'
+            print(f"Churn model {ml_model.model_id} has no predict_proba, using heuristic")
+        except Exception as e:
+            print(f"Could not load churn model {ml_model.model_id}: {str(e)}")
+    return None, 'heuristic'
+
+
+def churn_probabilities(matrix, estimator=None):
+    if estimator is None:
+        return heuristic_churn_probability(matrix)
+    names = list(getattr(estimator, 'feature_names_in_', FEATURE_NAMES))
+    return estimator.predict_proba(matrix[:, [COLUMNS[name] for name in names]])[:, 1]
+
+
+def risk_levels(scores):
+    return np.where(scores > HIGH_RISK, 'High', np.where(scores > MEDIUM_RISK, 'Medium', 'Low'))
+
+
+def _score_batch(batch, estimator, model_version, scored_at):
+    matrix = np.array([[features[name] for name in FEATURE_NAMES] for _, _, features in batch], dtype=np.float64)
+    scores = np.round(churn_probabilities(matrix, estimator) * 100, 1)
+    levels = risk_levels(scores)
+
+    bulk_upsert(ChurnScore, [
+        ChurnScore(
+            user_type=user_type,
+            user_id=user.pk,
+            name=user.full_name,
+            email=user.email,
+            churn_score=float(scores[i]),
+            risk_level=str(levels[i]),
+            days_inactive=int(features['days_since_last_active']),
+            total_bookings=features['total_bookings'],
+            completion_rate=features['completion_rate'],
+            model_version=model_version,
+            scored_at=scored_at,
+        )
+        for i, (user_type, user, features) in enumerate(batch)
+    ], unique_fields=['user_type', 'user_id'], update_fields=SCORE_UPDATE_FIELDS, batch_size=500)
+
+
+def score_all_users(progress=None, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Score every active account (deleted accounts are skipped) and drop the scores of users
+    that are gone. Returns {'scored': n, 'model_version': ...}.
+    """
+    scored_at = timezone.now()
+    estimator, model_version = load_churn_model()
+
+    scored = 0
+    batch = []
+    for row in user_feature_rows():
+        if row[1].email.startswith('DELETED_'):
+            continue
+        batch.append(row)
+        if len(batch) >= batch_size:
+            _score_batch(batch, estimator, model_version, scored_at)
+            scored += len(batch)
+            batch = []
+            if progress:
+                progress(scored)
+    if batch:
+        _score_batch(batch, estimator, model_version, scored_at)
+        scored += len(batch)
+
+    ChurnScore.objects.filter(scored_at__lt=scored_at).delete()
+    return {'scored': scored, 'model_version': model_version}
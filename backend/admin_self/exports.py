@@ -0,0 +1,716 @@
+# admin_self/exports.py
+# Admin CSV exports, run by the 'export' background task (admin_self.tasks).
+# Every export is a header plus a row generator. Rows are read in keyset-paginated batches
+# with per-user numbers annotated on, and the encoded output is written chunk by chunk to
+# the DataCollectionLog export file, so memory use does not grow with the number of rows.
+# The ML training dataset can also be written as Parquet/Feather (see xg_boost.training_data).
+
+import csv
+import os
+import tempfile
+from datetime import datetime
+
+from django.core.files import File
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from employee.models import Employee, JobRequest, Review
+from employee.skills import employees_with_skill
+from employer.models import Employer, Payment, SiteReview
+
+from xg_boost.training_data import (
+    ACCOUNT_STATUS_CODES, USER_TYPE_CODES, arrow_schema, derived_features, pa, pq,
+)
+
+from .models import Commission, Payout
+from .stats import PLATFORM_COMMISSION_RATE
+
+EXPORT_BATCH_SIZE = 2000
+
+USER_HEADER = [
+    'user_id', 'user_type', 'first_name', 'last_name', 'email',
+    'phone', 'registration_date', 'account_status', 'city', 'state',
+    'country', 'total_bookings', 'completed_bookings', 'cancelled_bookings',
+    'total_spent', 'total_earned', 'platform_commission', 'avg_rating',
+    'total_reviews', 'last_active'
+]
+
+BOOKING_HEADER = [
+    'booking_id', 'title', 'employer_id', 'employer_name', 'worker_id',
+    'worker_name', 'category', 'status', 'proposed_date', 'budget',
+    'location', 'created_at', 'accepted_at', 'completed_at', 'cancelled_at'
+]
+
+REVENUE_HEADER = [
+    'transaction_id', 'type', 'employer_id', 'employer_name', 'worker_id',
+    'worker_name', 'booking_id', 'amount', 'platform_commission',
+    'payment_method', 'status', 'transaction_date', 'created_at'
+]
+
+ALL_HEADER = [
+    'timestamp', 'user_id', 'user_type', 'registration_date', 'account_status',
+    'total_bookings', 'completed_bookings', 'cancelled_bookings',
+    'total_spent', 'total_earned', 'platform_commission',
+    'avg_rating', 'total_reviews', 'last_active'
+]
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _format(value, fmt=DATETIME_FORMAT):
+    return value.strftime(fmt) if value else ''
+
+
+def iter_batches(queryset, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Yield the rows of queryset in pk order, batch_size at a time (WHERE pk > last LIMIT n).
+    Unlike .iterator(), this keeps memory flat on MySQL, whose client library buffers a
+    whole result set, and it works with GROUP BY annotations.
+    """
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        batch = list(batch[:batch_size])
+        if not batch:
+            return
+        yield from batch
+        last_pk = batch[-1].pk
+
+
+def _review_count(owner_field):
+    reviews = Review.objects.filter(**{owner_field: OuterRef('pk')}).order_by().values(owner_field)
+    return Coalesce(
+        Subquery(reviews.annotate(count=Count('pk')).values('count'), output_field=IntegerField()),
+        Value(0),
+    )
+
+
+def annotated_users(model, review_owner_field):
+    """Workers or employers with their booking counts, completed budget and review count"""
+    completed = Q(job_requests__status='completed')
+    return model.objects.annotate(
+        total_jobs=Count('job_requests'),
+        completed_jobs=Count('job_requests', filter=completed),
+        completed_value=Sum('job_requests__budget', filter=completed),
+        review_count=_review_count(review_owner_field),
+    )
+
+
+def _user_rows():
+    """(user_id, user_type, user, spent, earned, rating) for every worker, then every employer"""
+    # Workers don't spend and employers don't earn (or have ratings)
+    for worker in iter_batches(annotated_users(Employee, 'employee')):
+        earned = float(worker.completed_value or 0)
+        yield f"WK{worker.employee_id:04d}", 'worker', worker, 0, earned, worker.rating
+    for employer in iter_batches(annotated_users(Employer, 'employer')):
+        spent = float(employer.completed_value or 0)
+        yield f"EM{employer.employer_id:04d}", 'employer', employer, spent, 0, 0
+
+
+def user_rows():
+    for user_id, user_type, user, spent, earned, rating in _user_rows():
+        yield [
+            user_id,
+            user_type,
+            user.first_name,
+            user.last_name,
+            user.email,
+            user.phone or '',
+            _format(user.created_at, '%Y-%m-%d'),
+            user.status,
+            user.city or '',
+            user.state or '',
+            user.country,
+            user.total_jobs,
+            user.completed_jobs,
+            user.total_jobs - user.completed_jobs,
+            spent,
+            earned,
+            float((user.completed_value or 0) * PLATFORM_COMMISSION_RATE),
+            rating,
+            user.review_count,
+            _format(user.updated_at),
+        ]
+
+
+def all_rows():
+    timestamp = timezone.now().strftime(DATETIME_FORMAT)
+    for user_id, user_type, user, spent, earned, rating in _user_rows():
+        yield [
+            timestamp,
+            user_id,
+            user_type,
+            _format(user.created_at, '%Y-%m-%d'),
+            user.status,
+            user.total_jobs,
+            user.completed_jobs,
+            user.total_jobs - user.completed_jobs,
+            float(spent),
+            float(earned),
+            float((user.completed_value or 0) * PLATFORM_COMMISSION_RATE),
+            rating,
+            user.review_count,
+            _format(user.updated_at),
+        ]
+
+
+def booking_rows():
+    for booking in iter_batches(JobRequest.objects.select_related('employer', 'employee')):
+        yield [
+            f"BK{booking.job_id:04d}",
+            booking.title,
+            f"EM{booking.employer.employer_id:04d}" if booking.employer else '',
+            booking.employer.full_name if booking.employer else '',
+            f"WK{booking.employee.employee_id:04d}" if booking.employee else '',
+            booking.employee.full_name if booking.employee else '',
+            booking.category or '',
+            booking.status,
+            _format(booking.proposed_date, '%Y-%m-%d'),
+            float(booking.budget) if booking.budget else 0,
+            booking.location,
+            _format(booking.created_at),
+            _format(booking.accepted_at),
+            _format(booking.completed_at),
+            _format(booking.updated_at) if booking.status == 'cancelled' else '',
+        ]
+
+
+def revenue_rows():
+    payments = Payment.objects.filter(status='completed').select_related('employer', 'employee', 'job')
+    for payment in iter_batches(payments):
+        yield [
+            f"PAY{payment.payment_id:04d}",
+            'payment',
+            f"EM{payment.employer.employer_id:04d}" if payment.employer else '',
+            payment.employer.full_name if payment.employer else '',
+            f"WK{payment.employee.employee_id:04d}" if payment.employee else '',
+            payment.employee.full_name if payment.employee else '',
+            f"BK{payment.job.job_id:04d}" if payment.job else '',
+            float(payment.amount),
+            float(payment.amount * PLATFORM_COMMISSION_RATE),
+            payment.get_payment_method_display(),
+            payment.status,
+            _format(payment.payment_date),
+            _format(payment.created_at),
+        ]
+
+    for payout in iter_batches(Payout.objects.filter(status='completed').select_related('employee')):
+        yield [
+            f"PO{payout.payout_id:04d}",
+            'payout',
+            '',  # No employer for payouts
+            '',
+            f"WK{payout.employee.employee_id:04d}" if payout.employee else '',
+            payout.employee.full_name if payout.employee else 'System Payout',
+            '',  # No booking for payouts
+            float(-payout.amount),  # Negative for payouts
+            0,  # No commission for payouts
+            payout.get_payout_method_display(),
+            payout.status,
+            _format(payout.completed_at),
+            _format(payout.created_at),
+        ]
+
+
+def user_feature_rows():
+    """(user_type, user, training features) for every worker, then every employer"""
+    timestamp = timezone.now().timestamp()
+    for _, user_type, user, spent, earned, rating in _user_rows():
+        yield user_type, user, derived_features({
+            'timestamp': timestamp,
+            'user_id': user.pk,
+            'user_type': USER_TYPE_CODES[user_type],
+            'registration_date': user.created_at.timestamp(),
+            'account_status': ACCOUNT_STATUS_CODES.get(user.status, 0),
+            'total_bookings': user.total_jobs,
+            'completed_bookings': user.completed_jobs,
+            'cancelled_bookings': user.total_jobs - user.completed_jobs,
+            'total_spent': spent,
+            'total_earned': earned,
+            'platform_commission': float((user.completed_value or 0) * PLATFORM_COMMISSION_RATE),
+            'avg_rating': float(rating or 0),
+            'total_reviews': user.review_count,
+            'last_active': user.updated_at.timestamp(),
+        })
+
+
+def training_rows():
+    """The 'all' export as typed training rows (xg_boost.training_data.FEATURE_SCHEMA)"""
+    for _, _, features in user_feature_rows():
+        yield features
+
+
+EXPORT_TYPES = {
+    'users': (USER_HEADER, user_rows),
+    'bookings': (BOOKING_HEADER, booking_rows),
+    'revenue': (REVENUE_HEADER, revenue_rows),
+    'all': (ALL_HEADER, all_rows),
+}
+
+
+def training_export():
+    """(rows, total) for the typed ML training dataset"""
+    return training_rows(), _user_total()
+
+
+def _user_total():
+    return Employee.objects.count() + Employer.objects.count()
+
+
+EXPORT_TOTALS = {
+    'users': _user_total,
+    'bookings': lambda: JobRequest.objects.count(),
+    'revenue': lambda: (Payment.objects.filter(status='completed').count()
+                        + Payout.objects.filter(status='completed').count()),
+    'all': _user_total,
+}
+
+
+def data_export(filters):
+    """Algorithm settings data export: filters['export_type'] is users/bookings/revenue/all"""
+    export_type = filters.get('export_type', 'all')
+    if export_type not in EXPORT_TYPES:
+        export_type = 'all'
+    header, rows = EXPORT_TYPES[export_type]
+    return header, rows(), EXPORT_TOTALS[export_type]()
+
+
+#****************************************************************
+# Admin list page exports. Each takes the list page's GET filters and returns
+# (header, rows, total row count).
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _filter_created_between(queryset, filters):
+    date_from = _parse_date(filters.get('date_from'))
+    date_to = _parse_date(filters.get('date_to'))
+    if date_from:
+        queryset = queryset.filter(created_at__date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(created_at__date__lte=date_to)
+    return queryset
+
+
+def bookings_export(filters):
+    search_query = filters.get('search', '')
+    status_filter = filters.get('status', '')
+    skill_filter = filters.get('skill', '')
+
+    bookings = JobRequest.objects.select_related('employer', 'employee')
+    if search_query:
+        bookings = bookings.filter(
+            Q(title__icontains=search_query) |
+            Q(description__icontains=search_query) |
+            Q(employer__first_name__icontains=search_query) |
+            Q(employer__last_name__icontains=search_query) |
+            Q(employee__first_name__icontains=search_query) |
+            Q(employee__last_name__icontains=search_query)
+        )
+    if status_filter:
+        bookings = bookings.filter(status=status_filter)
+    if skill_filter:
+        bookings = bookings.filter(category__icontains=skill_filter)
+
+    header = [
+        'Booking ID', 'Title', 'Employer', 'Worker', 'Skill',
+        'Amount', 'Status', 'Booking Date', 'Location',
+        'Completed Date', 'Platform Commission'
+    ]
+
+    def rows():
+        for booking in iter_batches(bookings):
+            yield [
+                f"BK{booking.job_id:04d}",
+                booking.title[:50],
+                booking.employer.full_name,
+                booking.employee.full_name if booking.employee else 'N/A',
+                booking.category or 'General',
+                booking.budget or 0,
+                booking.get_status_display(),
+                booking.created_at.strftime('%Y-%m-%d %H:%M'),
+                (f"{booking.city}, {booking.state}" if booking.city else booking.location) or 'N/A',
+                booking.completed_at.strftime('%Y-%m-%d %H:%M') if booking.completed_at else 'N/A',
+                booking.budget * PLATFORM_COMMISSION_RATE if booking.budget else 0,
+            ]
+
+    return header, rows(), bookings.count()
+
+
+def employers_export(filters):
+    search_query = filters.get('search', '')
+    business_type_filter = filters.get('business_type', '')
+    status_filter = filters.get('status', '')
+
+    employers = Employer.objects.all()
+    if search_query:
+        employers = employers.filter(
+            Q(first_name__icontains=search_query) |
+            Q(last_name__icontains=search_query) |
+            Q(email__icontains=search_query) |
+            Q(company_name__icontains=search_query)
+        )
+    if business_type_filter == 'individual':
+        employers = employers.filter(company_name__isnull=True)
+    elif business_type_filter == 'company':
+        employers = employers.filter(company_name__isnull=False)
+    if status_filter:
+        employers = employers.filter(status=status_filter)
+
+    header = [
+        'ID', 'Name', 'Email', 'Phone', 'Company',
+        'Location', 'Status', 'Total Bookings', 'Total Spending',
+        'Joined Date', 'Last Active'
+    ]
+    annotated = employers.annotate(
+        total_bookings=Count('job_requests'),
+        total_spending=Sum('job_requests__budget', filter=Q(job_requests__status='completed')),
+    )
+
+    def rows():
+        for employer in iter_batches(annotated):
+            location = f"{employer.city}, {employer.state}" if employer.city else employer.country
+            yield [
+                f"EM{employer.employer_id:04d}",
+                employer.full_name,
+                employer.email,
+                employer.phone or 'N/A',
+                employer.company_name or 'Individual',
+                location or 'N/A',
+                employer.get_status_display(),
+                employer.total_bookings,
+                employer.total_spending or 0,
+                employer.created_at.strftime('%Y-%m-%d'),
+                employer.updated_at.strftime('%Y-%m-%d') if employer.updated_at else ''
+            ]
+
+    return header, rows(), employers.count()
+
+
+def workers_export(filters):
+    search_query = filters.get('search', '')
+    skill_filter = filters.get('skill', '')
+    status_filter = filters.get('status', '')
+
+    workers = Employee.objects.all()
+    if search_query:
+        workers = workers.filter(
+            Q(first_name__icontains=search_query) |
+            Q(last_name__icontains=search_query) |
+            Q(email__icontains=search_query) |
+            Q(job_title__icontains=search_query) |
+            Q(skills__icontains=search_query)
+        )
+    if skill_filter:
+        workers = workers.filter(pk__in=employees_with_skill(skill_filter))
+    if status_filter:
+        workers = workers.filter(status=status_filter)
+
+    header = [
+        'ID', 'Name', 'Email', 'Phone', 'Job Title',
+        'Skills', 'Location', 'Rating', 'Jobs Done',
+        'Total Earnings', 'Status', 'Joined Date', 'Last Active'
+    ]
+
+    def rows():
+        for worker in iter_batches(workers):
+            location = f"{worker.city}, {worker.state}" if worker.city else worker.country
+            skills = worker.skills or 'N/A'
+            yield [
+                f"WK{worker.employee_id:04d}",
+                worker.full_name,
+                worker.email,
+                worker.phone or 'N/A',
+                worker.job_title or 'N/A',
+                skills[:100],  # Limit skills to 100 chars
+                location or 'N/A',
+                worker.rating,
+                worker.total_jobs_done,
+                worker.total_earnings,
+                worker.get_status_display(),
+                worker.created_at.strftime('%Y-%m-%d'),
+                worker.updated_at.strftime('%Y-%m-%d') if worker.updated_at else ''
+            ]
+
+    return header, rows(), workers.count()
+
+
+def reviews_export(filters):
+    """Worker and/or site reviews, each section with its own title and header row"""
+    tab = filters.get('tab', 'all')
+    search_query = filters.get('search', '')
+    rating_filter = filters.get('rating', '')
+
+    worker_reviews = Review.objects.none()
+    site_reviews = SiteReview.objects.none()
+
+    if tab in ('worker', 'all'):
+        worker_reviews = Review.objects.select_related('employer', 'employee', 'job')
+        if search_query:
+            worker_reviews = worker_reviews.filter(
+                Q(text__icontains=search_query) |
+                Q(employer__first_name__icontains=search_query) |
+                Q(employer__last_name__icontains=search_query) |
+                Q(employee__first_name__icontains=search_query) |
+                Q(employee__last_name__icontains=search_query)
+            )
+        if rating_filter:
+            worker_reviews = worker_reviews.filter(rating=float(rating_filter))
+
+    if tab in ('site', 'all'):
+        site_reviews = SiteReview.objects.select_related('employer')
+        if search_query:
+            site_reviews = site_reviews.filter(
+                Q(title__icontains=search_query) |
+                Q(review_text__icontains=search_query) |
+                Q(employer__first_name__icontains=search_query) |
+                Q(employer__last_name__icontains=search_query)
+            )
+        if rating_filter:
+            site_reviews = site_reviews.filter(rating=int(rating_filter))
+
+    def rows():
+        if tab in ('worker', 'all'):
+            yield ['Employee Reviews Export']
+            yield ['ID', 'Employer', 'Employee', 'Rating', 'Review Text',
+                   'Sentiment Score', 'Date', 'Job Title', 'Job ID']
+            for review in iter_batches(worker_reviews):
+                yield [
+                    f"WR{review.id:04d}",
+                    review.employer.full_name if review.employer else 'Unknown',
+                    review.employee.full_name if review.employee else 'Unknown',
+                    review.rating,
+                    review.text[:200],  # Limit text length
+                    review.sentiment_score,
+                    review.created_at.strftime('%Y-%m-%d %H:%M'),
+                    review.job.title if review.job else 'N/A',
+                    f"BK{review.job.job_id:04d}" if review.job else 'N/A',
+                ]
+            yield []  # Empty row
+
+        if tab in ('site', 'all'):
+            yield ['Site Reviews Export']
+            yield ['ID', 'User', 'Rating', 'Title', 'Review Text',
+                   'Review Type', 'Recommendation', 'Date', 'Areas']
+            for review in iter_batches(site_reviews):
+                yield [
+                    f"SR{review.id:04d}",
+                    review.employer.full_name if review.employer else 'Unknown',
+                    review.rating,
+                    review.title,
+                    review.review_text[:200],
+                    review.get_review_type_display(),
+                    review.recommendation,
+                    review.created_at.strftime('%Y-%m-%d %H:%M'),
+                    ', '.join(review.areas) if review.areas else 'N/A',
+                ]
+
+    return None, rows(), worker_reviews.count() + site_reviews.count()
+
+
+def commissions_export(filters):
+    commissions = Commission.objects.select_related('employer', 'employee', 'payment')
+    if filters.get('status'):
+        commissions = commissions.filter(status=filters['status'])
+    commissions = _filter_created_between(commissions, filters)
+
+    header = [
+        'Commission ID', 'Date', 'Employer', 'Worker', 'Transaction Amount',
+        'Commission Rate', 'Commission Amount', 'Status', 'Payment ID'
+    ]
+
+    def rows():
+        for commission in iter_batches(commissions):
+            yield [
+                commission.commission_id,
+                commission.created_at.strftime('%Y-%m-%d'),
+                commission.employer.full_name,
+                commission.employee.full_name,
+                commission.transaction_amount,
+                f"{float(commission.commission_rate * 100):.3f}%",
+                commission.commission_amount,
+                commission.get_status_display(),
+                commission.payment.payment_id if commission.payment else 'N/A',
+            ]
+
+    return header, rows(), commissions.count()
+
+
+def payouts_export(filters):
+    payouts = Payout.objects.select_related('employee')
+    if filters.get('status'):
+        payouts = payouts.filter(status=filters['status'])
+    payouts = _filter_created_between(payouts, filters)
+
+    header = [
+        'Payout ID', 'Date', 'Worker', 'Amount', 'Payout Method',
+        'Status', 'Reference Number', 'Description'
+    ]
+
+    def rows():
+        for payout in iter_batches(payouts):
+            yield [
+                payout.payout_id,
+                payout.created_at.strftime('%Y-%m-%d'),
+                payout.employee.full_name,
+                payout.amount,
+                payout.get_payout_method_display(),
+                payout.get_status_display(),
+                payout.reference_number or 'N/A',
+                payout.description or 'N/A',
+            ]
+
+    return header, rows(), payouts.count()
+
+
+# name -> export function, as referenced by the 'export' background task
+EXPORTS = {
+    'data': data_export,
+    'bookings': bookings_export,
+    'employers': employers_export,
+    'workers': workers_export,
+    'reviews': reviews_export,
+    'commissions': commissions_export,
+    'payouts': payouts_export,
+}
+
+
+#****************************************************************
+# Writing
+
+class _Echo:
+    """File-like object for csv.writer that hands back the formatted line"""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(header, rows, rows_per_chunk=500):
+    """Encoded CSV output, rows_per_chunk rows per bytes chunk (header=None writes no header)"""
+    writer = csv.writer(_Echo())
+    lines = [writer.writerow(header)] if header is not None else []
+    for row in rows:
+        lines.append(writer.writerow(row))
+        if len(lines) >= rows_per_chunk:
+            yield ''.join(lines).encode('utf-8')
+            lines = []
+    if lines:
+        yield ''.join(lines).encode('utf-8')
+
+
+class ExportFileWriter:
+    """
+    Writes the export straight into the DataCollectionLog.export_file location when the
+    storage is on local disk, otherwise into a temporary file that is saved on close.
+    """
+
+    def __init__(self, data_log, filename):
+        self.data_log = data_log
+        self.filename = filename
+        field = data_log.export_file
+        try:
+            self.name = field.storage.get_available_name(field.field.generate_filename(data_log, filename))
+            path = field.storage.path(self.name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.file = open(path, 'wb')
+            self.temporary = False
+        except NotImplementedError:
+            self.file = tempfile.TemporaryFile()
+            self.temporary = True
+
+    def write(self, chunk):
+        self.file.write(chunk)
+
+    def close(self):
+        """Attach the written file to the log (the caller saves the log)"""
+        if self.temporary:
+            self.file.seek(0)
+            self.data_log.export_file.save(self.filename, File(self.file), save=False)
+        else:
+            self.data_log.export_file.name = self.name
+        self.file.close()
+
+    def discard(self):
+        """Drop a partly written file (the export failed)"""
+        self.file.close()
+        if not self.temporary:
+            self.data_log.export_file.storage.delete(self.name)
+
+
+def write_export(data_log, filename, header, rows, total=None, progress=None,
+                 encode=csv_chunks, progress_every=1000):
+    """
+    Encode rows with encode(header, rows) into the log's export file, chunk by chunk, and
+    record the row count and byte size on data_log (not saved). progress(done, total) is
+    called every progress_every rows.
+    """
+    output = ExportFileWriter(data_log, filename)
+    records = 0
+    size = 0
+
+    def counted(rows):
+        nonlocal records
+        for row in rows:
+            records += 1
+            if progress and records % progress_every == 0:
+                progress(records, total)
+            yield row
+
+    try:
+        for chunk in encode(header, counted(rows)):
+            output.write(chunk)
+            size += len(chunk)
+    except Exception:
+        output.discard()
+        raise
+    output.close()
+    data_log.records_collected = records
+    data_log.file_size = size
+    return records
+
+
+def _record_batch(rows, schema):
+    return pa.RecordBatch.from_pydict({name: [row[name] for row in rows] for name in schema.names}, schema=schema)
+
+
+def write_columnar_export(data_log, filename, rows, file_format, total=None, progress=None,
+                          batch_size=EXPORT_BATCH_SIZE):
+    """
+    Write training rows as Parquet (one row group per batch) or Feather (Arrow IPC, one record
+    batch per batch) with the training schema, and record row count and size on data_log.
+    """
+    schema = arrow_schema()
+    output = ExportFileWriter(data_log, filename)
+    records = 0
+    try:
+        if file_format == 'parquet':
+            writer = pq.ParquetWriter(output.file, schema, compression='snappy')
+        else:
+            writer = pa.ipc.new_file(output.file, schema)
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.write_batch(_record_batch(batch, schema))
+                records += len(batch)
+                batch = []
+                if progress:
+                    progress(records, total)
+        if batch:
+            writer.write_batch(_record_batch(batch, schema))
+            records += len(batch)
+        writer.close()
+        size = output.file.tell()
+    except Exception:
+        output.discard()
+        raise
+    output.close()
+    data_log.records_collected = records
+    data_log.file_size = size
+    return records
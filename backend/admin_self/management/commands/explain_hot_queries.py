@@ -0,0 +1,95 @@
+# admin_self/management/commands/explain_hot_queries.py
+# EXPLAIN for the queries every page load depends on, each paired with the composite index
+# added for it (see the Meta.indexes in employee, employer, message_system and admin_self).
+# A query whose plan no longer mentions its index is flagged, so a dropped index or a
+# rewritten filter shows up before it reaches production. On near-empty tables the
+# optimizer may prefer a full scan; run it against a database with realistic data.
+# SQLite is only indicative: Django writes is_read=False as NOT is_read there, which
+# SQLite cannot match against an index (MySQL gets is_read = false).
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from admin_self.models import Commission, Payout
+from employee.models import Employee, EmployeeNotification, JobRequest
+from employer.models import Employer, EmployerNotification, Payment
+from message_system.models import ChatNotification, ChatRoom, Message
+
+
+def sample_pk(model):
+    """Some existing primary key (0 on an empty table), so the filters look like real ones"""
+    return model.objects.order_by().values_list('pk', flat=True).first() or 0
+
+
+def hot_queries():
+    """[(name, expected index, queryset)] for the hottest filters in the apps"""
+    employee_id = sample_pk(Employee)
+    employer_id = sample_pk(Employer)
+    room_id = sample_pk(ChatRoom)
+    now = timezone.now()
+    month_ago = now - timedelta(days=30)
+
+    return [
+        ('worker earnings', 'job_emp_status_done_idx', JobRequest.objects.filter(
+            employee_id=employee_id, status='completed', completed_at__gte=month_ago).values_list('budget')),
+        ('worker schedule', 'job_emp_proposed_idx', JobRequest.objects.filter(
+            employee_id=employee_id, proposed_date__gte=now.date()).order_by('proposed_date')),
+        ('employer jobs by status', 'job_er_status_created_idx', JobRequest.objects.filter(
+            employer_id=employer_id, status='completed').order_by('-created_at')),
+        ('completed jobs window', 'job_status_done_idx', JobRequest.objects.filter(
+            status='completed', completed_at__gte=month_ago).values_list('budget')),
+        ('admin bookings page', 'job_created_idx', JobRequest.objects.order_by('-created_at', '-job_id')[:11]),
+        ('chat history / polling', 'msg_room_live_idx', Message.objects.filter(
+            room_id=room_id, is_deleted=False, message_id__gt=0).order_by('message_id')),
+        ('employer inbox', 'room_er_last_msg_idx', ChatRoom.objects.filter(
+            employer_id=employer_id).order_by('-last_message_time')),
+        ('worker inbox', 'room_emp_last_msg_idx', ChatRoom.objects.filter(
+            employee_id=employee_id).order_by('-last_message_time')),
+        ('worker notifications', 'emp_notif_unread_idx', EmployeeNotification.objects.filter(
+            employee_id=employee_id, is_read=False).order_by('-created_at')[:10]),
+        ('employer notifications', 'er_notif_unread_idx', EmployerNotification.objects.filter(
+            employer_id=employer_id, is_read=False).order_by('-created_at')[:10]),
+        ('employer chat notifications', 'chat_notif_er_unread_idx', ChatNotification.objects.filter(
+            user_employer_id=employer_id, is_read=False).order_by('-created_at')),
+        ('worker chat notifications', 'chat_notif_emp_unread_idx', ChatNotification.objects.filter(
+            user_employee_id=employee_id, is_read=False).order_by('-created_at')),
+        ('completed payments window', 'payment_status_date_idx', Payment.objects.filter(
+            status='completed', payment_date__gte=month_ago).values_list('amount')),
+        ('commissions page', 'commission_status_created_idx', Commission.objects.filter(
+            status='pending').order_by('-created_at', '-commission_id')[:21]),
+        ('payouts page', 'payout_created_idx', Payout.objects.order_by('-created_at', '-payout_id')[:21]),
+    ]
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN on the hottest queries and flag any that no longer use their composite index"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--plans', action='store_true', help='Print the full plan of every query')
+        parser.add_argument('--analyze', action='store_true', help='EXPLAIN ANALYZE (executes the queries; MySQL 8.0.18+/PostgreSQL)')
+        parser.add_argument('--format', default=None, help='Plan format passed to EXPLAIN, e.g. tree or json')
+        parser.add_argument('--strict', action='store_true', help='Exit with an error if any query misses its index')
+
+    def handle(self, *args, **options):
+        explain_options = {}
+        if options['analyze']:
+            explain_options['analyze'] = True
+
+        queries = hot_queries()
+        missed = []
+        for name, index, queryset in queries:
+            plan = queryset.explain(format=options['format'], **explain_options)
+            uses_index = index in plan
+            if not uses_index:
+                missed.append(name)
+            status = self.style.SUCCESS('ok  ') if uses_index else self.style.WARNING('MISS')
+            self.stdout.write(f"{status} {name:<30} {index}")
+            if options['plans'] or not uses_index:
+                for line in plan.splitlines():
+                    self.stdout.write(f"       {line}")
+
+        self.stdout.write(f"\n{len(missed)} of {len(queries)} queries missed their index")
+        if missed and options['strict']:
+            raise CommandError("Index not used by: " + ", ".join(missed))
@@ -0,0 +1,33 @@
+# admin_self/management/commands/rollup_platform_metrics.py
+
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from admin_self.metrics import rollup_platform_metrics
+
+
+class Command(BaseCommand):
+    help = "Update the daily/monthly PlatformMetricsSnapshot rows and PlatformRevenue periods (run daily, e.g. from cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='First day to recompute (YYYY-MM-DD); defaults to the last snapshot day')
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Drop all snapshots and recompute from the first day with data')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError(f"Invalid --since date: {options['since']}")
+
+        start = time.perf_counter()
+        result = rollup_platform_metrics(since=since, rebuild=options['rebuild'])
+        self.stdout.write(
+            f"Rolled up {result['days']} days, {result['months']} months, "
+            f"{result['revenue_periods']} revenue periods"
+        )
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.perf_counter() - start:.2f}s"))
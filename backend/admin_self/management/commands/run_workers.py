@@ -0,0 +1,66 @@
+# admin_self/management/commands/run_workers.py
+
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _worker_main(index, poll_interval, max_tasks, burst):
+    """Entry point of one worker process (must not import models before django.setup())"""
+    import django
+    django.setup()
+    from admin_self.tasks import work_loop, worker_name
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+    signal.signal(signal.SIGINT, lambda signum, frame: stopping.append(signum))
+
+    name = f"{worker_name()}#{index}"
+    print(f"Worker {name} started")
+    processed = work_loop(name, poll_interval=poll_interval, max_tasks=max_tasks,
+                          burst=burst, should_stop=lambda: bool(stopping))
+    print(f"Worker {name} stopped after {processed} tasks")
+
+
+class Command(BaseCommand):
+    help = "Run background task workers (exports, data collection) against the BackgroundTask table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2, help='Number of worker processes')
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds to wait between polls when the queue is empty')
+        parser.add_argument('--max-tasks', type=int, default=None,
+                            help='Restart-friendly: each process exits after this many tasks')
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once the queue is empty instead of polling forever')
+
+    def handle(self, *args, **options):
+        processes = max(options['processes'], 1)
+        worker_args = (options['poll_interval'], options['max_tasks'], options['burst'])
+
+        if processes == 1:
+            from admin_self.tasks import work_loop
+            processed = work_loop(poll_interval=worker_args[0], max_tasks=worker_args[1], burst=worker_args[2])
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} tasks"))
+            return
+
+        # Children open their own connections; never share the parent's across a fork
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=_worker_main, args=(index,) + worker_args, daemon=False)
+            for index in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {processes} worker processes")
+
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            # Workers got the SIGINT too and finish their current task before exiting
+            for worker in workers:
+                worker.join()
+        self.stdout.write(self.style.SUCCESS("All workers stopped"))
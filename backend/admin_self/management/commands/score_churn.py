@@ -0,0 +1,17 @@
+# admin_self/management/commands/score_churn.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_self.churn import score_all_users
+
+
+class Command(BaseCommand):
+    help = "Recompute the ChurnScore table for every worker and employer (run daily, e.g. from cron)"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        result = score_all_users()
+        self.stdout.write(f"Scored {result['scored']} users with {result['model_version']}")
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.perf_counter() - start:.2f}s"))
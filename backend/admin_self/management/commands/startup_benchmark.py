@@ -0,0 +1,59 @@
+# admin_self/management/commands/startup_benchmark.py
+# Tracks process start-up cost: wall time of `manage.py check` in a fresh interpreter and
+# the slowest imports reported by `python -X importtime`. Run before and after changes to
+# module-level work (model loading, heavy libraries) and compare.
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def parse_importtime(stderr):
+    """{module: cumulative microseconds} for the top-level imports in -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if len(name) - len(name.lstrip()) == 1:
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class Command(BaseCommand):
+    help = "Measure `manage.py check` wall time and the slowest top-level imports in fresh processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='Number of timed runs (median is reported)')
+        parser.add_argument('--top', type=int, default=15, help='Number of slowest imports to list')
+
+    def run_check(self, importtime=False):
+        command = [sys.executable]
+        if importtime:
+            command += ['-X', 'importtime']
+        command += [os.path.join(settings.BASE_DIR, 'manage.py'), 'check']
+        start = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True, env=os.environ.copy())
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            raise CommandError(f"manage.py check failed:\n{result.stderr[-2000:]}")
+        return elapsed, result.stderr
+
+    def handle(self, *args, **options):
+        timings = [self.run_check()[0] for _ in range(max(options['runs'], 1))]
+        self.stdout.write(
+            f"manage.py check: median {statistics.median(timings):.2f}s "
+            f"(min {min(timings):.2f}s, max {max(timings):.2f}s, {len(timings)} runs)"
+        )
+
+        _, stderr = self.run_check(importtime=True)
+        modules = parse_importtime(stderr)
+        total = sum(modules.values())
+        self.stdout.write(f"\nImports: {total / 1e6:.2f}s cumulative, slowest top-level modules:")
+        for name, micros in sorted(modules.items(), key=lambda item: item[1], reverse=True)[:options['top']]:
+            self.stdout.write(f"  {micros / 1000:9.1f} ms  {name}")
@@ -0,0 +1,21 @@
+# admin_self/management/commands/warm_up_predictor.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from xg_boost.predictor import predictor
+
+
+class Command(BaseCommand):
+    help = ("Load the active XGBoost model and run one prediction. On a fresh install this also "
+            "publishes the legacy pickle package to the model registry, so workers start from native boosters.")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if not predictor.warm_up():
+            raise CommandError("Could not load the XGBoost model")
+        self.stdout.write(
+            f"Model version {predictor.version or '(pickle)'}: {len(predictor.models)} targets"
+        )
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.perf_counter() - start:.2f}s"))
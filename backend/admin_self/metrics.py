@@ -0,0 +1,233 @@
+# admin_self/metrics.py
+# Daily and monthly PlatformMetricsSnapshot rollups. `manage.py rollup_platform_metrics` keeps
+# them current, only recomputing the days that can still change, and the admin analytics pages
+# read these rows instead of scanning the raw user/booking/payment tables.
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from employee.models import Employee, JobRequest, Review
+from employer.models import Employer, Payment
+from home.db_utils import bulk_upsert
+
+from .models import Payout, PlatformMetricsSnapshot, PlatformRevenue
+from .stats import PLATFORM_COMMISSION_RATE, PlatformStats
+
+COUNT_FIELDS = [
+    'new_workers', 'new_employers', 'deleted_workers', 'deleted_employers',
+    'new_bookings', 'completed_bookings', 'cancelled_bookings',
+    'payment_count', 'review_count', 'rating_count',
+]
+AMOUNT_FIELDS = ['completed_booking_value', 'revenue', 'commission', 'payouts']
+METRIC_FIELDS = COUNT_FIELDS + AMOUNT_FIELDS + ['rating_sum']
+
+CENTS = Decimal('0.01')
+
+
+def _daily_sources():
+    """(queryset, date field, {metric: aggregate}) - each becomes one GROUP BY day query"""
+    return [
+        (Employee.objects.all(), 'created_at', {'new_workers': Count('pk')}),
+        (Employee.objects.filter(email__startswith='DELETED_'), 'updated_at', {'deleted_workers': Count('pk')}),
+        (Employer.objects.all(), 'created_at', {'new_employers': Count('pk')}),
+        (Employer.objects.filter(email__startswith='DELETED_'), 'updated_at', {'deleted_employers': Count('pk')}),
+        (JobRequest.objects.all(), 'created_at', {'new_bookings': Count('pk')}),
+        (JobRequest.objects.filter(status='completed'), 'completed_at', {
+            'completed_bookings': Count('pk'),
+            'completed_booking_value': Sum('budget'),
+        }),
+        (JobRequest.objects.filter(status='cancelled'), 'updated_at', {'cancelled_bookings': Count('pk')}),
+        (Payment.objects.filter(status='completed'), 'payment_date', {
+            'payment_count': Count('pk'),
+            'revenue': Sum('amount'),
+        }),
+        (Payout.objects.filter(status='completed'), 'created_at', {'payouts': Sum('amount')}),
+        (Review.objects.all(), 'created_at', {
+            'review_count': Count('pk'),
+            'rating_count': Count('rating'),
+            'rating_sum': Sum('rating'),
+        }),
+    ]
+
+
+def _start_of(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def month_bounds(day):
+    """(first day, last day) of the calendar month containing day"""
+    first = day.replace(day=1)
+    next_month = (first + timedelta(days=32)).replace(day=1)
+    return first, next_month - timedelta(days=1)
+
+
+def period_bounds(period_type, day):
+    """(start, end) dates of the daily/weekly/monthly period containing day"""
+    if period_type == 'daily':
+        return day, day
+    if period_type == 'weekly':
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    return month_bounds(day)
+
+
+def compute_daily_snapshots(first_day, last_day):
+    """
+    Unsaved daily snapshots for every day in [first_day, last_day]. Costs one grouped query
+    per source, whatever the length of the range.
+    """
+    values = {}
+    day = first_day
+    while day <= last_day:
+        values[day] = {field: 0 for field in METRIC_FIELDS}
+        day += timedelta(days=1)
+
+    start, end = _start_of(first_day), _start_of(last_day + timedelta(days=1))
+    for queryset, date_field, aggregates in _daily_sources():
+        rows = queryset.filter(**{
+            f'{date_field}__gte': start,
+            f'{date_field}__lt': end,
+        }).annotate(day=TruncDate(date_field)).values('day').annotate(**aggregates).order_by()
+        for row in rows:
+            for field in aggregates:
+                values[row['day']][field] = row[field] or 0
+
+    snapshots = []
+    for day, metrics in values.items():
+        metrics['revenue'] = Decimal(metrics['revenue'])
+        metrics['commission'] = (metrics['revenue'] * PLATFORM_COMMISSION_RATE).quantize(CENTS)
+        snapshots.append(PlatformMetricsSnapshot(
+            period_type='daily', period_start=day, period_end=day, **metrics
+        ))
+    return snapshots
+
+
+def _save(snapshots):
+    bulk_upsert(
+        PlatformMetricsSnapshot, snapshots,
+        unique_fields=['period_type', 'period_start'],
+        update_fields=METRIC_FIELDS + ['period_end', 'computed_at'],
+        batch_size=500,
+    )
+
+
+def period_totals(first_day, last_day):
+    """Summed daily metrics for [first_day, last_day] in one query on the snapshot table"""
+    totals = PlatformMetricsSnapshot.objects.filter(
+        period_type='daily', period_start__gte=first_day, period_start__lte=last_day
+    ).aggregate(**{field: Sum(field) for field in METRIC_FIELDS})
+    for field in COUNT_FIELDS:
+        totals[field] = totals[field] or 0
+    for field in AMOUNT_FIELDS:
+        totals[field] = totals[field] or Decimal('0')
+    totals['rating_sum'] = totals['rating_sum'] or 0.0
+    # Commission on the period total, not the sum of per-day rounded values
+    totals['commission'] = totals['revenue'] * PLATFORM_COMMISSION_RATE
+    return totals
+
+
+def rollup_months(days):
+    """Recompute the monthly snapshots covering the given days from their daily rows"""
+    months = sorted({month_bounds(day) for day in days})
+    snapshots = []
+    for first, last in months:
+        totals = period_totals(first, last)
+        totals['commission'] = totals['commission'].quantize(CENTS)
+        snapshots.append(PlatformMetricsSnapshot(
+            period_type='monthly', period_start=first, period_end=last, **totals
+        ))
+    _save(snapshots)
+    return len(snapshots)
+
+
+def refresh_revenue_periods(days):
+    """Recalculate the PlatformRevenue periods covering the given days (finalized periods are left alone)"""
+    refreshed = 0
+    for period_type, _ in PlatformRevenue.PERIOD_CHOICES:
+        for start, end in sorted({period_bounds(period_type, day) for day in days}):
+            records = list(PlatformRevenue.objects.filter(period_type=period_type, period_start=start))
+            if not records:
+                records = [PlatformRevenue(period_type=period_type, period_start=start)]
+            for record in records:
+                if record.is_finalized:
+                    continue
+                record.period_end = end
+                record.calculate_revenue()
+                refreshed += 1
+    return refreshed
+
+
+def earliest_activity_date():
+    """First day with any platform data, or None for an empty database"""
+    candidates = [
+        Employee.objects.aggregate(first=Min('created_at'))['first'],
+        Employer.objects.aggregate(first=Min('created_at'))['first'],
+        JobRequest.objects.aggregate(first=Min('created_at'))['first'],
+        Payment.objects.aggregate(first=Min('payment_date'))['first'],
+    ]
+    candidates = [timezone.localtime(value).date() for value in candidates if value]
+    return min(candidates) if candidates else None
+
+
+def rollup_platform_metrics(since=None, until=None, rebuild=False):
+    """
+    Bring the snapshots up to date. Without `since`, resumes at the most recent daily row
+    (it may have been a partial day when it was written), so a daily run only touches the
+    last day and today. Returns {'days': n, 'months': n, 'revenue_periods': n}.
+    """
+    until = until or timezone.localdate()
+    if rebuild:
+        PlatformMetricsSnapshot.objects.all().delete()
+
+    if since is None:
+        latest = PlatformMetricsSnapshot.objects.filter(period_type='daily').order_by('-period_start').first()
+        since = latest.period_start if latest else earliest_activity_date()
+    if since is None or since > until:
+        return {'days': 0, 'months': 0, 'revenue_periods': 0}
+
+    snapshots = compute_daily_snapshots(since, until)
+    _save(snapshots)
+    days = [snapshot.period_start for snapshot in snapshots]
+    return {
+        'days': len(days),
+        'months': rollup_months(days),
+        'revenue_periods': refresh_revenue_periods(days),
+    }
+
+
+def monthly_history(months=6, now=None):
+    """
+    Per-month history for the admin charts from the monthly snapshots (last N calendar
+    months, oldest first). Falls back to live aggregates until the first rollup has run.
+    """
+    stats = PlatformStats(now)
+    windows = stats.month_windows(months)
+    rows = {
+        row.period_start: row
+        for row in PlatformMetricsSnapshot.objects.filter(
+            period_type='monthly', period_start__in=[start.date() for start, _ in windows]
+        )
+    }
+    if not rows:
+        return stats.monthly_history(months)
+
+    historical = []
+    for month_start, _ in windows:
+        row = rows.get(month_start.date()) or PlatformMetricsSnapshot()
+        total_bookings = row.new_bookings
+        historical.append({
+            'month': month_start.strftime('%b'),
+            'year': month_start.year,
+            'new_users': row.new_users,
+            'deleted_users': row.deleted_users,
+            'completed_bookings': row.completed_bookings,
+            'total_bookings': total_bookings,
+            'success_rate': (row.completed_bookings / total_bookings) * 100 if total_bookings > 0 else 0,
+            'revenue': float(row.revenue),
+            'active_users': row.new_users * 0.7,  # Estimate
+        })
+    return historical
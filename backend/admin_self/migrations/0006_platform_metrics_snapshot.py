@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_self', '0005_mlmodel_modeltrainingdata_modelperformance_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformMetricsSnapshot',
+            fields=[
+                ('snapshot_id', models.AutoField(primary_key=True, serialize=False)),
+                ('period_type', models.CharField(choices=[('daily', 'Daily'), ('monthly', 'Monthly')], max_length=10)),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('new_workers', models.IntegerField(default=0)),
+                ('new_employers', models.IntegerField(default=0)),
+                ('deleted_workers', models.IntegerField(default=0)),
+                ('deleted_employers', models.IntegerField(default=0)),
+                ('new_bookings', models.IntegerField(default=0)),
+                ('completed_bookings', models.IntegerField(default=0)),
+                ('cancelled_bookings', models.IntegerField(default=0)),
+                ('completed_booking_value', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('payment_count', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('commission', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('payouts', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_count', models.IntegerField(default=0)),
+                ('rating_sum', models.FloatField(default=0.0)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'platform_metrics_snapshot_table',
+                'ordering': ['-period_start'],
+                'unique_together': {('period_type', 'period_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_self', '0007_background_tasks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modeltrainingdata',
+            name='data_format',
+            field=models.CharField(choices=[('csv', 'CSV'), ('parquet', 'Parquet'), ('feather', 'Feather')], default='csv', max_length=20),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_self', '0008_training_data_format'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChurnScore',
+            fields=[
+                ('churn_score_id', models.AutoField(primary_key=True, serialize=False)),
+                ('user_type', models.CharField(choices=[('worker', 'Worker'), ('employer', 'Employer')], max_length=10)),
+                ('user_id', models.IntegerField()),
+                ('name', models.CharField(max_length=200)),
+                ('email', models.EmailField(max_length=254)),
+                ('churn_score', models.FloatField()),
+                ('risk_level', models.CharField(choices=[('High', 'High'), ('Medium', 'Medium'), ('Low', 'Low')], max_length=10)),
+                ('days_inactive', models.IntegerField(default=0)),
+                ('total_bookings', models.IntegerField(default=0)),
+                ('completion_rate', models.FloatField(default=0.0)),
+                ('model_version', models.CharField(max_length=50)),
+                ('scored_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'churn_score_table',
+                'ordering': ['-churn_score', 'churn_score_id'],
+                'indexes': [models.Index(fields=['risk_level', 'churn_score'], name='churn_risk_score_idx'), models.Index(fields=['user_type', 'churn_score'], name='churn_type_score_idx')],
+                'unique_together': {('user_type', 'user_id')},
+            },
+        ),
+    ]
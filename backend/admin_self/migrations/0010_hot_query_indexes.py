@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_self', '0009_churn_score'),
+        ('employee', '0009_skill_taxonomy'),
+        ('employer', '0005_employer_latitude_employer_longitude'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='commission',
+            index=models.Index(fields=['status', 'created_at'], name='commission_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='commission',
+            index=models.Index(fields=['created_at'], name='commission_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payout',
+            index=models.Index(fields=['status', 'created_at'], name='payout_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payout',
+            index=models.Index(fields=['created_at'], name='payout_created_idx'),
+        ),
+    ]
@@ -37,6 +37,11 @@ class Commission(models.Model):
     class Meta:
         db_table = 'commission_table'
         ordering = ['-created_at']
+        indexes = [
+            # Commission list: optional status filter, keyset on (created_at, commission_id)
+            models.Index(fields=['status', 'created_at'], name='commission_status_created_idx'),
+            models.Index(fields=['created_at'], name='commission_created_idx'),
+        ]
     
     def __str__(self):
         return f"Commission #{self.commission_id} - ₹{self.commission_amount}"
@@ -89,6 +94,11 @@ class Payout(models.Model):
     class Meta:
         db_table = 'payout_table'
         ordering = ['-created_at']
+        indexes = [
+            # Payout list: optional status filter, keyset on (created_at, payout_id)
+            models.Index(fields=['status', 'created_at'], name='payout_status_created_idx'),
+            models.Index(fields=['created_at'], name='payout_created_idx'),
+        ]
     
     def __str__(self):
         return f"Payout #{self.payout_id} - ₹{self.amount}"
@@ -129,36 +139,84 @@ class PlatformRevenue(models.Model):
         return f"Revenue {self.period_type.capitalize()} {self.period_start} to {self.period_end}"
     
     def calculate_revenue(self):
-        """Calculate revenue for this period"""
+        """Calculate revenue for this period from the daily metrics snapshots"""
         # Import here to avoid circular imports
-        from employer.models import Payment
+        from .metrics import period_totals
         
-        # Get payments in this period
-        payments = Payment.objects.filter(
-            payment_date__date__gte=self.period_start,
-            payment_date__date__lte=self.period_end,
-            status='completed'
-        )
+        totals = period_totals(self.period_start, self.period_end)
         
-        self.total_transactions = payments.count()
-        self.total_transaction_amount = payments.aggregate(total=Sum('amount'))['total'] or Decimal('0')
+        self.total_transactions = totals['payment_count']
+        self.total_transaction_amount = totals['revenue']
         
-        # Calculate commission (0.10% = 0.0010)
-        self.total_commission = self.total_transaction_amount * Decimal('0.0010')
+        # Commission (0.10% = 0.0010) on the period's completed payment total
+        self.total_commission = totals['commission']
         
-        # Get payouts in this period
-        payouts = Payout.objects.filter(
-            created_at__date__gte=self.period_start,
-            created_at__date__lte=self.period_end,
-            status='completed'
-        )
-        self.total_payouts = payouts.aggregate(total=Sum('amount'))['total'] or Decimal('0')
+        # Completed payouts in this period
+        self.total_payouts = totals['payouts']
         
         # Calculate platform balance
         self.platform_balance = self.total_commission - self.total_payouts
         self.save()
 
 
+class PlatformMetricsSnapshot(models.Model):
+    """Pre-aggregated platform metrics for one day or one calendar month (see admin_self.metrics)"""
+    PERIOD_CHOICES = [
+        ('daily', 'Daily'),
+        ('monthly', 'Monthly'),
+    ]
+
+    snapshot_id = models.AutoField(primary_key=True)
+    period_type = models.CharField(max_length=10, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    period_end = models.DateField()
+
+    # Users
+    new_workers = models.IntegerField(default=0)
+    new_employers = models.IntegerField(default=0)
+    deleted_workers = models.IntegerField(default=0)
+    deleted_employers = models.IntegerField(default=0)
+
+    # Bookings
+    new_bookings = models.IntegerField(default=0)
+    completed_bookings = models.IntegerField(default=0)
+    cancelled_bookings = models.IntegerField(default=0)
+    completed_booking_value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    # Money
+    payment_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    commission = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    payouts = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    # Ratings (sum + count so periods can be combined into an exact average)
+    review_count = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+    rating_sum = models.FloatField(default=0.0)
+
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'platform_metrics_snapshot_table'
+        ordering = ['-period_start']
+        unique_together = ['period_type', 'period_start']
+
+    def __str__(self):
+        return f"Metrics {self.period_type} {self.period_start}"
+
+    @property
+    def new_users(self):
+        return self.new_workers + self.new_employers
+
+    @property
+    def deleted_users(self):
+        return self.deleted_workers + self.deleted_employers
+
+    @property
+    def avg_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else 0
+
+
 class MLModel(models.Model):
     """Model for storing uploaded ML models (XGBoost only)"""
     
@@ -289,10 +347,17 @@ class ModelTrainingData(models.Model):
         ('combined', 'Combined Data'),
     ]
     
+    DATA_FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('parquet', 'Parquet'),
+        ('feather', 'Feather'),
+    ]
+    
     data_id = models.AutoField(primary_key=True)
     ml_model = models.ForeignKey(MLModel, on_delete=models.CASCADE, related_name='training_data')
     data_source = models.CharField(max_length=50, choices=DATA_SOURCE_CHOICES)
     data_file = models.FileField(upload_to='training_data/', null=True, blank=True)
+    data_format = models.CharField(max_length=20, choices=DATA_FORMAT_CHOICES, default='csv')
     total_samples = models.IntegerField(default=0)
     total_features = models.IntegerField(default=0)
     
@@ -312,6 +377,13 @@ class ModelTrainingData(models.Model):
     
     def __str__(self):
         return f"Training Data for {self.ml_model.model_name}"
+    
+    def load_dataframe(self):
+        """Training data as a typed DataFrame (xg_boost.training_data.FEATURE_SCHEMA columns)"""
+        from xg_boost.training_data import load_training_data
+        
+        with self.data_file.open('rb') as f:
+            return load_training_data(f, self.data_format)
 
 
 class ModelPerformance(models.Model):
@@ -369,10 +441,13 @@ class DataCollectionLog(models.Model):
     
     # Status
     status = models.CharField(max_length=20, choices=[
+        ('queued', 'Queued'),
+        ('processing', 'Processing'),
         ('success', 'Success'),
         ('failed', 'Failed'),
         ('partial', 'Partial Success'),
     ], default='success')
+    progress = models.IntegerField(default=0)  # percent, updated by the background task
     
     error_message = models.TextField(blank=True)
     
@@ -412,5 +487,92 @@ class DataCollectionLog(models.Model):
         return round(self.file_size / (1024 * 1024), 2) if self.file_size else 0
 
 
+class BackgroundTask(models.Model):
+    """Queued job run by `manage.py run_workers` (see admin_self.tasks)"""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    task_id = models.AutoField(primary_key=True)
+    task_name = models.CharField(max_length=100)
+    params = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    run_after = models.DateTimeField(default=timezone.now)  # retries are pushed back with a backoff
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+
+    # Progress reporting
+    progress = models.IntegerField(default=0)  # percent
+    progress_message = models.CharField(max_length=255, blank=True)
+    error_message = models.TextField(blank=True)
+
+    # Worker lock
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    data_log = models.ForeignKey(DataCollectionLog, on_delete=models.SET_NULL, null=True, blank=True, related_name='tasks')
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'background_task_table'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='bg_task_status_run_after_idx'),
+        ]
 
+    def __str__(self):
+        return f"Task #{self.task_id} {self.task_name} - {self.status}"
+
+
+class ChurnScore(models.Model):
+    """Latest churn score for every worker and employer (written by admin_self.churn.score_all_users)"""
+
+    USER_TYPE_CHOICES = [
+        ('worker', 'Worker'),
+        ('employer', 'Employer'),
+    ]
+
+    RISK_CHOICES = [
+        ('High', 'High'),
+        ('Medium', 'Medium'),
+        ('Low', 'Low'),
+    ]
+
+    churn_score_id = models.AutoField(primary_key=True)
+    user_type = models.CharField(max_length=10, choices=USER_TYPE_CHOICES)
+    user_id = models.IntegerField()  # employee_id or employer_id
 
+    # Copied from the user row so the at-risk list needs no joins
+    name = models.CharField(max_length=200)
+    email = models.EmailField()
+
+    churn_score = models.FloatField()  # 0-100, probability of churn in percent
+    risk_level = models.CharField(max_length=10, choices=RISK_CHOICES)
+
+    # Main inputs, for display
+    days_inactive = models.IntegerField(default=0)
+    total_bookings = models.IntegerField(default=0)
+    completion_rate = models.FloatField(default=0.0)
+
+    model_version = models.CharField(max_length=50)  # 'heuristic' or the churn MLModel used
+    scored_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'churn_score_table'
+        ordering = ['-churn_score', 'churn_score_id']
+        unique_together = ['user_type', 'user_id']
+        indexes = [
+            models.Index(fields=['risk_level', 'churn_score'], name='churn_risk_score_idx'),
+            models.Index(fields=['user_type', 'churn_score'], name='churn_type_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_type} #{self.user_id} churn {self.churn_score:.0f}%"
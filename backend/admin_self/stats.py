@@ -0,0 +1,204 @@
+# admin_self/stats.py
+# Platform-wide counters for the admin dashboard and the ML feature vector.
+# Each table is read once with conditional aggregation (Count/Sum with filter=Q(...)),
+# instead of one COUNT/SUM query per number.
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from employee.models import Employee, JobRequest, Review
+from employer.models import Employer, Payment
+
+# Platform commission on completed payments (0.10%)
+PLATFORM_COMMISSION_RATE = Decimal('0.0010')
+
+
+class PlatformStats:
+    """
+    Lazily computed platform statistics. Every *_stats property is a single aggregate query
+    and is computed at most once per instance, so build one PlatformStats per request and
+    share it between the dashboard numbers and analytics_data().
+    """
+
+    def __init__(self, now=None):
+        self.now = now or timezone.now()
+        self.month_start = self.now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        self.month_ago = self.now - timedelta(days=30)
+        self.week_ago = self.now - timedelta(days=7)
+
+    def _user_counts(self, model, recent_job_owner):
+        """Active/growth/churn counters shared by Employee and Employer"""
+        recently_booked = JobRequest.objects.filter(
+            created_at__gte=self.week_ago
+        ).values(recent_job_owner)
+        return model.objects.aggregate(
+            active=Count('pk', filter=Q(status='Active')),
+            active_before_month=Count('pk', filter=Q(status='Active', created_at__lt=self.month_start)),
+            recently_active=Count('pk', filter=Q(updated_at__gte=self.week_ago) | Q(pk__in=recently_booked)),
+            new_this_month=Count('pk', filter=Q(created_at__gte=self.month_start)),
+            deleted_this_month=Count('pk', filter=Q(email__startswith='DELETED_', updated_at__gte=self.month_start)),
+        )
+
+    @cached_property
+    def worker_stats(self):
+        return self._user_counts(Employee, 'employee_id')
+
+    @cached_property
+    def employer_stats(self):
+        return self._user_counts(Employer, 'employer_id')
+
+    @cached_property
+    def job_stats(self):
+        completed = Q(status='completed')
+        stats = JobRequest.objects.aggregate(
+            total=Count('pk'),
+            completed=Count('pk', filter=completed),
+            cancelled=Count('pk', filter=Q(status='cancelled')),
+            today=Count('pk', filter=Q(created_at__date=self.now.date())),
+            completed_this_month=Count('pk', filter=completed & Q(completed_at__gte=self.month_start)),
+            completed_last_month=Count('pk', filter=completed & Q(
+                completed_at__gte=self.month_ago, completed_at__lt=self.month_start
+            )),
+            pending_budget=Sum('budget', filter=Q(status__in=['accepted', 'in_progress'])),
+            worker_earnings=Sum('budget', filter=completed & Q(employee__isnull=False)),
+        )
+        stats['pending_budget'] = stats['pending_budget'] or Decimal('0')
+        stats['worker_earnings'] = stats['worker_earnings'] or Decimal('0')
+        return stats
+
+    @cached_property
+    def payment_stats(self):
+        stats = Payment.objects.filter(status='completed').aggregate(
+            total=Sum('amount'),
+            last_month=Sum('amount', filter=Q(
+                payment_date__date__gte=self.month_ago, payment_date__date__lt=self.month_start
+            )),
+        )
+        return {key: value or Decimal('0') for key, value in stats.items()}
+
+    @cached_property
+    def review_stats(self):
+        stats = Review.objects.aggregate(avg_rating=Avg('rating'), total=Count('pk'))
+        stats['avg_rating'] = stats['avg_rating'] or 0
+        return stats
+
+    @property
+    def platform_revenue(self):
+        return self.payment_stats['total'] * PLATFORM_COMMISSION_RATE
+
+    @property
+    def last_month_revenue(self):
+        return self.payment_stats['last_month'] * PLATFORM_COMMISSION_RATE
+
+    def month_windows(self, months):
+        """(month_start, next_month_start) for the last N calendar months, oldest first"""
+        windows = []
+        month_start = self.month_start
+        for _ in range(months):
+            next_month = (month_start + timedelta(days=32)).replace(day=1)
+            windows.append((month_start, next_month))
+            month_start = (month_start - timedelta(days=1)).replace(day=1)
+        return windows[::-1]
+
+    @staticmethod
+    def _per_window(queryset, windows, **measures):
+        """
+        Evaluate measures (name -> f(start, end) returning a filtered aggregate) for every
+        window in one query. Returns one {name: value} dict per window.
+        """
+        result = queryset.aggregate(**{
+            f'{name}_{n}': make(start, end)
+            for name, make in measures.items()
+            for n, (start, end) in enumerate(windows)
+        })
+        return [{name: result[f'{name}_{n}'] for name in measures} for n in range(len(windows))]
+
+    def monthly_history(self, months=6):
+        """Per-month user, booking and revenue history for the charts, one query per table"""
+        windows = self.month_windows(months)
+
+        user_measures = {
+            'new': lambda start, end: Count('pk', filter=Q(created_at__gte=start, created_at__lt=end)),
+            'deleted': lambda start, end: Count('pk', filter=Q(
+                email__startswith='DELETED_', updated_at__gte=start, updated_at__lt=end
+            )),
+        }
+        workers = self._per_window(Employee.objects.all(), windows, **user_measures)
+        employers = self._per_window(Employer.objects.all(), windows, **user_measures)
+        jobs = self._per_window(
+            JobRequest.objects.all(), windows,
+            completed=lambda start, end: Count('pk', filter=Q(
+                status='completed', completed_at__gte=start, completed_at__lt=end
+            )),
+            total=lambda start, end: Count('pk', filter=Q(created_at__gte=start, created_at__lt=end)),
+        )
+        payments = self._per_window(
+            Payment.objects.filter(status='completed'), windows,
+            revenue=lambda start, end: Sum('amount', filter=Q(
+                payment_date__gte=start, payment_date__lt=end
+            )),
+        )
+
+        historical = []
+        for n, (month_start, _) in enumerate(windows):
+            new_users = workers[n]['new'] + employers[n]['new']
+            total_bookings = jobs[n]['total']
+            completed_bookings = jobs[n]['completed']
+            historical.append({
+                'month': month_start.strftime('%b'),
+                'year': month_start.year,
+                'new_users': new_users,
+                'deleted_users': workers[n]['deleted'] + employers[n]['deleted'],
+                'completed_bookings': completed_bookings,
+                'total_bookings': total_bookings,
+                'success_rate': (completed_bookings / total_bookings) * 100 if total_bookings > 0 else 0,
+                'revenue': float(payments[n]['revenue'] or Decimal('0')),
+                'active_users': new_users * 0.7,  # Estimate
+            })
+        return historical
+
+    def analytics_data(self):
+        """Current platform data in the shape the XGBoost predictor expects"""
+        workers = self.worker_stats
+        employers = self.employer_stats
+        jobs = self.job_stats
+        total_payment_amount = self.payment_stats['total']
+        completed_bookings = jobs['completed']
+
+        if jobs['total'] > 0:
+            success_rate = (completed_bookings / jobs['total']) * 100
+        else:
+            success_rate = 0
+
+        if completed_bookings > 0:
+            avg_earning_per_job = float(jobs['worker_earnings']) / completed_bookings
+            avg_spending_per_job = float(total_payment_amount) / completed_bookings
+        else:
+            avg_earning_per_job = 0
+            avg_spending_per_job = 0
+
+        return {
+            'total_users': workers['active'] + employers['active'],
+            'total_workers': workers['active'],
+            'total_employers': employers['active'],
+            'active_users': workers['recently_active'] + employers['recently_active'],
+            'new_users_this_month': workers['new_this_month'] + employers['new_this_month'],
+            'deleted_accounts_this_month': workers['deleted_this_month'] + employers['deleted_this_month'],
+            'total_bookings': jobs['total'],
+            'completed_bookings': completed_bookings,
+            'cancelled_bookings': jobs['cancelled'],
+            'bookings_today': jobs['today'],
+            'success_rate': success_rate,
+            'total_revenue': float(total_payment_amount),
+            'total_earnings': float(jobs['worker_earnings']),
+            'platform_commission': float(self.platform_revenue),
+            'total_payment_amount': float(total_payment_amount),
+            'avg_rating': self.review_stats['avg_rating'],
+            'total_reviews': self.review_stats['total'],
+            'avg_earning_per_job': avg_earning_per_job,
+            'avg_spending_per_job': avg_spending_per_job,
+        }
@@ -0,0 +1,229 @@
+# admin_self/tasks.py
+# Database-backed background tasks for long admin jobs (exports, data collection).
+# Views enqueue a BackgroundTask row; `manage.py run_workers` processes claim and run them.
+# A task is claimed with a conditional UPDATE (status='queued' -> 'running'), so several
+# worker processes can poll the same table without double-running anything, on any database.
+
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from employee.models import Employee, JobRequest
+from employer.models import Employer, Payment
+
+from .churn import score_all_users
+from .exports import EXPORTS, training_export, write_columnar_export, write_export
+from .models import BackgroundTask, DataCollectionLog, Payout
+
+DEFAULT_MAX_ATTEMPTS = 3
+RETRY_DELAY = timedelta(seconds=30)       # doubled after every failed attempt
+STALE_TASK_TIMEOUT = timedelta(minutes=30)  # running tasks without a heartbeat for this long are requeued
+HEARTBEAT_INTERVAL = 60                     # seconds; progress is written at least this often while a task runs
+CLAIM_CANDIDATES = 10
+
+TASKS = {}
+
+
+def register_task(name):
+    """Register func(task, progress) under name; progress(done, total=None, message='')"""
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def enqueue(task_name, params=None, user=None, data_log=None, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    if task_name not in TASKS:
+        raise ValueError(f"Unknown task: {task_name}")
+    return BackgroundTask.objects.create(
+        task_name=task_name,
+        params=params or {},
+        created_by=user,
+        data_log=data_log,
+        max_attempts=max_attempts,
+    )
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class ProgressReporter:
+    """
+    Writes progress to the task and its DataCollectionLog. Percentage changes hit the database,
+    and so does any call HEARTBEAT_INTERVAL after the last write, which keeps locked_at fresh
+    for tasks that report no total (or move slowly) so they are not requeued as stale.
+    """
+
+    def __init__(self, task):
+        self.task = task
+        self.percent = -1
+        self.written_at = time.monotonic()
+
+    def __call__(self, done, total=None, message=''):
+        percent = min(int(done * 100 / total), 99) if total else 0
+        now = time.monotonic()
+        if percent == self.percent and not message and now - self.written_at < HEARTBEAT_INTERVAL:
+            return
+        self.percent = percent
+        self.written_at = now
+        BackgroundTask.objects.filter(pk=self.task.pk).update(
+            progress=percent,
+            progress_message=message or f"{done} of {total or '?'} records",
+            locked_at=timezone.now(),
+        )
+        if self.task.data_log_id:
+            DataCollectionLog.objects.filter(pk=self.task.data_log_id).update(
+                progress=percent, records_collected=done,
+            )
+
+
+def claim_task(name):
+    """Atomically take the next due task, or return None when the queue is empty"""
+    now = timezone.now()
+    candidates = list(
+        BackgroundTask.objects.filter(status='queued', run_after__lte=now)
+        .order_by('run_after', 'task_id').values_list('task_id', flat=True)[:CLAIM_CANDIDATES]
+    )
+    for task_id in candidates:
+        claimed = BackgroundTask.objects.filter(task_id=task_id, status='queued').update(
+            status='running', locked_by=name, locked_at=now, started_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return BackgroundTask.objects.select_related('data_log').get(task_id=task_id)
+    return None
+
+
+def requeue_stale_tasks(timeout=STALE_TASK_TIMEOUT):
+    """Recover tasks whose worker died mid-run. Returns the number requeued."""
+    stale = BackgroundTask.objects.filter(status='running', locked_at__lt=timezone.now() - timeout)
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', finished_at=timezone.now(), error_message='Worker stopped responding',
+    )
+    return stale.update(status='queued', locked_by='', locked_at=None)
+
+
+def _update_log(task, **fields):
+    if task.data_log_id:
+        DataCollectionLog.objects.filter(pk=task.data_log_id).update(**fields)
+
+
+def run_task(task):
+    """Run one claimed task, then mark it completed, queue a retry or mark it failed"""
+    func = TASKS.get(task.task_name)
+    _update_log(task, status='processing', error_message='')
+    try:
+        if func is None:
+            raise ValueError(f"Unknown task: {task.task_name}")
+        func(task, ProgressReporter(task))
+    except Exception as e:
+        print(f"Task #{task.task_id} {task.task_name} failed (attempt {task.attempts}): {str(e)}")
+        task.error_message = str(e)
+        if func is not None and task.attempts < task.max_attempts:
+            task.status = 'queued'
+            task.run_after = timezone.now() + RETRY_DELAY * (2 ** (task.attempts - 1))
+            _update_log(task, status='queued', error_message=str(e))
+        else:
+            task.status = 'failed'
+            task.finished_at = timezone.now()
+            _update_log(task, status='failed', error_message=str(e), end_time=task.finished_at)
+        task.locked_by = ''
+        task.locked_at = None
+        task.save(update_fields=['status', 'run_after', 'error_message', 'finished_at', 'locked_by', 'locked_at'])
+        return False
+
+    task.status = 'completed'
+    task.progress = 100
+    task.progress_message = 'Done'
+    task.finished_at = timezone.now()
+    task.save(update_fields=['status', 'progress', 'progress_message', 'finished_at'])
+    _update_log(task, status='success', progress=100, end_time=task.finished_at)
+    return True
+
+
+def work_loop(name=None, poll_interval=2.0, max_tasks=None, burst=False, should_stop=lambda: False):
+    """
+    Claim and run tasks until should_stop() is true, max_tasks have run, or (burst) the
+    queue is empty. Returns the number of tasks run.
+    """
+    name = name or worker_name()
+    processed = 0
+    last_stale_check = 0.0
+    while not should_stop():
+        close_old_connections()
+        if time.monotonic() - last_stale_check > 60:
+            requeue_stale_tasks()
+            last_stale_check = time.monotonic()
+
+        task = claim_task(name)
+        if task is None:
+            if burst:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        run_task(task)
+        processed += 1
+        if max_tasks and processed >= max_tasks:
+            break
+    return processed
+
+
+#****************************************************************
+# Tasks
+
+@register_task('export')
+def export_task(task, progress):
+    """
+    params: export (key of admin_self.exports.EXPORTS), filters, filename and optionally
+    file_format - 'parquet'/'feather' write the typed ML training dataset instead of CSV
+    """
+    data_log = task.data_log
+    file_format = task.params.get('file_format', 'csv')
+    if file_format in ('parquet', 'feather'):
+        rows, total = training_export()
+        progress(0, total)
+        write_columnar_export(data_log, task.params['filename'], rows, file_format, total=total, progress=progress)
+    else:
+        export = EXPORTS[task.params['export']]
+        header, rows, total = export(task.params.get('filters', {}))
+        progress(0, total)
+        write_export(data_log, task.params['filename'], header, rows, total=total, progress=progress)
+    data_log.save(update_fields=['export_file', 'records_collected', 'file_size'])
+
+
+@register_task('collect_data')
+def collect_data_task(task, progress):
+    """params: data_type (users/bookings/revenue/all) - record counts and estimated size"""
+    data_type = task.params.get('data_type', 'all')
+
+    users_count = bookings_count = revenue_count = 0
+    if data_type in ('users', 'all'):
+        users_count = Employee.objects.count() + Employer.objects.count()
+    if data_type in ('bookings', 'all'):
+        bookings_count = JobRequest.objects.count()
+    if data_type in ('revenue', 'all'):
+        revenue_count = (Payment.objects.filter(status='completed').count()
+                         + Payout.objects.filter(status='completed').count())
+
+    # Approximate size per record type
+    _update_log(
+        task,
+        records_collected=users_count + bookings_count + revenue_count,
+        file_size=(users_count * 1024) + (bookings_count * 512) + (revenue_count * 256),
+    )
+
+
+@register_task('churn_scoring')
+def churn_scoring_task(task, progress):
+    """Recompute ChurnScore for every user (admin_self.churn)"""
+    total = Employee.objects.count() + Employer.objects.count()
+    progress(0, total)
+    result = score_all_users(progress=lambda done: progress(done, total))
+    progress(result['scored'], total, f"Scored {result['scored']} users with {result['model_version']}")
@@ -1,3 +1,690 @@
-from django.test import TestCase
+import csv
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from unittest import mock, skipUnless
+
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from employee.models import Employee, JobRequest, Review
+from employer.models import Employer, Payment, SiteReview
+from home.pagination import count_rows, paginate
+from xg_boost import registry as model_registry
+from xg_boost.prediction_cache import invalidate_predictions
+from xg_boost.predictor import XGBoostPredictor
+from xg_boost.training_data import FEATURE_DTYPES, FEATURE_NAMES, PYARROW_AVAILABLE, load_training_data
+from .churn import score_all_users
+from .metrics import monthly_history, rollup_platform_metrics
+from .models import BackgroundTask, ChurnScore, DataCollectionLog, Payout, PlatformMetricsSnapshot, PlatformRevenue
+from .stats import PlatformStats
+from .tasks import (
+    HEARTBEAT_INTERVAL, STALE_TASK_TIMEOUT, ProgressReporter, enqueue, requeue_stale_tasks, work_loop,
+)
+from .views import get_churn_risk_users, view_all_payouts
+
+
+def create_platform_data(count, start=0):
+    """count workers/employers, each with one completed paid job and one review"""
+    now = timezone.now()
+    for i in range(start, start + count):
+        employer = Employer.objects.create(
+            first_name=f'Employer{i}', last_name='Test', email=f'employer{i}@example.com',
+            phone=f'90000{i:05d}', status='Active',
+        )
+        worker = Employee.objects.create(
+            first_name=f'Worker{i}', last_name='Test', email=f'worker{i}@example.com',
+            phone=f'80000{i:05d}', job_title='Painter', status='Active',
+        )
+        job = JobRequest.objects.create(
+            employer=employer, employee=worker, title='Paint wall', description='Two coats',
+            category='Painting', proposed_date=now.date(), location='Kochi',
+            budget=Decimal('1000'), status='completed', completed_at=now,
+        )
+        JobRequest.objects.create(
+            employer=employer, employee=worker, title='Paint door', description='One coat',
+            proposed_date=now.date() + timedelta(days=3), location='Kochi',
+            budget=Decimal('400'), status='accepted',
+        )
+        Payment.objects.create(
+            employer=employer, employee=worker, job=job, amount=Decimal('1000'),
+            status='completed', payment_date=now,
+        )
+        Review.objects.create(employee=worker, employer=employer, job=job, text='Excellent work', rating=5)
+
+
+class PlatformStatsTests(TestCase):
+    """PlatformStats reads each table once with conditional aggregation"""
+
+    def test_analytics_data_is_one_query_per_table(self):
+        create_platform_data(3)
+        with self.assertNumQueries(5):
+            data = PlatformStats().analytics_data()
+
+        self.assertEqual(data['total_workers'], 3)
+        self.assertEqual(data['total_employers'], 3)
+        self.assertEqual(data['active_users'], 6)
+        self.assertEqual(data['new_users_this_month'], 6)
+        self.assertEqual(data['total_bookings'], 6)
+        self.assertEqual(data['completed_bookings'], 3)
+        self.assertEqual(data['success_rate'], 50)
+        self.assertEqual(data['total_payment_amount'], 3000.0)
+        self.assertAlmostEqual(data['platform_commission'], 3.0)
+        self.assertEqual(data['total_reviews'], 3)
+        self.assertEqual(data['avg_rating'], 5)
+
+    def test_dashboard_numbers(self):
+        create_platform_data(2)
+        stats = PlatformStats()
+        self.assertEqual(stats.job_stats['completed_this_month'], 2)
+        self.assertEqual(stats.job_stats['pending_budget'], Decimal('800'))
+        self.assertEqual(stats.worker_stats['active_before_month'], 0)
+
+
+class AdminDashboardQueryCountTests(TestCase):
+    """admin_dashboard issues a fixed number of queries, whatever the data volume"""
+
+    # session + user (2), PlatformStats (5), recent workers + cancellations (2),
+    # top categories (1), 6-month chart history (1, monthly snapshots)
+    EXPECTED_QUERIES = 11
+
+    def setUp(self):
+        admin = get_user_model().objects.create_superuser(email='admin@example.com', password='x')
+        self.client.force_login(admin)
+
+    def create_platform_data(self, count, start=0):
+        create_platform_data(count, start)
+        rollup_platform_metrics()
+
+    def dashboard(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_is_pinned(self):
+        self.create_platform_data(2)
+        self.assertEqual(self.dashboard(), self.EXPECTED_QUERIES)
+
+    def test_query_count_independent_of_data_volume(self):
+        self.create_platform_data(2)
+        small = self.dashboard()
+        self.create_platform_data(8, start=2)
+        self.assertEqual(self.dashboard(), small)
+
+
+class PlatformMetricsRollupTests(TestCase):
+    """Snapshot rollups agree with the live aggregates they replace"""
+
+    def test_history_matches_live_aggregates(self):
+        create_platform_data(3)
+        live = PlatformStats().monthly_history(6)
+        rollup_platform_metrics()
+        self.assertEqual(monthly_history(6), live)
+        self.assertEqual(monthly_history(6)[-1]['revenue'], 3000.0)
+
+    def test_rollup_is_incremental(self):
+        create_platform_data(2)
+        first = rollup_platform_metrics()
+        self.assertEqual(first['days'], 1)
+        self.assertEqual(first['months'], 1)
+
+        create_platform_data(1, start=2)
+        rollup_platform_metrics()
+        today = PlatformMetricsSnapshot.objects.get(period_type='daily', period_start=timezone.localdate())
+        self.assertEqual(today.new_workers, 3)
+        self.assertEqual(today.completed_bookings, 3)
+        self.assertEqual(today.avg_rating, 5)
+        self.assertEqual(PlatformMetricsSnapshot.objects.filter(period_type='daily').count(), 1)
+
+    def test_revenue_periods_follow_snapshots(self):
+        create_platform_data(2)
+        rollup_platform_metrics()
+        monthly = PlatformRevenue.objects.get(period_type='monthly')
+        self.assertEqual(monthly.total_transactions, 2)
+        self.assertEqual(monthly.total_transaction_amount, Decimal('2000'))
+        self.assertEqual(monthly.total_commission, Decimal('2.00'))
+        self.assertEqual(PlatformRevenue.objects.count(), 3)
+
+
+class BackgroundExportTests(TestCase):
+    """Exports are queued, run by a worker with annotated batch reads, and downloaded afterwards"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        admin = get_user_model().objects.create_superuser(email='admin@example.com', password='x')
+        self.client.force_login(admin)
+
+    def export(self, export_type):
+        response = self.client.post(reverse('export_data_csv'), {'export_type': export_type})
+        self.assertRedirects(response, reverse('algorithm_setting') + '?tab=data-collection', fetch_redirect_response=False)
+        task = BackgroundTask.objects.latest('task_id')
+        self.assertEqual(task.status, 'queued')
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(work_loop('test-worker', burst=True), 1)
+        task.refresh_from_db()
+        return task, len(ctx.captured_queries)
+
+    def test_users_export(self):
+        create_platform_data(2)
+        task, _ = self.export('users')
+        self.assertEqual(task.status, 'completed')
+        self.assertEqual(task.progress, 100)
+
+        log = task.data_log
+        log.refresh_from_db()
+        self.assertEqual(log.status, 'success')
+        self.assertEqual(log.records_collected, 4)
+
+        response = self.client.get(reverse('download_export', args=[log.log_id]))
+        body = b''.join(response.streaming_content)
+        self.assertEqual(log.file_size, len(body))
+        rows = list(csv.reader(io.StringIO(body.decode('utf-8'))))
+        self.assertEqual(len(rows), 5)
+        worker = rows[1]
+        self.assertEqual(worker[1], 'worker')
+        self.assertEqual(worker[11:17], ['2', '1', '1', '0', '1000.0', '1.0'])
+        self.assertEqual(worker[18], '1')
+
+    def test_query_count_independent_of_data_volume(self):
+        create_platform_data(2)
+        _, small = self.export('all')
+        create_platform_data(8, start=2)
+        _, large = self.export('all')
+        self.assertEqual(small, large)
+
+    def test_list_page_export_uses_filters(self):
+        create_platform_data(3)
+        self.client.get(reverse('export_bookings_csv'), {'status': 'completed'})
+        work_loop('test-worker', burst=True)
+        log = DataCollectionLog.objects.get(data_type='Bookings Export')
+        self.assertEqual(log.status, 'success')
+        self.assertEqual(log.records_collected, 3)
+
+    def test_failed_task_is_retried_then_failed(self):
+        log = DataCollectionLog.objects.create(
+            collection_type='manual', data_type='Broken', status='queued', start_time=timezone.now(),
+        )
+        task = enqueue('export', {'export': 'missing', 'filename': 'x.csv'}, data_log=log, max_attempts=2)
+
+        work_loop('test-worker', burst=True)
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'queued')
+        self.assertEqual(task.attempts, 1)
+        self.assertGreater(task.run_after, timezone.now())
+
+        BackgroundTask.objects.filter(pk=task.pk).update(run_after=timezone.now())
+        work_loop('test-worker', burst=True)
+        task.refresh_from_db()
+        log.refresh_from_db()
+        self.assertEqual(task.status, 'failed')
+        self.assertEqual(task.attempts, 2)
+        self.assertEqual(log.status, 'failed')
+
+    def test_progress_without_total_keeps_heartbeat(self):
+        task = enqueue('export', {'export': 'users', 'filename': 'x.csv'})
+        started = timezone.now() - STALE_TASK_TIMEOUT - timedelta(minutes=1)
+        BackgroundTask.objects.filter(pk=task.pk).update(status='running', locked_at=started)
+        progress = ProgressReporter(task)
+
+        with mock.patch('admin_self.tasks.time.monotonic', return_value=progress.written_at):
+            progress(100)
+        task.refresh_from_db()
+        self.assertGreater(task.locked_at, started)
+
+        # Same 0% within the interval: no write
+        BackgroundTask.objects.filter(pk=task.pk).update(locked_at=started)
+        with mock.patch('admin_self.tasks.time.monotonic', return_value=progress.written_at + 1):
+            progress(200)
+        task.refresh_from_db()
+        self.assertEqual(task.locked_at, started)
+
+        # Still 0%, but a heartbeat is due
+        with mock.patch('admin_self.tasks.time.monotonic', return_value=progress.written_at + HEARTBEAT_INTERVAL):
+            progress(300)
+        task.refresh_from_db()
+        self.assertGreater(task.locked_at, started)
+        self.assertEqual(task.progress_message, '300 of ? records')
+        self.assertEqual(requeue_stale_tasks(), 0)
+
+    @skipUnless(PYARROW_AVAILABLE, 'pyarrow is not installed')
+    def test_training_data_export_is_typed(self):
+        create_platform_data(2)
+        self.client.post(reverse('export_data_csv'), {'export_type': 'all', 'file_format': 'parquet'})
+        work_loop('test-worker', burst=True)
+        log = DataCollectionLog.objects.get(data_type__startswith='ML Training Data')
+        self.assertEqual(log.status, 'success')
+        self.assertEqual(log.records_collected, 4)
+
+        with log.export_file.open('rb') as f:
+            frame = load_training_data(f, log.file_format)
+        self.assertEqual(list(frame.columns), FEATURE_NAMES)
+        self.assertEqual({name: str(dtype) for name, dtype in frame.dtypes.items()}, FEATURE_DTYPES)
+        worker = frame.iloc[0]
+        self.assertEqual(worker['total_bookings'], 2)
+        self.assertEqual(worker['completion_rate'], 50.0)
+        self.assertEqual(worker['avg_earning_per_booking'], 1000.0)
+
+        # An old CSV export converts to the same features
+        self.client.post(reverse('export_data_csv'), {'export_type': 'all'})
+        work_loop('test-worker', burst=True)
+        csv_log = DataCollectionLog.objects.get(data_type='Data Export - all')
+        with csv_log.export_file.open('rb') as f:
+            from_csv = load_training_data(f, 'csv')
+        columns = [name for name in FEATURE_NAMES if name not in ('timestamp', 'registration_date', 'last_active',
+                                                                  'days_since_registration', 'days_since_last_active')]
+        self.assertTrue(from_csv[columns].equals(frame[columns]))
+
+
+class ChurnScoringTests(TestCase):
+    """Every user is scored in batches; the at-risk list filters and pages on the stored scores"""
+
+    def setUp(self):
+        create_platform_data(3)
+        # One worker who never booked and has not been active for 60 days
+        self.idle = Employee.objects.create(
+            first_name='Idle', last_name='Worker', email='idle@example.com', phone='7000000000',
+            job_title='Painter', status='Active',
+        )
+        Employee.objects.filter(pk=self.idle.pk).update(updated_at=timezone.now() - timedelta(days=60))
+
+    def test_scores_every_user(self):
+        with CaptureQueriesContext(connection) as ctx:
+            result = score_all_users(batch_size=2)
+        self.assertEqual(result, {'scored': 7, 'model_version': 'heuristic'})
+        self.assertEqual(ChurnScore.objects.count(), 7)
+
+        idle = ChurnScore.objects.get(user_type='worker', user_id=self.idle.pk)
+        self.assertEqual(idle.risk_level, 'High')
+        self.assertEqual(idle.days_inactive, 60)
+        self.assertEqual(ChurnScore.objects.first(), idle)
+        self.assertEqual(ChurnScore.objects.filter(risk_level='Low').count(), 6)
+
+        # Batches, not per-user queries: more users add no queries per batch
+        create_platform_data(3, start=10)
+        with CaptureQueriesContext(connection) as larger:
+            score_all_users(batch_size=100)
+        self.assertLessEqual(len(larger.captured_queries), len(ctx.captured_queries))
+
+        # Deleted accounts lose their score on the next run
+        Employee.objects.filter(pk=self.idle.pk).update(email='DELETED_idle@example.com')
+        score_all_users()
+        self.assertFalse(ChurnScore.objects.filter(user_id=self.idle.pk, user_type='worker').exists())
+
+    def test_churn_scores_endpoint_pages_with_cursor(self):
+        score_all_users()
+        admin = get_user_model().objects.create_superuser(email='admin@example.com', password='x')
+        self.client.force_login(admin)
+
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 3, 'user_type': 'worker'}
+            if cursor:
+                params['cursor'] = cursor
+            page = self.client.get(reverse('churn_scores'), params).json()
+            seen += [row['user_id'] for row in page['results']]
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(seen[0], self.idle.pk)
+        self.assertEqual(page['risk_counts'], {'High': 1, 'Low': 6})
+
+        # The last page leads back to the one before it
+        back = self.client.get(reverse('churn_scores'), {'limit': 3, 'user_type': 'worker',
+                                                          'cursor': page['previous_cursor']}).json()
+        self.assertEqual([row['user_id'] for row in back['results']], seen[:3])
+
+        # Cursors are the shared home.pagination tokens; anything else is rejected
+        bad = self.client.get(reverse('churn_scores'), {'cursor': '50.0:3'}).json()
+        self.assertEqual(bad, {'success': False, 'error': 'Invalid filter or cursor'})
+
+        high = self.client.get(reverse('churn_scores'), {'risk': 'High'}).json()
+        self.assertEqual([row['email'] for row in high['results']], ['idle@example.com'])
+
+        # Out-of-range limits are clamped to 1..200 instead of failing
+        for limit in (0, -5):
+            response = self.client.get(reverse('churn_scores'), {'limit': limit})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()['results']), 1)
+
+    def test_risk_list_includes_medium_and_high(self):
+        score_all_users()
+        ChurnScore.objects.filter(email='worker0@example.com').update(churn_score=45, risk_level='Medium')
+        ChurnScore.objects.filter(email='worker1@example.com').update(churn_score=40, risk_level='Low')
+        at_risk = get_churn_risk_users()
+        self.assertEqual([(row['email'], row['risk_level']) for row in at_risk],
+                         [('idle@example.com', 'High'), ('worker0@example.com', 'Medium')])
+
+
+class ReviewRatingsPaginationTests(TestCase):
+    """The reviews tab pages with keyset cursors and its stats don't scan the review tables"""
+
+    def setUp(self):
+        admin = get_user_model().objects.create_superuser(email='admin@example.com', password='x')
+        self.client.force_login(admin)
+
+    def add_site_reviews(self, count, start=0):
+        employer = Employer.objects.first()
+        for i in range(start, start + count):
+            SiteReview.objects.create(
+                employer=employer, review_type='platform', rating=(i % 5) + 1,
+                title=f'Site review {i}', review_text='Easy to use', recommendation='yes',
+            )
+
+    def walk(self, tab, **params):
+        """All rows of a tab, following next_cursor; returns (rows, query counts per page)"""
+        rows, queries = [], []
+        params = {'tab': tab, **params}
+        while True:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(reverse('review_ratings'), params)
+            queries.append(len(ctx.captured_queries))
+            rows += [(row['type'], row['id']) for row in response.context['reviews_list']]
+            if not response.context['has_next']:
+                return rows, queries, response
+            params['cursor'] = response.context['next_cursor']
+
+    def test_all_tab_pages_through_both_review_types(self):
+        create_platform_data(7)
+        self.add_site_reviews(8)
+        # Same timestamp for several rows: ties are broken by type then id
+        Review.objects.filter(pk__in=Review.objects.values('pk')[:3]).update(created_at=timezone.now())
+
+        rows, queries, response = self.walk('all')
+        self.assertEqual(len(rows), 15)
+        self.assertEqual(len(set(rows)), 15)
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(response.context['pagination_info'], 'Showing 11-15 of 15 reviews')
+        self.assertEqual(response.context['worker_rating_distribution'][5]['count'], 7)
+        self.assertEqual(response.context['site_rating_distribution'][1], {'count': 2, 'percentage': 25.0})
+        self.assertEqual(response.context['employee_rating'], 5.0)
+
+        created = [
+            (Review if kind == 'worker' else SiteReview).objects.get(pk=pk).created_at for kind, pk in rows
+        ]
+        self.assertEqual(created, sorted(created, reverse=True))
+
+        # Rating filter applies before paging
+        rows, _, response = self.walk('site', rating=1)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(response.context['pagination_info'], 'Showing 1-2 of 2 reviews')
+
+    def test_fractional_and_invalid_rating_filters(self):
+        create_platform_data(2)
+        self.add_site_reviews(5)
+        Review.objects.filter(pk=Review.objects.first().pk).update(rating=4.5)
+
+        rows, _, response = self.walk('worker', rating='4.5')
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(response.context['pagination_info'], 'Showing 1-1 of 1 reviews')
+
+        rows, _, response = self.walk('all', rating='4.5')
+        self.assertEqual(rows, [('worker', Review.objects.get(rating=4.5).pk)])
+
+        rows, _, response = self.walk('all', rating='4')
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(response.context['pagination_info'], 'Showing 1-1 of 1 reviews')
+
+        response = self.client.get(reverse('review_ratings'), {'tab': 'worker', 'rating': 'four'})
+        self.assertRedirects(response, reverse('review_ratings') + '?tab=worker', fetch_redirect_response=False)
+
+    def test_page_cost_does_not_grow_with_review_count(self):
+        create_platform_data(3)
+        self.add_site_reviews(12)
+        _, small, _ = self.walk('site')
+
+        self.add_site_reviews(30, start=12)
+        _, large, _ = self.walk('site')
+        self.assertEqual(large[0], small[0])
+        self.assertEqual(max(large), max(small))
+
+    def test_invalid_cursor_redirects_to_first_page(self):
+        response = self.client.get(reverse('review_ratings'), {'tab': 'worker', 'cursor': 'not-a-cursor'})
+        self.assertRedirects(response, reverse('review_ratings') + '?tab=worker', fetch_redirect_response=False)
+
+
+class KeysetPaginationTests(TestCase):
+    """Admin lists page with keyset cursors: stable order, both directions, constant cost"""
+
+    def setUp(self):
+        admin = get_user_model().objects.create_superuser(email='admin@example.com', password='x')
+        self.client.force_login(admin)
+        create_platform_data(23)
+        # Many equal sort keys, so the pk tie-breaker decides the order
+        Employee.objects.filter(pk__in=Employee.objects.values('pk')[:12]).update(rating=4.5)
+
+    def test_paginate_walks_both_directions(self):
+        queryset = Employee.objects.all()
+        ordering = ('-rating', 'first_name')
+        expected = list(queryset.order_by('-rating', 'first_name', 'pk').values_list('pk', flat=True))
+
+        pages, cursor = [], None
+        while True:
+            page = paginate(queryset, cursor, ordering, page_size=5)
+            pages.append(page)
+            if not page.next_cursor:
+                break
+            cursor = page.next_cursor
+        self.assertEqual([row.pk for page in pages for row in page], expected)
+        self.assertEqual([(page.start_index(), page.end_index()) for page in pages][-1], (21, 23))
+        self.assertFalse(pages[0].has_previous)
+
+        # Walking back from the last page retraces the same pages
+        page = pages[-1]
+        for previous in reversed(pages[:-1]):
+            page = paginate(queryset, page.previous_cursor, ordering, page_size=5)
+            self.assertEqual([row.pk for row in page], [row.pk for row in previous])
+            self.assertEqual(page.start_index(), previous.start_index())
+        self.assertFalse(page.has_previous)
+        self.assertIsNone(page.previous_cursor)
+
+        # A cursor is only valid for the ordering it was issued for
+        with self.assertRaises(ValueError):
+            paginate(queryset, pages[0].next_cursor, ('created_at',), page_size=5)
+
+    def test_counts(self):
+        page = paginate(Employee.objects.all(), page_size=5, count='exact')
+        self.assertEqual((page.count, page.count_is_exact), (23, True))
+        self.assertEqual(count_rows(Employee.objects.filter(rating=4.5), approximate=True), (12, True))
+        self.assertEqual(count_rows(Employee.objects.all(), approximate=True, cap=10), (10, False))
+
+    def test_worker_list_pages_by_sort_key(self):
+        url = reverse('manage_workers')
+        seen, params, queries = [], {'sort': 'jobs-high'}, []
+        while True:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url, params)
+            queries.append(len(ctx.captured_queries))
+            page = response.context['page_obj']
+            seen += [row['worker'].pk for row in response.context['worker_data_list']]
+            if not page.next_cursor:
+                break
+            params['cursor'] = page.next_cursor
+        self.assertEqual(sorted(seen), sorted(Employee.objects.values_list('pk', flat=True)))
+        self.assertEqual(len(set(seen)), 23)
+        self.assertEqual(queries[1], queries[0])
+        self.assertEqual(response.context['page_obj'].count, 23)
+
+        # A stale or tampered cursor falls back to the first page
+        response = self.client.get(url, {'sort': 'newest', 'cursor': params['cursor']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['page_obj'].start_index(), 1)
+
+    def test_bookings_and_payouts_pages(self):
+        response = self.client.get(reverse('bookings'))
+        page = response.context['bookings']
+        self.assertEqual((len(page), page.count), (10, 46))
+        self.assertTrue(page.has_next)
+        self.assertContains(response, 'Showing 1 to 10 of 46 bookings')
+
+        worker = Employee.objects.first()
+        for i in range(25):
+            Payout.objects.create(employee=worker, amount=Decimal('10'), payout_method='upi')
+        request = RequestFactory().get('/', {'search': 'Worker'})
+        request.user = get_user_model().objects.get(email='admin@example.com')
+        with mock.patch('admin_self.views.render') as render:
+            view_all_payouts(request)
+        context = render.call_args[0][2]
+        self.assertEqual(context['total_payouts'], 25)
+        self.assertEqual(len(context['payouts']), 20)
+        self.assertEqual(context['total_payout_amount'], Decimal('250'))
+
+
+class ExplainHotQueriesTests(TestCase):
+    def test_reports_every_hot_query(self):
+        create_platform_data(2)
+        out = io.StringIO()
+        call_command('explain_hot_queries', stdout=out)
+        output = out.getvalue()
+        self.assertIn('queries missed their index', output)
+        for name in ('worker earnings', 'employer jobs by status', 'chat history / polling', 'payouts page'):
+            self.assertIn(name, output)
+        # Keyset list pages seek on their created_at index
+        self.assertRegex(output, r'ok\s+admin bookings page\s+job_created_idx')
+        self.assertRegex(output, r'ok\s+commissions page\s+commission_status_created_idx')
+
+
+def write_model_package(path, scale, slope=0.0):
+    """Tiny two-target package in the uploaded-pickle layout: target = scale + slope * total_bookings"""
+    import pickle
+    import numpy as np
+    import pandas as pd
+    import xgboost as xgb
+
+    rng = np.random.default_rng(0)
+    features = pd.DataFrame(rng.random((50, len(FEATURE_NAMES))), columns=FEATURE_NAMES)
+    all_models = {}
+    for target in ('total_spent', 'completed_bookings'):
+        inputs = features.drop(columns=[target])
+        model = xgb.XGBRegressor(n_estimators=5, max_depth=2)
+        model.fit(inputs, scale + slope * features['total_bookings'])
+        all_models[target] = {'model': model, 'is_classification': False,
+                              'feature_names': list(inputs.columns), 'label_encoder': None}
+    with open(path, 'wb') as f:
+        pickle.dump({'all_models': all_models, 'data_info': {'original_features': FEATURE_NAMES}}, f)
+
+
+@skipUnless(model_registry.XGBOOST_AVAILABLE, 'xgboost is not installed')
+class ModelRegistryTests(TestCase):
+    """Published versions are stored as native boosters and picked up by every predictor"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        settings_override = override_settings(XGBOOST_REGISTRY_DIR=self.root + '/registry')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+
+    def package(self, name, scale, slope=0.0):
+        path = f'{self.root}/{name}.pkl'
+        write_model_package(path, scale, slope)
+        return path
+
+    def test_other_process_sees_new_version(self):
+        first = model_registry.publish_package(self.package('first', 100.0), version='model-1-1.0.0')
+        manifest = model_registry.read_manifest(first)
+        self.assertEqual(set(manifest['targets']), {'total_spent', 'completed_bookings'})
+        self.assertTrue(all(info['file'].endswith('.ubj') for info in manifest['targets'].values()))
+
+        # Two predictors stand in for two worker processes
+        serving, uploading = XGBoostPredictor(), XGBoostPredictor()
+        self.assertFalse(serving.loaded)  # loaded by the first prediction
+        platform_data = {'total_bookings': 10, 'completed_bookings': 8}
+        self.assertAlmostEqual(serving.predict(platform_data)['revenue_next_month'], 100.0, places=1)
+        self.assertEqual(serving.version, first)
+
+        second = model_registry.publish_package(self.package('second', 500.0), version='model-2-1.1.0')
+        uploading.load_model()
+        self.assertEqual(uploading.version, second)
+        self.assertAlmostEqual(serving.predict(platform_data)['revenue_next_month'], 500.0, places=1)
+        self.assertEqual(serving.version, second)
+
+        # Re-activating an old version does not re-export it
+        self.assertEqual(model_registry.publish_package(self.package('unused', 1.0), version=first), first)
+        self.assertAlmostEqual(serving.predict(platform_data)['revenue_next_month'], 100.0, places=1)
+
+    def test_empty_registry_publishes_legacy_package(self):
+        predictor = XGBoostPredictor()
+        predictor.model_path = self.package('legacy', 42.0)
+        self.assertTrue(predictor.load_model())
+        self.assertEqual(predictor.version, model_registry.active_version())
+        self.assertTrue(predictor.version.startswith('package-'))
+        self.assertAlmostEqual(predictor.predict({})['revenue_next_month'], 42.0, places=1)
+
+    def test_batch_prediction_matches_single_rows(self):
+        model_registry.publish_package(self.package('sloped', 10.0, slope=100.0))
+        predictor = XGBoostPredictor()
+        scenarios = [{'total_bookings': value, 'completed_bookings': 0.1} for value in (0.05, 0.5, 0.95)]
+
+        batch = predictor.predict_batch([predictor.platform_features(data) for data in scenarios])
+        self.assertEqual(set(batch), {'total_spent', 'completed_bookings'})
+        self.assertEqual(batch['total_spent'].shape, (3,))
+        self.assertLess(batch['total_spent'][0], batch['total_spent'][2])
+
+        # Same numbers as the per-row DataFrame path
+        model = predictor.models['total_spent']['model']
+        for i, data in enumerate(scenarios):
+            frame = predictor.prepare_platform_features(data).drop(columns=['total_spent'])
+            self.assertAlmostEqual(batch['total_spent'][i], float(model.predict(frame[model.feature_names_in_])[0]), places=4)
+        self.assertEqual(predictor.predict_many(scenarios), [predictor.predict(data) for data in scenarios])
+
+    def test_prediction_scenarios_endpoint(self):
+        from xg_boost.predictor import predictor
+        model_registry.publish_package(self.package('sloped', 10.0, slope=100.0))
+        admin = get_user_model().objects.create_superuser(email='admin@example.com', password='x')
+        self.client.force_login(admin)
+
+        response = self.client.post(
+            reverse('prediction_scenarios'),
+            data={'scenarios': [{'total_bookings': 0.05}, {'total_bookings': 0.95}]},
+            content_type='application/json',
+        )
+        result = response.json()
+        self.assertTrue(result['success'])
+        self.assertEqual(result['model_version'], predictor.version)
+        low, high = result['predictions']
+        self.assertLess(low['revenue_next_month'], high['revenue_next_month'])
+
+        response = self.client.post(reverse('prediction_scenarios'), data={'scenarios': [{'total_bookings': 'x'}]},
+                                    content_type='application/json')
+        self.assertFalse(response.json()['success'])
+
+    def test_predictions_are_cached_per_model_version(self):
+        model_registry.publish_package(self.package('first', 100.0), version='model-1-1.0.0')
+        predictor = XGBoostPredictor()
+        platform_data = {'total_bookings': 10, 'completed_bookings': 8}
+
+        with mock.patch.object(predictor, 'predict_batch', wraps=predictor.predict_batch) as predict_batch:
+            first = predictor.predict(platform_data)
+            self.assertEqual(predictor.predict(platform_data), first)
+            self.assertEqual(predict_batch.call_count, 1)
+
+            # Different inputs miss; a batch only runs the rows that missed
+            predictor.predict_many([platform_data, {'total_bookings': 20}])
+            self.assertEqual(predict_batch.call_count, 2)
+            self.assertEqual(len(predict_batch.call_args[0][0]), 1)
+
+            invalidate_predictions()
+            predictor.predict(platform_data)
+            self.assertEqual(predict_batch.call_count, 3)
+
+            # A new model version never serves the old version's numbers
+            model_registry.publish_package(self.package('second', 500.0), version='model-2-1.0.0')
+            self.assertAlmostEqual(predictor.predict(platform_data)['revenue_next_month'], 500.0, places=1)
+            self.assertEqual(predict_batch.call_count, 4)
@@ -11,6 +11,9 @@ urlpatterns = [
     path('admin/dashboard', views.admin_dashboard, name='admin_dashboard'),
     
     path('admin/analytics/prediction', views.analytics_prediction, name='analytics_prediction'),
+    path('admin/analytics/prediction/scenarios/', views.prediction_scenarios, name='prediction_scenarios'),
+    path('admin/analytics/churn/', views.churn_scores, name='churn_scores'),
+    path('admin/analytics/churn/score/', views.run_churn_scoring, name='run_churn_scoring'),
     
     path('admin/bookings/', views.bookings, name='bookings'),
     path('admin/bookings/update-status/', views.update_booking_status, name='update_booking_status'),
@@ -65,6 +68,7 @@ urlpatterns = [
     path('algorithm/model/<int:model_id>/details/', views.get_model_details, name='get_model_details'),
     path('algorithm/export-data/', views.export_data_csv, name='export_data_csv'),
     path('algorithm/collect-data/', views.collect_data_now, name='collect_data_now'),
+    path('algorithm/export/<int:log_id>/download/', views.download_export, name='download_export'),
 
 
     path('algorithm/old-models/', views.get_old_models_list, name='get_old_models_list'),
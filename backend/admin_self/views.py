@@ -23,10 +23,10 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.views.decorators.http import require_POST, require_GET
 from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.db import models, transaction
-from django.db.models import Q, Count, Sum, Avg, Max, Min, F
+from django.db.models import Q, Count, Sum, Avg, Max, Min, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
-from django.http import HttpResponse, JsonResponse, HttpResponseRedirect
-from django.core.paginator import Paginator
+from django.http import HttpResponse, JsonResponse, HttpResponseRedirect, FileResponse
 from django.core.mail import send_mail
 from django.conf import settings
 import logging
@@ -36,10 +36,13 @@ from django.core.files.base import ContentFile
 from django.urls import reverse
 
 # Import models
-from .models import MLModel, DataCollectionLog, Commission, Payout, PlatformRevenue
+from .models import MLModel, DataCollectionLog, Commission, Payout, PlatformRevenue, ChurnScore
 
-import pandas as pd
-from .ml_utils import predictor
+from .churn import HIGH_RISK, MEDIUM_RISK
+from .stats import PlatformStats
+from .metrics import monthly_history as snapshot_history
+from .tasks import enqueue as enqueue_task
+from xg_boost.training_data import FORMAT_EXTENSIONS as TRAINING_FORMAT_EXTENSIONS, resolve_format as resolve_training_format
 
 
 # THIRD-PARTY IMPORTS (with error handling)
@@ -80,18 +83,24 @@ except ImportError:
 
 # Home app models
 from home.models import User
+from home.geocoding import sync_stored_coordinates
+from home.pagination import merged_page, paginate, paginate_request
 
 # Employer app models
 # from employer.models import Employer
 from employer.models import (Employer, EmployerLogin, EmployerFavorite, Payment, PaymentInvoice, SiteReview, Report)
 # Employee app models
 from employee.models import (Employee, EmployeeLogin, EmployeeCertificate, EmployeeSkill, Review, JobRequest, JobAction,)
+from employee.search import matching_workers_filter, ADMIN_FIELDS
+from employee.skills import employees_with_skill, skill_category_counts
 
 # Message system models
 from message_system.models import ChatRoom, Message
 
 # ML Predictor (Use the fixed version in xg_boost)
 from xg_boost.predictor import predictor
+from xg_boost import registry as model_registry
+from xg_boost.prediction_cache import invalidate_predictions
 
 # Admin self models
 try:
@@ -202,55 +211,34 @@ def admin_dashboard(request):
     # Get current date and time
     now = timezone.now()
     month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
     
-    # Calculate statistics
+    # Calculate statistics (one conditional-aggregation query per table)
+    stats = PlatformStats(now)
     
     # 1. Total Registered Workers
-    total_workers = Employee.objects.filter(status='Active').count()
-    previous_workers = Employee.objects.filter(
-        status='Active',
-        created_at__lt=month_start
-    ).count()
+    total_workers = stats.worker_stats['active']
+    previous_workers = stats.worker_stats['active_before_month']
     worker_growth = calculate_percentage_growth(total_workers, previous_workers)
     
     # 2. Active Employers
-    active_employers = Employer.objects.filter(status='Active').count()
-    previous_employers = Employer.objects.filter(
-        status='Active',
-        created_at__lt=month_start
-    ).count()
+    active_employers = stats.employer_stats['active']
+    previous_employers = stats.employer_stats['active_before_month']
     employer_growth = calculate_percentage_growth(active_employers, previous_employers)
     
     # 3. Completed Bookings (This Month)
-    completed_bookings = JobRequest.objects.filter(
-        status='completed',
-        completed_at__gte=month_start
-    ).count()
-    last_month_completed = JobRequest.objects.filter(
-        status='completed',
-        completed_at__gte=month_ago,
-        completed_at__lt=month_start
-    ).count()
+    completed_bookings = stats.job_stats['completed_this_month']
+    last_month_completed = stats.job_stats['completed_last_month']
     booking_growth = calculate_percentage_growth(completed_bookings, last_month_completed)
     
     # 4. Total Platform Revenue
     # Calculate revenue from completed jobs
-    total_earnings = Payment.objects.filter(
-        status='completed'
-    ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
+    total_earnings = stats.payment_stats['total']
     
     # Platform revenue = 0.10% commission
-    platform_revenue = total_earnings * Decimal('0.0010')
+    platform_revenue = stats.platform_revenue
     
     # Last month revenue
-    last_month_earnings = Payment.objects.filter(
-        status='completed',
-        payment_date__date__gte=month_ago,
-        payment_date__date__lt=month_start
-    ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-    last_month_revenue = last_month_earnings * Decimal('0.0010') if last_month_earnings else Decimal('0')
+    last_month_revenue = stats.last_month_revenue
     
     revenue_growth = calculate_percentage_growth(float(platform_revenue), float(last_month_revenue))
     
@@ -259,13 +247,7 @@ def admin_dashboard(request):
     total_spent = total_earnings
     
     # 6. Calculate pending amount (Jobs accepted or in_progress but not completed)
-    pending_jobs = JobRequest.objects.filter(
-        Q(status='accepted') | Q(status='in_progress')
-    )
-    
-    # Calculate total budget for pending jobs
-    pending_amount_result = pending_jobs.aggregate(total=Sum('budget'))
-    pending_amount = pending_amount_result['total'] or Decimal('0')
+    pending_amount = stats.job_stats['pending_budget']
     
     # 7. Get recent critical activity
     recent_activities = []
@@ -274,10 +256,10 @@ def admin_dashboard(request):
     recent_workers = Employee.objects.filter(
         status='Active',
         created_at__gte=now - timedelta(hours=2)
-    ).order_by('-created_at')[:3]
+    ).annotate(avg_rating=Avg('reviews__rating')).order_by('-created_at')[:3]
     
     for worker in recent_workers:
-        avg_rating = Review.objects.filter(employee=worker).aggregate(avg=Avg('rating'))['avg'] or 0
+        avg_rating = worker.avg_rating or 0
         if avg_rating >= 4.5:
             recent_activities.append({
                 'type': 'new_worker',
@@ -322,8 +304,8 @@ def admin_dashboard(request):
     
     # ML PREDICTION DATA SECTION
     
-    # Get platform analytics data for ML predictions
-    platform_data = get_platform_analytics_data()
+    # Get platform analytics data for ML predictions (reuses the aggregates above)
+    platform_data = stats.analytics_data()
     
     # Get ML predictions from the XGBoost model
     try:
@@ -393,7 +375,7 @@ def admin_dashboard(request):
     
     
     # Get historical data for charts (last 6 months)
-    historical_data = get_historical_data(6)
+    historical_data = snapshot_history(6, now=now)
     
     # Calculate growth rates for display
     growth_rates = calculate_growth_rates(historical_data, platform_data)
@@ -479,117 +461,28 @@ def admin_dashboard(request):
 
 def get_platform_analytics_data():
     """Collect current platform data for ML predictions"""
-    now = timezone.now()
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    
-    # Get current statistics
-    total_workers = Employee.objects.filter(status='Active').count()
-    total_employers = Employer.objects.filter(status='Active').count()
-    total_users = total_workers + total_employers
-    
-    # Calculate active users (users with activity in last 7 days)
-    seven_days_ago = now - timedelta(days=7)
-    
-    # Estimate active users
-    active_workers = Employee.objects.filter(
-        Q(updated_at__gte=seven_days_ago) |
-        Q(job_requests__created_at__gte=seven_days_ago)
-    ).distinct().count()
-    
-    active_employers = Employer.objects.filter(
-        Q(updated_at__gte=seven_days_ago) |
-        Q(job_requests__created_at__gte=seven_days_ago)
-    ).distinct().count()
-    
-    active_users = active_workers + active_employers
-    
-    # Get monthly data
-    new_users_this_month = Employee.objects.filter(
-        created_at__gte=month_start
-    ).count() + Employer.objects.filter(
-        created_at__gte=month_start
-    ).count()
-    
-    deleted_accounts_this_month = Employee.objects.filter(
-        email__startswith='DELETED_',
-        updated_at__gte=month_start
-    ).count() + Employer.objects.filter(
-        email__startswith='DELETED_',
-        updated_at__gte=month_start
-    ).count()
-    
-    # Booking data
-    total_bookings = JobRequest.objects.count()
-    completed_bookings = JobRequest.objects.filter(status='completed').count()
-    cancelled_bookings = JobRequest.objects.filter(status='cancelled').count()
-    bookings_today = JobRequest.objects.filter(
-        created_at__date=now.date()
-    ).count()
-    
-    # Calculate success rate
-    if total_bookings > 0:
-        success_rate = (completed_bookings / total_bookings) * 100
-    else:
-        success_rate = 0
-    
-    # Revenue data
-    total_payment_amount_result = Payment.objects.filter(
-        status='completed'
-    ).aggregate(total=Sum('amount'))
-    total_payment_amount = total_payment_amount_result['total'] or Decimal('0')
-    
-    # Platform commission (0.10%)
-    platform_commission = total_payment_amount * Decimal('0.0010')
-    
-    # Worker earnings
-    worker_earnings_result = JobRequest.objects.filter(
-        status='completed',
-        employee__isnull=False
-    ).aggregate(total=Sum('budget'))
-    worker_earnings = worker_earnings_result['total'] or Decimal('0')
-    
-    # Average ratings
-    avg_rating_result = Review.objects.aggregate(avg=Avg('rating'))
-    avg_rating = avg_rating_result['avg'] or 0
-    
-    total_reviews = Review.objects.count()
-    
-    # Calculate average earnings per job
-    if completed_bookings > 0:
-        avg_earning_per_job = float(worker_earnings) / completed_bookings
-        avg_spending_per_job = float(total_payment_amount) / completed_bookings
-    else:
-        avg_earning_per_job = 0
-        avg_spending_per_job = 0
-    
-    return {
-        'total_users': total_users,
-        'total_workers': total_workers,
-        'total_employers': total_employers,
-        'active_users': active_users,
-        'new_users_this_month': new_users_this_month,
-        'deleted_accounts_this_month': deleted_accounts_this_month,
-        'total_bookings': total_bookings,
-        'completed_bookings': completed_bookings,
-        'cancelled_bookings': cancelled_bookings,
-        'bookings_today': bookings_today,
-        'success_rate': success_rate,
-        'total_revenue': float(total_payment_amount),
-        'total_earnings': float(worker_earnings),
-        'platform_commission': float(platform_commission),
-        'total_payment_amount': float(total_payment_amount),
-        'avg_rating': avg_rating,
-        'total_reviews': total_reviews,
-        'avg_earning_per_job': avg_earning_per_job,
-        'avg_spending_per_job': avg_spending_per_job,
-    }
+    return PlatformStats().analytics_data()
 
 
 #*****************************************************
 
 
+CHURN_RISK_LIST_SIZE = 20
+
+
 def get_churn_risk_users():
-    """Identify users at risk of churn"""
+    """Users at risk of churn, highest score first (from the ChurnScore table)"""
+    if ChurnScore.objects.exists():
+        return [{
+            'user_type': score.get_user_type_display(),
+            'name': score.name,
+            'email': score.email,
+            'days_inactive': score.days_inactive,
+            'churn_score': score.churn_score,
+            'risk_level': score.risk_level,
+        } for score in ChurnScore.objects.filter(churn_score__gt=MEDIUM_RISK)[:CHURN_RISK_LIST_SIZE]]
+
+    # Not scored yet (see `manage.py score_churn`): quick estimate from a few inactive users
     try:
         thirty_days_ago = timezone.now() - timedelta(days=30)
         
@@ -617,7 +510,7 @@ def get_churn_risk_users():
                 'email': worker.email,
                 'days_inactive': days_inactive,
                 'churn_score': churn_score,
-                'risk_level': 'High' if churn_score > 70 else 'Medium' if churn_score > 40 else 'Low',
+                'risk_level': 'High' if churn_score > HIGH_RISK else 'Medium' if churn_score > MEDIUM_RISK else 'Low',
             })
         
         for employer in inactive_employers:
@@ -630,7 +523,7 @@ def get_churn_risk_users():
                 'email': employer.email,
                 'days_inactive': days_inactive,
                 'churn_score': churn_score,
-                'risk_level': 'High' if churn_score > 70 else 'Medium' if churn_score > 40 else 'Low',
+                'risk_level': 'High' if churn_score > HIGH_RISK else 'Medium' if churn_score > MEDIUM_RISK else 'Low',
             })
         
         return sorted(churn_users, key=lambda x: x['churn_score'], reverse=True)
@@ -641,73 +534,68 @@ def get_churn_risk_users():
 
 #**************************************************************
 
+CHURN_PAGE_SIZE = 50
+
+
+@admin_required
+@require_GET
+def churn_scores(request):
+    """
+    At-risk users as JSON, highest score first. Filters: risk (High/Medium/Low), user_type
+    (worker/employer), min_score. Pages with ?cursor=<next_cursor or previous_cursor of a page>.
+    """
+    scores = ChurnScore.objects.all()
+    risk = request.GET.get('risk')
+    if risk:
+        scores = scores.filter(risk_level=risk)
+    user_type = request.GET.get('user_type')
+    if user_type:
+        scores = scores.filter(user_type=user_type)
+    try:
+        min_score = request.GET.get('min_score')
+        if min_score:
+            scores = scores.filter(churn_score__gte=float(min_score))
+        limit = max(1, min(int(request.GET.get('limit', CHURN_PAGE_SIZE)), 200))
+        # Keyset pagination on (churn_score desc, id asc)
+        page = paginate(scores, request.GET.get('cursor'), ordering=('-churn_score', 'pk'), page_size=limit)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid filter or cursor'})
+
+    last = page[-1] if page else None
+
+    return JsonResponse({
+        'success': True,
+        'results': [{
+            'user_type': score.user_type,
+            'user_id': score.user_id,
+            'name': score.name,
+            'email': score.email,
+            'churn_score': score.churn_score,
+            'risk_level': score.risk_level,
+            'days_inactive': score.days_inactive,
+            'total_bookings': score.total_bookings,
+            'completion_rate': score.completion_rate,
+        } for score in page],
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+        'risk_counts': dict(ChurnScore.objects.values_list('risk_level').annotate(count=Count('pk')).order_by()),
+        'scored_at': last.scored_at.isoformat() if last else None,
+    })
+
+
+@admin_required
+@require_POST
+def run_churn_scoring(request):
+    """Queue a full churn scoring run for the background workers"""
+    task = enqueue_task('churn_scoring', user=request.user)
+    return JsonResponse({'success': True, 'task_id': task.task_id})
+
+
+#**************************************************************
+
 def get_historical_data(months=6):
-    """Get historical data for the last N months"""
-    historical = []
-    now = timezone.now()
-    
-    for i in range(months, 0, -1):
-        month_date = now.replace(day=1) - timedelta(days=(i-1)*30)
-        month_start = month_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-        
-        # Get data for this month
-        new_users = Employee.objects.filter(
-            created_at__gte=month_start,
-            created_at__lte=month_end
-        ).count() + Employer.objects.filter(
-            created_at__gte=month_start,
-            created_at__lte=month_end
-        ).count()
-        
-        deleted_users = Employee.objects.filter(
-            email__startswith='DELETED_',
-            updated_at__gte=month_start,
-            updated_at__lte=month_end
-        ).count() + Employer.objects.filter(
-            email__startswith='DELETED_',
-            updated_at__gte=month_start,
-            updated_at__lte=month_end
-        ).count()
-        
-        completed_bookings = JobRequest.objects.filter(
-            status='completed',
-            completed_at__gte=month_start,
-            completed_at__lte=month_end
-        ).count()
-        
-        total_bookings = JobRequest.objects.filter(
-            created_at__gte=month_start,
-            created_at__lte=month_end
-        ).count()
-        
-        # Calculate success rate for this month
-        if total_bookings > 0:
-            success_rate = (completed_bookings / total_bookings) * 100
-        else:
-            success_rate = 0
-        
-        # Estimate revenue
-        revenue_payments = Payment.objects.filter(
-            status='completed',
-            payment_date__date__gte=month_start,
-            payment_date__date__lte=month_end
-        ).aggregate(total=Sum('amount'))
-        revenue = revenue_payments['total'] or Decimal('0')
-        
-        historical.append({
-            'month': month_start.strftime('%b'),
-            'year': month_start.year,
-            'new_users': new_users,
-            'deleted_users': deleted_users,
-            'completed_bookings': completed_bookings,
-            'total_bookings': total_bookings,
-            'success_rate': success_rate,
-            'revenue': float(revenue),
-            'active_users': new_users * 0.7,  # Estimate
-        })
-    
-    return historical
+    """Get historical data for the last N months (from the monthly metrics snapshots)"""
+    return snapshot_history(months)
 
 
 #*******************************************************************
@@ -999,12 +887,11 @@ def bookings(request):
     status_filter = request.GET.get('status', '')
     skill_filter = request.GET.get('skill', '')
     date_filter = request.GET.get('date', '')
-    page_number = request.GET.get('page', 1)
     
     # Base queryset - get all job requests
     bookings = JobRequest.objects.all().select_related(
         'employer', 'employee'
-    ).order_by('-created_at')
+    )
     
     # Apply filters
     if search_query:
@@ -1026,7 +913,7 @@ def bookings(request):
         bookings = bookings.filter(
             Q(category__icontains=skill_filter) |
             Q(title__icontains=skill_filter) |
-            Q(employee__skills__icontains=skill_filter)
+            Q(employee_id__in=employees_with_skill(skill_filter))
         ).distinct()
     
     # Apply date filters
@@ -1079,9 +966,8 @@ def bookings(request):
         budget__isnull=False
     ).aggregate(total=Sum('budget'))['total'] or 0
     
-    # Pagination
-    paginator = Paginator(bookings, 10)
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset on created_at, id; total estimated from table statistics)
+    page_obj = paginate_request(request, bookings, ('-created_at',), 10, count='approximate')
     
     # Prepare booking data for template
     booking_data_list = []
@@ -1299,70 +1185,9 @@ def process_refund(request):
 
 @admin_required
 def export_bookings_csv(request):
-    """Export bookings data to CSV"""
-    # Get filter parameters from request
-    search_query = request.GET.get('search', '')
-    status_filter = request.GET.get('status', '')
-    skill_filter = request.GET.get('skill', '')
-    
-    # Build queryset with same filters
-    bookings = JobRequest.objects.all().select_related('employer', 'employee')
-    
-    if search_query:
-        bookings = bookings.filter(
-            Q(title__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(employer__first_name__icontains=search_query) |
-            Q(employer__last_name__icontains=search_query) |
-            Q(employee__first_name__icontains=search_query) |
-            Q(employee__last_name__icontains=search_query)
-        )
-    
-    if status_filter:
-        bookings = bookings.filter(status=status_filter)
-    
-    if skill_filter:
-        bookings = bookings.filter(category__icontains=skill_filter)
-    
-    # Create HTTP response with CSV attachment
-    response = HttpResponse(content_type='text/csv')
+    """Export bookings data to CSV (runs as a background task)"""
     report_date = datetime.now().strftime('%Y%m%d')
-    response['Content-Disposition'] = f'attachment; filename="bookings_export_{report_date}.csv"'
-    
-    writer = csv.writer(response)
-    # Write header
-    writer.writerow([
-        'Booking ID', 'Title', 'Employer', 'Worker', 'Skill', 
-        'Amount', 'Status', 'Booking Date', 'Location', 
-        'Completed Date', 'Platform Commission'
-    ])
-    
-    # Write data rows
-    for booking in bookings:
-        employer_name = booking.employer.full_name
-        worker_name = booking.employee.full_name if booking.employee else 'N/A'
-        booking_date = booking.created_at.strftime('%Y-%m-%d %H:%M')
-        location = f"{booking.city}, {booking.state}" if booking.city else booking.location
-        completed_date = booking.completed_at.strftime('%Y-%m-%d %H:%M') if booking.completed_at else 'N/A'
-        
-        # Calculate platform commission (1%)
-        platform_commission = booking.budget * Decimal('0.001') if booking.budget else 0
-        
-        writer.writerow([
-            f"BK{booking.job_id:04d}",
-            booking.title[:50],
-            employer_name,
-            worker_name,
-            booking.category or 'General',
-            booking.budget or 0,
-            booking.get_status_display(),
-            booking_date,
-            location or 'N/A',
-            completed_date,
-            platform_commission,
-        ])
-    
-    return response
+    return enqueue_export(request, 'bookings', 'Bookings Export', f"bookings_export_{report_date}.csv", request.GET.dict())
 
 
 #*******************************************************************
@@ -1422,10 +1247,9 @@ def show_employer_list(request):
     business_type_filter = request.GET.get('business_type', '')
     status_filter = request.GET.get('status', '')
     sort_by = request.GET.get('sort', 'newest')
-    page_number = request.GET.get('page', 1)
     
     # Base queryset
-    employers = Employer.objects.all().order_by('-created_at')
+    employers = Employer.objects.all()
     
     # Apply filters
     if search_query:
@@ -1448,18 +1272,16 @@ def show_employer_list(request):
         employers = employers.filter(status=status_filter)
     
     # Apply sorting
-    if sort_by == 'bookings-high':
-        employers = employers.annotate(job_count=Count('job_requests')).order_by('-job_count')
-    elif sort_by == 'bookings-low':
-        employers = employers.annotate(job_count=Count('job_requests')).order_by('job_count')
+    if sort_by in ('bookings-high', 'bookings-low'):
+        employers = employers.annotate(job_count=Count('job_requests'))
+        ordering = ('-job_count',) if sort_by == 'bookings-high' else ('job_count',)
     elif sort_by == 'oldest':
-        employers = employers.order_by('created_at')
+        ordering = ('created_at',)
     else:  # newest (default)
-        employers = employers.order_by('-created_at')
+        ordering = ('-created_at',)
     
-    # Pagination
-    paginator = Paginator(employers, 10)
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset on the sort key + id)
+    page_obj = paginate_request(request, employers, ordering, 10, count='approximate')
     
     # Prepare employer data for template
     employer_data_list = []
@@ -1744,6 +1566,7 @@ def update_employer(request, employer_id):
             employer.state = request.POST.get('state', employer.state)
             employer.zip_code = request.POST.get('zip_code', employer.zip_code)
             employer.country = request.POST.get('country', employer.country)
+            sync_stored_coordinates(employer)
             
             # Update preferences
             employer.language = request.POST.get('language', employer.language)
@@ -1945,70 +1768,8 @@ def handle_single_action(request):
 
 @admin_required
 def export_employers_csv(request):
-    """Export employers data to CSV"""
-    # Get filter parameters from request
-    search_query = request.GET.get('search', '')
-    business_type_filter = request.GET.get('business_type', '')
-    status_filter = request.GET.get('status', '')
-    
-    # Build queryset with same filters
-    employers = Employer.objects.all()
-    
-    if search_query:
-        employers = employers.filter(
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(company_name__icontains=search_query)
-        )
-    
-    if business_type_filter == 'individual':
-        employers = employers.filter(company_name__isnull=True)
-    elif business_type_filter == 'company':
-        employers = employers.filter(company_name__isnull=False)
-    
-    if status_filter:
-        employers = employers.filter(status=status_filter)
-    
-    # Create HTTP response with CSV attachment
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="employers_export.csv"'
-    
-    writer = csv.writer(response)
-    # Write header
-    writer.writerow([
-        'ID', 'Name', 'Email', 'Phone', 'Company', 
-        'Location', 'Status', 'Total Bookings', 'Total Spending',
-        'Joined Date', 'Last Active'
-    ])
-    
-    # Write data rows
-    for employer in employers:
-        total_bookings = JobRequest.objects.filter(employer=employer).count()
-        
-        total_spending_result = JobRequest.objects.filter(
-            employer=employer,
-            status='completed'
-        ).aggregate(total=Sum('budget'))
-        total_spending = total_spending_result['total'] or 0
-        
-        location = f"{employer.city}, {employer.state}" if employer.city else employer.country
-        
-        writer.writerow([
-            f"EM{employer.employer_id:04d}",
-            employer.full_name,
-            employer.email,
-            employer.phone or 'N/A',
-            employer.company_name or 'Individual',
-            location or 'N/A',
-            employer.get_status_display(),
-            total_bookings,
-            total_spending,
-            employer.created_at.strftime('%Y-%m-%d'),
-            employer.updated_at.strftime('%Y-%m-%d') if employer.updated_at else ''
-        ])
-    
-    return response
+    """Export employers data to CSV (runs as a background task)"""
+    return enqueue_export(request, 'employers', 'Employers Export', "employers_export.csv", request.GET.dict())
 
 
 #******************************************************************
@@ -2069,6 +1830,18 @@ def get_worker_initials(worker):
 
 #*********************************************************
 
+# ?sort= value -> keyset ordering for the worker list
+WORKER_LIST_ORDERING = {
+    'rating-high': ('-rating',),
+    'rating-low': ('rating',),
+    'jobs-high': ('-job_count',),
+    'jobs-low': ('job_count',),
+    'earnings-high': ('-total_earnings',),
+    'earnings-low': ('total_earnings',),
+    'oldest': ('created_at',),
+    'newest': ('-created_at',),
+}
+
 def show_worker_list(request):
     """Show worker list view"""
     # Get all filter parameters
@@ -2076,51 +1849,27 @@ def show_worker_list(request):
     skill_filter = request.GET.get('skill', '')
     status_filter = request.GET.get('status', '')
     sort_by = request.GET.get('sort', 'newest')
-    page_number = request.GET.get('page', 1)
     
     # Base queryset
-    workers = Employee.objects.all().order_by('-created_at')
+    workers = Employee.objects.all()
     
-    # Apply filters
+    # Apply filters (worker search index: every term must prefix-match an indexed field)
     if search_query:
-        workers = workers.filter(
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(job_title__icontains=search_query) |
-            Q(skills__icontains=search_query) |
-            Q(city__icontains=search_query) |
-            Q(state__icontains=search_query) |
-            Q(phone__icontains=search_query)
-        )
+        workers = workers.filter(matching_workers_filter(search_query, ADMIN_FIELDS))
     
     if skill_filter:
-        workers = workers.filter(skills__icontains=skill_filter)
+        workers = workers.filter(pk__in=employees_with_skill(skill_filter))
     
     if status_filter:
         workers = workers.filter(status=status_filter)
     
     # Apply sorting
-    if sort_by == 'rating-high':
-        workers = workers.order_by('-rating')
-    elif sort_by == 'rating-low':
-        workers = workers.order_by('rating')
-    elif sort_by == 'jobs-high':
-        workers = workers.annotate(job_count=Count('job_requests')).order_by('-job_count')
-    elif sort_by == 'jobs-low':
-        workers = workers.annotate(job_count=Count('job_requests')).order_by('job_count')
-    elif sort_by == 'earnings-high':
-        workers = workers.order_by('-total_earnings')
-    elif sort_by == 'earnings-low':
-        workers = workers.order_by('total_earnings')
-    elif sort_by == 'oldest':
-        workers = workers.order_by('created_at')
-    else:  # newest (default)
-        workers = workers.order_by('-created_at')
+    if sort_by in ('jobs-high', 'jobs-low'):
+        workers = workers.annotate(job_count=Count('job_requests'))
+    ordering = WORKER_LIST_ORDERING.get(sort_by, ('-created_at',))  # newest (default)
     
-    # Pagination
-    paginator = Paginator(workers, 10)
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset on the sort key + id)
+    page_obj = paginate_request(request, workers, ordering, 10, count='approximate')
     
     # Prepare worker data for template
     worker_data_list = []
@@ -2189,19 +1938,14 @@ def show_worker_list(request):
     removed_workers = Employee.objects.filter(email__startswith='DELETED_').count()
     
     # Calculate category statistics
+    category_counts = skill_category_counts()
     categories = {
-        'Plumbers': Employee.objects.filter(skills__icontains='plumb').count(),
-        'Electricians': Employee.objects.filter(skills__icontains='electric').count(),
-        'Carpenters': Employee.objects.filter(skills__icontains='carpent').count(),
-        'Painters': Employee.objects.filter(skills__icontains='paint').count(),
-        'Cleaners': Employee.objects.filter(skills__icontains='clean').count(),
-        'Other': Employee.objects.exclude(
-            Q(skills__icontains='plumb') |
-            Q(skills__icontains='electric') |
-            Q(skills__icontains='carpent') |
-            Q(skills__icontains='paint') |
-            Q(skills__icontains='clean')
-        ).count()
+        'Plumbers': category_counts['plumbing'],
+        'Electricians': category_counts['electrical'],
+        'Carpenters': category_counts['carpentry'],
+        'Painters': category_counts['painting'],
+        'Cleaners': category_counts['cleaning'],
+        'Other': category_counts['other'],
     }
     
     # Platform job statistics
@@ -2493,6 +2237,7 @@ def update_worker(request, worker_id):
             worker.state = request.POST.get('state', worker.state)
             worker.zip_code = request.POST.get('zip_code', worker.zip_code)
             worker.country = request.POST.get('country', worker.country)
+            sync_stored_coordinates(worker)
             
             # Update preferences
             worker.language = request.POST.get('language', worker.language)
@@ -2723,67 +2468,179 @@ def handle_worker_single_action(request):
 
 @admin_required
 def export_workers_csv(request):
-    """Export workers data to CSV"""
-    # Get filter parameters from request
-    search_query = request.GET.get('search', '')
-    skill_filter = request.GET.get('skill', '')
-    status_filter = request.GET.get('status', '')
-    
-    # Build queryset with same filters
-    workers = Employee.objects.all()
-    
+    """Export workers data to CSV (runs as a background task)"""
+    return enqueue_export(request, 'workers', 'Workers Export', "workers_export.csv", request.GET.dict())
+
+
+#************************************************************
+
+REVIEWS_PAGE_SIZE = 10
+
+
+def rating_summary(model):
+    """
+    Total, average, positive (4+) count and 1-5 star distribution for a review model from a
+    single GROUP BY rating query
+    """
+    counts = dict(model.objects.values_list('rating').annotate(count=Count('pk')).order_by())
+    total = sum(counts.values())
+    rated = {rating: count for rating, count in counts.items() if rating is not None}
+    rated_count = sum(rated.values())
+    average = sum(rating * count for rating, count in rated.items()) / rated_count if rated_count else 0.0
+
+    distribution = {}
+    for i in range(1, 6):
+        count = counts.get(i, 0)
+        distribution[i] = {
+            'count': count,
+            'percentage': round((count / total * 100) if total > 0 else 0, 1),
+        }
+    return {
+        'total': total,
+        'average': round(average, 1),
+        'positive': sum(count for rating, count in rated.items() if rating >= 4),
+        'distribution': distribution,
+        'counts': counts,
+    }
+
+
+def _worker_review_row(review):
+    reviewer_name = review.employer.full_name if review.employer else "Unknown"
+    worker_name = review.employee.full_name if review.employee else "Unknown"
+    job_title = review.job.title if review.job else "N/A"
+    job_id = f"BK{review.job.job_id:04d}" if review.job else "N/A"
+    return {
+        'id': review.id,
+        'type': 'worker',
+        'reviewer_avatar': get_initials(review.employer) if review.employer else "??",
+        'reviewer_name': reviewer_name,
+        'reviewed_entity': f"{worker_name} ({review.employee.job_title if review.employee else 'Worker'})",
+        'additional_info': f"Booking: {job_id} | {job_title}",
+        'rating': review.rating,
+        'text': review.text,
+        'created_at': review.created_at,
+        'sentiment_score': review.sentiment_score,
+    }
+
+
+def _site_review_row(review):
+    reviewer_name = review.employer.full_name if review.employer else "Unknown"
+
+    # User info (job counts are annotated on the queryset)
+    user_info = f"Review Type: {review.get_review_type_display()}"
+    if review.employee:
+        user_info = f"Worker since: {review.created_at.strftime('%b %Y')} | {review.employee_job_count} jobs"
+    elif review.employer:
+        user_info = f"Employer since: {review.created_at.strftime('%b %Y')} | {review.employer_job_count} bookings"
+
+    return {
+        'id': review.id,
+        'type': 'site',
+        'reviewer_avatar': get_initials(review.employer) if review.employer else "??",
+        'reviewer_name': reviewer_name,
+        'reviewed_entity': "SkillConnect Platform",
+        'additional_info': user_info,
+        'rating': review.rating,
+        'title': review.title,
+        'text': review.review_text,
+        'review_type': review.review_type,
+        'created_at': review.created_at,
+        'recommendation': review.recommendation,
+        'areas': review.areas,
+        'is_published': review.is_published,
+    }
+
+
+def _report_row(report, row_type):
+    reporter_name = report.employer.full_name if report.employer else "Unknown"
+    reported_name = report.employee.full_name if report.employee else "Unknown"
+    row = {
+        'id': report.id,
+        'type': row_type,
+        'reviewer_avatar': get_initials(report.employer) if report.employer else "??",
+        'reviewer_name': reporter_name,
+        'reviewed_entity': f"{reported_name} ({report.employee.job_title if report.employee else 'Worker'})",
+        'additional_info': f"Type: {report.get_report_type_display()} | Severity: {report.get_severity_display()}",
+        'text': report.description,
+        'created_at': report.created_at,
+        'report_type': report.report_type,
+        'severity': report.severity,
+        'resolution_preference': report.resolution_preference,
+    }
+    if row_type == 'reported':
+        # Get the related review if exists
+        related_review = None
+        if report.employee and report.employer:
+            related_review = Review.objects.filter(
+                employee=report.employee,
+                employer=report.employer,
+                job=report.job
+            ).first()
+        row['related_review'] = related_review.text if related_review else None
+    return row
+
+
+def _job_count(owner_field):
+    jobs = JobRequest.objects.filter(**{owner_field: OuterRef(owner_field)}).order_by().values(owner_field)
+    return Coalesce(Subquery(jobs.annotate(count=Count('pk')).values('count')), Value(0))
+
+
+def worker_reviews_queryset(search_query='', rating=None):
+    queryset = Review.objects.select_related('employer', 'employee', 'job')
     if search_query:
-        workers = workers.filter(
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(job_title__icontains=search_query) |
-            Q(skills__icontains=search_query)
+        queryset = queryset.filter(
+            Q(text__icontains=search_query) |
+            Q(employer__first_name__icontains=search_query) |
+            Q(employer__last_name__icontains=search_query) |
+            Q(employer__company_name__icontains=search_query) |
+            Q(employee__first_name__icontains=search_query) |
+            Q(employee__last_name__icontains=search_query) |
+            Q(job__title__icontains=search_query)
         )
-    
-    if skill_filter:
-        workers = workers.filter(skills__icontains=skill_filter)
-    
-    if status_filter:
-        workers = workers.filter(status=status_filter)
-    
-    # Create HTTP response with CSV attachment
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="workers_export.csv"'
-    
-    writer = csv.writer(response)
-    # Write header
-    writer.writerow([
-        'ID', 'Name', 'Email', 'Phone', 'Job Title', 
-        'Skills', 'Location', 'Rating', 'Jobs Done',
-        'Total Earnings', 'Status', 'Joined Date', 'Last Active'
-    ])
-    
-    # Write data rows
-    for worker in workers:
-        location = f"{worker.city}, {worker.state}" if worker.city else worker.country
-        skills = worker.skills or 'N/A'
-        
-        writer.writerow([
-            f"WK{worker.employee_id:04d}",
-            worker.full_name,
-            worker.email,
-            worker.phone or 'N/A',
-            worker.job_title or 'N/A',
-            skills[:100],  # Limit skills to 100 chars
-            location or 'N/A',
-            worker.rating,
-            worker.total_jobs_done,
-            worker.total_earnings,
-            worker.get_status_display(),
-            worker.created_at.strftime('%Y-%m-%d'),
-            worker.updated_at.strftime('%Y-%m-%d') if worker.updated_at else ''
-        ])
-    
-    return response
+    if rating is not None:
+        queryset = queryset.filter(rating=rating)
+    return queryset
 
 
-#************************************************************
+def site_reviews_queryset(search_query='', rating=None):
+    queryset = SiteReview.objects.select_related('employer', 'employee').annotate(
+        employee_job_count=_job_count('employee'),
+        employer_job_count=_job_count('employer'),
+    )
+    if search_query:
+        queryset = queryset.filter(
+            Q(title__icontains=search_query) |
+            Q(review_text__icontains=search_query) |
+            Q(employer__first_name__icontains=search_query) |
+            Q(employer__last_name__icontains=search_query) |
+            Q(employer__company_name__icontains=search_query)
+        )
+    if rating is not None:
+        # Site ratings are whole stars; a fractional filter matches none of them
+        queryset = queryset.filter(rating=int(rating)) if rating.is_integer() else queryset.none()
+    return queryset
+
+
+def reports_queryset(tab, search_query=''):
+    queryset = Report.objects.select_related('employer', 'employee', 'job')
+    if tab == 'reported':
+        queryset = queryset.filter(status='pending')
+    else:
+        queryset = queryset.filter(employee__isnull=False)
+    if search_query:
+        search = (
+            Q(title__icontains=search_query) |
+            Q(description__icontains=search_query) |
+            Q(employer__first_name__icontains=search_query) |
+            Q(employer__last_name__icontains=search_query) |
+            Q(employee__first_name__icontains=search_query) |
+            Q(employee__last_name__icontains=search_query)
+        )
+        if tab == 'reported':
+            search |= Q(resolution_preference__icontains=search_query)
+        queryset = queryset.filter(search)
+    return queryset
+
 
 @admin_required
 def review_ratings(request):
@@ -2794,27 +2651,19 @@ def review_ratings(request):
     search_query = request.GET.get('search', '').strip()
     rating_filter = request.GET.get('rating', '')
     category_filter = request.GET.get('category', '')
-    page_number = request.GET.get('page', 1)
+    cursor = request.GET.get('cursor', '')
     
-    # Calculate statistics
-    all_worker_reviews = Review.objects.all()
-    all_site_reviews = SiteReview.objects.all()
+    # Statistics: one GROUP BY rating query per review type
+    worker_summary = rating_summary(Review)
+    site_summary = rating_summary(SiteReview)
     
     # Overall Employee Rating (from employer reviews to workers)
-    employee_rating = 0.0
-    total_worker_reviews_count = all_worker_reviews.count()
-    
-    if total_worker_reviews_count > 0:
-        employee_rating_avg = all_worker_reviews.aggregate(avg=Avg('rating'))['avg'] or 0.0
-        employee_rating = round(employee_rating_avg, 1)
+    employee_rating = worker_summary['average']
+    total_worker_reviews_count = worker_summary['total']
     
     # Overall Site Review Rating (from platform reviews)
-    site_rating = 0.0
-    total_site_reviews_count = all_site_reviews.count()
-    
-    if total_site_reviews_count > 0:
-        site_rating_avg = all_site_reviews.aggregate(avg=Avg('rating'))['avg'] or 0.0
-        site_rating = round(site_rating_avg, 1)
+    site_rating = site_summary['average']
+    total_site_reviews_count = site_summary['total']
     
     # Count reviews by type
     total_reviews = total_worker_reviews_count + total_site_reviews_count
@@ -2823,324 +2672,71 @@ def review_ratings(request):
     reported_reviews_count = Report.objects.filter(status='pending').count()
     
     # Positive worker reviews (4+ stars)
-    positive_worker_reviews = Review.objects.filter(rating__gte=4.0).count()
+    positive_worker_reviews = worker_summary['positive']
     positive_worker_percentage = (positive_worker_reviews / total_worker_reviews_count * 100) if total_worker_reviews_count > 0 else 0
     
     # Positive site reviews (4+ stars)
-    positive_site_reviews = SiteReview.objects.filter(rating__gte=4.0).count()
+    positive_site_reviews = site_summary['positive']
     positive_site_percentage = (positive_site_reviews / total_site_reviews_count * 100) if total_site_reviews_count > 0 else 0
     
     # Overall positive percentage (weighted average)
     total_positive_reviews = positive_worker_reviews + positive_site_reviews
     overall_positive_percentage = (total_positive_reviews / total_reviews * 100) if total_reviews > 0 else 0
     
-    # Rating distribution for worker reviews
-    worker_rating_distribution = {}
-    for i in range(1, 6):
-        count = Review.objects.filter(rating=i).count()
-        percentage = (count / total_worker_reviews_count * 100) if total_worker_reviews_count > 0 else 0
-        worker_rating_distribution[i] = {
-            'count': count,
-            'percentage': round(percentage, 1)
-        }
-    
-    # Rating distribution for site reviews
-    site_rating_distribution = {}
-    for i in range(1, 6):
-        count = SiteReview.objects.filter(rating=i).count()
-        percentage = (count / total_site_reviews_count * 100) if total_site_reviews_count > 0 else 0
-        site_rating_distribution[i] = {
-            'count': count,
-            'percentage': round(percentage, 1)
-        }
-    
-    # Get reviews based on active tab
-    reviews_list = []
-    
-    if tab == 'worker':
-        # Worker reviews (employer to employee)
-        base_queryset = Review.objects.select_related(
-            'employer', 'employee', 'job'
-        ).order_by('-created_at')
-        
-        if search_query:
-            base_queryset = base_queryset.filter(
-                Q(text__icontains=search_query) |
-                Q(employer__first_name__icontains=search_query) |
-                Q(employer__last_name__icontains=search_query) |
-                Q(employer__company_name__icontains=search_query) |
-                Q(employee__first_name__icontains=search_query) |
-                Q(employee__last_name__icontains=search_query) |
-                Q(job__title__icontains=search_query)
-            )
-        
-        if rating_filter:
-            base_queryset = base_queryset.filter(rating=float(rating_filter))
-        
-        for review in base_queryset:
-            reviewer_name = review.employer.full_name if review.employer else "Unknown"
-            worker_name = review.employee.full_name if review.employee else "Unknown"
-            job_title = review.job.title if review.job else "N/A"
-            job_id = f"BK{review.job.job_id:04d}" if review.job else "N/A"
-            
-            reviews_list.append({
-                'id': review.id,
-                'type': 'worker',
-                'reviewer_avatar': get_initials(review.employer) if review.employer else "??",
-                'reviewer_name': reviewer_name,
-                'reviewed_entity': f"{worker_name} ({review.employee.job_title if review.employee else 'Worker'})",
-                'additional_info': f"Booking: {job_id} | {job_title}",
-                'rating': review.rating,
-                'text': review.text,
-                'created_at': review.created_at,
-                'sentiment_score': review.sentiment_score,
-            })
-            
-    elif tab == 'site':
-        # Site reviews
-        base_queryset = SiteReview.objects.select_related(
-            'employer', 'employee'
-        ).order_by('-created_at')
-        
-        if search_query:
-            base_queryset = base_queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(review_text__icontains=search_query) |
-                Q(employer__first_name__icontains=search_query) |
-                Q(employer__last_name__icontains=search_query) |
-                Q(employer__company_name__icontains=search_query)
-            )
-        
-        if rating_filter:
-            base_queryset = base_queryset.filter(rating=int(rating_filter))
-        
-        for review in base_queryset:
-            reviewer_name = review.employer.full_name if review.employer else "Unknown"
-            
-            # User info
-            user_info = f"Review Type: {review.get_review_type_display()}"
-            if review.employee:
-                job_count = JobRequest.objects.filter(employee=review.employee).count()
-                user_info = f"Worker since: {review.created_at.strftime('%b %Y')} | {job_count} jobs"
-            elif review.employer:
-                job_count = JobRequest.objects.filter(employer=review.employer).count()
-                user_info = f"Employer since: {review.created_at.strftime('%b %Y')} | {job_count} bookings"
-            
-            reviews_list.append({
-                'id': review.id,
-                'type': 'site',
-                'reviewer_avatar': get_initials(review.employer) if review.employer else "??",
-                'reviewer_name': reviewer_name,
-                'reviewed_entity': "SkillConnect Platform",
-                'additional_info': user_info,
-                'rating': review.rating,
-                'title': review.title,
-                'text': review.review_text,
-                'review_type': review.review_type,
-                'created_at': review.created_at,
-                'recommendation': review.recommendation,
-                'recommendation': review.recommendation,
-                'areas': review.areas,
-                'is_published': review.is_published,
-            })
-            
-    elif tab == 'employee_report':
-        # Employee Reports
-        base_queryset = Report.objects.select_related(
-            'employer', 'employee', 'job'
-        ).filter(
-            employee__isnull=False
-        ).order_by('-created_at')
-        
-        if search_query:
-            base_queryset = base_queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(employer__first_name__icontains=search_query) |
-                Q(employer__last_name__icontains=search_query) |
-                Q(employee__first_name__icontains=search_query) |
-                Q(employee__last_name__icontains=search_query)
-            )
-        
-        for report in base_queryset:
-            reporter_name = report.employer.full_name if report.employer else "Unknown"
-            reported_name = report.employee.full_name if report.employee else "Unknown"
-            
-            # Additional info
-            additional_info = f"Type: {report.get_report_type_display()} | Severity: {report.get_severity_display()}"
-            
-            reviews_list.append({
-                'id': report.id,
-                'type': 'employee_report', # Distinct type for styling if needed
-                'reviewer_avatar': get_initials(report.employer) if report.employer else "??",
-                'reviewer_name': reporter_name,
-                'reviewed_entity': f"{reported_name} ({report.employee.job_title if report.employee else 'Worker'})",
-                'additional_info': additional_info,
-                'text': report.description,
-                'created_at': report.created_at,
-                'report_type': report.report_type,
-                'severity': report.severity,
-                'resolution_preference': report.resolution_preference,
-            })
-
-    elif tab == 'reported':
-        # Reported reviews
-        base_queryset = Report.objects.select_related(
-            'employer', 'employee', 'job'
-        ).filter(
-            status='pending'
-        ).order_by('-created_at')
-        
-        if search_query:
-            base_queryset = base_queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(resolution_preference__icontains=search_query) |
-                Q(employer__first_name__icontains=search_query) |
-                Q(employer__last_name__icontains=search_query) |
-                Q(employee__first_name__icontains=search_query) |
-                Q(employee__last_name__icontains=search_query)
-            )
-        
-        for report in base_queryset:
-            reporter_name = report.employer.full_name if report.employer else "Unknown"
-            reported_name = report.employee.full_name if report.employee else "Unknown"
-            
-            # Additional info
-            additional_info = f"Type: {report.get_report_type_display()} | Severity: {report.get_severity_display()}"
-            
-            # Get the related review if exists
-            related_review = None
-            if report.employee and report.employer:
-                related_review = Review.objects.filter(
-                    employee=report.employee,
-                    employer=report.employer,
-                    job=report.job
-                ).first()
-            
-            reviews_list.append({
-                'id': report.id,
-                'type': 'reported',
-                'reviewer_avatar': get_initials(report.employer) if report.employer else "??",
-                'reviewer_name': reporter_name,
-                'reviewed_entity': f"{reported_name} ({report.employee.job_title if report.employee else 'Worker'})",
-                'additional_info': additional_info,
-                'text': report.description,
-                'created_at': report.created_at,
-                'report_type': report.report_type,
-                'severity': report.severity,
-                'related_review': related_review.text if related_review else None,
-                'resolution_preference': report.resolution_preference,
-            })
-            
-    else:  # 'all' tab or default
-        # Combine both types of reviews
-        worker_reviews = Review.objects.select_related(
-            'employer', 'employee', 'job'
-        ).order_by('-created_at')[:50]
-        
-        site_reviews = SiteReview.objects.select_related(
-            'employer', 'employee'
-        ).order_by('-created_at')[:50]
-        
-        # Process worker reviews
-        for review in worker_reviews:
-            if search_query and not (
-                search_query.lower() in review.text.lower() or
-                (review.employer and search_query.lower() in review.employer.full_name.lower()) or
-                (review.employee and search_query.lower() in review.employee.full_name.lower())
-            ):
-                continue
-            
-            if rating_filter and review.rating != float(rating_filter):
-                continue
-            
-            reviewer_name = review.employer.full_name if review.employer else "Unknown"
-            worker_name = review.employee.full_name if review.employee else "Unknown"
-            job_title = review.job.title if review.job else "N/A"
-            job_id = f"BK{review.job.job_id:04d}" if review.job else "N/A"
-            
-            reviews_list.append({
-                'id': review.id,
-                'type': 'worker',
-                'reviewer_avatar': get_initials(review.employer) if review.employer else "??",
-                'reviewer_name': reviewer_name,
-                'reviewed_entity': f"{worker_name} ({review.employee.job_title if review.employee else 'Worker'})",
-                'additional_info': f"Booking: {job_id} | {job_title}",
-                'rating': review.rating,
-                'text': review.text,
-                'created_at': review.created_at,
-                'sentiment_score': review.sentiment_score,
-            })
-        
-        # Process site reviews
-        for review in site_reviews:
-            if search_query and not (
-                search_query.lower() in review.review_text.lower() or
-                search_query.lower() in review.title.lower() or
-                (review.employer and search_query.lower() in review.employer.full_name.lower())
-            ):
-                continue
-            
-            if rating_filter and review.rating != int(rating_filter):
-                continue
-            
-            reviewer_name = review.employer.full_name if review.employer else "Unknown"
-            
-            # User info
-            user_info = f"Review Type: {review.get_review_type_display()}"
-            if review.employee:
-                job_count = JobRequest.objects.filter(employee=review.employee).count()
-                user_info = f"Worker | {job_count} jobs"
-            elif review.employer:
-                job_count = JobRequest.objects.filter(employer=review.employer).count()
-                user_info = f"Employer | {job_count} bookings"
-            
-            reviews_list.append({
-                'id': review.id,
-                'type': 'site',
-                'reviewer_avatar': get_initials(review.employer) if review.employer else "??",
-                'reviewer_name': reviewer_name,
-                'reviewed_entity': "SkillConnect Platform",
-                'additional_info': user_info,
-                'rating': review.rating,
-                'title': review.title,
-                'text': review.review_text,
-                'review_type': review.review_type,
-                'review_type': review.review_type,
-                'created_at': review.created_at,
-                'is_published': review.is_published,
-            })
-        
-        # Sort combined list by date
-        reviews_list.sort(key=lambda x: x['created_at'], reverse=True)
-    
-    # Pagination
-    paginator = Paginator(reviews_list, 10)
-    page_obj = paginator.get_page(page_number)
-    
-    # Calculate pagination info
-    start_index = (page_obj.number - 1) * paginator.per_page + 1
-    end_index = start_index + len(page_obj.object_list) - 1
-    total_count = paginator.count
+    # Get one page of the active tab (keyset pagination on created_at, id)
+    try:
+        rating = float(rating_filter) if rating_filter else None
+        if tab == 'worker':
+            page = paginate(worker_reviews_queryset(search_query, rating), cursor, page_size=REVIEWS_PAGE_SIZE)
+            reviews_list = [_worker_review_row(review) for review in page]
+
+        elif tab == 'site':
+            page = paginate(site_reviews_queryset(search_query, rating), cursor, page_size=REVIEWS_PAGE_SIZE)
+            reviews_list = [_site_review_row(review) for review in page]
+
+        elif tab in ('employee_report', 'reported'):
+            page = paginate(reports_queryset(tab, search_query), cursor, page_size=REVIEWS_PAGE_SIZE)
+            reviews_list = [_report_row(report, tab) for report in page]
+
+        else:  # 'all' tab or default: worker and site reviews merged by date
+            page = merged_page([
+                ('worker', worker_reviews_queryset(search_query, rating)),
+                ('site', site_reviews_queryset(search_query, rating)),
+            ], cursor, REVIEWS_PAGE_SIZE)
+            reviews_list = [
+                _worker_review_row(review) if source == 'worker' else _site_review_row(review)
+                for source, review in page
+            ]
+    except ValueError:
+        # Malformed cursor or rating filter: back to the first page
+        messages.error(request, "Invalid page or filter.")
+        return redirect('{}?tab={}'.format(reverse('review_ratings'), tab))
+    
+    # Totals are known from the summaries unless a text search is active
+    total_count = None
+    if not search_query:
+        if tab in ('worker', 'all', 'site'):
+            summaries = {'worker': [worker_summary], 'site': [site_summary], 'all': [worker_summary, site_summary]}[tab]
+            if rating is not None:
+                total_count = sum(summary['counts'].get(rating, 0) for summary in summaries)
+            else:
+                total_count = sum(summary['total'] for summary in summaries)
+        elif tab == 'reported':
+            total_count = reported_reviews_count
+    
+    if not reviews_list:
+        pagination_info = "No reviews"
+    elif total_count is not None:
+        pagination_info = f"Showing {page.start_index()}-{page.end_index()} of {total_count} reviews"
+    else:
+        pagination_info = f"Showing {page.start_index()}-{page.end_index()} reviews"
     
     # Calculate average ratings for top categories
-    top_categories_rating = {}
-    if total_worker_reviews_count > 0:
-        # Get average rating by job category
-        category_ratings = {}
-        for review in Review.objects.select_related('job'):
-            if review.job and review.job.category:
-                category = review.job.category
-                if category not in category_ratings:
-                    category_ratings[category] = {'total': 0, 'count': 0}
-                category_ratings[category]['total'] += review.rating
-                category_ratings[category]['count'] += 1
-        
-        # Calculate averages
-        for category, data in category_ratings.items():
-            if data['count'] > 0:
-                top_categories_rating[category] = round(data['total'] / data['count'], 1)
+    top_categories_rating = {
+        row['job__category']: round(row['avg'], 1)
+        for row in Review.objects.filter(job__category__isnull=False, rating__isnull=False)
+        .exclude(job__category='').values('job__category').annotate(avg=Avg('rating')).order_by()
+    }
     
     context = {
         'tab': tab,
@@ -3165,23 +2761,24 @@ def review_ratings(request):
         'positive_site_reviews': positive_site_reviews,
         'total_positive_reviews': total_positive_reviews,
         
-        # Reviews data
-        'reviews': page_obj,
+        # Reviews data (current page)
+        'reviews': reviews_list,
         'reviews_list': reviews_list,
         
         # Rating distributions
-        'worker_rating_distribution': worker_rating_distribution,
-        'site_rating_distribution': site_rating_distribution,
+        'worker_rating_distribution': worker_summary['distribution'],
+        'site_rating_distribution': site_summary['distribution'],
         
         # Category ratings
         'top_categories_rating': top_categories_rating,
         
         # Pagination info
-        'pagination_info': f"Showing {start_index}-{end_index} of {total_count} reviews",
-        'has_previous': page_obj.has_previous(),
-        'has_next': page_obj.has_next(),
-        'page_range': range(1, paginator.num_pages + 1),
-        'current_page': page_obj.number,
+        'pagination_info': pagination_info,
+        'page': page,
+        'has_previous': page.has_previous,
+        'has_next': page.has_next,
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
         
         # Filter options
         'rating_choices': [
@@ -3349,91 +2946,8 @@ def handle_review_action(request):
 # function for exporting reviews
 @admin_required
 def export_reviews_csv(request):
-    """Export reviews data to CSV"""
-    import csv
-    from django.http import HttpResponse
-    
-    # Get filter parameters
-    tab = request.GET.get('tab', 'all')
-    search_query = request.GET.get('search', '')
-    rating_filter = request.GET.get('rating', '')
-    
-    # Create HTTP response with CSV attachment
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="reviews_export.csv"'
-    
-    writer = csv.writer(response)
-    
-    if tab == 'worker' or tab == 'all':
-        # Write worker reviews header
-        writer.writerow(['Employee Reviews Export'])
-        writer.writerow(['ID', 'Employer', 'Employee', 'Rating', 'Review Text', 
-                        'Sentiment Score', 'Date', 'Job Title', 'Job ID'])
-        
-        # Get worker reviews
-        worker_reviews = Review.objects.select_related('employer', 'employee', 'job')
-        
-        if search_query:
-            worker_reviews = worker_reviews.filter(
-                Q(text__icontains=search_query) |
-                Q(employer__first_name__icontains=search_query) |
-                Q(employer__last_name__icontains=search_query) |
-                Q(employee__first_name__icontains=search_query) |
-                Q(employee__last_name__icontains=search_query)
-            )
-        
-        if rating_filter:
-            worker_reviews = worker_reviews.filter(rating=float(rating_filter))
-        
-        for review in worker_reviews:
-            writer.writerow([
-                f"WR{review.id:04d}",
-                review.employer.full_name if review.employer else 'Unknown',
-                review.employee.full_name if review.employee else 'Unknown',
-                review.rating,
-                review.text[:200],  # Limit text length
-                review.sentiment_score,
-                review.created_at.strftime('%Y-%m-%d %H:%M'),
-                review.job.title if review.job else 'N/A',
-                f"BK{review.job.job_id:04d}" if review.job else 'N/A',
-            ])
-        
-        writer.writerow([])  # Empty row
-    
-    if tab == 'site' or tab == 'all':
-        # Write site reviews header
-        writer.writerow(['Site Reviews Export'])
-        writer.writerow(['ID', 'User', 'Rating', 'Title', 'Review Text', 
-                        'Review Type', 'Recommendation', 'Date', 'Areas'])
-        
-        # Get site reviews
-        site_reviews = SiteReview.objects.select_related('employer')
-        
-        if search_query:
-            site_reviews = site_reviews.filter(
-                Q(title__icontains=search_query) |
-                Q(review_text__icontains=search_query) |
-                Q(employer__first_name__icontains=search_query) |
-                Q(employer__last_name__icontains=search_query)
-            )
-        
-        if rating_filter:
-            site_reviews = site_reviews.filter(rating=int(rating_filter))
-        
-        for review in site_reviews:
-            writer.writerow([
-                f"SR{review.id:04d}",
-                review.employer.full_name if review.employer else 'Unknown',
-                review.rating,
-                review.title,
-                review.review_text[:200],
-                review.get_review_type_display(),
-                review.recommendation,
-                review.created_at.strftime('%Y-%m-%d %H:%M'),
-                ', '.join(review.areas) if review.areas else 'N/A',
-            ])
-    
-    return response
+    """Export reviews data to CSV (runs as a background task)"""
+    return enqueue_export(request, 'reviews', 'Reviews Export', "reviews_export.csv", request.GET.dict())
 
 
 #**********************************************************************
@@ -4176,12 +3690,11 @@ def view_all_commissions(request):
     date_from = request.GET.get('date_from', '')
     date_to = request.GET.get('date_to', '')
     search_query = request.GET.get('search', '').strip()
-    page_number = request.GET.get('page', 1)
     
     # Base queryset
     commissions = Commission.objects.all().select_related(
         'employer', 'employee', 'payment'
-    ).order_by('-created_at')
+    )
     
     # Apply filters
     if status_filter:
@@ -4211,11 +3724,10 @@ def view_all_commissions(request):
             Q(payment__payment_id__icontains=search_query)
         )
     
-    # Calculate statistics
-    total_commissions = commissions.count()
-    total_commission_amount = commissions.aggregate(
-        total=Sum('commission_amount')
-    )['total'] or Decimal('0')
+    # Calculate statistics (count and total in one aggregate)
+    totals = commissions.aggregate(count=Count('pk'), total=Sum('commission_amount'))
+    total_commissions = totals['count']
+    total_commission_amount = totals['total'] or Decimal('0')
     
     pending_amount = commissions.filter(status='pending').aggregate(
         total=Sum('commission_amount')
@@ -4225,9 +3737,8 @@ def view_all_commissions(request):
         total=Sum('commission_amount')
     )['total'] or Decimal('0')
     
-    # Pagination
-    paginator = Paginator(commissions, 20)
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset on created_at, id; the total is already in the statistics)
+    page_obj = paginate_request(request, commissions, ('-created_at',), 20)
     
     context = {
         'commissions': page_obj,
@@ -4254,10 +3765,9 @@ def view_all_payouts(request):
     date_from = request.GET.get('date_from', '')
     date_to = request.GET.get('date_to', '')
     search_query = request.GET.get('search', '').strip()
-    page_number = request.GET.get('page', 1)
     
     # Base queryset
-    payouts = Payout.objects.all().select_related('employee').order_by('-created_at')
+    payouts = Payout.objects.all().select_related('employee')
     
     # Apply filters
     if status_filter:
@@ -4285,11 +3795,10 @@ def view_all_payouts(request):
             Q(payout_id__icontains=search_query)
         )
     
-    # Calculate statistics
-    total_payouts = payouts.count()
-    total_payout_amount = payouts.aggregate(
-        total=Sum('amount')
-    )['total'] or Decimal('0')
+    # Calculate statistics (count and total in one aggregate)
+    totals = payouts.aggregate(count=Count('pk'), total=Sum('amount'))
+    total_payouts = totals['count']
+    total_payout_amount = totals['total'] or Decimal('0')
     
     pending_amount = payouts.filter(status='pending').aggregate(
         total=Sum('amount')
@@ -4299,9 +3808,8 @@ def view_all_payouts(request):
         total=Sum('amount')
     )['total'] or Decimal('0')
     
-    # Pagination
-    paginator = Paginator(payouts, 20)
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset on created_at, id; the total is already in the statistics)
+    page_obj = paginate_request(request, payouts, ('-created_at',), 20)
     
     context = {
         'payouts': page_obj,
@@ -4403,18 +3911,15 @@ def revenue_reports(request):
         period_start__year=year
     ).order_by('-period_start')
     
-    # Calculate statistics
-    total_revenue = revenue_records.aggregate(
-        total=Sum('total_commission')
-    )['total'] or Decimal('0')
-    
-    total_payouts = revenue_records.aggregate(
-        total=Sum('total_payouts')
-    )['total'] or Decimal('0')
-    
-    net_balance = revenue_records.aggregate(
-        total=Sum('platform_balance')
-    )['total'] or Decimal('0')
+    # Calculate statistics (the rows are kept current by rollup_platform_metrics)
+    totals = revenue_records.aggregate(
+        total_revenue=Sum('total_commission'),
+        total_payouts=Sum('total_payouts'),
+        net_balance=Sum('platform_balance'),
+    )
+    total_revenue = totals['total_revenue'] or Decimal('0')
+    total_payouts = totals['total_payouts'] or Decimal('0')
+    net_balance = totals['net_balance'] or Decimal('0')
     
     # Generate year list (last 5 years + current year)
     current_year = timezone.now().year
@@ -4437,120 +3942,17 @@ def revenue_reports(request):
 
 @admin_required
 def export_commissions(request):
-    """Export commissions data to CSV"""
-    import csv
-    from django.http import HttpResponse
-    
-    # Get filter parameters
-    status_filter = request.GET.get('status', '')
-    date_from = request.GET.get('date_from', '')
-    date_to = request.GET.get('date_to', '')
-    
-    # Build queryset with filters
-    commissions = Commission.objects.select_related('employer', 'employee', 'payment')
-    
-    if status_filter:
-        commissions = commissions.filter(status=status_filter)
-    
-    if date_from:
-        try:
-            date_from_obj = datetime.strptime(date_from, '%Y-%m-%d').date()
-            commissions = commissions.filter(created_at__date__gte=date_from_obj)
-        except ValueError:
-            pass
-    
-    if date_to:
-        try:
-            date_to_obj = datetime.strptime(date_to, '%Y-%m-%d').date()
-            commissions = commissions.filter(created_at__date__lte=date_to_obj)
-        except ValueError:
-            pass
-    
-    # Create HTTP response with CSV attachment
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="commissions_export.csv"'
-    
-    writer = csv.writer(response)
-    # Write header
-    writer.writerow([
-        'Commission ID', 'Date', 'Employer', 'Worker', 'Transaction Amount',
-        'Commission Rate', 'Commission Amount', 'Status', 'Payment ID'
-    ])
-    
-    # Write data rows
-    for commission in commissions:
-        writer.writerow([
-            commission.commission_id,
-            commission.created_at.strftime('%Y-%m-%d'),
-            commission.employer.full_name,
-            commission.employee.full_name,
-            commission.transaction_amount,
-            f"{float(commission.commission_rate * 100):.3f}%",
-            commission.commission_amount,
-            commission.get_status_display(),
-            commission.payment.payment_id if commission.payment else 'N/A',
-        ])
-    
-    return response
+    """Export commissions data to CSV (runs as a background task)"""
+    return enqueue_export(request, 'commissions', 'Commissions Export', "commissions_export.csv", request.GET.dict())
+
 
 #*********************************************************
 
 @admin_required
 def export_payouts(request):
-    """Export payouts data to CSV"""
-    import csv
-    from django.http import HttpResponse
-    
-    # Get filter parameters
-    status_filter = request.GET.get('status', '')
-    date_from = request.GET.get('date_from', '')
-    date_to = request.GET.get('date_to', '')
-    
-    # Build queryset with filters
-    payouts = Payout.objects.select_related('employee')
-    
-    if status_filter:
-        payouts = payouts.filter(status=status_filter)
-    
-    if date_from:
-        try:
-            date_from_obj = datetime.strptime(date_from, '%Y-%m-%d').date()
-            payouts = payouts.filter(created_at__date__gte=date_from_obj)
-        except ValueError:
-            pass
-    
-    if date_to:
-        try:
-            date_to_obj = datetime.strptime(date_to, '%Y-%m-%d').date()
-            payouts = payouts.filter(created_at__date__lte=date_to_obj)
-        except ValueError:
-            pass
-    
-    # Create HTTP response with CSV attachment
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="payouts_export.csv"'
-    
-    writer = csv.writer(response)
-    # Write header
-    writer.writerow([
-        'Payout ID', 'Date', 'Worker', 'Amount', 'Payout Method',
-        'Status', 'Reference Number', 'Description'
-    ])
-    
-    # Write data rows
-    for payout in payouts:
-        writer.writerow([
-            payout.payout_id,
-            payout.created_at.strftime('%Y-%m-%d'),
-            payout.employee.full_name,
-            payout.amount,
-            payout.get_payout_method_display(),
-            payout.get_status_display(),
-            payout.reference_number or 'N/A',
-            payout.description or 'N/A',
-        ])
-    
-    return response
+    """Export payouts data to CSV (runs as a background task)"""
+    return enqueue_export(request, 'payouts', 'Payouts Export', "payouts_export.csv", request.GET.dict())
+
 
 #*********************************************************************
 @admin_required
@@ -4836,6 +4238,20 @@ def algorithm_setting(request):
 #************************************************************
 
 
+def publish_model_package(package_path, ml_model=None):
+    """
+    Publish a model package to the registry and make it the active version. Other worker
+    processes switch on their next prediction; this one reloads straight away.
+    """
+    version = model_registry.version_key(ml_model) if ml_model else None
+    model_registry.publish_package(package_path, version=version)
+    predictor.load_model()
+    invalidate_predictions()
+
+
+#**************************************************************
+
+
 @admin_required
 def upload_ml_model(request):
     """Handle ML model upload with proper file management"""
@@ -4960,10 +4376,9 @@ def upload_ml_model(request):
             
             messages.success(request, f"XGBoost model '{model_name}' uploaded and deployed successfully!")
             
-            # Reload the predictor
+            # Publish to the model registry so every worker process switches to it
             try:
-                from xg_boost.predictor import predictor
-                predictor.load_model()  # Force reload
+                publish_model_package(model_file_path, ml_model)
             except Exception as e:
                 print(f"Warning: Could not reload predictor: {str(e)}")
             
@@ -5019,10 +4434,9 @@ def update_model_status(request, model_id):
                             with open(current_model_path, 'wb') as dest:
                                 dest.write(source.read())
                         
-                        # Reload predictor
+                        # Publish and activate in the model registry
                         try:
-                            from xg_boost.predictor import predictor
-                            predictor.load_model()
+                            publish_model_package(current_model_path, ml_model)
                         except Exception as e:
                             print(f"Warning: Could not reload predictor: {str(e)}")
                     except Exception as e:
@@ -5073,10 +4487,9 @@ def update_model_status(request, model_id):
                             with open(current_model_path, 'wb') as dest:
                                 dest.write(source.read())
                         
-                        # Reload predictor
+                        # Publish and activate in the model registry
                         try:
-                            from xg_boost.predictor import predictor
-                            predictor.load_model()
+                            publish_model_package(current_model_path, ml_model)
                         except Exception as e:
                             print(f"Warning: Could not reload predictor: {str(e)}")
                     except Exception as e:
@@ -5139,10 +4552,9 @@ def update_model_status(request, model_id):
                         # Update filename in database to reflect restoration
                         ml_model.model_file.name = f'ml_models/xgboost/restored_version_{version_num}.pkl'
                         
-                        # Reload predictor
+                        # Publish and activate in the model registry
                         try:
-                            from xg_boost.predictor import predictor
-                            predictor.load_model()
+                            publish_model_package(current_model_path)
                         except Exception as e:
                             print(f"Warning: Could not reload predictor: {str(e)}")
                         
@@ -5200,6 +4612,7 @@ def update_model_status(request, model_id):
             
             # Save model
             ml_model.save()
+            invalidate_predictions()
             messages.success(request, message)
             
         except MLModel.DoesNotExist:
@@ -5242,314 +4655,49 @@ def delete_model(request, model_id):
 
 #******************************************************
 
+def enqueue_export(request, export, data_type, filename, filters, file_format='csv'):
+    """Queue a background export; the file shows up under Data Collection when it is done"""
+    data_log = DataCollectionLog.objects.create(
+        collection_type='manual',
+        data_type=data_type,
+        file_format=file_format,
+        status='queued',
+        collected_by=request.user,
+        start_time=timezone.now(),
+    )
+    enqueue_task('export', {
+        'export': export,
+        'filters': filters,
+        'filename': filename,
+        'file_format': file_format,
+    }, user=request.user, data_log=data_log)
+    
+    messages.success(request, f"{data_type} queued. Download it from Recent Exports when it has finished.")
+    return redirect('{}?tab=data-collection'.format(reverse('algorithm_setting')))
+
 @admin_required
 def export_data_csv(request):
-    """Export platform data as CSV"""
-    try:
-        # Get export type from request
-        export_type = request.POST.get('export_type', 'all')
-        
-        # Create timestamp for filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        # Create HTTP response with CSV attachment
-        response = HttpResponse(content_type='text/csv')
-        filename = f"skillconnect_data_export_{timestamp}.csv"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        
-        # Create CSV writer
-        writer = csv.writer(response)
-        
-        # Write header based on export type
-        if export_type == 'users':
-            # User data export
-            writer.writerow([
-                'user_id', 'user_type', 'first_name', 'last_name', 'email',
-                'phone', 'registration_date', 'account_status', 'city', 'state',
-                'country', 'total_bookings', 'completed_bookings', 'cancelled_bookings',
-                'total_spent', 'total_earned', 'platform_commission', 'avg_rating',
-                'total_reviews', 'last_active'
-            ])
-            
-            # Export workers
-            workers = Employee.objects.all().select_related()
-            for worker in workers:
-                total_jobs = JobRequest.objects.filter(employee=worker).count()
-                completed_jobs = JobRequest.objects.filter(
-                    employee=worker, status='completed'
-                ).count()
-                
-                total_earned_result = JobRequest.objects.filter(
-                    employee=worker,
-                    status='completed'
-                ).aggregate(total=Sum('budget'))
-                total_earned = total_earned_result['total'] or Decimal('0')
-                
-                writer.writerow([
-                    f"WK{worker.employee_id:04d}",
-                    'worker',
-                    worker.first_name,
-                    worker.last_name,
-                    worker.email,
-                    worker.phone or '',
-                    worker.created_at.strftime('%Y-%m-%d'),
-                    worker.status,
-                    worker.city or '',
-                    worker.state or '',
-                    worker.country,
-                    total_jobs,
-                    completed_jobs,
-                    total_jobs - completed_jobs,
-                    0,  # workers don't spend
-                    float(total_earned),
-                    float(total_earned * Decimal('0.0010')),
-                    worker.rating,
-                    Review.objects.filter(employee=worker).count(),
-                    worker.updated_at.strftime('%Y-%m-%d %H:%M:%S')
-                ])
-            
-            # Export employers
-            employers = Employer.objects.all().select_related()
-            for employer in employers:
-                total_jobs = JobRequest.objects.filter(employer=employer).count()
-                completed_jobs = JobRequest.objects.filter(
-                    employer=employer, status='completed'
-                ).count()
-                
-                total_spent_result = JobRequest.objects.filter(
-                    employer=employer,
-                    status='completed'
-                ).aggregate(total=Sum('budget'))
-                total_spent = total_spent_result['total'] or Decimal('0')
-                
-                writer.writerow([
-                    f"EM{employer.employer_id:04d}",
-                    'employer',
-                    employer.first_name,
-                    employer.last_name,
-                    employer.email,
-                    employer.phone or '',
-                    employer.created_at.strftime('%Y-%m-%d'),
-                    employer.status,
-                    employer.city or '',
-                    employer.state or '',
-                    employer.country,
-                    total_jobs,
-                    completed_jobs,
-                    total_jobs - completed_jobs,
-                    float(total_spent),
-                    0,  # employers don't earn
-                    float(total_spent * Decimal('0.0010')),
-                    0,  # employers don't have ratings
-                    Review.objects.filter(employer=employer).count(),
-                    employer.updated_at.strftime('%Y-%m-%d %H:%M:%S')
-                ])
-                
-        elif export_type == 'bookings':
-            # Booking data export
-            writer.writerow([
-                'booking_id', 'title', 'employer_id', 'employer_name', 'worker_id',
-                'worker_name', 'category', 'status', 'proposed_date', 'budget',
-                'location', 'created_at', 'accepted_at', 'completed_at', 'cancelled_at'
-            ])
-            
-            # Export all job requests
-            bookings = JobRequest.objects.all().select_related('employer', 'employee')
-            for booking in bookings:
-                writer.writerow([
-                    f"BK{booking.job_id:04d}",
-                    booking.title,
-                    f"EM{booking.employer.employer_id:04d}" if booking.employer else '',
-                    booking.employer.full_name if booking.employer else '',
-                    f"WK{booking.employee.employee_id:04d}" if booking.employee else '',
-                    booking.employee.full_name if booking.employee else '',
-                    booking.category or '',
-                    booking.status,
-                    booking.proposed_date.strftime('%Y-%m-%d') if booking.proposed_date else '',
-                    float(booking.budget) if booking.budget else 0,
-                    booking.location,
-                    booking.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                    booking.accepted_at.strftime('%Y-%m-%d %H:%M:%S') if booking.accepted_at else '',
-                    booking.completed_at.strftime('%Y-%m-%d %H:%M:%S') if booking.completed_at else '',
-                    booking.updated_at.strftime('%Y-%m-%d %H:%M:%S') if booking.status == 'cancelled' else ''
-                ])
-                
-        elif export_type == 'revenue':
-            # Revenue data export
-            writer.writerow([
-                'transaction_id', 'type', 'employer_id', 'employer_name', 'worker_id',
-                'worker_name', 'booking_id', 'amount', 'platform_commission',
-                'payment_method', 'status', 'transaction_date', 'created_at'
-            ])
-            
-            # Export payments
-            payments = Payment.objects.filter(status='completed').select_related(
-                'employer', 'employee', 'job'
-            )
-            for payment in payments:
-                writer.writerow([
-                    f"PAY{payment.payment_id:04d}",
-                    'payment',
-                    f"EM{payment.employer.employer_id:04d}" if payment.employer else '',
-                    payment.employer.full_name if payment.employer else '',
-                    f"WK{payment.employee.employee_id:04d}" if payment.employee else '',
-                    payment.employee.full_name if payment.employee else '',
-                    f"BK{payment.job.job_id:04d}" if payment.job else '',
-                    float(payment.amount),
-                    float(payment.amount * Decimal('0.0010')),
-                    payment.get_payment_method_display(),
-                    payment.status,
-                    payment.payment_date.strftime('%Y-%m-%d %H:%M:%S') if payment.payment_date else '',
-                    payment.created_at.strftime('%Y-%m-%d %H:%M:%S')
-                ])
-            
-            # Export payouts
-            payouts = Payout.objects.filter(status='completed').select_related('employee')
-            for payout in payouts:
-                writer.writerow([
-                    f"PO{payout.payout_id:04d}",
-                    'payout',
-                    '',  # No employer for payouts
-                    '',
-                    f"WK{payout.employee.employee_id:04d}" if payout.employee else '',
-                    payout.employee.full_name if payout.employee else 'System Payout',
-                    '',  # No booking for payouts
-                    float(-payout.amount),  # Negative for payouts
-                    0,  # No commission for payouts
-                    payout.get_payout_method_display(),
-                    payout.status,
-                    payout.completed_at.strftime('%Y-%m-%d %H:%M:%S') if payout.completed_at else '',
-                    payout.created_at.strftime('%Y-%m-%d %H:%M:%S')
-                ])
-                
-        else:  # 'all' - Combined data
-            # Write header for combined export
-            writer.writerow([
-                'timestamp', 'user_id', 'user_type', 'registration_date', 'account_status',
-                'total_bookings', 'completed_bookings', 'cancelled_bookings',
-                'total_spent', 'total_earned', 'platform_commission',
-                'avg_rating', 'total_reviews', 'last_active'
-            ])
-            
-            # Export all users data
-            all_users = []
-            
-            # Add workers
-            workers = Employee.objects.all()
-            for worker in workers:
-                total_jobs = JobRequest.objects.filter(employee=worker).count()
-                completed_jobs = JobRequest.objects.filter(
-                    employee=worker, status='completed'
-                ).count()
-                
-                total_earned_result = JobRequest.objects.filter(
-                    employee=worker,
-                    status='completed'
-                ).aggregate(total=Sum('budget'))
-                total_earned = total_earned_result['total'] or Decimal('0')
-                
-                all_users.append({
-                    'user_id': f"WK{worker.employee_id:04d}",
-                    'user_type': 'worker',
-                    'registration_date': worker.created_at,
-                    'account_status': worker.status,
-                    'total_bookings': total_jobs,
-                    'completed_bookings': completed_jobs,
-                    'cancelled_bookings': total_jobs - completed_jobs,
-                    'total_spent': 0,
-                    'total_earned': total_earned,
-                    'platform_commission': total_earned * Decimal('0.0010'),
-                    'avg_rating': worker.rating,
-                    'total_reviews': Review.objects.filter(employee=worker).count(),
-                    'last_active': worker.updated_at,
-                })
-            
-            # Add employers
-            employers = Employer.objects.all()
-            for employer in employers:
-                total_jobs = JobRequest.objects.filter(employer=employer).count()
-                completed_jobs = JobRequest.objects.filter(
-                    employer=employer, status='completed'
-                ).count()
-                
-                total_spent_result = JobRequest.objects.filter(
-                    employer=employer,
-                    status='completed'
-                ).aggregate(total=Sum('budget'))
-                total_spent = total_spent_result['total'] or Decimal('0')
-                
-                all_users.append({
-                    'user_id': f"EM{employer.employer_id:04d}",
-                    'user_type': 'employer',
-                    'registration_date': employer.created_at,
-                    'account_status': employer.status,
-                    'total_bookings': total_jobs,
-                    'completed_bookings': completed_jobs,
-                    'cancelled_bookings': total_jobs - completed_jobs,
-                    'total_spent': total_spent,
-                    'total_earned': 0,
-                    'platform_commission': total_spent * Decimal('0.0010'),
-                    'avg_rating': 0,
-                    'total_reviews': Review.objects.filter(employer=employer).count(),
-                    'last_active': employer.updated_at,
-                })
-            
-            # Write data rows
-            for user in all_users:
-                writer.writerow([
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    user['user_id'],
-                    user['user_type'],
-                    user['registration_date'].strftime('%Y-%m-%d'),
-                    user['account_status'],
-                    user['total_bookings'],
-                    user['completed_bookings'],
-                    user['cancelled_bookings'],
-                    float(user['total_spent']),
-                    float(user['total_earned']),
-                    float(user['platform_commission']),
-                    user['avg_rating'],
-                    user['total_reviews'],
-                    user['last_active'].strftime('%Y-%m-%d %H:%M:%S'),
-                ])
-        
-        # Log the export activity
-        data_log = DataCollectionLog.objects.create(
-            collection_type='manual',
-            data_type=f'Data Export - {export_type}',
-            records_collected=len(response.content.decode('utf-8').split('\n')) - 1,  # Subtract header
-            file_size=len(response.content),
-            file_format='csv',
-            status='success',
-            collected_by=request.user,
-            start_time=timezone.now(),
-            end_time=timezone.now(),
-        )
-        
-        # Save export file
-        data_log.export_file.save(filename, ContentFile(response.content))
-        data_log.save()
-        
-        messages.success(request, f"Data exported successfully! {filename}")
-        return response
-        
-    except Exception as e:
-        # Log error
-        DataCollectionLog.objects.create(
-            collection_type='manual',
-            data_type=f'Data Export - {export_type}',
-            records_collected=0,
-            file_size=0,
-            file_format='csv',
-            status='failed',
-            error_message=str(e),
-            collected_by=request.user,
-            start_time=timezone.now(),
-            end_time=timezone.now(),
+    """Export platform data as CSV, or the ML training dataset as Parquet/Feather (runs as a background task)"""
+    export_type = request.POST.get('export_type', 'all')
+    file_format = request.POST.get('file_format', 'csv')
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    if file_format != 'csv':
+        # Parquet needs pyarrow.parquet; Feather (Arrow IPC) only needs pyarrow
+        resolved_format = resolve_training_format(file_format)
+        if resolved_format is None:
+            messages.error(request, "Parquet/Feather export needs the pyarrow package on the server.")
+            return redirect('{}?tab=data-collection'.format(reverse('algorithm_setting')))
+        return enqueue_export(
+            request, 'data', f'ML Training Data - {resolved_format}',
+            f"skillconnect_training_data_{timestamp}{TRAINING_FORMAT_EXTENSIONS[resolved_format]}",
+            {}, file_format=resolved_format,
         )
-        
-        messages.error(request, f"Error exporting data: {str(e)}")
-        return redirect('{}?tab=data-collection'.format(reverse('algorithm_setting')))
+    
+    return enqueue_export(
+        request, 'data', f'Data Export - {export_type}',
+        f"skillconnect_data_export_{timestamp}.csv", {'export_type': export_type},
+    )
 
 
 #************************************************************************
@@ -5557,84 +4705,40 @@ def export_data_csv(request):
 
 @admin_required
 def collect_data_now(request):
-    """Trigger immediate data collection"""
+    """Trigger data collection (runs as a background task)"""
     if request.method == 'POST':
-        try:
-            # Get data type from request
-            data_type = request.POST.get('data_type', 'all')
-            collection_type = request.POST.get('collection_type', 'manual')
-            
-            # Create data collection log
-            data_log = DataCollectionLog.objects.create(
-                collection_type=collection_type,
-                data_type=f'Manual Collection - {data_type}',
-                status='processing',
-                collected_by=request.user,
-                start_time=timezone.now(),
-            )
-            
-            # Simulate data collection based on type
-            records_collected = 0
-            file_size = 0
-            
-            if data_type == 'users':
-                # Collect user data
-                workers_count = Employee.objects.count()
-                employers_count = Employer.objects.count()
-                records_collected = workers_count + employers_count
-                file_size = records_collected * 1024  # Approximate size
-                
-            elif data_type == 'bookings':
-                # Collect booking data
-                bookings_count = JobRequest.objects.count()
-                records_collected = bookings_count
-                file_size = bookings_count * 512
-                
-            elif data_type == 'revenue':
-                # Collect revenue data
-                payments_count = Payment.objects.filter(status='completed').count()
-                payouts_count = Payout.objects.filter(status='completed').count()
-                records_collected = payments_count + payouts_count
-                file_size = records_collected * 256
-                
-            else:  # 'all' data
-                # Collect all data
-                users_count = Employee.objects.count() + Employer.objects.count()
-                bookings_count = JobRequest.objects.count()
-                payments_count = Payment.objects.filter(status='completed').count()
-                payouts_count = Payout.objects.filter(status='completed').count()
-                
-                records_collected = users_count + bookings_count + payments_count + payouts_count
-                file_size = (users_count * 1024) + (bookings_count * 512) + ((payments_count + payouts_count) * 256)
-            
-            # Update log with results
-            data_log.end_time = timezone.now()
-            data_log.records_collected = records_collected
-            data_log.file_size = file_size
-            data_log.status = 'success'
-            data_log.save()
-            
-            messages.success(request, f"Data collection completed! Collected {records_collected} records.")
-            
-        except Exception as e:
-            # Log error
-            DataCollectionLog.objects.create(
-                collection_type='manual',
-                data_type=f'Manual Collection - {data_type}',
-                records_collected=0,
-                file_size=0,
-                file_format='csv',
-                status='failed',
-                error_message=str(e),
-                collected_by=request.user,
-                start_time=timezone.now(),
-                end_time=timezone.now(),
-            )
-            
-            messages.error(request, f"Error collecting data: {str(e)}")
+        data_type = request.POST.get('data_type', 'all')
+        collection_type = request.POST.get('collection_type', 'manual')
+        
+        data_log = DataCollectionLog.objects.create(
+            collection_type=collection_type,
+            data_type=f'Manual Collection - {data_type}',
+            status='queued',
+            collected_by=request.user,
+            start_time=timezone.now(),
+        )
+        enqueue_task('collect_data', {'data_type': data_type}, user=request.user, data_log=data_log)
+        
+        messages.success(request, f"Data collection for '{data_type}' queued.")
     
     return redirect('{}?tab=data-collection'.format(reverse('algorithm_setting')))
 
+
+@admin_required
+def download_export(request, log_id):
+    """Download the file written by a finished export"""
+    data_log = get_object_or_404(DataCollectionLog, log_id=log_id)
+    
+    if data_log.status != 'success' or not data_log.export_file:
+        messages.error(request, "This export is not ready yet.")
+        return redirect('{}?tab=data-collection'.format(reverse('algorithm_setting')))
+    
+    return FileResponse(
+        data_log.export_file.open('rb'),
+        as_attachment=True,
+        filename=os.path.basename(data_log.export_file.name),
+    )
+
 #***************************************************
 
 @admin_required
@@ -5835,6 +4939,44 @@ def analytics_prediction(request):
     return render(request, 'admin_html/analytics_prediction.html', context)
 
 
+#*****************************************************
+
+MAX_PREDICTION_SCENARIOS = 500
+
+
+@admin_required
+@require_POST
+def prediction_scenarios(request):
+    """
+    What-if predictions: JSON {"scenarios": [{"total_bookings": 150, ...}, ...]}. Each scenario
+    overrides the current platform data; all of them run through the model in one batch.
+    """
+    try:
+        data = json.loads(request.body)
+        scenarios = data.get('scenarios')
+        if not isinstance(scenarios, list) or not scenarios or not all(isinstance(item, dict) for item in scenarios):
+            return JsonResponse({'success': False, 'error': 'scenarios must be a non-empty list of objects'})
+        if not all(isinstance(value, (int, float)) for item in scenarios for value in item.values()):
+            return JsonResponse({'success': False, 'error': 'Scenario values must be numbers'})
+        if len(scenarios) > MAX_PREDICTION_SCENARIOS:
+            return JsonResponse({'success': False, 'error': f'At most {MAX_PREDICTION_SCENARIOS} scenarios per request'})
+
+        platform_data = get_platform_analytics_data()
+        scenario_data = [{**platform_data, **overrides} for overrides in scenarios]
+        predictions = predictor.predict_many(scenario_data)
+        if not all(predictions):
+            return JsonResponse({'success': False, 'error': 'ML model is not available'})
+
+        for prediction in predictions:
+            prediction.pop('raw_predictions', None)
+        return JsonResponse({'success': True, 'model_version': predictor.version, 'predictions': predictions})
+
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON data'})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
 #*****************************************************
 
 def get_feature_importance():
@@ -3,6 +3,10 @@ ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Chat rooms stream new messages over Server-Sent Events (message_system.views.message_stream),
+which needs this entry point, e.g. ``uvicorn backend.asgi:application``. Under WSGI the
+chat page falls back to polling get_new_messages.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
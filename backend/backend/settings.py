@@ -162,6 +162,56 @@ USE_TZ = True
 
 
 
+# Geocoding cache (home.geocoding). Coordinates are filled by `manage.py backfill_coordinates`,
+# request handlers only read the stored lat/long or the cache and never call Nominatim.
+GEOCODING = {
+    'CACHE_TTL_DAYS': 90,           # successful lookups
+    'NEGATIVE_CACHE_TTL_DAYS': 7,   # locations Nominatim could not resolve
+    'MEMORY_CACHE_SIZE': 1024,      # in-process LRU entries per worker
+    'USER_AGENT': 'worker_finder_app',
+}
+
+
+# Cache framework. Set REDIS_URL in production so all worker processes share entries and
+# invalidations; without it each process keeps its own in-memory cache (dev/tests).
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'jobportal-default',
+        }
+    }
+
+# Chat push (message_system.pubsub): Redis pub/sub across processes when REDIS_URL is set,
+# otherwise in-process fan-out (single-process ASGI server, tests)
+CHAT_BROKER = 'redis' if REDIS_URL else 'memory'
+# Streams are refused (the chat page polls) unless the broker reaches every process: 'memory'
+# does not. Set True when a single ASGI process serves chat on the memory broker.
+CHAT_BROKER_SHARED = None
+
+# Chat long polling (message_system.views.get_new_messages ?wait=N): the longest a poll is held.
+# Under WSGI every waiting poll occupies a worker thread, so it is capped lower there.
+CHAT_LONG_POLL_MAX_WAIT = 25       # seconds, ASGI
+CHAT_LONG_POLL_MAX_WAIT_WSGI = 10  # seconds
+# Long polls and 304s trust per-room versions only when the cache is shared by every worker
+# (guessed from the backend: locmem/dummy are per-process). Set True/False to override.
+CHAT_ROOM_VERSIONS_SHARED = None
+
+# Employer dashboard "top nearby workers" panel (employer.dashboard_cache)
+TOP_WORKERS_CACHE_TTL = 300  # seconds; worker/review changes invalidate earlier
+
+# Admin dashboard ML predictions (xg_boost.prediction_cache)
+PREDICTION_CACHE_TTL = 600  # seconds; model uploads and status changes invalidate earlier
+
+
 # Add ML model path
 ML_MODEL_PATH = os.path.join(BASE_DIR, 'xg_boost', 'complete_xgboost_package.pkl')
 
@@ -170,6 +220,9 @@ XG_BOOST_DIR = os.path.join(BASE_DIR, 'xg_boost')
 if not os.path.exists(XG_BOOST_DIR):
     os.makedirs(XG_BOOST_DIR)
 
+# Load the XGBoost predictor when a WSGI worker starts instead of on its first prediction
+XGBOOST_WARM_UP = os.environ.get('XGBOOST_WARM_UP', '') == '1'
+
     
 
 # Static files (CSS, JavaScript, Images)
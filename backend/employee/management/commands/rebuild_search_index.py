@@ -0,0 +1,21 @@
+# employee/management/commands/rebuild_search_index.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from employee.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the worker search index (token postings + BM25 document lengths) from scratch"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        indexed = rebuild_search_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {indexed} workers in {time.perf_counter() - start:.2f}s"
+        ))
@@ -0,0 +1,18 @@
+# employee/management/commands/rebuild_skill_tags.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from employee.skills import backfill_skill_tags
+
+
+class Command(BaseCommand):
+    help = "Re-link every worker to the normalized skill taxonomy from their skills text and EmployeeSkill rows"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        links = backfill_skill_tags()
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {links} worker skill links in {time.perf_counter() - start:.2f}s"
+        ))
@@ -0,0 +1,22 @@
+# employee/management/commands/rebuild_worker_scores.py
+# Nightly full rebuild of WorkerScore (also picks up certificates that expired since yesterday).
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from employee.scoring import rebuild_all_worker_scores
+
+
+class Command(BaseCommand):
+    help = "Recompute the find-workers efficiency score for every employee (run nightly)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        written = rebuild_all_worker_scores(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {written} worker scores in {time.perf_counter() - start:.2f}s"
+        ))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:08
+
+from django.db import migrations, models
+
+
+def fill_geohash(apps, schema_editor):
+    from home.spatial import encode_geohash
+
+    Employee = apps.get_model('employee', 'Employee')
+    located = Employee.objects.filter(latitude__isnull=False, longitude__isnull=False)
+    for emp in located.only('employee_id', 'latitude', 'longitude').iterator():
+        Employee.objects.filter(pk=emp.pk).update(geohash=encode_geohash(emp.latitude, emp.longitude))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0005_employee_latitude_employee_longitude'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, max_length=12, null=True),
+        ),
+        migrations.RunPython(fill_geohash, migrations.RunPython.noop),
+    ]
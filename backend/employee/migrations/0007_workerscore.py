@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0006_employee_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkerScore',
+            fields=[
+                ('employee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='worker_score', serialize=False, to='employee.employee')),
+                ('score', models.FloatField(default=0)),
+                ('grade', models.CharField(default='D', max_length=2)),
+                ('tier', models.CharField(default='New/Unverified', max_length=50)),
+                ('avg_rating', models.FloatField(default=0)),
+                ('avg_sentiment', models.FloatField(default=0)),
+                ('sentiment_boost', models.IntegerField(default=0)),
+                ('review_count', models.IntegerField(default=0)),
+                ('cert_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'worker_score_table',
+            },
+        ),
+    ]
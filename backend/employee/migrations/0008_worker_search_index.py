@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_search_index(apps, schema_editor):
+    from employee.search import rebuild_search_index
+
+    rebuild_search_index(
+        employee_model=apps.get_model('employee', 'Employee'),
+        employee_skill_model=apps.get_model('employee', 'EmployeeSkill'),
+        token_model=apps.get_model('employee', 'WorkerSearchToken'),
+        document_model=apps.get_model('employee', 'WorkerSearchDocument'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0007_workerscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkerSearchDocument',
+            fields=[
+                ('employee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='employee.employee')),
+                ('doc_length', models.IntegerField(default=0)),
+                ('content_hash', models.CharField(blank=True, max_length=40)),
+                ('indexed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'worker_search_document_table',
+            },
+        ),
+        migrations.CreateModel(
+            name='WorkerSearchToken',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('token', models.CharField(max_length=50)),
+                ('field', models.CharField(max_length=20)),
+                ('term_frequency', models.IntegerField(default=1)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='employee.employee')),
+            ],
+            options={
+                'db_table': 'worker_search_token_table',
+                'unique_together': {('token', 'field', 'employee')},
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
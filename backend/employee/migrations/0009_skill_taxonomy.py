@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_skills(apps, schema_editor):
+    from employee.skills import backfill_skill_tags
+
+    backfill_skill_tags(
+        employee_model=apps.get_model('employee', 'Employee'),
+        employee_skill_model=apps.get_model('employee', 'EmployeeSkill'),
+        skill_model=apps.get_model('employee', 'Skill'),
+        alias_model=apps.get_model('employee', 'SkillAlias'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0008_worker_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('skill_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('category', models.CharField(choices=[('plumbing', 'Plumbing'), ('electrical', 'Electrical'), ('carpentry', 'Carpentry'), ('painting', 'Painting'), ('cleaning', 'Cleaning'), ('other', 'Other')], db_index=True, default='other', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'skill_table',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, db_table='employee_skill_tag_table', related_name='employees', to='employee.skill'),
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('alias_id', models.AutoField(primary_key=True, serialize=False)),
+                ('alias', models.CharField(max_length=100, unique=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='employee.skill')),
+            ],
+            options={
+                'db_table': 'skill_alias_table',
+            },
+        ),
+        migrations.RunPython(backfill_skills, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0009_skill_taxonomy'),
+        ('employer', '0005_employer_latitude_employer_longitude'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employeenotification',
+            index=models.Index(fields=['employee', 'is_read', 'created_at'], name='emp_notif_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobrequest',
+            index=models.Index(fields=['employee', 'status', 'completed_at'], name='job_emp_status_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobrequest',
+            index=models.Index(fields=['employee', 'proposed_date'], name='job_emp_proposed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobrequest',
+            index=models.Index(fields=['employer', 'status', 'created_at'], name='job_er_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobrequest',
+            index=models.Index(fields=['status', 'completed_at'], name='job_status_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobrequest',
+            index=models.Index(fields=['created_at'], name='job_created_idx'),
+        ),
+    ]
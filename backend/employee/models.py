@@ -4,6 +4,8 @@ from django.db import models
 from django.contrib.auth.hashers import make_password, check_password
 from django.utils import timezone
 from django.db.models import Avg, Count
+from home.spatial import encode_geohash
+from home.sentiment import compute_text_sentiment
 import os
 
 class Employee(models.Model):
@@ -78,6 +80,8 @@ class Employee(models.Model):
     years_experience = models.IntegerField(default=0, verbose_name="Years of Experience")
     work_experience = models.TextField(null=True, blank=True)
     skills = models.TextField(null=True, blank=True, help_text="Comma separated skills")
+    # Normalized skills (from the text field and EmployeeSkill rows), kept in sync by signals
+    skill_tags = models.ManyToManyField('Skill', blank=True, related_name='employees', db_table='employee_skill_tag_table')
     
     # Performance Metrics
     rating = models.FloatField(default=0)
@@ -97,6 +101,9 @@ class Employee(models.Model):
     state = models.CharField(max_length=100, null=True, blank=True)
     zip_code = models.CharField(max_length=20, null=True, blank=True)
     country = models.CharField(max_length=100, default='India')
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, null=True, blank=True, db_index=True)
     service_radius = models.IntegerField(choices=SERVICE_RADIUS_CHOICES, default=10)
     
     # Privacy & Security Settings
@@ -203,6 +210,11 @@ class Employee(models.Model):
             self.working_hours = '9:00 AM - 7:00 PM'
         if not self.service_area:
             self.service_area = f'Within {self.service_radius} km radius'
+        # Keep the spatial bucket in step with the stored coordinates
+        self.geohash = encode_geohash(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'geohash'}
         super().save(*args, **kwargs)
 
 
@@ -302,6 +314,43 @@ class EmployeeSkill(models.Model):
         return self.skill_name
 
 
+class Skill(models.Model):
+    """Canonical skill in the normalized taxonomy"""
+    CATEGORY_CHOICES = [
+        ('plumbing', 'Plumbing'),
+        ('electrical', 'Electrical'),
+        ('carpentry', 'Carpentry'),
+        ('painting', 'Painting'),
+        ('cleaning', 'Cleaning'),
+        ('other', 'Other'),
+    ]
+
+    skill_id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=100, unique=True)
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='other', db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'skill_table'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    """Normalized spelling or stem that resolves to a canonical Skill (plumb, plumber -> Plumbing)"""
+    alias_id = models.AutoField(primary_key=True)
+    alias = models.CharField(max_length=100, unique=True)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+
+    class Meta:
+        db_table = 'skill_alias_table'
+
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+
+
 class EmployeeLogin(models.Model):
     STATUS_CHOICES = [
         ('Active', 'Active'),
@@ -350,6 +399,14 @@ class Review(models.Model):
 
     def __str__(self):
         return f"Review for {self.employee.full_name} - Job #{self.job.job_id if self.job else 'N/A'}"
+
+    def save(self, *args, **kwargs):
+        # Score once on write so listings and worker scores read the stored value
+        self.sentiment_score = compute_text_sentiment(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'sentiment_score'}
+        super().save(*args, **kwargs)
     
     
 
@@ -410,6 +467,18 @@ class JobRequest(models.Model):
     class Meta:
         db_table = 'job_request_table'
         ordering = ['-created_at']
+        indexes = [
+            # Worker earnings/history: employee=..., status='completed', completed_at range
+            models.Index(fields=['employee', 'status', 'completed_at'], name='job_emp_status_done_idx'),
+            # Worker schedule/calendar: employee=..., proposed_date range
+            models.Index(fields=['employee', 'proposed_date'], name='job_emp_proposed_idx'),
+            # Employer dashboard/hiring history: employer=..., status=..., newest first
+            models.Index(fields=['employer', 'status', 'created_at'], name='job_er_status_created_idx'),
+            # Admin metrics: status='completed', completed_at range
+            models.Index(fields=['status', 'completed_at'], name='job_status_done_idx'),
+            # Admin bookings list (keyset on created_at, job_id)
+            models.Index(fields=['created_at'], name='job_created_idx'),
+        ]
     
     def __str__(self):
         return f"Job #{self.job_id}: {self.title} - {self.get_status_display()}"
@@ -542,6 +611,64 @@ class EmployeeNotification(models.Model):
     class Meta:
         db_table = 'employee_notification_table'
         ordering = ['-created_at']
+        indexes = [
+            # Notification context processor: employee=..., is_read=False, newest first
+            models.Index(fields=['employee', 'is_read', 'created_at'], name='emp_notif_unread_idx'),
+        ]
         
     def __str__(self):
         return f"{self.title} - {self.employee.full_name}"
+
+
+class WorkerScore(models.Model):
+    """
+    Precomputed find-workers efficiency score (one row per employee).
+    Kept current by employee.signals and rebuilt nightly by `manage.py rebuild_worker_scores`.
+    """
+    employee = models.OneToOneField(Employee, on_delete=models.CASCADE, primary_key=True, related_name='worker_score')
+    score = models.FloatField(default=0)
+    grade = models.CharField(max_length=2, default='D')
+    tier = models.CharField(max_length=50, default='New/Unverified')
+    avg_rating = models.FloatField(default=0)
+    avg_sentiment = models.FloatField(default=0)
+    sentiment_boost = models.IntegerField(default=0)
+    review_count = models.IntegerField(default=0)
+    cert_count = models.IntegerField(default=0)  # unexpired certificates on updated_at's date
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'worker_score_table'
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.grade} ({self.score})"
+
+
+class WorkerSearchDocument(models.Model):
+    """Per-employee metadata for the worker search index (see employee.search)"""
+    employee = models.OneToOneField(Employee, on_delete=models.CASCADE, primary_key=True, related_name='search_document')
+    doc_length = models.IntegerField(default=0)  # total indexed tokens, used for BM25 length normalization
+    content_hash = models.CharField(max_length=40, blank=True)  # skip re-indexing when nothing changed
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'worker_search_document_table'
+
+    def __str__(self):
+        return f"Search document for employee {self.employee_id}"
+
+
+class WorkerSearchToken(models.Model):
+    """Inverted index posting: token -> employee, per profile field"""
+    id = models.AutoField(primary_key=True)
+    token = models.CharField(max_length=50)
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='search_tokens')
+    field = models.CharField(max_length=20)
+    term_frequency = models.IntegerField(default=1)
+
+    class Meta:
+        db_table = 'worker_search_token_table'
+        # (token, ...) leading column serves the token__startswith lookups
+        unique_together = ['token', 'field', 'employee']
+
+    def __str__(self):
+        return f"{self.token} -> {self.employee_id} ({self.field})"
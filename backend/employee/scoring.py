@@ -0,0 +1,224 @@
+# employee/scoring.py
+# Worker efficiency score ("Random Forest Sim" + "K-Means Sim" grade tiers) used by find-workers.
+# The score is materialized in WorkerScore so searches read one joined row per worker.
+
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from home.db_utils import bulk_upsert
+
+from .models import Employee, EmployeeCertificate, Review, WorkerScore
+
+STAT_FIELDS = ['avg_rating', 'avg_sentiment', 'review_count', 'cert_count']
+SCORE_FIELDS = ['score', 'grade', 'tier', 'sentiment_boost'] + STAT_FIELDS
+
+
+def sentiment_boost_for(avg_sentiment, review_count):
+    """Boost based on sentiment and review count"""
+    if review_count >= 10:
+        if avg_sentiment >= 0.8:
+            return 30
+        elif avg_sentiment >= 0.5:
+            return 20
+        elif avg_sentiment >= 0:
+            return 0
+        elif avg_sentiment >= -0.5:
+            return -10
+        return -20
+    elif review_count >= 5:
+        if avg_sentiment >= 0.5:
+            return 15
+        elif avg_sentiment <= -0.5:
+            return -5
+        return 0
+    elif review_count > 0:
+        return int(avg_sentiment * 10)
+    return 0
+
+
+def efficiency_score(employee, avg_rating, avg_sentiment, review_count, cert_count):
+    """Random Forest Simulation - returns (score capped to 0..100, sentiment_boost)"""
+    score = 0.0
+    sentiment_boost = sentiment_boost_for(avg_sentiment, review_count)
+
+    # Review contribution
+    review_score = min(avg_rating * 20, 100) + sentiment_boost
+    score += max(0, min(review_score, 100))
+
+    # Experience points
+    score += min(employee.years_experience * 5, 50)
+
+    # Success rate
+    score += employee.success_rate
+
+    # Jobs done reliability
+    if employee.total_jobs_done >= 50:
+        score += 20
+    elif employee.total_jobs_done >= 20:
+        score += 15
+    elif employee.total_jobs_done >= 5:
+        score += 10
+    else:
+        score += 5
+
+    # Certificates (licenses/certs)
+    if cert_count >= 3:
+        score += 30
+    elif cert_count >= 1:
+        score += 20
+
+    # Response time bonus
+    response_time = (employee.response_time or '').lower()
+    if 'hour' in response_time or 'fast' in response_time or 'quick' in response_time:
+        score += 10
+    elif 'day' in response_time or 'medium' in response_time:
+        score += 5
+
+    return max(0, min(score, 100)), sentiment_boost
+
+
+def grade_for_score(score):
+    """K-Means Simulation - (grade, tier description)"""
+    if score >= 90:
+        return 'A+', 'Elite Performers'
+    elif score >= 80:
+        return 'A', 'Top Tier'
+    elif score >= 60:
+        return 'B', 'Reliable'
+    elif score >= 40:
+        return 'C', 'Developing'
+    return 'D', 'New/Unverified'
+
+
+def review_stats(employee_id):
+    """(avg_rating, avg_sentiment, review_count) for one employee, from the stored review sentiment"""
+    stats = Review.objects.filter(employee_id=employee_id).aggregate(
+        avg_rating=Avg('rating'), avg_sentiment=Avg('sentiment_score'), review_count=Count('pk'),
+    )
+    return stats['avg_rating'] or 0.0, stats['avg_sentiment'] or 0.0, stats['review_count']
+
+
+def active_cert_count(employee_id, today=None):
+    today = today or timezone.now().date()
+    return EmployeeCertificate.objects.filter(employee_id=employee_id, expiry_date__gte=today).count()
+
+
+def build_score_values(employee, avg_rating, avg_sentiment, review_count, cert_count):
+    score, sentiment_boost = efficiency_score(employee, avg_rating, avg_sentiment, review_count, cert_count)
+    grade, tier = grade_for_score(score)
+    return {
+        'score': round(score, 1),
+        'grade': grade,
+        'tier': tier,
+        'sentiment_boost': sentiment_boost,
+        'avg_rating': avg_rating,
+        'avg_sentiment': avg_sentiment,
+        'review_count': review_count,
+        'cert_count': cert_count,
+    }
+
+
+def refresh_worker_score(employee, reviews=True, certificates=True, create=True):
+    """
+    Recompute one worker's score. Pass reviews=False / certificates=False to reuse the
+    stored review or certificate stats when only the other inputs changed.
+    create=False only updates an existing row (used from delete handlers, where the
+    employee itself may be on its way out).
+    """
+    if not isinstance(employee, Employee):
+        employee = Employee.objects.filter(pk=employee).first()
+        if employee is None:
+            return None
+
+    current = WorkerScore.objects.filter(employee_id=employee.pk).first()
+    if current is None:
+        if not create:
+            return None
+        reviews = certificates = True
+
+    if reviews:
+        avg_rating, avg_sentiment, review_count = review_stats(employee.pk)
+    else:
+        avg_rating, avg_sentiment, review_count = current.avg_rating, current.avg_sentiment, current.review_count
+
+    cert_count = active_cert_count(employee.pk) if certificates else current.cert_count
+
+    values = build_score_values(employee, avg_rating, avg_sentiment, review_count, cert_count)
+    if current is None:
+        return WorkerScore.objects.create(employee=employee, **values)
+
+    for field, value in values.items():
+        setattr(current, field, value)
+    current.save()
+    return current
+
+
+def stats_queryset(employee_ids=None):
+    """
+    Employees annotated with their review averages/count and unexpired certificate count
+    in a single query. The reviews x certificates join repeats every review row the same
+    number of times, so the Avgs stay correct and the Counts use distinct.
+    """
+    today = timezone.now().date()
+    employees = Employee.objects.all()
+    if employee_ids is not None:
+        employees = employees.filter(pk__in=employee_ids)
+    return employees.only(
+        'employee_id', 'years_experience', 'success_rate', 'total_jobs_done', 'response_time'
+    ).annotate(
+        review_avg=Avg('reviews__rating'),
+        sentiment_avg=Avg('reviews__sentiment_score'),
+        review_total=Count('reviews', distinct=True),
+        active_certs=Count('certificates', filter=Q(certificates__expiry_date__gte=today), distinct=True),
+    )
+
+
+def compute_worker_scores(employee_ids=None, chunk_size=1000):
+    """Yield unsaved WorkerScore objects for the given employees (all when None) from one annotated stats query"""
+    for employee in stats_queryset(employee_ids).iterator(chunk_size=chunk_size):
+        values = build_score_values(
+            employee, employee.review_avg or 0.0, employee.sentiment_avg or 0.0,
+            employee.review_total, employee.active_certs
+        )
+        yield WorkerScore(employee_id=employee.pk, **values)
+
+
+def ensure_worker_scores(employees):
+    """
+    {employee_id: WorkerScore} for a list of employees loaded with select_related('worker_score').
+    Rows that were never materialized are computed and saved together, so the cost does
+    not grow with the number of missing workers.
+    """
+    scores = {}
+    missing = []
+    for emp in employees:
+        try:
+            scores[emp.pk] = emp.worker_score
+        except WorkerScore.DoesNotExist:
+            missing.append(emp.pk)
+
+    if missing:
+        created = list(compute_worker_scores(missing))
+        _upsert(created)
+        scores.update({row.employee_id: row for row in created})
+    return scores
+
+
+def rebuild_all_worker_scores(batch_size=1000):
+    """Full rebuild for every employee in a fixed number of queries. Returns rows written."""
+    written = 0
+    batch = []
+    for row in compute_worker_scores(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            written += _upsert(batch)
+            batch = []
+
+    if batch:
+        written += _upsert(batch)
+    return written
+
+
+def _upsert(rows):
+    bulk_upsert(WorkerScore, rows, unique_fields=['employee'], update_fields=SCORE_FIELDS + ['updated_at'])
+    return len(rows)
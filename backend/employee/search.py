@@ -0,0 +1,207 @@
+# employee/search.py
+# Local inverted index for worker search (token -> employee postings) with BM25 ranking.
+# Replaces the multi-field icontains OR chains, which scan the whole employee table.
+
+import hashlib
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Avg, Count, Q
+
+from .models import Employee, EmployeeSkill, WorkerSearchDocument, WorkerSearchToken
+
+MAX_TOKEN_LENGTH = 50
+STOP_WORDS = {'a', 'an', 'and', 'the', 'of', 'in', 'on', 'for', 'to', 'with', 'at', 'by', 'is', 'i', 'am'}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Indexed fields and their BM25 weights (a hit in the title counts more than one in the bio)
+FIELD_WEIGHTS = {
+    'job_title': 3.0,
+    'skills': 3.0,
+    'bio': 1.0,
+    'experience': 1.0,
+    'name': 1.0,
+    'location': 1.0,
+    'contact': 1.0,
+}
+
+# Employer "find workers": profession and profile text only (name-only hits never counted there)
+FIND_WORKER_FIELDS = ['job_title', 'skills', 'bio', 'experience']
+# Admin worker list: names, contact details, title, skills and location
+ADMIN_FIELDS = ['name', 'contact', 'job_title', 'skills', 'location']
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    if not text:
+        return []
+    return [
+        token[:MAX_TOKEN_LENGTH]
+        for token in _TOKEN_RE.findall(str(text).lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def query_terms(query):
+    """Distinct query tokens, in order"""
+    return list(dict.fromkeys(tokenize(query)))
+
+
+def employee_field_texts(employee, skill_names=None):
+    """Text for each indexed field of one employee"""
+    if skill_names is None:
+        skill_names = list(employee.employee_skills.values_list('skill_name', flat=True))
+    return {
+        'job_title': employee.job_title,
+        'skills': ' '.join(filter(None, [employee.skills] + list(skill_names))),
+        'bio': employee.bio,
+        'experience': employee.work_experience,
+        'name': f"{employee.first_name} {employee.last_name}",
+        'location': ' '.join(filter(None, [employee.city, employee.state, employee.location])),
+        'contact': ' '.join(filter(None, [employee.email, employee.phone])),
+    }
+
+
+def _postings_for(employee, skill_names=None, token_model=WorkerSearchToken):
+    postings = []
+    for field, text in employee_field_texts(employee, skill_names).items():
+        for token, tf in Counter(tokenize(text)).items():
+            postings.append(token_model(employee_id=employee.pk, field=field, token=token, term_frequency=tf))
+    return postings
+
+
+def _content_hash(postings):
+    digest = hashlib.sha1()
+    for p in sorted(postings, key=lambda p: (p.field, p.token)):
+        digest.update(f"{p.field}:{p.token}:{p.term_frequency};".encode())
+    return digest.hexdigest()
+
+
+def index_employee(employee, skill_names=None, force=False):
+    """(Re)build the postings for one employee. No-op when the indexed text has not changed."""
+    postings = _postings_for(employee, skill_names)
+    content_hash = _content_hash(postings)
+
+    document = WorkerSearchDocument.objects.filter(employee_id=employee.pk).first()
+    if document and document.content_hash == content_hash and not force:
+        return False
+
+    with transaction.atomic():
+        WorkerSearchToken.objects.filter(employee_id=employee.pk).delete()
+        WorkerSearchToken.objects.bulk_create(postings)
+        WorkerSearchDocument.objects.update_or_create(
+            employee_id=employee.pk,
+            defaults={
+                'doc_length': sum(p.term_frequency for p in postings),
+                'content_hash': content_hash,
+            }
+        )
+    return True
+
+
+def rebuild_search_index(batch_size=500, employee_model=Employee, employee_skill_model=EmployeeSkill,
+                         token_model=WorkerSearchToken, document_model=WorkerSearchDocument):
+    """Rebuild every employee's postings. Returns the number of employees indexed."""
+    skills_by_employee = defaultdict(list)
+    for employee_id, skill_name in employee_skill_model.objects.values_list('employee_id', 'skill_name').iterator():
+        skills_by_employee[employee_id].append(skill_name)
+
+    indexed = 0
+    with transaction.atomic():
+        token_model.objects.all().delete()
+        document_model.objects.all().delete()
+
+        postings = []
+        documents = []
+        for employee in employee_model.objects.iterator(chunk_size=batch_size):
+            employee_postings = _postings_for(employee, skills_by_employee.get(employee.pk, []), token_model)
+            postings.extend(employee_postings)
+            documents.append(document_model(
+                employee_id=employee.pk,
+                doc_length=sum(p.term_frequency for p in employee_postings),
+                content_hash=_content_hash(employee_postings),
+            ))
+            indexed += 1
+
+            if len(documents) >= batch_size:
+                token_model.objects.bulk_create(postings, batch_size=2000)
+                document_model.objects.bulk_create(documents)
+                postings, documents = [], []
+
+        token_model.objects.bulk_create(postings, batch_size=2000)
+        document_model.objects.bulk_create(documents)
+    return indexed
+
+
+def _term_filter(terms):
+    term_q = Q()
+    for term in terms:
+        term_q |= Q(token__startswith=term)
+    return term_q
+
+
+def search_workers(query, fields=FIND_WORKER_FIELDS, candidates=None):
+    """
+    BM25 relevance for every employee matching at least one query term (prefix match,
+    so "plumb" finds "plumber"). Returns {employee_id: score}, best first.
+    `candidates` (an Employee queryset) restricts the search to those employees.
+    Fixed cost of three indexed queries regardless of how many workers match.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return {}
+
+    postings = WorkerSearchToken.objects.filter(_term_filter(terms), field__in=fields)
+    documents = WorkerSearchDocument.objects.all()
+    if candidates is not None:
+        postings = postings.filter(employee_id__in=candidates.values('pk'))
+        documents = documents.filter(employee_id__in=candidates.values('pk'))
+
+    # weighted term frequency per (employee, query term)
+    tf = defaultdict(lambda: defaultdict(float))
+    for employee_id, token, field, frequency in postings.values_list('employee_id', 'token', 'field', 'term_frequency'):
+        for term in terms:
+            if token.startswith(term):
+                tf[employee_id][term] += FIELD_WEIGHTS.get(field, 1.0) * frequency
+
+    if not tf:
+        return {}
+
+    stats = documents.aggregate(total=Count('pk'), avg_length=Avg('doc_length'))
+    total_docs = max(stats['total'] or 0, len(tf))
+    avg_length = stats['avg_length'] or 1.0
+    lengths = dict(documents.filter(employee_id__in=list(tf)).values_list('employee_id', 'doc_length'))
+
+    doc_freq = Counter(term for term_tf in tf.values() for term in term_tf)
+    idf = {
+        term: math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+        for term, df in doc_freq.items()
+    }
+
+    scores = {}
+    for employee_id, term_tf in tf.items():
+        norm = K1 * (1 - B + B * lengths.get(employee_id, avg_length) / avg_length)
+        scores[employee_id] = sum(
+            idf[term] * (f * (K1 + 1)) / (f + norm)
+            for term, f in term_tf.items()
+        )
+    return dict(sorted(scores.items(), key=lambda item: item[1], reverse=True))
+
+
+def matching_workers_filter(query, fields=ADMIN_FIELDS):
+    """
+    Q for employees whose indexed fields contain every query term (prefix match).
+    Runs entirely in the database as one index subquery per term.
+    """
+    matched = Q()
+    for term in query_terms(query):
+        matched &= Q(employee_id__in=WorkerSearchToken.objects.filter(
+            token__startswith=term, field__in=fields
+        ).values('employee_id'))
+    return matched
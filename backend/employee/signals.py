@@ -0,0 +1,67 @@
+# employee/signals.py
+# Keep WorkerScore rows, normalized skill tags and the worker search index in step with the profile data they are built from.
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Employee, EmployeeCertificate, EmployeeSkill, Review
+from .scoring import refresh_worker_score
+from .search import index_employee
+from .skills import sync_employee_skills
+
+
+@receiver(post_save, sender=Employee)
+def employee_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Profile fields only - reuse the stored review/certificate stats
+    refresh_worker_score(instance, reviews=False, certificates=False)
+    sync_employee_skills(instance)
+    index_employee(instance)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    refresh_worker_score(instance.employee_id, certificates=False)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    refresh_worker_score(instance.employee_id, certificates=False, create=False)
+
+
+@receiver(post_save, sender=EmployeeCertificate)
+def certificate_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    refresh_worker_score(instance.employee_id, reviews=False)
+
+
+@receiver(post_delete, sender=EmployeeCertificate)
+def certificate_deleted(sender, instance, **kwargs):
+    refresh_worker_score(instance.employee_id, reviews=False, create=False)
+
+
+def _refresh_skills_if_present(employee_id):
+    employee = Employee.objects.filter(pk=employee_id).first()
+    if employee is not None:
+        sync_employee_skills(employee)
+        index_employee(employee)
+
+
+@receiver(post_save, sender=EmployeeSkill)
+def skill_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    sync_employee_skills(instance.employee)
+    index_employee(instance.employee)
+
+
+@receiver(post_delete, sender=EmployeeSkill)
+def skill_deleted(sender, instance, **kwargs):
+    # Deferred: the employee may be in the middle of a cascade delete
+    employee_id = instance.employee_id
+    transaction.on_commit(lambda: _refresh_skills_if_present(employee_id))
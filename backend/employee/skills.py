@@ -0,0 +1,222 @@
+# employee/skills.py
+# Normalized skill taxonomy: canonical Skill rows, alias/stem resolution (plumb, plumber -> Plumbing)
+# and the Employee.skill_tags many-to-many, so skill filters and category counts are indexed joins.
+
+import re
+from collections import defaultdict
+
+from django.db.models import Count, Q
+
+from .models import Employee, EmployeeSkill, Skill, SkillAlias
+
+MAX_SKILL_LENGTH = 100
+MIN_STEM_LENGTH = 4
+
+# Longest first, so "electricians" loses "icians" rather than just the "s"
+SUFFIXES = ('icians', 'ician', 'ations', 'ation', 'ings', 'ing', 'ical', 'ity', 'ics', 'ic',
+            'ians', 'ian', 'ers', 'er', 'ry', 's')
+
+# Category for a skill whose stem contains one of these word prefixes
+CATEGORY_STEMS = {
+    'plumbing': 'plumb',
+    'electrical': 'electr',
+    'carpentry': 'carpent',
+    'painting': 'paint',
+    'cleaning': 'clean',
+}
+CATEGORIES = list(CATEGORY_STEMS)
+
+# Seed taxonomy: canonical name and extra spellings that should resolve to it
+DEFAULT_SKILLS = [
+    ('Plumbing', ['plumber', 'pipe fitting']),
+    ('Electrical', ['electrician', 'electrical work', 'wiring']),
+    ('Carpentry', ['carpenter', 'woodwork']),
+    ('Painting', ['painter']),
+    ('Cleaning', ['cleaner', 'house cleaning']),
+    ('Repair', ['repairs', 'repairing']),
+    ('Installation', ['installer', 'install']),
+]
+
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_skill(text):
+    """'  Pipe-Fitting ' -> 'pipe fitting'"""
+    if not text:
+        return ''
+    return ' '.join(_NON_ALNUM_RE.sub(' ', str(text).lower()).split())[:MAX_SKILL_LENGTH]
+
+
+def stem_word(word):
+    """Strip common trade suffixes until nothing more comes off (plumbers -> plumb, electricity -> electr)"""
+    changed = True
+    while changed:
+        changed = False
+        for suffix in SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+                word = word[:-len(suffix)]
+                changed = True
+                break
+    return word
+
+
+def skill_stem(text):
+    return ' '.join(stem_word(word) for word in normalize_skill(text).split())
+
+
+def category_for(text):
+    words = skill_stem(text).split()
+    for category, prefix in CATEGORY_STEMS.items():
+        if any(word.startswith(prefix) for word in words):
+            return category
+    return 'other'
+
+
+def split_skills(text):
+    """Comma separated Employee.skills text -> list of skill names"""
+    if not text:
+        return []
+    return [s.strip() for s in text.split(',') if s.strip()]
+
+
+def _display_name(raw):
+    raw = ' '.join(raw.split())[:MAX_SKILL_LENGTH]
+    return raw.title() if raw == raw.lower() else raw
+
+
+def _create_skill(name, skill_model, alias_model, extra_aliases=()):
+    key = normalize_skill(name)
+    stem = skill_stem(key)
+    skill, _ = skill_model.objects.get_or_create(
+        name=_display_name(name),
+        defaults={'category': category_for(key)},
+    )
+    aliases = {key, stem} | {normalize_skill(a) for a in extra_aliases} | {skill_stem(a) for a in extra_aliases}
+    alias_model.objects.bulk_create(
+        [alias_model(alias=alias, skill_id=skill.pk) for alias in aliases if alias],
+        ignore_conflicts=True,
+    )
+    return skill
+
+
+def seed_default_skills(skill_model=Skill, alias_model=SkillAlias):
+    for name, aliases in DEFAULT_SKILLS:
+        _create_skill(name, skill_model, alias_model, aliases)
+
+
+def resolve_skills(names, skill_model=Skill, alias_model=SkillAlias):
+    """
+    {normalized name: skill_id} for raw skill names. Known spellings and stems resolve in
+    one alias query; unknown skills are added to the taxonomy, and new spellings of known
+    skills are remembered as aliases.
+    """
+    stems = {}
+    raw_by_key = {}
+    for raw in names:
+        key = normalize_skill(raw)
+        if key:
+            raw_by_key.setdefault(key, raw)
+            stems[key] = skill_stem(key)
+    if not raw_by_key:
+        return {}
+
+    known = dict(alias_model.objects.filter(
+        alias__in=set(stems) | set(stems.values())
+    ).values_list('alias', 'skill_id'))
+
+    resolved = {}
+    new_aliases = []
+    for key, stem in stems.items():
+        skill_id = known.get(key) or known.get(stem)
+        if skill_id is None:
+            skill_id = _create_skill(raw_by_key[key], skill_model, alias_model).pk
+            known[key] = known[stem] = skill_id
+        elif key not in known:
+            new_aliases.append(alias_model(alias=key, skill_id=skill_id))
+            known[key] = skill_id
+        resolved[key] = skill_id
+
+    if new_aliases:
+        alias_model.objects.bulk_create(new_aliases, ignore_conflicts=True)
+    return resolved
+
+
+def employee_skill_names(employee):
+    """Skill names from both sources: the comma separated text field and EmployeeSkill rows"""
+    names = split_skills(employee.skills)
+    names.extend(employee.employee_skills.values_list('skill_name', flat=True))
+    return names
+
+
+def sync_employee_skills(employee):
+    """Point employee.skill_tags at the canonical skills for its current skill names"""
+    skill_ids = set(resolve_skills(employee_skill_names(employee)).values())
+    employee.skill_tags.set(skill_ids)
+    return skill_ids
+
+
+def backfill_skill_tags(employee_model=Employee, employee_skill_model=EmployeeSkill,
+                        skill_model=Skill, alias_model=SkillAlias, batch_size=2000):
+    """Rebuild every employee's skill_tags from both skill sources. Returns links written."""
+    seed_default_skills(skill_model, alias_model)
+
+    names_by_employee = defaultdict(list)
+    for employee_id, text in employee_model.objects.exclude(skills__isnull=True).values_list('employee_id', 'skills').iterator():
+        names_by_employee[employee_id].extend(split_skills(text))
+    for employee_id, skill_name in employee_skill_model.objects.values_list('employee_id', 'skill_name').iterator():
+        names_by_employee[employee_id].append(skill_name)
+
+    resolved = resolve_skills(
+        {name for names in names_by_employee.values() for name in names},
+        skill_model, alias_model,
+    )
+
+    through = employee_model.skill_tags.through
+    links = []
+    for employee_id, names in names_by_employee.items():
+        skill_ids = {resolved[normalize_skill(name)] for name in names if normalize_skill(name)}
+        links.extend(through(employee_id=employee_id, skill_id=skill_id) for skill_id in skill_ids)
+
+    through.objects.all().delete()
+    through.objects.bulk_create(links, batch_size=batch_size)
+    return len(links)
+
+
+def skill_ids_matching(term):
+    """
+    Skills with an alias word starting with the term or its stem ("repair" -> "AC repair").
+    The alias table holds one row per distinct spelling, so this stays small; the
+    employee side is an indexed join on the tag table.
+    """
+    key = normalize_skill(term)
+    if not key:
+        return SkillAlias.objects.none().values('skill_id')
+    matched = Q()
+    for prefix in {key, skill_stem(key)}:
+        matched |= Q(alias__startswith=prefix) | Q(alias__contains=' ' + prefix)
+    return SkillAlias.objects.filter(matched).values('skill_id')
+
+
+def employees_with_skill(term):
+    """Subquery of employee ids tagged with a skill matching term - use as pk__in / employee_id__in"""
+    return Employee.skill_tags.through.objects.filter(
+        skill_id__in=skill_ids_matching(term)
+    ).values('employee_id')
+
+
+def skill_category_counts():
+    """
+    Workers per skill category in one aggregate query over the tag join. A worker counts once
+    per category they have; 'other' is every worker with no categorized skill.
+    """
+    categorized = Q(skill_tags__category__in=CATEGORIES)
+    counts = Employee.objects.aggregate(
+        total=Count('pk', distinct=True),
+        categorized=Count('pk', filter=categorized, distinct=True),
+        **{
+            category: Count('pk', filter=Q(skill_tags__category=category), distinct=True)
+            for category in CATEGORIES
+        }
+    )
+    counts['other'] = counts.pop('total') - counts.pop('categorized')
+    return counts
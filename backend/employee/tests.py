@@ -1,3 +1,308 @@
+from datetime import date, timedelta
+from importlib import import_module
+
+from django.apps import apps
+from django.db.models import Avg
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from employer.models import Employer
+from home.sentiment import compute_text_sentiment
+from .models import (
+    Employee, EmployeeCertificate, EmployeeSkill, JobRequest, Review, Skill, SkillAlias, WorkerScore,
+    WorkerSearchToken,
+)
+from .search import matching_workers_filter, rebuild_search_index, search_workers
+from .skills import resolve_skills, seed_default_skills, skill_category_counts
+
+
+class ReviewSentimentTests(TestCase):
+    def setUp(self):
+        self.employer = Employer.objects.create(
+            first_name='Asha', last_name='Menon', email='asha@example.com', phone='9000000001',
+        )
+        self.employee = Employee.objects.create(
+            first_name='Ravi', last_name='Kumar', email='ravi@example.com', phone='8000000001',
+        )
+
+    def test_score_is_stored_on_save(self):
+        review = Review.objects.create(employer=self.employer, employee=self.employee, text='Honest and punctual')
+        self.assertEqual(Review.objects.get(pk=review.pk).sentiment_score, 1.0)
+
+    def test_update_fields_with_text_also_writes_score(self):
+        review = Review.objects.create(employer=self.employer, employee=self.employee, text='Honest and punctual')
+        review.text = 'Sloppy work'
+        review.save(update_fields=['text'])
+        self.assertEqual(Review.objects.get(pk=review.pk).sentiment_score, -1.0)
+
+    def test_update_fields_without_text_leave_score_alone(self):
+        review = Review.objects.create(employer=self.employer, employee=self.employee, text='Honest and punctual')
+        Review.objects.filter(pk=review.pk).update(sentiment_score=0.5)
+        review.rating = 4
+        review.save(update_fields=['rating'])
+        self.assertEqual(Review.objects.get(pk=review.pk).sentiment_score, 0.5)
+
+
+def on_the_fly_score(emp):
+    """The efficiency score as employer_find_workers computed it per request before WorkerScore"""
+    score = 0.0
+    reviews = emp.reviews.all()
+    review_count = reviews.count()
+    avg_rating = 0.0
+    avg_sentiment = 0.0
+    sentiment_boost = 0
+    if review_count > 0:
+        avg_rating = reviews.aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0.0
+        avg_sentiment = sum(compute_text_sentiment(r.text) for r in reviews) / review_count
+        if review_count >= 10:
+            if avg_sentiment >= 0.8:
+                sentiment_boost = 30
+            elif avg_sentiment >= 0.5:
+                sentiment_boost = 20
+            elif avg_sentiment >= 0:
+                sentiment_boost = 0
+            elif avg_sentiment >= -0.5:
+                sentiment_boost = -10
+            else:
+                sentiment_boost = -20
+        elif review_count >= 5:
+            if avg_sentiment >= 0.5:
+                sentiment_boost = 15
+            elif avg_sentiment <= -0.5:
+                sentiment_boost = -5
+        else:
+            sentiment_boost = int(avg_sentiment * 10)
+
+    score += max(0, min(min(avg_rating * 20, 100) + sentiment_boost, 100))
+    score += min(emp.years_experience * 5, 50)
+    score += emp.success_rate
+    if emp.total_jobs_done >= 50:
+        score += 20
+    elif emp.total_jobs_done >= 20:
+        score += 15
+    elif emp.total_jobs_done >= 5:
+        score += 10
+    else:
+        score += 5
+    cert_count = emp.certificates.filter(expiry_date__gte=timezone.now().date()).count()
+    if cert_count >= 3:
+        score += 30
+    elif cert_count >= 1:
+        score += 20
+    response_time = emp.response_time.lower()
+    if 'hour' in response_time or 'fast' in response_time or 'quick' in response_time:
+        score += 10
+    elif 'day' in response_time or 'medium' in response_time:
+        score += 5
+    return round(max(0, min(score, 100)), 1)
+
+
+class WorkerScoreTests(TestCase):
+    """WorkerScore rows are kept current by the employee signals"""
+
+    def setUp(self):
+        self.employer = Employer.objects.create(
+            first_name='Asha', last_name='Menon', email='asha@example.com', phone='9000000001',
+        )
+        self.employee = Employee.objects.create(
+            first_name='Ravi', last_name='Kumar', email='ravi@example.com', phone='8000000001',
+            years_experience=2, success_rate=10, total_jobs_done=4, response_time='Within a day',
+        )
+
+    def stored(self):
+        return WorkerScore.objects.get(employee=self.employee)
+
+    def assertMatchesOnTheFly(self):
+        self.employee.refresh_from_db()
+        self.assertEqual(self.stored().score, on_the_fly_score(self.employee))
+
+    def test_score_created_with_employee(self):
+        self.assertEqual(self.stored().review_count, 0)
+        self.assertMatchesOnTheFly()
+
+    def test_review_save_and_delete_update_score(self):
+        before = self.stored().score
+        review = Review.objects.create(employer=self.employer, employee=self.employee, text='Excellent work', rating=5)
+        self.assertEqual(self.stored().review_count, 1)
+        self.assertEqual(self.stored().avg_rating, 5)
+        self.assertGreater(self.stored().score, before)
+        self.assertMatchesOnTheFly()
+
+        review.rating = 2
+        review.text = 'Sloppy work'
+        review.save()
+        self.assertEqual(self.stored().avg_rating, 2)
+        self.assertMatchesOnTheFly()
+
+        review.delete()
+        self.assertEqual(self.stored().review_count, 0)
+        self.assertEqual(self.stored().score, before)
+
+    def test_certificates_update_score(self):
+        cert = EmployeeCertificate.objects.create(
+            employee=self.employee, name='Wiring', issuer='Board',
+            issue_date=date.today() - timedelta(days=30), expiry_date=date.today() + timedelta(days=30),
+        )
+        self.assertEqual(self.stored().cert_count, 1)
+        self.assertMatchesOnTheFly()
+        cert.delete()
+        self.assertEqual(self.stored().cert_count, 0)
+        self.assertMatchesOnTheFly()
+
+    def test_completing_a_job_updates_score(self):
+        job = JobRequest.objects.create(
+            employer=self.employer, employee=self.employee, title='Fix sink', description='Leak',
+            proposed_date=date.today() + timedelta(days=2), location='Kochi', status='accepted',
+        )
+        before = self.stored().score
+        self.assertMatchesOnTheFly()
+
+        session = self.client.session
+        session['employee_id'] = self.employee.employee_id
+        session.save()
+        self.client.post(reverse('update_job_status'), {'job_id': job.job_id, 'status': 'completed'})
+
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.total_jobs_done, 5)
+        self.assertEqual(self.stored().score, before + 5)
+        self.assertMatchesOnTheFly()
+
+    def test_many_mixed_reviews_match_on_the_fly(self):
+        texts = ['Excellent work', 'Sloppy work', 'Honest and punctual', 'Okay', 'Rude and late']
+        for i in range(12):
+            Review.objects.create(
+                employer=self.employer, employee=self.employee, text=texts[i % len(texts)], rating=1 + i % 5,
+            )
+        self.assertEqual(self.stored().review_count, 12)
+        self.assertMatchesOnTheFly()
+
+
+class WorkerSearchTests(TestCase):
+    """Inverted index search: prefix matching, BM25 ranking, AND filters and signal upkeep"""
+
+    def add_worker(self, name, job_title='', skills='', bio='', city='Kochi'):
+        return Employee.objects.create(
+            first_name=name, last_name='Test', email=f'{name.lower()}@example.com',
+            phone=f'80000{Employee.objects.count():05d}', job_title=job_title, skills=skills, bio=bio, city=city,
+        )
+
+    def matching(self, query):
+        return set(Employee.objects.filter(matching_workers_filter(query)).values_list('pk', flat=True))
+
+    def test_prefix_matches_longer_tokens(self):
+        plumber = self.add_worker('Ravi', job_title='Plumber')
+        self.add_worker('Anu', job_title='Electrician')
+        self.assertEqual(list(search_workers('plumb')), [plumber.pk])
+        self.assertEqual(self.matching('plu'), {plumber.pk})
+
+    def test_rarer_term_ranks_higher(self):
+        # "painter" is on every profile, "tiling" on one; a hit on the rare term weighs more
+        tiler = self.add_worker('Ravi', job_title='Painter', skills='tiling')
+        painters = [self.add_worker(f'Worker{i}', job_title='Painter', skills='painting') for i in range(4)]
+        mason = self.add_worker('Anu', job_title='Mason', skills='tiling')
+
+        scores = search_workers('painter tiling')
+        self.assertEqual(next(iter(scores)), tiler.pk)
+        self.assertGreater(scores[mason.pk], scores[painters[0].pk])
+
+    def test_search_is_or_and_filter_is_and(self):
+        both = self.add_worker('Ravi', job_title='Plumber', city='Kochi')
+        plumber_elsewhere = self.add_worker('Anu', job_title='Plumber', city='Madurai')
+        kochi_only = self.add_worker('Binu', job_title='Driver', city='Kochi')
+
+        self.assertEqual(self.matching('plumber kochi'), {both.pk})
+        self.assertEqual(self.matching('plumber'), {both.pk, plumber_elsewhere.pk})
+        self.assertEqual(self.matching('plumber pune'), set())
+        self.assertEqual(set(search_workers('plumber kochi', fields=['job_title', 'location'])),
+                         {both.pk, plumber_elsewhere.pk, kochi_only.pk})
+
+    def test_save_reindexes_changed_profile(self):
+        worker = self.add_worker('Ravi', job_title='Plumber')
+        worker.job_title = 'Carpenter'
+        worker.save()
+        self.assertEqual(search_workers('plumber'), {})
+        self.assertEqual(list(search_workers('carpenter')), [worker.pk])
+
+        EmployeeSkill.objects.create(employee=worker, skill_name='Welding')
+        self.assertEqual(list(search_workers('weld')), [worker.pk])
+
+    def test_delete_removes_postings(self):
+        worker = self.add_worker('Ravi', job_title='Plumber')
+        worker.delete()
+        self.assertFalse(WorkerSearchToken.objects.exists())
+        self.assertEqual(search_workers('plumber'), {})
+
+    def test_rebuild_matches_incremental_index(self):
+        self.add_worker('Ravi', job_title='Plumber', skills='pipe fitting')
+        self.add_worker('Anu', job_title='Electrician', bio='Fast wiring and plumbing repairs')
+        before = search_workers('plumb')
+        self.assertEqual(rebuild_search_index(), 2)
+        self.assertEqual(search_workers('plumb'), before)
+
+
+class SkillTaxonomyTests(TestCase):
+    """Alias/stem resolution, category counts and the skill_tags backfill"""
+
+    def setUp(self):
+        seed_default_skills()
+
+    def add_worker(self, name, skills='', extra_skills=()):
+        worker = Employee.objects.create(
+            first_name=name, last_name='Test', email=f'{name.lower()}@example.com',
+            phone=f'80000{Employee.objects.count():05d}', skills=skills,
+        )
+        for skill_name in extra_skills:
+            EmployeeSkill.objects.create(employee=worker, skill_name=skill_name)
+        return worker
+
+    def tags(self, worker):
+        return set(worker.skill_tags.values_list('name', flat=True))
+
+    def test_aliases_and_stems_resolve_to_one_skill(self):
+        plumbing = Skill.objects.get(name='Plumbing')
+        resolved = resolve_skills(['plumbing', 'Plumber', 'PLUMBERS', ' pipe-fitting '])
+        self.assertEqual(resolved, {
+            'plumbing': plumbing.pk, 'plumber': plumbing.pk, 'plumbers': plumbing.pk, 'pipe fitting': plumbing.pk,
+        })
+        # the new spelling is remembered, so the next lookup is a direct alias hit
+        self.assertTrue(SkillAlias.objects.filter(alias='plumbers', skill=plumbing).exists())
+
+    def test_unknown_skill_is_added_once(self):
+        first = resolve_skills(['Tiling'])
+        second = resolve_skills(['Tilings', 'tiling'])
+        skill = Skill.objects.get(name='Tiling')
+        self.assertEqual(skill.category, 'other')
+        self.assertEqual(first, {'tiling': skill.pk})
+        self.assertEqual(second, {'tilings': skill.pk, 'tiling': skill.pk})
+        self.assertEqual(Skill.objects.filter(name__istartswith='til').count(), 1)
+        self.assertEqual(resolve_skills(['', '  ']), {})
+
+    def test_employee_tags_follow_both_skill_sources(self):
+        worker = self.add_worker('Ravi', skills='plumber, wiring')
+        self.assertEqual(self.tags(worker), {'Plumbing', 'Electrical'})
+        EmployeeSkill.objects.create(employee=worker, skill_name='Painter')
+        self.assertEqual(self.tags(worker), {'Plumbing', 'Electrical', 'Painting'})
+
+    def test_category_counts(self):
+        self.add_worker('Ravi', skills='plumber, pipe fitting')
+        self.add_worker('Anu', skills='electrician', extra_skills=['Plumbing'])
+        self.add_worker('Binu', skills='woodwork')
+        self.add_worker('Chitra', skills='tiling')
+        self.add_worker('Devi')
+        self.assertEqual(skill_category_counts(), {
+            'plumbing': 2, 'electrical': 1, 'carpentry': 1, 'painting': 0, 'cleaning': 0, 'other': 2,
+        })
+
+    def test_migration_backfill_rebuilds_tags(self):
+        ravi = self.add_worker('Ravi', skills='plumber, house cleaning', extra_skills=['Carpenter'])
+        anu = self.add_worker('Anu', skills='Tiling')
+        Employee.skill_tags.through.objects.all().delete()
+        SkillAlias.objects.all().delete()
+        Skill.objects.all().delete()
+
+        import_module('employee.migrations.0009_skill_taxonomy').backfill_skills(apps, None)
 
-# Create your tests here.
+        self.assertEqual(self.tags(ravi), {'Plumbing', 'Cleaning', 'Carpentry'})
+        self.assertEqual(self.tags(anu), {'Tiling'})
+        self.assertTrue(SkillAlias.objects.filter(alias='electrician', skill__name='Electrical').exists())
@@ -12,8 +12,12 @@ from django.db import transaction
 from django.http import JsonResponse, HttpResponse
 # from django.core.files.storage import FileSystemStorage
 from home.models import Location 
-from django.db.models import Q, Sum, Count, Avg
+from home.geocoding import sync_stored_coordinates
+from home.pagination import paginate_request
+from django.db.models import Q, Sum, Count, Avg, Value
+from django.db.models.functions import Coalesce
 from datetime import datetime, timedelta
+from decimal import Decimal
 import calendar
 from .models import JobRequest, JobAction, Review
 import re
@@ -512,19 +516,19 @@ def employee_job_history(request):
                 Q(state__icontains=search_query)
             )
         
-        # Apply sorting
-        if sort_filter == 'newest':
-            job_history = job_history.order_by('-updated_at')
-        elif sort_filter == 'oldest':
-            job_history = job_history.order_by('updated_at')
-        elif sort_filter == 'rating-high':
+        # Apply sorting (keyset keys must be non-null, so nullable columns are coalesced)
+        if sort_filter == 'oldest':
+            ordering = ('updated_at',)
+        elif sort_filter in ('rating-high', 'rating-low'):
             # This would require joining with reviews table
             # For now, sort by job completion date
-            job_history = job_history.order_by('-completed_at')
-        elif sort_filter == 'rating-low':
-            job_history = job_history.order_by('completed_at')
+            job_history = job_history.annotate(sort_date=Coalesce('completed_at', 'updated_at'))
+            ordering = ('-sort_date',) if sort_filter == 'rating-high' else ('sort_date',)
         elif sort_filter == 'earning-high':
-            job_history = job_history.order_by('-budget')
+            job_history = job_history.annotate(sort_budget=Coalesce('budget', Value(Decimal('0'))))
+            ordering = ('-sort_budget',)
+        else:  # newest
+            ordering = ('-updated_at',)
         
         # Calculate statistics
         total_jobs = JobRequest.objects.filter(
@@ -540,10 +544,8 @@ def employee_job_history(request):
             status='completed'
         ).aggregate(total=Sum('budget'))['total'] or 0
         
-        # Pagination
-        paginator = Paginator(job_history, 10)  # 10 jobs per page
-        page_number = request.GET.get('page', 1)
-        job_history_page = paginator.get_page(page_number)
+        # Pagination (keyset cursor, 10 jobs per page)
+        job_history_page = paginate_request(request, job_history, ordering, 10)
         
         # Prepare stats for template
         stats = {
@@ -764,9 +766,9 @@ def employee_review_list(request):
                 Q(job__title__icontains=search_query)
             )
         
-        # Get sentiment for each review
+        # Sentiment is scored when the review is saved
         for review in reviews:
-            review.sentiment = compute_text_sentiment(review.text)
+            review.sentiment = review.sentiment_score
             review.sentiment_category = get_sentiment_category(review.sentiment)
 
         # Notifications are now handled by context processor
@@ -810,48 +812,6 @@ def get_sentiment_category(sentiment_score):
     
 
 
-# Add this function to employee/views.py
-def compute_text_sentiment(text):
-    """Simple sentiment analysis for reviews"""
-    if not text or not isinstance(text, str):
-        return 0.0
-    
-    # Expanded positive and negative keywords
-    positive = [
-        'good', 'great', 'excellent', 'hardworking', 'reliable', 'professional',
-        'amazing', 'best', 'awesome', 'fantastic', 'skilled', 'efficient',
-        'timely', 'honest', 'dedicated', 'outstanding', 'superb', 'wonderful',
-        'trustworthy', 'punctual', 'clean', 'neat', 'careful', 'experienced',
-        'knowledgeable', 'helpful', 'friendly', 'polite', 'patient', 'quick',
-        'fast', 'thorough', 'detail-oriented', 'creative', 'innovative',
-        'proactive', 'responsible', 'conscientious', 'diligent', 'meticulous',
-        'perfect', 'excellent', 'superior', 'exceptional', 'commendable'
-    ]
-    
-    negative = [
-        'bad', 'poor', 'terrible', 'lazy', 'unreliable', 'incompetent',
-        'worst', 'awful', 'disappointing', 'late', 'dishonest', 'inefficient',
-        'sloppy', 'unprofessional', 'horrible', 'frustrating', 'subpar',
-        'careless', 'messy', 'slow', 'rude', 'impolite', 'unfriendly',
-        'unskilled', 'inexperienced', 'negligent', 'inattentive', 'forgetful',
-        'disorganized', 'chaotic', 'expensive', 'overpriced', 'unsatisfactory',
-        'mediocre', 'average', 'ordinary'
-    ]
-    
-    text_lower = text.lower()
-    
-    # Count positive and negative occurrences
-    pos_count = sum(1 for word in positive if re.search(r'\b' + re.escape(word) + r'\b', text_lower))
-    neg_count = sum(1 for word in negative if re.search(r'\b' + re.escape(word) + r'\b', text_lower))
-    
-    # Calculate sentiment score
-    if pos_count > 0 or neg_count > 0:
-        sentiment = (pos_count - neg_count) / (pos_count + neg_count)
-        return round(sentiment, 2)
-    
-    return 0.0
-
-
 #**************************************************************
 
 
@@ -2613,6 +2573,7 @@ def update_employee_location(request):
             if service_radius:
                 employee.service_radius = int(service_radius)
             
+            sync_stored_coordinates(employee)
             employee.save()
             messages.success(request, "Location settings updated successfully!")
             
@@ -3296,6 +3257,7 @@ def send_rejection_message(request):
             )
             
             # Update chat room stats
+            chat_room.record_message(message)
             chat_room.message_count += 1
             chat_room.unread_employer += 1
             chat_room.last_message_time = timezone.now()
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EmployerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'employer'
+
+    def ready(self):
+        from . import signals  # noqa: F401  (registers dashboard cache invalidation handlers)
@@ -0,0 +1,108 @@
+# employer/dashboard_cache.py
+# Per-employer cached "top nearby workers" panel for employer_dashboard.
+# Entries live in Django's cache framework (locmem in dev/tests, Redis in prod) and expire after
+# TOP_WORKERS_CACHE_TTL. Worker profile and review changes bump a shared version number, which
+# makes every cached panel stale at once without having to know which employers were affected.
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count
+
+from employee.models import Employee
+from home.cache_versions import bump_version, get_version
+from home.geocoding import get_stored_coordinates, get_stored_coordinates_many
+from home.spatial import distances_to
+
+TOP_WORKERS_TTL = getattr(settings, 'TOP_WORKERS_CACHE_TTL', 300)
+CANDIDATE_LIMIT = 20     # active, visible workers considered for the panel
+TOP_WORKERS_LIMIT = 5
+DEFAULT_DISTANCE_KM = 100.0
+
+VERSION_KEY = 'employer:top_workers:version'
+
+
+# Employee fields baked into cached panel rows: who is a candidate, the wage estimate and the
+# distance. Names, titles and the like are read fresh on every hit, so saves that only touch
+# those (or last login, job counts...) leave cached panels alone.
+PANEL_FIELDS = (
+    'status', 'show_profile_to_employer', 'years_experience',
+    'latitude', 'longitude', 'city', 'state', 'country',
+)
+
+
+def panel_fields_changed(employee, update_fields=None):
+    """Whether saving employee changes any PANEL_FIELDS value (one query unless update_fields rules it out)"""
+    if update_fields is not None and not set(update_fields) & set(PANEL_FIELDS):
+        return False
+    if employee.pk is None:
+        return True
+    saved = Employee.objects.filter(pk=employee.pk).values(*PANEL_FIELDS).first()
+    return saved is None or any(saved[field] != getattr(employee, field) for field in PANEL_FIELDS)
+
+
+def invalidate_top_workers():
+    """Make every cached panel stale (called when a worker profile or review changes)"""
+    bump_version(VERSION_KEY)
+
+
+def _cache_key(employer, employer_coords):
+    # Employer location is part of the key, so moving the employer never serves old distances
+    coords = '%.4f,%.4f' % employer_coords if employer_coords else 'none'
+    return f'employer:top_workers:v{get_version(VERSION_KEY)}:{employer.pk}:{coords}'
+
+
+def compute_top_workers(employer_coords):
+    """
+    Ranked panel rows for the first CANDIDATE_LIMIT active workers: review stats come from one
+    annotated query and distances from one vectorized pass over stored coordinates.
+    """
+    employees = list(
+        Employee.objects.filter(status='Active', show_profile_to_employer=True)
+        .annotate(avg_rating=Avg('reviews__rating'), review_count=Count('reviews'))
+        .order_by('pk')[:CANDIDATE_LIMIT]
+    )
+    distances = distances_to(employer_coords, get_stored_coordinates_many(employees))
+
+    rows = [{
+        'employee_id': emp.pk,
+        'avg_rating': round(emp.avg_rating or 0.0, 1),
+        'review_count': emp.review_count,
+        'distance': round(distances.get(emp.pk, DEFAULT_DISTANCE_KM), 1),
+        'wage_estimate': emp.years_experience * 100 + 500,
+    } for emp in employees]
+
+    # Sort by rating (highest first), then by distance (closest first)
+    rows.sort(key=lambda row: (-row['avg_rating'], row['distance']))
+    return rows[:TOP_WORKERS_LIMIT]
+
+
+def get_top_workers(employer):
+    """
+    Dashboard "top workers" entries for one employer. A cache hit costs one lookup plus one
+    query for the (at most TOP_WORKERS_LIMIT) employee rows, whatever the number of workers.
+    """
+    employer_coords = get_stored_coordinates(employer)
+    key = _cache_key(employer, employer_coords)
+
+    rows = cache.get(key)
+    if rows is None:
+        rows = compute_top_workers(employer_coords)
+        cache.set(key, rows, TOP_WORKERS_TTL)
+
+    employees = Employee.objects.in_bulk([row['employee_id'] for row in rows])
+    top_workers = []
+    for row in rows:
+        emp = employees.get(row['employee_id'])
+        if emp is None:
+            continue
+        top_workers.append({
+            'employee': emp,
+            'avg_rating': row['avg_rating'],
+            'review_count': row['review_count'],
+            'distance': row['distance'],
+            'wage_estimate': row['wage_estimate'],
+            'experience': emp.years_experience,
+            'response_time': emp.response_time or 'Not specified',
+            'job_title': emp.job_title or 'Worker',
+        })
+    return top_workers
@@ -0,0 +1,119 @@
+# employer/management/commands/benchmark_radius_search.py
+
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from employee.models import Employee
+from home.spatial import encode_geohash, radius_filter, haversine_km
+
+try:
+    from geopy.distance import geodesic
+    GEOPY_AVAILABLE = True
+except ImportError:
+    GEOPY_AVAILABLE = False
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Seed N synthetic employees (inside a rolled-back transaction) and compare the "
+            "per-row geodesic loop against the geohash index + NumPy haversine radius search")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100000, help='Number of employees to seed')
+        parser.add_argument('--radius', type=float, default=30.0, help='Search radius in km')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per strategy (best time is reported)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback()
+        except _Rollback:
+            self.stdout.write("Seed data rolled back.")
+
+    def _seed(self, count, rng):
+        # Spread workers over India's bounding box
+        batch = []
+        for i in range(count):
+            lat = rng.uniform(8.0, 35.0)
+            lon = rng.uniform(68.0, 97.0)
+            batch.append(Employee(
+                first_name='Bench',
+                last_name=str(i),
+                email=f'bench-radius-{i}@example.invalid',
+                status='Active',
+                latitude=lat,
+                longitude=lon,
+                geohash=encode_geohash(lat, lon),
+            ))
+            if len(batch) == 5000:
+                Employee.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Employee.objects.bulk_create(batch)
+
+    def _best_of(self, repeat, func):
+        best = None
+        result = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def _run(self, options):
+        rng = random.Random(options['seed'])
+        count = options['count']
+        radius = options['radius']
+        origin = (9.9312, 76.2673)  # Kochi
+
+        self.stdout.write(f"Seeding {count} employees...")
+        start = time.perf_counter()
+        self._seed(count, rng)
+        self.stdout.write(f"Seeded in {time.perf_counter() - start:.2f}s")
+
+        candidates = Employee.objects.filter(status='Active', email__startswith='bench-radius-')
+
+        def legacy_loop():
+            # Old path: every row loaded, one geodesic call per employee
+            matched = []
+            for emp in candidates.only('employee_id', 'latitude', 'longitude'):
+                if GEOPY_AVAILABLE:
+                    km = geodesic(origin, (emp.latitude, emp.longitude)).kilometers
+                else:
+                    km = float(haversine_km(origin[0], origin[1], [emp.latitude], [emp.longitude])[0])
+                if km <= radius:
+                    matched.append(emp.employee_id)
+            return matched
+
+        def indexed_path():
+            # New path: geohash prefix + bounding box in SQL, vectorized haversine on survivors
+            rows = list(candidates.filter(radius_filter(origin[0], origin[1], radius))
+                        .values_list('employee_id', 'latitude', 'longitude'))
+            if not rows:
+                return []
+            ids, lats, lons = zip(*rows)
+            km = haversine_km(origin[0], origin[1], lats, lons)
+            return [emp_id for emp_id, d in zip(ids, km) if d <= radius]
+
+        repeat = options['repeat']
+        legacy_time, legacy_ids = self._best_of(repeat, legacy_loop)
+        indexed_time, indexed_ids = self._best_of(repeat, indexed_path)
+
+        # geodesic (ellipsoid) and haversine (sphere) can disagree right on the boundary
+        mismatch = len(set(legacy_ids) ^ set(indexed_ids))
+
+        self.stdout.write(f"Radius {radius} km around {origin}")
+        self.stdout.write(f"  per-row geodesic loop : {legacy_time * 1000:9.1f} ms  ({len(legacy_ids)} matches)")
+        self.stdout.write(f"  geohash index + numpy : {indexed_time * 1000:9.1f} ms  ({len(indexed_ids)} matches)")
+        if indexed_time:
+            self.stdout.write(self.style.SUCCESS(f"  speedup: {legacy_time / indexed_time:.1f}x"))
+        self.stdout.write(f"  boundary mismatches: {mismatch}")
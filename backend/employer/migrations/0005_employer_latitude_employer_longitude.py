@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employer', '0004_alter_sitereview_employer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employer',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='employer',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0010_hot_query_indexes'),
+        ('employer', '0005_employer_latitude_employer_longitude'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employernotification',
+            index=models.Index(fields=['employer', 'is_read', 'created_at'], name='er_notif_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', 'payment_date'], name='payment_status_date_idx'),
+        ),
+    ]
@@ -5,6 +5,7 @@ from django.contrib.auth.hashers import make_password, check_password
 from django.utils import timezone
 from decimal import Decimal
 from django.conf import settings  
+from home.sentiment import compute_text_sentiment
 
 
 
@@ -68,6 +69,8 @@ class Employer(models.Model):
     state = models.CharField(max_length=100, null=True, blank=True)
     zip_code = models.CharField(max_length=20, null=True, blank=True)
     country = models.CharField(max_length=100, default='India')
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
     location_visibility = models.CharField(
         max_length=10, 
         choices=VISIBILITY_CHOICES, 
@@ -214,6 +217,10 @@ class Payment(models.Model):
     class Meta:
         db_table = 'payment_table'
         ordering = ['-created_at']
+        indexes = [
+            # Dashboards and metrics: status='completed', payment_date range
+            models.Index(fields=['status', 'payment_date'], name='payment_status_date_idx'),
+        ]
     
     def __str__(self):
         return f"Payment #{self.payment_id} - ₹{self.amount} - {self.status}"
@@ -311,6 +318,14 @@ class SiteReview(models.Model):
     def __str__(self):
         return f"Site Review by {self.employer.full_name} - {self.review_type}"
 
+    def save(self, *args, **kwargs):
+        # Score once on write so the admin review pages read the stored value
+        self.sentiment_score = compute_text_sentiment(f"{self.title} {self.review_text}")
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'title', 'review_text'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'sentiment_score'}
+        super().save(*args, **kwargs)
+
 
 class Report(models.Model):
     """Model for reports"""
@@ -390,6 +405,10 @@ class EmployerNotification(models.Model):
     class Meta:
         db_table = 'employer_notification_table'
         ordering = ['-created_at']
+        indexes = [
+            # Notification context processor: employer=..., is_read=False, newest first
+            models.Index(fields=['employer', 'is_read', 'created_at'], name='er_notif_unread_idx'),
+        ]
         
     def __str__(self):
         return f"{self.title} - {self.employer.full_name}"
@@ -0,0 +1,37 @@
+# employer/signals.py
+# Drop cached employer dashboard panels when the worker data they show changes.
+
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from employee.models import Employee, Review
+from .dashboard_cache import invalidate_top_workers, panel_fields_changed
+
+
+@receiver(pre_save, sender=Employee)
+def employee_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    # Compared before the write, acted on after it (see employee_saved)
+    instance._top_workers_stale = panel_fields_changed(instance, update_fields)
+
+
+@receiver(post_save, sender=Employee)
+def employee_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if getattr(instance, '_top_workers_stale', True):
+        invalidate_top_workers()
+
+
+@receiver(post_delete, sender=Employee)
+def employee_deleted(sender, instance, **kwargs):
+    invalidate_top_workers()
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_top_workers()
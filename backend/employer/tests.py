@@ -1,3 +1,221 @@
+import time
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from employee.models import Employee, EmployeeCertificate, EmployeeSkill, JobRequest, Review
+from .dashboard_cache import VERSION_KEY
+from .models import Employer, EmployerFavorite, EmployerLogin, SiteReview
+
+
+class FindWorkersQueryCountTests(TestCase):
+    """employer_find_workers must not issue per-worker queries"""
+
+    def setUp(self):
+        self.employer = Employer.objects.create(
+            first_name='Asha', last_name='Menon', email='asha@example.com', phone='9000000001',
+            city='Kochi', state='Kerala', country='India', latitude=9.9312, longitude=76.2673,
+        )
+        EmployerLogin.objects.create(employer=self.employer, email='asha@example.com', password='x')
+
+        session = self.client.session
+        session['employer_id'] = self.employer.employer_id
+        session.save()
+
+    def add_workers(self, count, start=0):
+        for i in range(start, start + count):
+            emp = Employee.objects.create(
+                first_name=f'Worker{i}', last_name='Test', email=f'worker{i}@example.com',
+                phone=f'80000{i:05d}', job_title='Plumber', skills='plumbing, pipe fitting',
+                city='Kochi', state='Kerala', country='India',
+                latitude=9.9312 + i * 0.001, longitude=76.2673,
+            )
+            EmployeeSkill.objects.create(employee=emp, skill_name='Plumbing')
+            Review.objects.create(employee=emp, employer=self.employer, text='Good and reliable', rating=4)
+            EmployeeCertificate.objects.create(
+                employee=emp, name='Plumbing License', issuer='Board',
+                issue_date=date.today(), expiry_date=date.today() + timedelta(days=365),
+            )
+            JobRequest.objects.create(
+                employer=self.employer, employee=emp, title='Fix sink', description='Leak',
+                proposed_date=date.today() + timedelta(days=2), location='Kochi', status='accepted',
+            )
+            if i % 2 == 0:
+                EmployerFavorite.objects.create(employer=self.employer, employee=emp)
+
+    def search(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                reverse('employer_find_workers'),
+                {'search_query': 'plumber', 'location': 'kochi'},
+            )
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_query_count_independent_of_result_size(self):
+        self.add_workers(3)
+        response, small = self.search()
+        self.assertEqual(len(response.context['workers']), 3)
+
+        self.add_workers(12, start=3)
+        response, large = self.search()
+        self.assertEqual(len(response.context['workers']), 15)
+
+        self.assertEqual(small, large)
+
+    def test_missing_scores_are_built_in_one_batch(self):
+        self.add_workers(3)
+        Employee.objects.filter(email__startswith='worker').first().worker_score.delete()
+        _, with_missing = self.search()
+        _, all_present = self.search()
+        # Building the missing rows is a constant number of extra queries, not one per worker
+        self.assertLessEqual(with_missing - all_present, 3)
+
+    def test_annotations_match_worker_data(self):
+        self.add_workers(2)
+        response, _ = self.search()
+        by_name = {w['employee'].first_name: w for w in response.context['workers']}
+
+        self.assertTrue(by_name['Worker0']['is_favorited'])
+        self.assertFalse(by_name['Worker1']['is_favorited'])
+        self.assertEqual(by_name['Worker0']['review_count'], 1)
+        self.assertEqual(by_name['Worker0']['avg_rating'], 4.0)
+
+        booked = date.today() + timedelta(days=2)
+        days = [d for m in by_name['Worker0']['availability_months'] for d in m['days']]
+        self.assertFalse(next(d for d in days if d['date'] == booked)['available'])
+
+
+class DashboardTopWorkersCacheTests(TestCase):
+    """employer_dashboard "top workers" panel is cached per employer and invalidated on changes"""
+
+    def setUp(self):
+        cache.clear()
+        self.employer = Employer.objects.create(
+            first_name='Ravi', last_name='Nair', email='ravi@example.com', phone='9000000002',
+            city='Kochi', state='Kerala', country='India', latitude=9.9312, longitude=76.2673,
+        )
+        EmployerLogin.objects.create(employer=self.employer, email='ravi@example.com', password='x')
+
+        session = self.client.session
+        session['employer_id'] = self.employer.employer_id
+        session.save()
+
+    def add_workers(self, count, start=0):
+        for i in range(start, start + count):
+            emp = Employee.objects.create(
+                first_name=f'Worker{i}', last_name='Test', email=f'worker{i}@example.com',
+                phone=f'81000{i:05d}', job_title='Electrician', city='Kochi', state='Kerala',
+                country='India', latitude=9.9312 + i * 0.001, longitude=76.2673,
+            )
+            Review.objects.create(employee=emp, employer=self.employer, text='Good work', rating=3)
+
+    def dashboard(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('employer_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_cached_render_independent_of_worker_count(self):
+        self.add_workers(3)
+        self.dashboard()
+        _, small = self.dashboard()
+
+        self.add_workers(12, start=3)
+        self.dashboard()
+        response, large = self.dashboard()
+
+        self.assertEqual(len(response.context['top_workers']), 5)
+        self.assertEqual(small, large)
+
+    def test_cache_hit_skips_recomputation(self):
+        self.add_workers(6)
+        _, cold = self.dashboard()
+        _, warm = self.dashboard()
+        self.assertLess(warm, cold)
+
+    def test_new_review_invalidates_panel(self):
+        self.add_workers(2)
+        response, _ = self.dashboard()
+        self.assertEqual(response.context['top_workers'][0]['avg_rating'], 3.0)
+
+        best = Employee.objects.get(email='worker1@example.com')
+        Review.objects.create(employee=best, employer=self.employer, text='Excellent', rating=5)
+
+        response, _ = self.dashboard()
+        top = response.context['top_workers'][0]
+        self.assertEqual(top['employee'].pk, best.pk)
+        self.assertEqual(top['avg_rating'], 4.0)
+
+    def test_worker_profile_change_invalidates_panel(self):
+        self.add_workers(2)
+        self.dashboard()
+
+        worker = Employee.objects.get(email='worker0@example.com')
+        worker.show_profile_to_employer = False
+        worker.save()
+
+        response, _ = self.dashboard()
+        shown = [w['employee'].pk for w in response.context['top_workers']]
+        self.assertNotIn(worker.pk, shown)
+
+    def test_unrelated_worker_save_keeps_panel(self):
+        self.add_workers(3)
+        self.dashboard()
+        _, warm = self.dashboard()
+
+        worker = Employee.objects.get(email='worker0@example.com')
+        worker.total_jobs_done += 1
+        worker.save()
+        worker.job_title = 'Senior Electrician'
+        worker.save(update_fields=['job_title'])
+
+        response, queries = self.dashboard()
+        self.assertEqual(queries, warm)
+        shown = {w['employee'].pk: w['job_title'] for w in response.context['top_workers']}
+        self.assertEqual(shown[worker.pk], 'Senior Electrician')
+
+    def test_evicted_version_never_reuses_an_old_one(self):
+        self.add_workers(2)
+        self.dashboard()
+
+        worker = Employee.objects.get(email='worker0@example.com')
+        worker.status = 'Inactive'
+        worker.save()
+        self.dashboard()
+
+        time.sleep(0.005)
+        cache.delete(VERSION_KEY)
+        response, _ = self.dashboard()
+        shown = [w['employee'].pk for w in response.context['top_workers']]
+        self.assertNotIn(worker.pk, shown)
+
+
+class SiteReviewSentimentTests(TestCase):
+    def setUp(self):
+        self.employer = Employer.objects.create(
+            first_name='Asha', last_name='Menon', email='asha@example.com', phone='9000000001',
+        )
+        self.review = SiteReview.objects.create(
+            employer=self.employer, review_type='platform', rating=5, recommendation='yes',
+            title='Excellent platform', review_text='Quick and helpful support',
+        )
+
+    def test_score_covers_title_and_text(self):
+        self.assertEqual(SiteReview.objects.get(pk=self.review.pk).sentiment_score, 1.0)
+
+    def test_update_fields_with_title_also_writes_score(self):
+        self.review.title = 'Terrible platform'
+        self.review.save(update_fields=['title'])
+        # excellent is gone; terrible against quick and helpful
+        self.assertEqual(SiteReview.objects.get(pk=self.review.pk).sentiment_score, 0.33)
 
-# Create your tests here.
+    def test_update_fields_without_text_leave_score_alone(self):
+        SiteReview.objects.filter(pk=self.review.pk).update(sentiment_score=0.5)
+        self.review.is_published = True
+        self.review.save(update_fields=['is_published'])
+        self.assertEqual(SiteReview.objects.get(pk=self.review.pk).sentiment_score, 0.5)
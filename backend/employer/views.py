@@ -62,7 +62,7 @@ from django.contrib.auth.hashers import make_password, check_password
 from django.utils import timezone
 from django.http import HttpResponse, JsonResponse, HttpResponseRedirect
 from django.db import transaction
-from django.db.models import Q, Avg, Count, Sum
+from django.db.models import Q, Avg, Count, Sum, Max, Exists, OuterRef
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 from decimal import Decimal
@@ -101,8 +101,15 @@ except ImportError:
 
 # Models
 from .models import Employer, EmployerLogin, EmployerFavorite, Payment, PaymentInvoice, SiteReview, Report, EmployerNotification
-from employee.models import Employee, EmployeeCertificate, EmployeeSkill, Review, JobRequest, JobAction, EmployeePortfolio, EmployeeExperience, EmployeeNotification
+from employee.models import Employee, EmployeeCertificate, EmployeeSkill, Review, JobRequest, JobAction, EmployeePortfolio, EmployeeExperience, EmployeeNotification, WorkerScore
+from employee.scoring import ensure_worker_scores
+from employee.search import search_workers, FIND_WORKER_FIELDS
+from employee.skills import employees_with_skill
+from .dashboard_cache import get_top_workers
 from message_system.models import ChatRoom, Message
+from home.geocoding import geocode_location, get_stored_coordinates, get_stored_coordinates_many, sync_stored_coordinates
+from home.spatial import radius_filter, distances_to
+from home.pagination import paginate_request
 
 
 
@@ -157,69 +164,8 @@ def employer_dashboard(request):
         # Get completed jobs count
         completed_jobs_count = completed_jobs.count()
         
-        # Get top rated workers near the employer (limit to 5)
-        top_workers = []
-        
-        # Get employer coordinates for distance calculation
-        employer_location_parts = []
-        if employer.city:
-            employer_location_parts.append(employer.city)
-        if employer.state:
-            employer_location_parts.append(employer.state)
-        if employer.country:
-            employer_location_parts.append(employer.country)
-        
-        employer_coords = None
-        if employer_location_parts:
-            employer_coords = get_coordinates(", ".join(employer_location_parts))
-        
-        # Get all active employees who allow their profile to be shown
-        employees = Employee.objects.filter(
-            status='Active',
-            show_profile_to_employer=True
-        ).prefetch_related('reviews', 'employee_skills')[:20]  # Get first 20, we'll sort and take top 5
-        
-        workers_data = []
-        for emp in employees:
-            try:
-                # Calculate average rating
-                reviews = emp.reviews.all()
-                review_count = reviews.count()
-                avg_rating = 0.0
-                
-                if review_count > 0:
-                    rating_avg = reviews.aggregate(avg_rating=Avg('rating'))
-                    avg_rating = rating_avg['avg_rating'] or 0.0
-                
-                # Calculate distance
-                distance = 100.0
-                emp_coords = get_employee_location_coords(emp)
-                if employer_coords and emp_coords:
-                    distance = calculate_distance(employer_coords, emp_coords)
-                
-                # Calculate wage estimate
-                wage_estimate = emp.years_experience * 100 + 500
-                
-                workers_data.append({
-                    'employee': emp,
-                    'avg_rating': round(avg_rating, 1),
-                    'review_count': review_count,
-                    'distance': round(distance, 1),
-                    'wage_estimate': wage_estimate,
-                    'experience': emp.years_experience,
-                    'response_time': emp.response_time or 'Not specified',
-                    'job_title': emp.job_title or 'Worker',
-                })
-                
-            except Exception as e:
-                print(f"Error processing employee {emp.employee_id}: {str(e)}")
-                continue
-        
-        # Sort by rating (highest first), then by distance (closest first)
-        workers_data.sort(key=lambda x: (-x['avg_rating'], x['distance']))
-        
-        # Take top 5 workers
-        top_workers = workers_data[:5]
+        # Top rated workers near the employer (limit to 5) - cached per employer
+        top_workers = get_top_workers(employer)
         
         # Get unread messages count
         try:
@@ -541,7 +487,7 @@ def employer_favorites(request):
         # Get all favorites for this employer
         favorites = EmployerFavorite.objects.filter(employer=employer).select_related(
             'employee'
-        ).order_by('-created_at')
+        ).prefetch_related('employee__skill_tags').order_by('-created_at')
         
         # Search functionality
         search_query = request.GET.get('search', '').strip()
@@ -560,8 +506,7 @@ def employer_favorites(request):
                             Q(employee__first_name__icontains=term) |
                             Q(employee__last_name__icontains=term) |
                             Q(employee__job_title__icontains=term) |
-                            Q(employee__skills__icontains=term) |
-                            Q(employee__employee_skills__skill_name__icontains=term)
+                            Q(employee_id__in=employees_with_skill(term))
                         )
                 
                 favorites = favorites.filter(search_filter).distinct()
@@ -590,15 +535,8 @@ def employer_favorites(request):
                 # Calculate wage estimate
                 wage_estimate = f"₹{employee.years_experience * 100 + 500}/day"
                 
-                # Get skills
-                employee_skills = list(employee.employee_skills.all()[:3])
-                skills_from_text = []
-                if employee.skills:
-                    skills_from_text = [s.strip() for s in employee.skills.split(',') if s.strip()][:3]
-                
-                # Combine skills
-                all_skills = [s.skill_name for s in employee_skills] + skills_from_text
-                unique_skills = list(set(all_skills))[:3]
+                # Get skills (normalized tags from the text field and EmployeeSkill rows)
+                unique_skills = [skill.name for skill in employee.skill_tags.all()][:3]
                 
                 favorite_workers.append({
                     'favorite_id': fav.id,
@@ -720,6 +658,8 @@ def view_employee_public_profile(request, employee_id):
 
 #******************************************************************************
 
+HIRING_HISTORY_PAGE_SIZE = 20
+
 
 def employer_hiring_history(request):
     """View for employer hiring history with advanced filtering and statistics"""
@@ -735,7 +675,7 @@ def employer_hiring_history(request):
             employer=employer
         ).exclude(status='pending').select_related(
             'employee'
-        ).order_by('-created_at')
+        )
         
         # Get filter parameters
         status_filter = request.GET.get('status', '')
@@ -839,9 +779,16 @@ def employer_hiring_history(request):
         else:
             hire_trend = 100 if current_month_hires > 0 else 0
         
+        # One page of hiring records (keyset cursor on created_at, id)
+        records_page = paginate_request(request, job_requests, ('-created_at',), HIRING_HISTORY_PAGE_SIZE)
+        rated_employee_ids = set(Review.objects.filter(
+            employer=employer,
+            employee_id__in=[job.employee_id for job in records_page if job.employee_id]
+        ).values_list('employee_id', flat=True))
+        
         # Prepare hiring records for template
         hiring_records = []
-        for job in job_requests:
+        for job in records_page:
             # Get employee initials for avatar
             initials = ''
             if job.employee:
@@ -860,10 +807,7 @@ def employer_hiring_history(request):
             amount = f"₹{job.budget}" if job.budget else "Negotiable"
             
             # Check if job has rating
-            has_rating = Review.objects.filter(
-                employer=employer,
-                employee=job.employee
-            ).exists() if job.employee else False
+            has_rating = job.employee_id in rated_employee_ids
             
             hiring_records.append({
                 'id': job.job_id,
@@ -884,6 +828,7 @@ def employer_hiring_history(request):
             'employer_name': employer.full_name,
             'employer_email': employer.email,
             'hiring_records': hiring_records,
+            'records_page': records_page,
             'total_hires': total_hires,
             'completed_jobs': completed_jobs,
             'ongoing_jobs': ongoing_jobs,
@@ -1217,6 +1162,7 @@ def update_location(request):
             employer.zip_code = request.POST.get('zip_code', employer.zip_code)
             employer.country = request.POST.get('country', employer.country)
             employer.location_visibility = request.POST.get('location_visibility', employer.location_visibility)
+            sync_stored_coordinates(employer)
             employer.save()
             messages.success(request, "Location settings updated successfully!")
         except Exception as e:
@@ -1337,75 +1283,10 @@ def employer_payment_section(request):
 #***********************************************************************************
 
 
-# Helper: Sentiment Analysis (standalone to avoid circular imports)
-def compute_text_sentiment(text):
-    """
-    Keyword-based sentiment: +1 (good/excellent), -1 (bad/terrible), 0 (normal/neutral).
-    Uses provided positive/negative lists.
-    """
-    if not text or not isinstance(text, str):
-        return 0.0
-    
-    # Expanded positive and negative keywords
-    positive = [
-        'good', 'great', 'excellent', 'hardworking', 'reliable', 'professional',
-        'amazing', 'best', 'awesome', 'fantastic', 'skilled', 'efficient',
-        'timely', 'honest', 'dedicated', 'outstanding', 'superb', 'wonderful',
-        'trustworthy', 'punctual', 'clean', 'neat', 'careful', 'experienced',
-        'knowledgeable', 'helpful', 'friendly', 'polite', 'patient', 'quick',
-        'fast', 'thorough', 'detail-oriented', 'creative', 'innovative',
-        'proactive', 'responsible', 'conscientious', 'diligent', 'meticulous'
-    ]
-    
-    negative = [
-        'bad', 'poor', 'terrible', 'lazy', 'unreliable', 'incompetent',
-        'worst', 'awful', 'disappointing', 'late', 'dishonest', 'inefficient',
-        'sloppy', 'unprofessional', 'horrible', 'frustrating', 'subpar',
-        'careless', 'messy', 'slow', 'rude', 'impolite', 'unfriendly',
-        'unskilled', 'inexperienced', 'negligent', 'inattentive', 'forgetful',
-        'disorganized', 'chaotic', 'expensive', 'overpriced', 'unsatisfactory',
-        'mediocre', 'average', 'ordinary', 'forgetful', 'absent'
-    ]
-    
-    text_lower = text.lower()
-    
-    # Count positive and negative occurrences
-    pos_count = sum(1 for word in positive if re.search(r'\b' + re.escape(word) + r'\b', text_lower))
-    neg_count = sum(1 for word in negative if re.search(r'\b' + re.escape(word) + r'\b', text_lower))
-    
-    # Calculate sentiment score
-    if pos_count > 0 or neg_count > 0:
-        sentiment = (pos_count - neg_count) / (pos_count + neg_count)
-        return round(sentiment, 2)
-    
-    return 0.0
-
-
-# Alternative geocoding function with fallback
+# Geocoding goes through home.geocoding (in-process LRU -> GeocodeCache table -> Nominatim)
 def get_coordinates(location_str, max_retries=3):
-    """Get coordinates for a location string with retry logic."""
-    if not location_str:
-        return None
-    
-    geolocator = Nominatim(user_agent="worker_finder_app", timeout=10)
-    
-    for attempt in range(max_retries):
-        try:
-            time.sleep(1)  # Rate limiting
-            location = geolocator.geocode(location_str)
-            if location:
-                return (location.latitude, location.longitude)
-            break
-        except (GeocoderTimedOut, GeocoderServiceError) as e:
-            if attempt == max_retries - 1:
-                print(f"Geocoding failed for '{location_str}': {str(e)}")
-                return None
-            time.sleep(2)
-        except Exception as e:
-            print(f"Geocoding error for '{location_str}': {str(e)}")
-            return None
-    
-    return None
+    """Get coordinates for a location string. Only hits the network on a cache miss."""
+    return geocode_location(location_str, max_retries=max_retries)
 
 
 def calculate_distance(coord1, coord2):
@@ -1420,19 +1301,8 @@ def calculate_distance(coord1, coord2):
 
 
 def get_employee_location_coords(employee):
-    """Get coordinates for employee location."""
-    location_parts = []
-    if employee.city:
-        location_parts.append(employee.city)
-    if employee.state:
-        location_parts.append(employee.state)
-    if employee.country:
-        location_parts.append(employee.country)
-    
-    if location_parts:
-        return get_coordinates(", ".join(location_parts))
-    
-    return None
+    """Get coordinates for employee location (stored lat/long or geocode cache, never the network)."""
+    return get_stored_coordinates(employee)
 
 
 # Main View: Employer Find Workers (FULL PIPELINE IMPLEMENTATION)
@@ -1470,51 +1340,27 @@ def employer_find_workers(request):
         print(f"DEBUG: Search Query: '{search_query}'")
         print(f"DEBUG: Location Query: '{location_query}'")
 
-        # Step 1: Get employer coordinates (for distance calculation)
-        employer_location_parts = []
-        if employer.city:
-            employer_location_parts.append(employer.city)
-        if employer.state:
-            employer_location_parts.append(employer.state)
-        if employer.country:
-            employer_location_parts.append(employer.country)
-        
-        employer_coords = None
-        if employer_location_parts:
-            employer_coords = get_coordinates(", ".join(employer_location_parts))
+        # Step 1: Get employer coordinates (for distance calculation, precomputed - no network)
+        employer_coords = get_stored_coordinates(employer)
         
         # Step 2: Base query for employees
         employees = Employee.objects.filter(
             status='Active',
             show_profile_to_employer=True
-        ).select_related().prefetch_related('certificates', 'employee_skills', 'reviews')
+        ).select_related('worker_score').annotate(
+            # Favourite flag resolved in the same query instead of one EXISTS per worker
+            is_favorited=Exists(EmployerFavorite.objects.filter(employer=employer, employee=OuterRef('pk')))
+        )
         
         # Apply country filter if employer has country
         if employer.country:
             employees = employees.filter(country__icontains=employer.country)
-        
-        print(f"DEBUG: Initial employee count: {employees.count()}")
 
-        # Step 3: Apply text search if provided
+        # Step 3: Apply text search if provided - worker search index with BM25 relevance
+        relevance = {}
         if search_query:
-            # Create search query for multiple fields
-            search_terms = search_query.lower().split()
-            search_filter = Q()
-            
-            for term in search_terms:
-                if term:
-                    search_filter |= (
-                        Q(job_title__icontains=term) |
-                        Q(skills__icontains=term) |
-                        Q(bio__icontains=term) |
-                        Q(work_experience__icontains=term) |
-                        Q(first_name__icontains=term) |
-                        Q(last_name__icontains=term) |
-                        Q(employee_skills__skill_name__icontains=term)
-                    )
-            
-            employees = employees.filter(search_filter).distinct()
-            print(f"DEBUG: After text filter: {employees.count()}")
+            relevance = search_workers(search_query, FIND_WORKER_FIELDS, candidates=employees)
+            employees = employees.filter(pk__in=list(relevance))
 
         # Step 4: Apply location filter if provided
         if location_query:
@@ -1533,32 +1379,40 @@ def employer_find_workers(request):
             employees = employees.filter(location_filter)
             search_mode = 'specific_location'
             filter_desc = f" in/near {location_query.title()}"
-            print(f"DEBUG: After location filter: {employees.count()}")
+        
+        # Spatial prefilter: with a location search nobody further away than the largest
+        # service radius can pass the radius check below, so only pull rows in that box
+        # (geohash prefix on the indexed column + lat/long range). Rows without stored
+        # coordinates still go through the city/state fallback.
+        if location_query and employer_coords:
+            max_radius = employees.aggregate(max_radius=Max('service_radius'))['max_radius'] or 0
+            employees = employees.filter(
+                radius_filter(employer_coords[0], employer_coords[1], max_radius)
+                | Q(latitude__isnull=True) | Q(longitude__isnull=True)
+            )
+        
+        employees = list(employees)
+        print(f"DEBUG: Candidate employee count: {len(employees)}")
+        
+        # Distances for every located candidate in one vectorized haversine pass
+        # (stored lat/long, or one geocode-cache query for workers not backfilled yet)
+        distances = distances_to(employer_coords, get_stored_coordinates_many(employees))
+        
+        # Scores for every candidate (missing WorkerScore rows are built in one batch)
+        worker_scores = ensure_worker_scores(employees)
+        best_relevance = max(relevance.values(), default=0) or 1.0
         
         # Step 5: Process each employee
         worker_list = []
         
         for emp in employees:
             try:
-                is_favorited = False
-                if 'employer_id' in request.session:
-                    try:
-                        current_employer = Employer.objects.get(employer_id=request.session['employer_id'])
-                        is_favorited = EmployerFavorite.objects.filter(
-                            employer=current_employer, 
-                            employee=emp
-                        ).exists()
-                    except Exception as e:
-                        print(f"DEBUG: Error checking favorite status: {str(e)}")
-                        pass
-
-                # Get employee coordinates
-                emp_coords = get_employee_location_coords(emp)
-                
+                is_favorited = emp.is_favorited
+
                 # Calculate distance
                 distance = 100.0
-                if employer_coords and emp_coords:
-                    distance = calculate_distance(employer_coords, emp_coords)
+                if emp.pk in distances:
+                    distance = round(distances[emp.pk], 1)
                 elif emp.city and employer.city:
                     # Simple string comparison as fallback
                     if emp.city.lower() == employer.city.lower():
@@ -1570,142 +1424,21 @@ def employer_find_workers(request):
                 if distance > emp.service_radius and location_query:
                     continue  # Skip if out of radius AND location was specified
                 
-                # Step 1: Random Forest Simulation - Efficiency Score
-                score = 0.0
-                
-                # Review Analysis
-                reviews = emp.reviews.all()
-                review_count = reviews.count()
-                avg_rating = 0.0
-                avg_sentiment = 0.0
-                sentiment_boost = 0
-                
-                if review_count > 0:
-                    # Numerical average rating
-                    rating_avg = reviews.aggregate(avg_rating=Avg('rating'))
-                    avg_rating = rating_avg['avg_rating'] or 0.0
-                    
-                    # Text sentiment average
-                    sentiment_scores = [compute_text_sentiment(r.text) for r in reviews]
-                    avg_sentiment = sum(sentiment_scores) / review_count if review_count > 0 else 0.0
-                    
-                    # Boost based on sentiment and review count
-                    if review_count >= 10:
-                        if avg_sentiment >= 0.8:
-                            sentiment_boost = 30
-                        elif avg_sentiment >= 0.5:
-                            sentiment_boost = 20
-                        elif avg_sentiment >= 0:
-                            sentiment_boost = 0
-                        elif avg_sentiment >= -0.5:
-                            sentiment_boost = -10
-                        else:
-                            sentiment_boost = -20
-                    elif review_count >= 5:
-                        if avg_sentiment >= 0.5:
-                            sentiment_boost = 15
-                        elif avg_sentiment <= -0.5:
-                            sentiment_boost = -5
-                    else:
-                        sentiment_boost = int(avg_sentiment * 10)
-                
-                # Review contribution
-                review_score = min(avg_rating * 20, 100) + sentiment_boost
-                score += max(0, min(review_score, 100))
-                
-                # Experience points
-                exp_points = min(emp.years_experience * 5, 50)
-                score += exp_points
-                
-                # Success rate
-                score += emp.success_rate
-                
-                # Jobs done reliability
-                if emp.total_jobs_done >= 50:
-                    score += 20
-                elif emp.total_jobs_done >= 20:
-                    score += 15
-                elif emp.total_jobs_done >= 5:
-                    score += 10
-                else:
-                    score += 5
-                
-                # Certificates (licenses/certs)
-                cert_count = emp.certificates.filter(expiry_date__gte=timezone.now().date()).count()
-                if cert_count >= 3:
-                    score += 30
-                elif cert_count >= 1:
-                    score += 20
-                
-                # Response time bonus
-                response_time = emp.response_time.lower()
-                if 'hour' in response_time or 'fast' in response_time or 'quick' in response_time:
-                    score += 10
-                elif 'day' in response_time or 'medium' in response_time:
-                    score += 5
-                
-                # Cap score
-                score = max(0, min(score, 100))
+                # Step 1 + 2: Random Forest Sim score and grade tier, precomputed in WorkerScore
+                worker_score = worker_scores[emp.pk]
                 
-                # Step 2: Grade Tiers
-                if score >= 90:
-                    grade = 'A+'
-                    tier_desc = 'Elite Performers'
-                elif score >= 80:
-                    grade = 'A'
-                    tier_desc = 'Top Tier'
-                elif score >= 60:
-                    grade = 'B'
-                    tier_desc = 'Reliable'
-                elif score >= 40:
-                    grade = 'C'
-                    tier_desc = 'Developing'
-                else:
-                    grade = 'D'
-                    tier_desc = 'New/Unverified'
+                score = worker_score.score
+                grade = worker_score.grade
+                tier_desc = worker_score.tier
+                review_count = worker_score.review_count
+                avg_rating = worker_score.avg_rating
+                avg_sentiment = worker_score.avg_sentiment
+                sentiment_boost = worker_score.sentiment_boost
                 
-                # Step 3: Content-Based Filtering - Skill Match %
+                # Step 3: Content-Based Filtering - Skill Match % (BM25 relative to the best match)
                 skill_match = 100
                 if search_query:
-                    search_terms = [term.lower().strip() for term in search_query.split() if term.strip()]
-                    matched_terms = 0
-                    
-                    # Check job title
-                    if emp.job_title:
-                        job_title_lower = emp.job_title.lower()
-                        for term in search_terms:
-                            if term in job_title_lower:
-                                matched_terms += 1
-                                break
-                    
-                    # Check skills
-                    all_skills = [s.skill_name.lower() for s in emp.employee_skills.all()]
-                    if emp.skills:
-                        all_skills.extend([s.strip().lower() for s in emp.skills.split(',') if s.strip()])
-                    
-                    for term in search_terms:
-                        for skill in all_skills:
-                            if term in skill:
-                                matched_terms += 1
-                                break
-                    
-                    # Check bio and work experience
-                    if emp.bio:
-                        bio_lower = emp.bio.lower()
-                        for term in search_terms:
-                            if term in bio_lower:
-                                matched_terms += 0.5
-                                break
-                    
-                    if emp.work_experience:
-                        exp_lower = emp.work_experience.lower()
-                        for term in search_terms:
-                            if term in exp_lower:
-                                matched_terms += 0.5
-                                break
-                    
-                    if search_terms:
-                        skill_match = min((matched_terms / len(search_terms)) * 100, 100)
+                    skill_match = min(relevance.get(emp.pk, 0) / best_relevance * 100, 100)
                     
                     # If no skill match at all, skip this employee
                     if skill_match == 0:
@@ -1755,42 +1488,6 @@ def employer_find_workers(request):
                     'is_favorited': is_favorited,
                 })
                 
-                # Get raw availability
-                raw_av = get_employee_availability(emp, end_date=datetime.now().date() + timedelta(days=60))
-                
-                # Group by month
-                months = []
-                current_month_key = None
-                current_month_data = None
-                
-                for day in raw_av:
-                    m_key = (day['date'].year, day['date'].month)
-                    if m_key != current_month_key:
-                        if current_month_data:
-                            months.append(current_month_data)
-                        
-                        # Start new month
-                        # Calculate padding for first day (0=Sun, 6=Sat)
-                        padding = int(day['date'].strftime('%w'))
-                        
-                        current_month_data = {
-                            'name': day['date'].strftime('%B %Y'),
-                            'padding': range(padding), # Create iterable for template
-                            'days': []
-                        }
-                        current_month_key = m_key
-                    
-                    current_month_data['days'].append(day)
-                
-                if current_month_data:
-                    months.append(current_month_data)
-                
-                # Verify data structure
-                if months:
-                    print(f"DEBUG: Processed months for {emp.employee_id}: {[m['name'] for m in months]}")
-                    
-                worker_list[-1]['availability_months'] = months
-                
             except Exception as e:
                 print(f"Error processing employee {emp.employee_id}: {str(e)}")
                 continue
@@ -1799,6 +1496,14 @@ def employer_find_workers(request):
         worker_list.sort(key=lambda x: x['final_score'], reverse=True)
         workers = worker_list[:20]  # Limit to top 20
         
+        # Availability calendars only for the workers actually shown, one query for all of them
+        availability = get_employees_availability(
+            [w['employee'] for w in workers],
+            end_date=datetime.now().date() + timedelta(days=60)
+        )
+        for worker in workers:
+            worker['availability_months'] = group_availability_by_month(availability[worker['employee'].pk])
+        
         print(f"DEBUG: Final worker count: {len(workers)}")
         
         # Feedback messages
@@ -2272,14 +1977,10 @@ def give_employee_review(request, employee_id, job_id=None):
                 else:
                     return redirect('give_employee_review', employee_id=employee_id)
             
-            # Calculate sentiment score
-            sentiment_score = compute_text_sentiment(review_text)
-            
             if existing_review:
                 # Update existing review
                 existing_review.text = review_text
                 existing_review.rating = rating_value
-                existing_review.sentiment_score = sentiment_score
                 existing_review.updated_at = timezone.now()
                 existing_review.save()
                 action = "updated"
@@ -2290,8 +1991,7 @@ def give_employee_review(request, employee_id, job_id=None):
                     employee=employee,
                     job=job,
                     text=review_text,
-                    rating=rating_value,
-                    sentiment_score=sentiment_score
+                    rating=rating_value
                 )
                 action = "submitted"
             
@@ -2470,17 +2170,13 @@ def add_job_review(request, job_id):
                 messages.error(request, "Please provide a rating.")
                 return redirect('view_job_details', job_id=job_id)
             
-            # Calculate sentiment
-            sentiment_score = compute_text_sentiment(review_text)
-            
-            # Create review
+            # Create review (sentiment is scored on save)
             review = Review.objects.create(
                 employer=employer,
                 employee=job_request.employee,
                 job=job_request,
                 text=review_text,
-                rating=float(rating),
-                sentiment_score=sentiment_score
+                rating=float(rating)
             )
             
             # Update employee rating
@@ -2817,28 +2513,15 @@ def view_previous_reports(request):
 
 #**************************************************
 
-def get_employee_availability(employee, start_date=None, end_date=None):
-    from employee.models import JobRequest
+def _build_availability_days(employee, booked_dates, start_date, end_date):
     import datetime
-    
-    if not start_date:
-        start_date = datetime.date.today()
-    if not end_date:
-        end_date = start_date + datetime.timedelta(days=30)
-        
-    # Get all accepted/completed jobs for this worker in the date range
-    existing_jobs = JobRequest.objects.filter(
-        employee=employee,
-        status__in=['accepted', 'completed'],
-        proposed_date__range=[start_date, end_date]
-    ).values_list('proposed_date', flat=True)
-    
+
     availability_list = []
     current_date = start_date
     while current_date <= end_date:
         is_available = True
         # If worker has a job that day, they are unavailable
-        if current_date in existing_jobs:
+        if current_date in booked_dates:
             is_available = False
         # Also check general availability status
         if employee.availability == 'unavailable':
@@ -2854,7 +2537,68 @@ def get_employee_availability(employee, start_date=None, end_date=None):
     return availability_list
 
 
-    return availability_list
+def get_employee_availability(employee, start_date=None, end_date=None):
+    return get_employees_availability([employee], start_date, end_date)[employee.pk]
+
+
+def get_employees_availability(employees, start_date=None, end_date=None):
+    """Day-by-day availability for several workers at once: {employee_id: [day, ...]} from one query."""
+    from employee.models import JobRequest
+    import datetime
+    
+    if not start_date:
+        start_date = datetime.date.today()
+    if not end_date:
+        end_date = start_date + datetime.timedelta(days=30)
+    
+    employees = list(employees)
+    if not employees:
+        return {}
+        
+    # Get all accepted/completed jobs for these workers in the date range
+    booked = {emp.pk: set() for emp in employees}
+    existing_jobs = JobRequest.objects.filter(
+        employee_id__in=list(booked),
+        status__in=['accepted', 'completed'],
+        proposed_date__range=[start_date, end_date]
+    ).values_list('employee_id', 'proposed_date')
+    for employee_id, proposed_date in existing_jobs:
+        booked[employee_id].add(proposed_date)
+    
+    return {
+        emp.pk: _build_availability_days(emp, booked[emp.pk], start_date, end_date)
+        for emp in employees
+    }
+
+
+def group_availability_by_month(raw_av):
+    """Group a day list into month blocks (with leading padding) for the calendar template."""
+    months = []
+    current_month_key = None
+    current_month_data = None
+    
+    for day in raw_av:
+        m_key = (day['date'].year, day['date'].month)
+        if m_key != current_month_key:
+            if current_month_data:
+                months.append(current_month_data)
+            
+            # Start new month
+            # Calculate padding for first day (0=Sun, 6=Sat)
+            padding = int(day['date'].strftime('%w'))
+            
+            current_month_data = {
+                'name': day['date'].strftime('%B %Y'),
+                'padding': range(padding), # Create iterable for template
+                'days': []
+            }
+            current_month_key = m_key
+        
+        current_month_data['days'].append(day)
+    
+    if current_month_data:
+        months.append(current_month_data)
+    return months
 
 
 
@@ -2896,7 +2640,7 @@ def contact_employee(request, employee_id):
             if request.method == 'POST':
                 initial_message = request.POST.get('initial_message', '').strip()
                 if initial_message:
-                    Message.objects.create(
+                    message = Message.objects.create(
                         room=chat_room,
                         sender_type='employer',
                         sender_employer=employer,
@@ -2905,6 +2649,7 @@ def contact_employee(request, employee_id):
                         status='sent'
                     )
                     
+                    chat_room.record_message(message)
                     chat_room.message_count = 1
                     chat_room.last_message_time = timezone.now()
                     chat_room.unread_employee = 1
@@ -0,0 +1,29 @@
+# home/cache_versions.py
+# Version counters kept in Django's cache. Callers put the current version in their cache keys
+# (or ETags) and bump it to make everything built from the old version stale at once.
+# Counters start from the clock rather than 1: a counter evicted from the cache comes back
+# with a value larger than any handed out before, so it never repeats one an old key holds.
+
+import time
+
+from django.core.cache import cache
+
+
+def _seed():
+    return time.time_ns() // 1_000_000
+
+
+def get_version(key):
+    return cache.get_or_set(key, _seed, timeout=None)
+
+
+async def aget_version(key):
+    return await cache.aget_or_set(key, _seed, timeout=None)
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key evicted or never set - a fresh seed differs from every version handed out so far
+        cache.set(key, _seed(), timeout=None)
@@ -0,0 +1,15 @@
+# home/db_utils.py
+
+from django.db import connections, router
+
+
+def bulk_upsert(model, rows, unique_fields, update_fields, batch_size=None):
+    """
+    Insert rows, updating update_fields where a row with the same unique_fields exists.
+    MySQL/MariaDB take the conflict target from the table's unique keys and reject an explicit
+    unique_fields, so it is only passed to backends that support it (SQLite, PostgreSQL).
+    """
+    options = {'update_conflicts': True, 'update_fields': update_fields}
+    if connections[router.db_for_write(model)].features.supports_update_conflicts_with_target:
+        options['unique_fields'] = unique_fields
+    return model.objects.bulk_create(rows, batch_size=batch_size, **options)
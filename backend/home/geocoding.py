@@ -0,0 +1,287 @@
+# home/geocoding.py
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import GeocodeCache, Location
+
+# Geopy is only needed when we actually go to the network (backfill command)
+try:
+    from geopy.geocoders import Nominatim
+    from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+    GEOPY_AVAILABLE = True
+except ImportError:
+    GEOPY_AVAILABLE = False
+
+
+GEOCODE_SETTINGS = getattr(settings, 'GEOCODING', {})
+CACHE_TTL = timedelta(days=GEOCODE_SETTINGS.get('CACHE_TTL_DAYS', 90))
+NEGATIVE_CACHE_TTL = timedelta(days=GEOCODE_SETTINGS.get('NEGATIVE_CACHE_TTL_DAYS', 7))
+MEMORY_CACHE_SIZE = GEOCODE_SETTINGS.get('MEMORY_CACHE_SIZE', 1024)
+USER_AGENT = GEOCODE_SETTINGS.get('USER_AGENT', 'worker_finder_app')
+
+_MISSING = object()
+
+
+class _LRUCache:
+    """Small thread-safe in-process LRU sitting in front of the GeocodeCache table"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return _MISSING
+            value, expires = self._data[key]
+            if expires <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl_seconds):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl_seconds)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+memory_cache = _LRUCache(MEMORY_CACHE_SIZE)
+
+
+def build_location_string(obj):
+    """Build the "city, state, country" string used for geocoding an Employee/Employer."""
+    parts = []
+    if getattr(obj, 'city', None):
+        parts.append(obj.city)
+    if getattr(obj, 'state', None):
+        parts.append(obj.state)
+    if getattr(obj, 'country', None):
+        parts.append(obj.country)
+    return ", ".join(parts)
+
+
+def normalize_location_key(location_str):
+    """Normalize a location string so 'Kochi ,Kerala, India ' and 'kochi, kerala, india' share a key."""
+    if not location_str:
+        return ''
+    parts = [' '.join(part.split()).lower() for part in location_str.split(',')]
+    return ', '.join(part for part in parts if part)[:255]
+
+
+def _entry_ttl(entry):
+    return CACHE_TTL if entry.found else NEGATIVE_CACHE_TTL
+
+
+def _seconds_left(entry):
+    return (entry.updated_at + _entry_ttl(entry) - timezone.now()).total_seconds()
+
+
+def _cached_lookup(key):
+    """LRU first, then the DB table. Returns _MISSING when the key is unknown or expired."""
+    coords = memory_cache.get(key)
+    if coords is not _MISSING:
+        return coords
+
+    entry = GeocodeCache.objects.filter(location_key=key).first()
+    if entry is None or _seconds_left(entry) <= 0:
+        return _MISSING
+
+    memory_cache.set(key, entry.coords, _seconds_left(entry))
+    return entry.coords
+
+
+def lookup_cached_coordinates(location_str):
+    """
+    Return (lat, lon) for a location from the in-process LRU or the DB cache.
+    Never touches the network - returns None if the location has not been geocoded yet.
+    """
+    key = normalize_location_key(location_str)
+    if not key:
+        return None
+
+    coords = _cached_lookup(key)
+    return None if coords is _MISSING else coords
+
+
+def lookup_cached_coordinates_many(location_strs):
+    """
+    {location_str: (lat, lon) or None} for many locations: LRU hits first, then a single
+    query on the cache table for the rest. Never touches the network.
+    """
+    results = {}
+    pending = {}
+    for location_str in location_strs:
+        key = normalize_location_key(location_str)
+        if not key:
+            results[location_str] = None
+            continue
+        coords = memory_cache.get(key)
+        if coords is _MISSING:
+            pending.setdefault(key, []).append(location_str)
+        else:
+            results[location_str] = coords
+
+    if pending:
+        for entry in GeocodeCache.objects.filter(location_key__in=list(pending)):
+            if _seconds_left(entry) <= 0:
+                continue
+            memory_cache.set(entry.location_key, entry.coords, _seconds_left(entry))
+            for location_str in pending[entry.location_key]:
+                results[location_str] = entry.coords
+
+    for location_strs_for_key in pending.values():
+        for location_str in location_strs_for_key:
+            results.setdefault(location_str, None)
+    return results
+
+
+def store_coordinates(location_str, coords):
+    """Save a geocoding result (or a miss when coords is None) to both cache levels."""
+    key = normalize_location_key(location_str)
+    if not key:
+        return None
+
+    entry, _ = GeocodeCache.objects.update_or_create(
+        location_key=key,
+        defaults={
+            'latitude': coords[0] if coords else None,
+            'longitude': coords[1] if coords else None,
+            'found': coords is not None,
+        }
+    )
+    memory_cache.set(key, entry.coords, _entry_ttl(entry).total_seconds())
+    return entry
+
+
+def fetch_coordinates(location_str, max_retries=3):
+    """Geocode a location through Nominatim. Slow (rate limited) - keep it off the request path."""
+    if not location_str or not GEOPY_AVAILABLE:
+        return None
+
+    geolocator = Nominatim(user_agent=USER_AGENT, timeout=10)
+
+    for attempt in range(max_retries):
+        try:
+            time.sleep(1)  # Nominatim usage policy: max 1 request per second
+            location = geolocator.geocode(location_str)
+            if location:
+                return (location.latitude, location.longitude)
+            break
+        except (GeocoderTimedOut, GeocoderServiceError) as e:
+            if attempt == max_retries - 1:
+                print(f"Geocoding failed for '{location_str}': {str(e)}")
+                return None
+            time.sleep(2)
+        except Exception as e:
+            print(f"Geocoding error for '{location_str}': {str(e)}")
+            return None
+
+    return None
+
+
+def geocode_location(location_str, max_retries=3, refresh=False):
+    """Cached geocoding: LRU -> DB cache -> Nominatim. Network misses are cached too."""
+    if not location_str:
+        return None
+
+    if not refresh:
+        coords = _cached_lookup(normalize_location_key(location_str))
+        if coords is not _MISSING:
+            return coords
+
+    coords = fetch_coordinates(location_str, max_retries=max_retries)
+    store_coordinates(location_str, coords)
+    return coords
+
+
+def get_stored_coordinates(obj):
+    """
+    Coordinates for an Employee/Employer on the request path.
+    Uses the precomputed latitude/longitude columns first, then the geocode cache.
+    """
+    if getattr(obj, 'latitude', None) is not None and getattr(obj, 'longitude', None) is not None:
+        return (obj.latitude, obj.longitude)
+    return lookup_cached_coordinates(build_location_string(obj))
+
+
+def get_stored_coordinates_many(objects):
+    """{pk: (lat, lon) or None} for many Employees/Employers with at most one cache query."""
+    coords = {}
+    unlocated = {}
+    for obj in objects:
+        if obj.latitude is not None and obj.longitude is not None:
+            coords[obj.pk] = (obj.latitude, obj.longitude)
+        else:
+            unlocated[obj.pk] = build_location_string(obj)
+
+    cached = lookup_cached_coordinates_many(set(unlocated.values()))
+    for pk, location_str in unlocated.items():
+        coords[pk] = cached.get(location_str)
+    return coords
+
+
+def _saved_location_string(obj):
+    """The location string of obj as currently stored, or None for an unsaved object"""
+    if obj.pk is None:
+        return None
+    saved = type(obj).objects.filter(pk=obj.pk).values('city', 'state', 'country').first()
+    return build_location_string(SimpleNamespace(**saved)) if saved else None
+
+
+def sync_stored_coordinates(obj):
+    """
+    Refresh obj.latitude/longitude from the cache before saving a location form (no network).
+    Stored coordinates are kept unless city/state/country actually changed: a cache miss or an
+    expired entry must not erase what backfill_coordinates stored. A changed location that is
+    not cached yet is left empty for the backfill_coordinates command.
+    """
+    location_str = build_location_string(obj)
+    coords = lookup_cached_coordinates(location_str)
+    if coords:
+        obj.latitude, obj.longitude = coords
+    elif normalize_location_key(location_str) != normalize_location_key(_saved_location_string(obj)):
+        obj.latitude, obj.longitude = None, None
+    return coords
+
+
+def save_location_row(user_type, user_id, address, coords):
+    """Mirror coordinates into the existing home.Location table."""
+    lat, lon = coords if coords else (0.0, 0.0)
+    Location.objects.update_or_create(
+        user_type=user_type,
+        user_id=user_id,
+        defaults={
+            'address': (address or '')[:255],
+            'latitude': Decimal(str(round(lat, 7))),
+            'longitude': Decimal(str(round(lon, 7))),
+        }
+    )
+
+
+def evict_expired_entries():
+    """Delete cache rows that are past their TTL. Returns the number of rows removed."""
+    now = timezone.now()
+    deleted, _ = GeocodeCache.objects.filter(
+        found=True, updated_at__lt=now - CACHE_TTL
+    ).delete()
+    missed, _ = GeocodeCache.objects.filter(
+        found=False, updated_at__lt=now - NEGATIVE_CACHE_TTL
+    ).delete()
+    memory_cache.clear()
+    return deleted + missed
@@ -0,0 +1,81 @@
+# home/management/commands/backfill_coordinates.py
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from employee.models import Employee
+from employer.models import Employer
+from home.geocoding import (
+    build_location_string, normalize_location_key, geocode_location,
+    save_location_row, evict_expired_entries, GEOPY_AVAILABLE,
+)
+from home.spatial import encode_geohash
+
+
+class Command(BaseCommand):
+    help = "Geocode employee/employer locations once and store lat/long so search pages never hit Nominatim"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--refresh', action='store_true',
+                            help='Re-geocode every location, ignoring stored coordinates and the cache')
+        parser.add_argument('--limit', type=int, default=0,
+                            help='Maximum number of distinct locations to look up on the network (0 = no limit)')
+        parser.add_argument('--evict-expired', action='store_true',
+                            help='Delete expired geocode cache rows before backfilling')
+
+    def handle(self, *args, **options):
+        refresh = options['refresh']
+        limit = options['limit']
+
+        if options['evict_expired']:
+            removed = evict_expired_entries()
+            self.stdout.write(f"Evicted {removed} expired geocode cache entries")
+
+        if not GEOPY_AVAILABLE:
+            self.stdout.write(self.style.WARNING("geopy not installed - only cached locations can be backfilled"))
+
+        missing = Q(latitude__isnull=True) | Q(longitude__isnull=True)
+        targets = [
+            ('Employee', Employee.objects.all() if refresh else Employee.objects.filter(missing)),
+            ('Employer', Employer.objects.all() if refresh else Employer.objects.filter(missing)),
+        ]
+
+        # One lookup per distinct normalized location, not per user
+        resolved = {}
+        lookups = 0
+        updated = 0
+        skipped = 0
+
+        for user_type, queryset in targets:
+            model = queryset.model
+            pk_name = model._meta.pk.name
+            for obj in queryset.only(pk_name, 'city', 'state', 'country', 'address').iterator():
+                location_str = build_location_string(obj)
+                key = normalize_location_key(location_str)
+                if not key:
+                    skipped += 1
+                    continue
+
+                if key not in resolved:
+                    if limit and lookups >= limit:
+                        skipped += 1
+                        continue
+                    resolved[key] = geocode_location(location_str, refresh=refresh)
+                    lookups += 1
+
+                coords = resolved[key]
+                if not coords:
+                    skipped += 1
+                    continue
+
+                fields = {'latitude': coords[0], 'longitude': coords[1]}
+                if model is Employee:
+                    fields['geohash'] = encode_geohash(coords[0], coords[1])
+                model.objects.filter(pk=obj.pk).update(**fields)
+                save_location_row(user_type, obj.pk, obj.address or location_str, coords)
+                updated += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled coordinates for {updated} users "
+            f"({lookups} distinct locations resolved, {skipped} skipped)"
+        ))
@@ -0,0 +1,63 @@
+# home/management/commands/backfill_review_sentiment.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from employee.models import Review
+from employee.scoring import rebuild_all_worker_scores
+from employer.models import SiteReview
+from home.sentiment import compute_text_sentiments
+
+
+class Command(BaseCommand):
+    help = "Score Review/SiteReview sentiment in batches and store it, so pages read sentiment_score instead of re-scoring text"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--skip-worker-scores', action='store_true',
+                            help='Do not rebuild WorkerScore rows afterwards (they cache the average review sentiment)')
+
+    def score_model(self, queryset, text_of, batch_size):
+        """Score every row, writing back only those whose stored value changed"""
+        updated = 0
+        batch = []
+        for row in queryset.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                updated += self.write_batch(queryset.model, batch, text_of)
+                batch = []
+        if batch:
+            updated += self.write_batch(queryset.model, batch, text_of)
+        return updated
+
+    def write_batch(self, model, rows, text_of):
+        scores = compute_text_sentiments([text_of(row) for row in rows])
+        changed = []
+        for row, score in zip(rows, scores):
+            if row.sentiment_score != score:
+                row.sentiment_score = score
+                changed.append(row)
+        # bulk_update skips save(), so no per-row signals fire here
+        model.objects.bulk_update(changed, ['sentiment_score'])
+        return len(changed)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        start = time.perf_counter()
+
+        reviews = self.score_model(
+            Review.objects.only('id', 'text', 'sentiment_score'),
+            lambda r: r.text, batch_size,
+        )
+        site_reviews = self.score_model(
+            SiteReview.objects.only('id', 'title', 'review_text', 'sentiment_score'),
+            lambda r: f"{r.title} {r.review_text}", batch_size,
+        )
+        self.stdout.write(f"Updated {reviews} reviews and {site_reviews} site reviews")
+
+        if reviews and not options['skip_worker_scores']:
+            written = rebuild_all_worker_scores()
+            self.stdout.write(f"Rebuilt {written} worker scores")
+
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.perf_counter() - start:.2f}s"))
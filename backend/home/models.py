@@ -64,4 +64,26 @@ class Location(models.Model):
         return f"{self.user_type} - {self.address}"
     
     class Meta:
-        db_table = 'location_table'
\ No newline at end of file
+        db_table = 'location_table'
+
+class GeocodeCache(models.Model):
+    """Geocoding results keyed by a normalized "city, state, country" string"""
+    cache_id = models.AutoField(primary_key=True)
+    location_key = models.CharField(max_length=255, unique=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    found = models.BooleanField(default=True)  # False = lookup returned nothing (negative cache)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.location_key} ({self.latitude}, {self.longitude})"
+
+    class Meta:
+        db_table = 'geocode_cache_table'
+
+    @property
+    def coords(self):
+        if self.found and self.latitude is not None and self.longitude is not None:
+            return (self.latitude, self.longitude)
+        return None
@@ -0,0 +1,255 @@
+# home/pagination.py
+# Keyset ("seek") pagination for the admin and history lists. A page is fetched with
+#     WHERE (created_at, id) < (last created_at, last id) ORDER BY created_at DESC, id DESC LIMIT n+1
+# instead of OFFSET, so page 500 costs the same as page 1. The position travels between
+# requests as an opaque cursor string, and the total is either skipped, counted exactly,
+# or estimated from table statistics (count='approximate').
+#
+#   page = paginate(queryset, request.GET.get('cursor'), ordering=('-rating',), page_size=10,
+#                   count='approximate')
+#   for row in page: ...
+#   page.next_cursor / page.previous_cursor -> ?cursor=... links (None at either end)
+
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db import connections
+from django.db.models import Q
+
+# Above this many rows a filtered list shows "about N" instead of running COUNT(*) to the end
+COUNT_CAP = 1000
+
+
+def encode_cursor(values):
+    """Opaque URL-safe token for a JSON-able value"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor; raises ValueError for a malformed token"""
+    try:
+        return json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def _dump(value):
+    """Sort key value -> JSON value that _load turns back into the same type"""
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'dec': str(value)}
+    return value
+
+
+def _load(value):
+    if not isinstance(value, dict):
+        return value
+    try:
+        (kind, raw), = value.items()
+        return {'dt': datetime.fromisoformat, 'd': date.fromisoformat, 'dec': Decimal}[kind](raw)
+    except (ValueError, KeyError, ArithmeticError):
+        raise ValueError("Invalid cursor")
+
+
+def _sort_keys(ordering):
+    """('-rating', 'name') -> [('rating', True), ('name', False), ('pk', False)]; pk breaks ties"""
+    keys = [(field.lstrip('-'), field.startswith('-')) for field in ordering]
+    if not any(field == 'pk' for field, _ in keys):
+        keys.append(('pk', keys[-1][1] if keys else True))
+    return keys
+
+
+def _seek(keys, values, forward=True):
+    """Rows strictly after (forward) or before the position `values` in the `keys` order"""
+    condition = Q()
+    for i, (field, descending) in enumerate(keys):
+        lookup = 'lt' if descending == forward else 'gt'
+        equal = {f: v for (f, _), v in zip(keys[:i], values[:i])}
+        condition |= Q(**equal, **{f'{field}__{lookup}': values[i]})
+    return condition
+
+
+def _order_by(keys, reverse=False):
+    return [('-' if descending != reverse else '') + field for field, descending in keys]
+
+
+class KeysetPage:
+    """
+    One page of a keyset-paginated list. Iterates like a Django Page; start_index/end_index
+    are 1-based positions carried in the cursor, count is None when not requested.
+    """
+
+    def __init__(self, object_list, start, has_next, has_previous, next_cursor=None,
+                 previous_cursor=None, count=None, count_is_exact=True):
+        self.object_list = object_list
+        self.start = start
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+        self.count_is_exact = count_is_exact
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def start_index(self):
+        return self.start + 1 if self.object_list else 0
+
+    def end_index(self):
+        return self.start + len(self.object_list)
+
+    def __repr__(self):
+        return f'<KeysetPage {self.start_index()}-{self.end_index()}>'
+
+
+def paginate(queryset, cursor=None, ordering=('-created_at',), page_size=10, count=None):
+    """
+    Keyset-paginate queryset by `ordering` (model fields or annotations, non-null), with pk
+    appended as the tie-breaker. `count` is None, 'exact' or 'approximate'. Raises ValueError
+    for a malformed cursor or one issued for a different ordering.
+    """
+    keys = _sort_keys(ordering)
+    signature = _order_by(keys)
+    forward, start = True, 0
+    queryset = base = queryset.order_by(*signature)
+
+    if cursor:
+        state = decode_cursor(cursor)
+        if not isinstance(state, dict) or state.get('o') != signature:
+            raise ValueError("Invalid cursor")
+        try:
+            values = [_load(value) for value in state['v']]
+            forward, start = state['d'] == 'n', max(int(state['s']), 0)
+        except (KeyError, TypeError):
+            raise ValueError("Invalid cursor")
+        if len(values) != len(keys):
+            raise ValueError("Invalid cursor")
+        queryset = queryset.filter(_seek(keys, values, forward))
+        if not forward:
+            queryset = queryset.order_by(*_order_by(keys, reverse=True))
+
+    rows = list(queryset[:page_size + 1])
+    more = len(rows) > page_size
+    rows = rows[:page_size]
+    if forward:
+        has_next, has_previous = more, bool(cursor)
+    else:
+        rows.reverse()
+        has_next, has_previous = True, more
+        if not more:
+            start = 0
+
+    def position(row, direction, row_start):
+        values = [_dump(getattr(row, field)) for field, _ in keys]
+        return encode_cursor({'o': signature, 'v': values, 'd': direction, 's': row_start})
+
+    next_cursor = position(rows[-1], 'n', start + len(rows)) if rows and has_next else None
+    previous_cursor = position(rows[0], 'p', max(start - page_size, 0)) if rows and has_previous else None
+
+    total, exact = count_rows(base, approximate=count == 'approximate') if count else (None, True)
+    return KeysetPage(rows, start, has_next, has_previous, next_cursor, previous_cursor, total, exact)
+
+
+def merged_page(sources, cursor=None, page_size=10, field='created_at'):
+    """
+    One newest-first page across several querysets (e.g. worker and site reviews), ordered
+    by (field DESC, source order, pk DESC). Each source is read with its own keyset query
+    of at most page_size + 1 rows, so only forward (older) navigation is supported.
+    Returns a KeysetPage of (source name, row) pairs.
+    """
+    start = 0
+    if cursor:
+        state = decode_cursor(cursor)
+        try:
+            value, source_index, pk = _load(state['v']), int(state['src']), int(state['pk'])
+            start = max(int(state['s']), 0)
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+
+    candidates = []
+    for index, (name, queryset) in enumerate(sources):
+        queryset = queryset.order_by(f'-{field}', '-pk')
+        if cursor:
+            if index > source_index:
+                queryset = queryset.filter(**{f'{field}__lte': value})
+            elif index == source_index:
+                queryset = queryset.filter(_seek([(field, True), ('pk', True)], [value, pk]))
+            else:
+                queryset = queryset.filter(**{f'{field}__lt': value})
+        candidates += [(getattr(row, field), index, row.pk, name, row) for row in queryset[:page_size + 1]]
+
+    candidates.sort(key=lambda item: (item[0], -item[1], item[2]), reverse=True)
+    page = candidates[:page_size]
+    rows = [(name, row) for _, _, _, name, row in page]
+    next_cursor = None
+    if len(candidates) > page_size:
+        last_value, last_index, last_pk = page[-1][:3]
+        next_cursor = encode_cursor({'v': _dump(last_value), 'src': last_index, 'pk': last_pk, 's': start + len(rows)})
+    return KeysetPage(rows, start, next_cursor is not None, bool(cursor), next_cursor)
+
+
+#****************************************************************
+# Counting
+
+def table_row_estimate(model, using='default'):
+    """
+    Row count from the database's table statistics (InnoDB TABLE_ROWS, pg_class.reltuples):
+    no scan, but only roughly right. None on backends without such statistics.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == 'mysql':
+        sql = "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+    elif connection.vendor == 'postgresql':
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE relname = %s"
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [table])
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def count_rows(queryset, approximate=False, cap=COUNT_CAP):
+    """
+    (count, is_exact) for queryset. Approximate mode reads table statistics for an
+    unfiltered queryset and otherwise counts at most cap + 1 rows; small tables, where the
+    statistics are least reliable and an exact count is cheap, are always counted exactly.
+    """
+    if not approximate:
+        return queryset.count(), True
+
+    if not queryset.query.where:
+        estimate = table_row_estimate(queryset.model, queryset.db)
+        if estimate is not None and estimate > cap:
+            return estimate, False
+
+    counted = queryset.order_by()[:cap + 1].count()
+    if counted > cap:
+        return cap, False
+    return counted, True
+
+
+def paginate_request(request, queryset, ordering=('-created_at',), page_size=10, count=None):
+    """paginate() with the cursor from ?cursor=; a malformed or stale cursor shows the first page"""
+    try:
+        return paginate(queryset, request.GET.get('cursor'), ordering, page_size, count)
+    except ValueError:
+        return paginate(queryset, None, ordering, page_size, count)
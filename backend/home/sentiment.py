@@ -0,0 +1,56 @@
+# home/sentiment.py
+# Keyword-based review sentiment shared by the employee/employer apps.
+# The lexicon is compiled once into a single alternation regex, so a text is scanned in one pass.
+
+import re
+
+POSITIVE_WORDS = frozenset([
+    'good', 'great', 'excellent', 'hardworking', 'reliable', 'professional',
+    'amazing', 'best', 'awesome', 'fantastic', 'skilled', 'efficient',
+    'timely', 'honest', 'dedicated', 'outstanding', 'superb', 'wonderful',
+    'trustworthy', 'punctual', 'clean', 'neat', 'careful', 'experienced',
+    'knowledgeable', 'helpful', 'friendly', 'polite', 'patient', 'quick',
+    'fast', 'thorough', 'detail-oriented', 'creative', 'innovative',
+    'proactive', 'responsible', 'conscientious', 'diligent', 'meticulous',
+    'perfect', 'superior', 'exceptional', 'commendable',
+])
+
+NEGATIVE_WORDS = frozenset([
+    'bad', 'poor', 'terrible', 'lazy', 'unreliable', 'incompetent',
+    'worst', 'awful', 'disappointing', 'late', 'dishonest', 'inefficient',
+    'sloppy', 'unprofessional', 'horrible', 'frustrating', 'subpar',
+    'careless', 'messy', 'slow', 'rude', 'impolite', 'unfriendly',
+    'unskilled', 'inexperienced', 'negligent', 'inattentive', 'forgetful',
+    'disorganized', 'chaotic', 'expensive', 'overpriced', 'unsatisfactory',
+    'mediocre', 'average', 'ordinary', 'absent',
+])
+
+# Longest alternatives first so "detail-oriented" is not cut short by a shorter word
+_LEXICON_RE = re.compile(
+    r'\b(?:' + '|'.join(
+        re.escape(word) for word in sorted(POSITIVE_WORDS | NEGATIVE_WORDS, key=len, reverse=True)
+    ) + r')\b'
+)
+
+
+def compute_text_sentiment(text):
+    """
+    Keyword-based sentiment in -1..1: (positive - negative) / (positive + negative) over the
+    distinct lexicon words found, 0.0 when none are present.
+    """
+    if not text or not isinstance(text, str):
+        return 0.0
+
+    found = set(_LEXICON_RE.findall(text.lower()))
+    pos_count = len(found & POSITIVE_WORDS)
+    neg_count = len(found & NEGATIVE_WORDS)
+
+    if pos_count > 0 or neg_count > 0:
+        return round((pos_count - neg_count) / (pos_count + neg_count), 2)
+    return 0.0
+
+
+def compute_text_sentiments(texts):
+    """Batch version: one score per text, in order"""
+    return [compute_text_sentiment(text) for text in texts]
+
@@ -0,0 +1,169 @@
+# home/spatial.py
+# Geohash bucketing + vectorized distance helpers for radius searches.
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 8          # stored precision (~38m x 19m cells)
+MAX_PREFIX_CELLS = 32          # upper bound on geohash__startswith clauses per query
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Standard geohash encoding of a (lat, lon) pair."""
+    if latitude is None or longitude is None:
+        return None
+
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bit = 0
+    ch = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                ch = (ch << 1) | 1
+                lon_range[0] = mid
+            else:
+                ch = ch << 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                ch = (ch << 1) | 1
+                lat_range[0] = mid
+            else:
+                ch = ch << 1
+                lat_range[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(_BASE32[ch])
+            bit = 0
+            ch = 0
+
+    return ''.join(chars)
+
+
+def _cell_size(precision):
+    """(lat_degrees, lon_degrees) covered by one geohash cell of the given precision."""
+    bits = precision * 5
+    lon_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    (min_lat, max_lat, min_lon, max_lon) enclosing a circle of radius_km, on the same sphere
+    as haversine_km so a point exactly on the radius is never cut off by the prefilter.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    dlat = math.degrees(angular)
+    # Widest longitude span of the circle (it is reached north/south of the centre latitude)
+    sin_ratio = math.sin(min(angular, math.pi / 2)) / max(math.cos(math.radians(latitude)), 1e-12)
+    dlon = math.degrees(math.asin(sin_ratio)) if sin_ratio < 1 else 180.0
+    return (
+        max(latitude - dlat, -90.0),
+        min(latitude + dlat, 90.0),
+        max(longitude - dlon, -180.0),
+        min(longitude + dlon, 180.0),
+    )
+
+
+def _cells_for_bbox(bbox, precision):
+    min_lat, max_lat, min_lon, max_lon = bbox
+    cell_lat, cell_lon = _cell_size(precision)
+
+    lats = list(np.arange(min_lat, max_lat, cell_lat)) + [max_lat]
+    lons = list(np.arange(min_lon, max_lon, cell_lon)) + [max_lon]
+    if len(lats) * len(lons) > MAX_PREFIX_CELLS * 4:
+        return None
+
+    cells = {encode_geohash(lat, lon, precision) for lat in lats for lon in lons}
+    if len(cells) > MAX_PREFIX_CELLS:
+        return None
+    return cells
+
+
+def geohash_prefixes(bbox):
+    """
+    Smallest set of geohash prefixes covering bbox. Picks the finest precision
+    that still needs at most MAX_PREFIX_CELLS cells, so the index scan stays tight.
+    """
+    best = None
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        cells = _cells_for_bbox(bbox, precision)
+        if cells is None:
+            break
+        best = cells
+    return best or {''}
+
+
+def radius_filter(latitude, longitude, radius_km, lat_field='latitude', lon_field='longitude',
+                  geohash_field='geohash'):
+    """
+    Q object selecting rows inside the bounding box of a radius search.
+    The geohash prefix OR hits the column index, the lat/lon ranges trim the cell edges.
+    Exact distances still need haversine_km() on the survivors.
+    """
+    from django.db.models import Q
+
+    bbox = bounding_box(latitude, longitude, radius_km)
+    prefix_q = Q()
+    for prefix in sorted(geohash_prefixes(bbox)):
+        prefix_q |= Q(**{f'{geohash_field}__startswith': prefix})
+
+    return prefix_q & Q(**{
+        f'{lat_field}__gte': bbox[0],
+        f'{lat_field}__lte': bbox[1],
+        f'{lon_field}__gte': bbox[2],
+        f'{lon_field}__lte': bbox[3],
+    })
+
+
+def haversine_km(latitude, longitude, lats, lons):
+    """Great-circle distance (km) from one point to arrays of points, in one NumPy pass."""
+    lat1 = np.radians(latitude)
+    lon1 = np.radians(longitude)
+    lat2 = np.radians(np.asarray(lats, dtype=np.float64))
+    lon2 = np.radians(np.asarray(lons, dtype=np.float64))
+
+    a = (np.sin((lat2 - lat1) / 2.0) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2)
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def distances_to(origin, coords_by_key):
+    """
+    {key: km} from origin to every (lat, lon) in coords_by_key, in one vectorized call.
+    Keys whose coordinates are None are left out so callers can apply their own fallback.
+    """
+    if not origin:
+        return {}
+
+    located = [(key, coords) for key, coords in coords_by_key.items() if coords]
+    if not located:
+        return {}
+
+    km = haversine_km(
+        origin[0], origin[1],
+        [coords[0] for _, coords in located],
+        [coords[1] for _, coords in located],
+    )
+    return {key: float(d) for (key, _), d in zip(located, km)}
+
+
+def distances_from(origin, objects):
+    """{pk: km} for every object with stored latitude/longitude."""
+    return distances_to(origin, {
+        obj.pk: (obj.latitude, obj.longitude)
+        for obj in objects
+        if obj.latitude is not None and obj.longitude is not None
+    })
@@ -1,3 +1,102 @@
+import math
+
 from django.test import TestCase
 
-# Create your tests here.
+from employee.models import Employee
+from .geocoding import memory_cache, store_coordinates, sync_stored_coordinates
+from .spatial import EARTH_RADIUS_KM, bounding_box, encode_geohash, geohash_prefixes, haversine_km, radius_filter
+from .sentiment import compute_text_sentiment, compute_text_sentiments
+
+
+class SyncStoredCoordinatesTests(TestCase):
+    def setUp(self):
+        memory_cache.clear()
+        self.employee = Employee.objects.create(
+            first_name='Ravi', last_name='Kumar', email='ravi@example.com', phone='8000000001',
+            city='Kochi', state='Kerala', country='India', latitude=9.93, longitude=76.26,
+        )
+
+    def test_cache_miss_keeps_coordinates_of_unchanged_location(self):
+        self.employee.zip_code = '682001'
+        sync_stored_coordinates(self.employee)
+        self.assertEqual((self.employee.latitude, self.employee.longitude), (9.93, 76.26))
+
+    def test_changed_location_uses_cached_coordinates(self):
+        store_coordinates('Thrissur, Kerala, India', (10.52, 76.21))
+        self.employee.city = 'Thrissur'
+        sync_stored_coordinates(self.employee)
+        self.assertEqual((self.employee.latitude, self.employee.longitude), (10.52, 76.21))
+
+    def test_changed_location_without_cache_entry_is_cleared(self):
+        self.employee.city = 'Kannur'
+        sync_stored_coordinates(self.employee)
+        self.assertEqual((self.employee.latitude, self.employee.longitude), (None, None))
+
+
+class ComputeTextSentimentTests(TestCase):
+    def test_scores_distinct_lexicon_words(self):
+        self.assertEqual(compute_text_sentiment('Great, great and punctual'), 1.0)
+        self.assertEqual(compute_text_sentiment('Rude and LATE'), -1.0)
+        self.assertEqual(compute_text_sentiment('Skilled but slow and messy'), -0.33)
+
+    def test_matches_whole_words_only(self):
+        # "detail-oriented" is one word; "badge"/"fastener" must not match "bad"/"fast"
+        self.assertEqual(compute_text_sentiment('Very detail-oriented'), 1.0)
+        self.assertEqual(compute_text_sentiment('Fixed the badge fastener'), 0.0)
+
+    def test_empty_or_non_text_is_neutral(self):
+        for text in (None, '', 42, 'The job is finished'):
+            self.assertEqual(compute_text_sentiment(text), 0.0)
+
+    def test_batch_keeps_order(self):
+        self.assertEqual(compute_text_sentiments(['awful', None, 'excellent']), [-1.0, 0.0, 1.0])
+
+
+def destination(latitude, longitude, bearing_deg, km):
+    """Point km away from (latitude, longitude) along bearing_deg, on the haversine sphere"""
+    lat1, lon1, bearing = map(math.radians, (latitude, longitude, bearing_deg))
+    d = km / EARTH_RADIUS_KM
+    lat2 = math.asin(math.sin(lat1) * math.cos(d) + math.cos(lat1) * math.sin(d) * math.cos(bearing))
+    lon2 = lon1 + math.atan2(math.sin(bearing) * math.sin(d) * math.cos(lat1), math.cos(d) - math.sin(lat1) * math.sin(lat2))
+    return math.degrees(lat2), math.degrees(lon2)
+
+
+class SpatialTests(TestCase):
+    def test_encode_geohash(self):
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        self.assertEqual(encode_geohash(9.9312, 76.2673), encode_geohash(9.9312, 76.2673, 8))
+        self.assertIsNone(encode_geohash(None, 76.2673))
+
+    def test_prefixes_cover_the_whole_box(self):
+        bbox = bounding_box(9.9312, 76.2673, 25)
+        prefixes = geohash_prefixes(bbox)
+        min_lat, max_lat, min_lon, max_lon = bbox
+        for i in range(11):
+            for j in range(11):
+                lat = min_lat + (max_lat - min_lat) * i / 10
+                lon = min_lon + (max_lon - min_lon) * j / 10
+                self.assertTrue(any(encode_geohash(lat, lon).startswith(p) for p in prefixes), (lat, lon))
+
+    def test_box_holds_every_point_on_the_radius(self):
+        for latitude in (0.0, 9.93, 60.0):
+            min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, 76.0, 50)
+            for bearing in range(0, 360, 5):
+                lat, lon = destination(latitude, 76.0, bearing, 49.995)
+                self.assertTrue(min_lat <= lat <= max_lat and min_lon <= lon <= max_lon, (latitude, bearing))
+
+    def test_radius_filter_keeps_workers_at_the_edge(self):
+        origin = (60.0, 10.0)
+        inside = []
+        for n, bearing in enumerate((0, 90, 135, 270)):
+            lat, lon = destination(*origin, bearing, 29.99)
+            self.assertLess(float(haversine_km(*origin, [lat], [lon])[0]), 30)
+            inside.append(Employee.objects.create(
+                first_name=f'Edge{n}', last_name='Worker', email=f'edge{n}@example.com', phone=f'800000010{n}',
+                latitude=lat, longitude=lon,
+            ))
+        far_lat, far_lon = destination(*origin, 90, 31)
+        Employee.objects.create(first_name='Far', last_name='Worker', email='far@example.com', phone='8000000200',
+                                latitude=far_lat, longitude=far_lon)
+
+        found = set(Employee.objects.filter(radius_filter(*origin, 30)).values_list('pk', flat=True))
+        self.assertTrue({e.pk for e in inside} <= found)
@@ -0,0 +1,68 @@
+# message_system/management/commands/backfill_chat_previews.py
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from message_system.models import ChatRoom, Message
+
+
+class Command(BaseCommand):
+    help = "Recompute ChatRoom.message_count and last_message/last_message_preview/last_sender_type from the live messages"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def write_batch(self, rooms):
+        """Point each room at its latest message and count, writing back only the rooms that changed"""
+        latest = Message.objects.only('message_id', 'content', 'sender_type').in_bulk(
+            [room.latest_id for room in rooms if room.latest_id]
+        )
+        changed = []
+        for room in rooms:
+            before = (room.message_count, room.last_message_id, room.last_message_preview, room.last_sender_type)
+            room.message_count = room.live_count
+            message = latest.get(room.latest_id)
+            if message:
+                room.record_message(message)
+            else:
+                room.last_message, room.last_message_preview, room.last_sender_type = None, '', None
+            if (room.message_count, room.last_message_id, room.last_message_preview, room.last_sender_type) != before:
+                changed.append(room)
+        # bulk_update skips save(), so last_message_time (auto_now) keeps its value
+        ChatRoom.objects.bulk_update(changed, ['message_count', 'last_message', 'last_message_preview', 'last_sender_type'])
+        return len(changed)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        start = time.perf_counter()
+
+        latest_id = Message.objects.filter(
+            room=OuterRef('pk'), is_deleted=False
+        ).order_by('-message_id').values('message_id')[:1]
+        live_count = Message.objects.filter(
+            room=OuterRef('pk'), is_deleted=False
+        ).order_by().values('room').annotate(n=Count('pk')).values('n')
+        rooms = ChatRoom.objects.annotate(
+            latest_id=Subquery(latest_id),
+            live_count=Coalesce(Subquery(live_count), 0),
+        ).only(
+            'room_id', 'message_count', 'last_message', 'last_message_preview', 'last_sender_type'
+        ).order_by('pk')
+
+        updated = total = 0
+        batch = []
+        for room in rooms.iterator(chunk_size=batch_size):
+            batch.append(room)
+            if len(batch) >= batch_size:
+                updated += self.write_batch(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            updated += self.write_batch(batch)
+            total += len(batch)
+
+        self.stdout.write(f"Updated {updated} of {total} chat rooms")
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.perf_counter() - start:.2f}s"))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0010_hot_query_indexes'),
+        ('employer', '0006_hot_query_indexes'),
+        ('message_system', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatnotification',
+            index=models.Index(fields=['user_employer', 'is_read', 'created_at'], name='chat_notif_er_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatnotification',
+            index=models.Index(fields=['user_employee', 'is_read', 'created_at'], name='chat_notif_emp_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatroom',
+            index=models.Index(fields=['employer', 'last_message_time'], name='room_er_last_msg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatroom',
+            index=models.Index(fields=['employee', 'last_message_time'], name='room_emp_last_msg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['room', 'is_deleted', 'message_id'], name='msg_room_live_idx'),
+        ),
+    ]
@@ -36,6 +36,12 @@ class ChatRoom(models.Model):
     unread_employee = models.IntegerField(default=0)
     unread_employer = models.IntegerField(default=0)
     
+    # Latest live message, kept up to date by send/edit/delete so the inbox needs no message query
+    last_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_message_preview = models.CharField(max_length=100, blank=True, default='')
+    last_sender_type = models.CharField(max_length=10, choices=[('employer', 'Employer'), ('employee', 'Employee')],
+                                        null=True, blank=True)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -44,6 +50,11 @@ class ChatRoom(models.Model):
         db_table = 'chat_room_table'
         unique_together = ['employer', 'employee', 'job']
         ordering = ['-last_message_time']
+        indexes = [
+            # Inbox lists: employer=... / employee=..., most recent conversation first
+            models.Index(fields=['employer', 'last_message_time'], name='room_er_last_msg_idx'),
+            models.Index(fields=['employee', 'last_message_time'], name='room_emp_last_msg_idx'),
+        ]
     
     def __str__(self):
         if self.job:
@@ -71,13 +82,35 @@ class ChatRoom(models.Model):
         from django.utils.timesince import timesince
         return f"{timesince(self.last_message_time)} ago"
     
+    def record_message(self, message):
+        """Make `message` the room's last message (the caller saves the room)"""
+        self.last_message = message
+        self.last_message_preview = message.content[:100]
+        self.last_sender_type = message.sender_type
+    
+    def refresh_last_message(self):
+        """Recompute the last message after an edit/delete/clear, without touching last_message_time"""
+        last = self.messages.filter(is_deleted=False).order_by('-message_id').first()
+        if last:
+            self.record_message(last)
+        else:
+            self.last_message = None
+            self.last_message_preview = ''
+            self.last_sender_type = None
+        self.save(update_fields=['last_message', 'last_message_preview', 'last_sender_type'])
+    
     def mark_as_read(self, user_type):
         """Mark messages as read for a specific user type"""
         if user_type == 'employer':
             self.unread_employer = 0
+            field = 'unread_employer'
         elif user_type == 'employee':
             self.unread_employee = 0
-        self.save()
+            field = 'unread_employee'
+        else:
+            return
+        # Only the counter: a full save from a stale instance would undo a concurrent send
+        self.save(update_fields=[field, 'updated_at'])
 
 
 class Message(models.Model):
@@ -129,6 +162,10 @@ class Message(models.Model):
     class Meta:
         db_table = 'message_table'
         ordering = ['created_at']
+        indexes = [
+            # Chat history and polling: room=..., is_deleted=False, message_id > last seen
+            models.Index(fields=['room', 'is_deleted', 'message_id'], name='msg_room_live_idx'),
+        ]
     
     def __str__(self):
         return f"Message #{self.message_id} in Room #{self.room.room_id}"
@@ -208,6 +245,11 @@ class ChatNotification(models.Model):
     class Meta:
         db_table = 'chat_notification_table'
         ordering = ['-created_at']
+        indexes = [
+            # Unread chat notifications per user
+            models.Index(fields=['user_employer', 'is_read', 'created_at'], name='chat_notif_er_unread_idx'),
+            models.Index(fields=['user_employee', 'is_read', 'created_at'], name='chat_notif_emp_unread_idx'),
+        ]
     
     def __str__(self):
         return f"Notification for {self.user_type}: {self.title}"
\ No newline at end of file
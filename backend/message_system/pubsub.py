@@ -0,0 +1,232 @@
+# message_system/pubsub.py
+# Fan-out of chat events to the open chat tabs. send_message publishes each new message
+# to its room once the transaction commits; every Server-Sent Events stream subscribed to
+# that room (views.message_stream) receives it, and rooms with no open tab cost nothing.
+#
+# The broker is chosen by settings.CHAT_BROKER:
+#   'memory'  in-process queues: tests and single-process servers
+#   'redis'   Redis PUBLISH/SUBSCRIBE on 'chat:room:<id>': several processes or nodes
+#   or the dotted path of a Broker subclass.
+# The in-process broker only reaches streams in the publishing process, so message_stream
+# refuses to stream with it unless CHAT_BROKER_SHARED says there is a single process.
+
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+HEARTBEAT_SECONDS = 15  # keeps proxies from closing idle streams
+
+
+class Broker:
+    """publish() is called from sync views; subscribe() is used by async stream views"""
+
+    shared = True  # whether every server process receives what any process publishes
+
+    def publish(self, room_id, event):
+        raise NotImplementedError
+
+    def subscribe(self, room_id):
+        """A Subscription to use as `async with broker.subscribe(room_id) as subscription`"""
+        raise NotImplementedError
+
+
+class Subscription:
+    """
+    One stream's interest in a room. A plain class rather than an @asynccontextmanager
+    generator: an abandoned stream is finalized by the event loop, which must not close
+    the subscription's generator separately and leave the stream holding a closed one.
+    """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def next_event(self, timeout):
+        """The room's next event, or None once `timeout` seconds pass without one"""
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class InProcessBroker(Broker):
+    shared = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)  # room_id -> {InProcessSubscription}
+
+    def publish(self, room_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(room_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.queue.put_nowait, event)
+            except RuntimeError:
+                pass  # subscriber's loop already closed; it unsubscribes on its way out
+
+    def subscriber_count(self, room_id):
+        with self._lock:
+            return len(self._subscribers.get(room_id, ()))
+
+    def subscribe(self, room_id):
+        return InProcessSubscription(self, room_id)
+
+    def _add(self, subscription):
+        with self._lock:
+            self._subscribers[subscription.room_id].add(subscription)
+
+    def _discard(self, subscription):
+        with self._lock:
+            room = self._subscribers.get(subscription.room_id)
+            if room is not None:
+                room.discard(subscription)
+                if not room:
+                    del self._subscribers[subscription.room_id]
+
+
+class InProcessSubscription(Subscription):
+    def __init__(self, broker, room_id):
+        self.broker = broker
+        self.room_id = room_id
+
+    async def __aenter__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.broker._add(self)
+        return self
+
+    async def next_event(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        self.broker._discard(self)
+
+
+class RedisBroker(Broker):
+    def __init__(self, url=None):
+        import redis  # optional dependency, only needed with CHAT_BROKER = 'redis'
+
+        self.url = url or settings.REDIS_URL
+        self._client = redis.Redis.from_url(self.url)
+
+    @staticmethod
+    def channel(room_id):
+        return f'chat:room:{room_id}'
+
+    def publish(self, room_id, event):
+        self._client.publish(self.channel(room_id), json.dumps(event))
+
+    def subscribe(self, room_id):
+        return RedisSubscription(self.url, self.channel(room_id))
+
+
+class RedisSubscription(Subscription):
+    def __init__(self, url, channel):
+        self.url = url
+        self.channel = channel
+
+    async def __aenter__(self):
+        import redis.asyncio
+
+        self.client = redis.asyncio.Redis.from_url(self.url)
+        self.pubsub = self.client.pubsub()
+        await self.pubsub.subscribe(self.channel)
+        return self
+
+    async def next_event(self, timeout):
+        # get_message polls with its own timeout, so a read is never cancelled half way
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=min(remaining, 1.0))
+            if message:
+                return json.loads(message['data'])
+
+    async def close(self):
+        await self.pubsub.unsubscribe()
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+
+BROKERS = {
+    'memory': InProcessBroker,
+    'redis': RedisBroker,
+}
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                name = getattr(settings, 'CHAT_BROKER', 'memory')
+                _broker = (BROKERS.get(name) or import_string(name))()
+    return _broker
+
+
+def broker_shared():
+    """
+    Whether a stream sees messages sent through every server process. With the in-process
+    broker a message sent by another worker never reaches this one's streams; the chat page
+    then polls instead. CHAT_BROKER_SHARED overrides the guess, e.g. for a single-process
+    ASGI server on the memory broker.
+    """
+    shared = getattr(settings, 'CHAT_BROKER_SHARED', None)
+    if shared is not None:
+        return shared
+    return get_broker().shared
+
+
+def publish_on_commit(room_id, event):
+    """Publish once the surrounding transaction commits; a broker outage never fails the request"""
+    def publish():
+        try:
+            get_broker().publish(room_id, event)
+        except Exception as e:
+            print(f"Chat publish failed for room {room_id}: {e}")
+    transaction.on_commit(publish)
+
+
+def sse_event(payload, event='message'):
+    return f"id: {payload['id']}\nevent: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+async def room_event_stream(room_id, last_id, backlog, heartbeat=HEARTBEAT_SECONDS):
+    """
+    Server-Sent Events for a room: messages after last_id from `backlog` (an async callable
+    (room_id, after_id) -> [payload]), then every published message, with heartbeats.
+    Subscribing before reading the backlog means nothing sent in between is lost.
+    """
+    async with get_broker().subscribe(room_id) as subscription:
+        yield "retry: 3000\n\n"
+        for payload in await backlog(room_id, last_id):
+            last_id = max(last_id, payload['id'])
+            yield sse_event(payload)
+
+        while True:
+            event = await subscription.next_event(heartbeat)
+            if event is None:
+                yield ": ping\n\n"
+                continue
+            payload = event.get('message')
+            if event.get('type') != 'message' or not payload or payload['id'] <= last_id:
+                continue
+            last_id = payload['id']
+            yield sse_event(payload)
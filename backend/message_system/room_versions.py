@@ -0,0 +1,74 @@
+# message_system/room_versions.py
+# Per-room version counters in the cache (Redis in prod), used by get_new_messages for long
+# polling and ETags when that cache is shared by every worker (see room_versions_shared).
+# Every change to a room's messages bumps its version once the transaction commits; a poller
+# holds its request until the version moves instead of re-running the same message_id__gt
+# query every few seconds.
+
+import asyncio
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from home.cache_versions import aget_version, bump_version, get_version
+
+POLL_INTERVAL = 0.5  # seconds between cache reads while a long poll waits
+
+
+def room_versions_shared():
+    """
+    Whether every worker sees the same versions. A per-process cache (locmem, dummy) never sees
+    a bump made by another worker, so pollers there must not trust it. CHAT_ROOM_VERSIONS_SHARED
+    overrides the guess, e.g. for a single-process server on locmem.
+    """
+    shared = getattr(settings, 'CHAT_ROOM_VERSIONS_SHARED', None)
+    if shared is not None:
+        return shared
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def _version_key(room_id):
+    return f'chat:room:{room_id}:version'
+
+
+def room_version(room_id):
+    return get_version(_version_key(room_id))
+
+
+async def aroom_version(room_id):
+    return await aget_version(_version_key(room_id))
+
+
+def bump_room_version(room_id):
+    bump_version(_version_key(room_id))
+
+
+def bump_room_version_on_commit(room_id):
+    """Bump once the surrounding transaction commits; a cache outage never fails the request"""
+    def bump():
+        try:
+            bump_room_version(room_id)
+        except Exception as e:
+            print(f"Chat room version bump failed for room {room_id}: {e}")
+    transaction.on_commit(bump)
+
+
+async def wait_for_room_change(room_id, version, timeout):
+    """The room's new version as soon as it differs from `version`, or None after `timeout` seconds"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return None
+        await asyncio.sleep(min(POLL_INTERVAL, remaining))
+        current = await cache.aget(_version_key(room_id))
+        if current != version:
+            return current if current is not None else await aroom_version(room_id)
+
+
+def room_etag(room_id, version, last_message_id):
+    return f'"room{room_id}-v{version}-m{last_message_id}"'
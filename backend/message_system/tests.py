@@ -1,3 +1,365 @@
-from django.test import TestCase
+import asyncio
+import json
+import time
+from io import StringIO
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from employee.models import Employee
+from employer.models import Employer
+from .models import ChatRoom, Message
+from .views import CHAT_HISTORY_PAGE_SIZE
+from .pubsub import get_broker
+
+
+class ChatTestCase(TestCase):
+    def setUp(self):
+        self.employer = Employer.objects.create(
+            first_name='Asha', last_name='Menon', email='asha@example.com', phone='9000000001', status='Active',
+        )
+        self.employee = Employee.objects.create(
+            first_name='Ravi', last_name='Kumar', email='ravi@example.com', phone='8000000001',
+            job_title='Plumber', status='Active',
+        )
+        self.room = ChatRoom.objects.create(employer=self.employer, employee=self.employee)
+
+    def login(self, client, **user):
+        """Session login for client, as the room's employer unless employer_id/employee_id is given"""
+        session = self.client.session
+        session.update(user or {'employer_id': self.employer.employer_id})
+        session.save()
+        if client is not self.client:
+            client.cookies = self.client.cookies
+
+    def add_message(self, content, sender='employee'):
+        return Message.objects.create(
+            room=self.room, sender_type=sender, content=content,
+            sender_employee=self.employee if sender == 'employee' else None,
+            sender_employer=self.employer if sender == 'employer' else None,
+        )
+
+    def send(self, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('send_message'), json.dumps({'room_id': self.room.room_id, 'content': content}),
+                content_type='application/json',
+            )
+        self.assertTrue(response.json()['success'])
+        return response.json()['message_id']
+
+
+def parse_event(chunk):
+    """'id: ..\\nevent: message\\ndata: {..}\\n\\n' -> payload dict (None for comments/retry)"""
+    for line in chunk.decode().splitlines():
+        if line.startswith('data: '):
+            return json.loads(line[len('data: '):])
+    return None
+
+
+@override_settings(CHAT_BROKER_SHARED=True)
+class MessageStreamTests(ChatTestCase):
+    async def next_payload(self, stream):
+        while True:
+            payload = parse_event(await asyncio.wait_for(anext(stream), 5))
+            if payload:
+                return payload
+
+    async def disconnect(self, stream):
+        """What the ASGI handler does when the browser goes away: cancel the pending read"""
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+
+    async def test_stream_sends_backlog_then_published_messages(self):
+        first = await sync_to_async(self.add_message)('Is the leak fixed?')
+        await sync_to_async(self.login)(self.async_client)
+
+        response = await self.async_client.get(reverse('message_stream', args=[self.room.room_id]))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+
+        backlog = await self.next_payload(stream)
+        self.assertEqual((backlog['id'], backlog['sender_name']), (first.message_id, 'Ravi Kumar'))
+        self.assertEqual(get_broker().subscriber_count(self.room.room_id), 1)
+
+        sent_id = await sync_to_async(self.send)('Yes, all done')
+        pushed = await self.next_payload(stream)
+        self.assertEqual((pushed['id'], pushed['content'], pushed['sender_type']), (sent_id, 'Yes, all done', 'employer'))
+
+        await self.disconnect(stream)
+        self.assertEqual(get_broker().subscriber_count(self.room.room_id), 0)
+
+    async def test_stream_resumes_after_last_event_id(self):
+        old = await sync_to_async(self.add_message)('old')
+        new = await sync_to_async(self.add_message)('new')
+        await sync_to_async(self.login)(self.async_client)
+
+        response = await self.async_client.get(
+            reverse('message_stream', args=[self.room.room_id]), headers={'Last-Event-ID': str(old.message_id)},
+        )
+        stream = aiter(response.streaming_content)
+        self.assertEqual((await self.next_payload(stream))['id'], new.message_id)
+        await self.disconnect(stream)
+
+    async def test_stream_requires_room_access(self):
+        other = await sync_to_async(Employer.objects.create)(
+            first_name='Other', last_name='Employer', email='other@example.com', phone='9000000002',
+        )
+        await sync_to_async(self.login)(self.async_client, employer_id=other.employer_id)
+        response = await self.async_client.get(reverse('message_stream', args=[self.room.room_id]))
+        self.assertEqual(response.status_code, 403)
+
+    async def test_unshared_broker_falls_back_to_polling(self):
+        # The default memory broker only reaches streams in its own process
+        await sync_to_async(self.login)(self.async_client)
+        with self.settings(CHAT_BROKER_SHARED=None):
+            response = await self.async_client.get(reverse('message_stream', args=[self.room.room_id]))
+        self.assertEqual(response.status_code, 501)
+        self.assertEqual(get_broker().subscriber_count(self.room.room_id), 0)
+
+    def test_wsgi_request_falls_back_to_polling(self):
+        self.login(self.client)
+        response = self.client.get(reverse('message_stream', args=[self.room.room_id]))
+        self.assertEqual(response.status_code, 501)
+
+    def test_publish_without_subscribers_is_a_no_op(self):
+        self.login(self.client)
+        self.send('Nobody is watching')
+        self.assertEqual(get_broker().subscriber_count(self.room.room_id), 0)
+
+    def test_polling_payload_matches_stream_payload(self):
+        self.login(self.client)
+        message = self.add_message('Polled')
+        response = self.client.get(reverse('get_new_messages', args=[self.room.room_id]), {'last_message_id': 0})
+        payload = response.json()['messages'][0]
+        self.assertEqual(payload['id'], message.message_id)
+        self.assertEqual(payload['sender_id'], self.employee.employee_id)
+        self.assertEqual(payload['timestamp'], message.created_at.isoformat())
+
+
+@override_settings(CHAT_ROOM_VERSIONS_SHARED=True)
+class LongPollTests(ChatTestCase):
+    def poll(self, client=None, **params):
+        headers = params.pop('headers', {})
+        return (client or self.client).get(reverse('get_new_messages', args=[self.room.room_id]), params, headers=headers)
+
+    def test_unchanged_room_answers_not_modified(self):
+        self.login(self.client)
+        message = self.add_message('Hello')
+        first = self.poll(last_message_id=0)
+        self.assertEqual(first.json()['messages'][0]['id'], message.message_id)
+
+        # The ETag already accounts for the message the client has just received
+        again = self.poll(last_message_id=message.message_id, headers={'If-None-Match': first['ETag']})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again['ETag'], first['ETag'])
+
+        sent_id = self.send('Reply')
+        changed = self.poll(last_message_id=message.message_id, headers={'If-None-Match': first['ETag']})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual([m['id'] for m in changed.json()['messages']], [sent_id])
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+
+    def test_edit_and_delete_invalidate_etag(self):
+        self.login(self.client, employee_id=self.employee.employee_id)
+        message = self.add_message('Typo')
+        etag = self.poll(last_message_id=0)['ETag']
+        self.client.post(reverse('edit_message', args=[message.message_id]),
+                         json.dumps({'content': 'Fixed'}), content_type='application/json')
+        response = self.poll(last_message_id=0, headers={'If-None-Match': etag})
+        self.assertEqual(response.json()['messages'][0]['content'], 'Fixed')
+
+        self.client.post(reverse('delete_message', args=[message.message_id]))
+        response = self.poll(last_message_id=0, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.json()['messages'], [])
+
+    async def test_long_poll_returns_when_message_is_sent(self):
+        await sync_to_async(self.login)(self.async_client)
+        started = time.monotonic()
+        poll = asyncio.ensure_future(self.poll(self.async_client, last_message_id=0, wait=10))
+        await asyncio.sleep(0.2)
+        self.assertFalse(poll.done())
+
+        sent_id = await sync_to_async(self.send)('Are you on the way?')
+        response = await asyncio.wait_for(poll, 5)
+        self.assertEqual([m['id'] for m in response.json()['messages']], [sent_id])
+        self.assertLess(time.monotonic() - started, 5)
+
+    @override_settings(CHAT_LONG_POLL_MAX_WAIT_WSGI=0.3)
+    def test_wsgi_long_poll_is_capped(self):
+        self.login(self.client)
+        started = time.monotonic()
+        response = self.poll(last_message_id=0, wait=60)
+        self.assertEqual(response.json()['messages'], [])
+        self.assertLess(time.monotonic() - started, 5)
+
+    @override_settings(CHAT_ROOM_VERSIONS_SHARED=None)
+    def test_per_process_cache_always_queries(self):
+        # locmem: another worker's sends never bump this process's versions
+        self.login(self.client)
+        first = self.poll(last_message_id=0, wait=10)
+        self.assertNotIn('ETag', first)
+        message = self.add_message('Sent through another worker')
+        started = time.monotonic()
+        response = self.poll(last_message_id=0, wait=10, headers={'If-None-Match': '"room1-v1-m0"'})
+        self.assertEqual([m['id'] for m in response.json()['messages']], [message.message_id])
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_requires_room_access(self):
+        other = Employee.objects.create(first_name='Other', last_name='Worker', email='other@example.com', phone='8000000002')
+        self.login(self.client, employee_id=other.employee_id)
+        self.assertEqual(self.poll(last_message_id=0).status_code, 403)
+
+
+class InboxPreviewTests(ChatTestCase):
+    def assert_preview(self, message, preview=None):
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.last_message_id, message.message_id if message else None)
+        self.assertEqual(self.room.last_message_preview, preview if preview is not None else (message.content if message else ''))
+        self.assertEqual(self.room.last_sender_type, message.sender_type if message else None)
+
+    def test_send_edit_delete_keep_preview_current(self):
+        self.login(self.client)
+        first = Message.objects.get(message_id=self.send('First'))
+        second = Message.objects.get(message_id=self.send('Second ' + 'x' * 200))
+        self.assert_preview(second, ('Second ' + 'x' * 200)[:100])
+
+        self.client.post(reverse('edit_message', args=[second.message_id]),
+                         json.dumps({'content': 'Second, edited'}), content_type='application/json')
+        self.assert_preview(second, 'Second, edited')
+
+        # Editing an older message leaves the preview alone
+        self.client.post(reverse('edit_message', args=[first.message_id]),
+                         json.dumps({'content': 'First, edited'}), content_type='application/json')
+        self.assert_preview(second, 'Second, edited')
+
+        self.client.post(reverse('delete_message', args=[second.message_id]))
+        self.assert_preview(first, 'First, edited')
+
+        self.client.get(reverse('clear_chat', args=[self.room.room_id]))
+        self.assert_preview(None)
+
+    def test_dashboard_query_count_does_not_grow_with_rooms(self):
+        self.login(self.client)
+        self.send('Hello Ravi')
+
+        def dashboard_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('message_dashboard'))
+            self.assertEqual(response.status_code, 200)
+            return response, len(queries)
+
+        response, one_room = dashboard_queries()
+        self.assertContains(response, 'Hello Ravi')
+
+        for n in range(3):
+            employee = Employee.objects.create(first_name=f'Worker{n}', last_name='X', email=f'w{n}@example.com', phone=f'800000001{n}')
+            room = ChatRoom.objects.create(employer=self.employer, employee=employee)
+            message = Message.objects.create(room=room, sender_type='employee', sender_employee=employee, content=f'Quote {n}')
+            room.record_message(message)
+            room.save()
+
+        response, four_rooms = dashboard_queries()
+        self.assertContains(response, 'Quote 2')
+        self.assertEqual(four_rooms, one_room)
+
+    def test_backfill_command(self):
+        self.add_message('Older')
+        latest = self.add_message('Latest', sender='employer')
+        deleted = self.add_message('Deleted')
+        deleted.is_deleted = True
+        deleted.save()
+        empty = ChatRoom.objects.create(
+            employer=self.employer,
+            employee=Employee.objects.create(first_name='New', last_name='Worker', email='new@example.com', phone='8000000009'),
+        )
+
+        out = StringIO()
+        call_command('backfill_chat_previews', stdout=out)
+        self.assertIn('Updated 1 of 2 chat rooms', out.getvalue())
+        self.assert_preview(latest)
+        self.assertEqual(self.room.message_count, 2)
+        empty.refresh_from_db()
+        self.assertIsNone(empty.last_message_id)
+
+        out = StringIO()
+        call_command('backfill_chat_previews', stdout=out)
+        self.assertIn('Updated 0 of 2 chat rooms', out.getvalue())
+
+
+class ChatHistoryTests(ChatTestCase):
+    def add_messages(self, n):
+        Message.objects.bulk_create([
+            Message(room=self.room, sender_type='employee', sender_employee=self.employee, content=f'm{i}')
+            for i in range(n)
+        ])
+        return list(self.room.messages.order_by('message_id').values_list('message_id', flat=True))
+
+    def open_room(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('chat_room', args=[self.room.room_id]))
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_room_renders_latest_window_with_constant_queries(self):
+        self.login(self.client)
+        self.add_messages(5)
+        _, few = self.open_room()
+
+        ids = self.add_messages(CHAT_HISTORY_PAGE_SIZE + 5)
+        ChatRoom.objects.filter(pk=self.room.pk).update(message_count=123)
+        response, many = self.open_room()
+
+        shown = [m['id'] for m in response.context['messages'] if not m.get('is_separator')]
+        self.assertEqual(shown, ids[-CHAT_HISTORY_PAGE_SIZE:])
+        self.assertTrue(response.context['has_older_messages'])
+        self.assertEqual(response.context['oldest_message_id'], shown[0])
+        self.assertEqual(response.context['total_messages'], 123)
+        self.assertEqual(many, few)
+
+    def test_scrollback_pages_by_message_id(self):
+        self.login(self.client)
+        ids = self.add_messages(CHAT_HISTORY_PAGE_SIZE + 5)
+        url = reverse('chat_history', args=[self.room.room_id])
+
+        data = self.client.get(url, {'before': ids[-CHAT_HISTORY_PAGE_SIZE]}).json()
+        self.assertEqual([m['id'] for m in data['messages']], ids[:5])
+        self.assertEqual((data['has_more'], data['before']), (False, ids[0]))
+        self.assertEqual(data['messages'][0]['date_label'], 'Today')
+
+        data = self.client.get(url, {'before': ids[-1]}).json()
+        self.assertEqual(len(data['messages']), CHAT_HISTORY_PAGE_SIZE)
+        self.assertTrue(data['has_more'])
+
+    def test_scrollback_requires_room_access(self):
+        other = Employer.objects.create(first_name='Other', last_name='Employer', email='other@example.com', phone='9000000002')
+        self.login(self.client, employer_id=other.employer_id)
+        response = self.client.get(reverse('chat_history', args=[self.room.room_id]))
+        self.assertEqual(response.status_code, 403)
+
+    def test_delete_and_clear_keep_message_count(self):
+        self.login(self.client)
+        first = self.send('one')
+        self.send('two')
+        for _ in range(2):  # deleting again is a no-op
+            self.client.post(reverse('delete_message', args=[first]))
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.message_count, 1)
+        self.client.get(reverse('clear_chat', args=[self.room.room_id]))
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.message_count, 0)
+
+        # Starting the chat again counts only live messages, not the cleared history
+        self.client.post(reverse('start_chat'), {
+            'user_id': self.employee.employee_id, 'initial_message': 'Back again', 'subject': 'Follow-up',
+        })
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.message_count, 1)
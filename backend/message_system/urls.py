@@ -32,6 +32,10 @@ urlpatterns = [
     # AJAX endpoints
     path('send/', views.send_message, name='send_message'),
     path('get-new/<int:room_id>/', views.get_new_messages, name='get_new_messages'),
+    path('history/<int:room_id>/', views.chat_history, name='chat_history'),
+    
+    # Server-Sent Events push channel (ASGI only; the page falls back to get-new polling)
+    path('stream/<int:room_id>/', views.message_stream, name='message_stream'),
 
 
 ]
@@ -1,14 +1,24 @@
 # message_system/views.py
 
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
-from django.db.models import Q
+from django.conf import settings
+from django.http import HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.db import transaction
+from django.db.models import F, Q
 from django.contrib import messages
+from django.core.handlers.asgi import ASGIRequest
 from django.utils import timezone
+from django.utils.http import parse_etags
 from datetime import timedelta
+from asgiref.sync import sync_to_async
 import json
+import time
 
 from .models import ChatRoom, Message, ChatNotification
+from .pubsub import broker_shared, publish_on_commit, room_event_stream
+from .room_versions import (
+    aroom_version, bump_room_version_on_commit, room_etag, room_versions_shared, wait_for_room_change,
+)
 from employer.models import Employer
 from employee.models import Employee, JobRequest
 
@@ -24,6 +34,31 @@ def check_user_session(view_func):
     return wrapper
 
 
+def inbox_rooms(rooms):
+    """Inbox rooms with both participants and the last message's time in one query (no message bodies)"""
+    return rooms.select_related(
+        'employer', 'employee', 'job', 'last_message'
+    ).defer(
+        'last_message__content'
+    ).order_by('-last_message_time')
+
+
+def inbox_row(room):
+    last_message = room.last_message
+    return {
+        'room': room,
+        'room_id': room.room_id,  # Explicitly include room_id
+        'last_message_content': room.last_message_preview[:50] if last_message else "No messages yet",
+        'last_activity': last_message.created_at if last_message else room.created_at,
+        'last_sender_type': room.last_sender_type,
+        'employee': room.employee,
+        'employer': room.employer,
+        'subject': room.subject,
+        'unread_employer': room.unread_employer,
+        'unread_employee': room.unread_employee,
+    }
+
+
 @check_user_session
 def message_dashboard(request):
     """Main messaging dashboard view"""
@@ -44,29 +79,8 @@ def message_dashboard(request):
             }
             
             # Get chat rooms for employer
-            chat_rooms = ChatRoom.objects.filter(
-                employer=employer
-            ).select_related(
-                'employee', 'job'
-            ).prefetch_related(
-                'messages'
-            ).order_by('-last_message_time')
-            
-            # Process chat rooms for template
-            for room in chat_rooms:
-                last_message = room.messages.order_by('-created_at').first()
-                room_data = {
-                    'room': room,
-                    'room_id': room.room_id,  # Explicitly include room_id
-                    'last_message_content': last_message.content[:50] if last_message else "No messages yet",
-                    'last_activity': last_message.created_at if last_message else room.created_at,
-                    'employee': room.employee,
-                    'employer': room.employer,
-                    'subject': room.subject,
-                    'unread_employer': room.unread_employer,
-                    'unread_employee': room.unread_employee,
-                }
-                chat_rooms_list.append(room_data)
+            chat_rooms = inbox_rooms(ChatRoom.objects.filter(employer=employer))
+            chat_rooms_list = [inbox_row(room) for room in chat_rooms]
                     
         # Check if employee is logged in
         employee_id = request.session.get('employee_id')
@@ -80,29 +94,8 @@ def message_dashboard(request):
             }
             
             # Get chat rooms for employee
-            chat_rooms = ChatRoom.objects.filter(
-                employee=employee
-            ).select_related(
-                'employer', 'job'
-            ).prefetch_related(
-                'messages'
-            ).order_by('-last_message_time')
-            
-            # Process chat rooms for template
-            for room in chat_rooms:
-                last_message = room.messages.order_by('-created_at').first()
-                room_data = {
-                    'room': room,
-                    'room_id': room.room_id,  # Explicitly include room_id
-                    'last_message_content': last_message.content[:50] if last_message else "No messages yet",
-                    'last_activity': last_message.created_at if last_message else room.created_at,
-                    'employee': room.employee,
-                    'employer': room.employer,
-                    'subject': room.subject,
-                    'unread_employer': room.unread_employer,
-                    'unread_employee': room.unread_employee,
-                }
-                chat_rooms_list.append(room_data)
+            chat_rooms = inbox_rooms(ChatRoom.objects.filter(employee=employee))
+            chat_rooms_list = [inbox_row(room) for room in chat_rooms]
         
         if not user_info:
             messages.error(request, "Please login to access messages")
@@ -121,12 +114,37 @@ def message_dashboard(request):
         return redirect('index')
 
 
+CHAT_HISTORY_PAGE_SIZE = 50  # messages rendered with the room, and per scrollback request
+
+
+def history_page(room_id, before_id=None, page_size=CHAT_HISTORY_PAGE_SIZE):
+    """A room's latest live messages older than before_id, oldest first, and whether even older ones exist"""
+    history = Message.objects.filter(
+        room_id=room_id,
+        is_deleted=False
+    ).select_related('sender_employer', 'sender_employee').order_by('-message_id')
+    if before_id:
+        history = history.filter(message_id__lt=before_id)
+    page = list(history[:page_size + 1])
+    return page[:page_size][::-1], len(page) > page_size
+
+
+def date_label(day):
+    """Date separator text: Today, Yesterday or the full date"""
+    today = timezone.now().date()
+    if day == today:
+        return "Today"
+    if day == today - timedelta(days=1):
+        return "Yesterday"
+    return day.strftime("%B %d, %Y")
+
+
 @check_user_session
 def chat_room(request, room_id):
     """Individual chat room view"""
     try:
         # Get chat room
-        chat_room_obj = get_object_or_404(ChatRoom, room_id=room_id)
+        chat_room_obj = get_object_or_404(ChatRoom.objects.select_related('employer', 'employee', 'job'), room_id=room_id)
         
         # Check if user has access to this chat
         user_has_access = False
@@ -184,51 +202,39 @@ def chat_room(request, room_id):
             messages.error(request, "You don't have permission to access this chat")
             return redirect('message_dashboard')
         
-        # Get messages with date grouping
-        all_messages = chat_room_obj.messages.filter(is_deleted=False).order_by('created_at')
+        # Latest messages only; older ones are fetched by chat_history as the user scrolls up
+        window, has_older = history_page(chat_room_obj.room_id)
         
         # Format messages for template
         messages_list = []
         current_date = None
         
-        for msg in all_messages:
+        for msg in window:
             msg_date = msg.created_at.date()
             
             # Add date separator if date changed
             if msg_date != current_date:
                 current_date = msg_date
-                if msg_date == timezone.now().date():
-                    date_str = "Today"
-                elif msg_date == timezone.now().date() - timedelta(days=1):
-                    date_str = "Yesterday"
-                else:
-                    date_str = msg_date.strftime("%B %d, %Y")
-                
                 messages_list.append({
-                    'date_separator': date_str,
+                    'date_separator': date_label(msg_date),
+                    'date': msg_date.isoformat(),
                     'is_separator': True
                 })
             
             # Determine if message is sent by current user
-            is_sent = False
-            sender_name = ""
-            
-            if msg.sender_type == 'employer' and msg.sender_employer:
-                sender_name = f"{msg.sender_employer.first_name} {msg.sender_employer.last_name}"
-                if employer_id and msg.sender_employer.employer_id == employer_id:
-                    is_sent = True
-            elif msg.sender_type == 'employee' and msg.sender_employee:
-                sender_name = f"{msg.sender_employee.first_name} {msg.sender_employee.last_name}"
-                if employee_id and msg.sender_employee.employee_id == employee_id:
-                    is_sent = True
+            if msg.sender_type == 'employer':
+                is_sent = bool(employer_id) and msg.sender_employer_id == employer_id
+            else:
+                is_sent = bool(employee_id) and msg.sender_employee_id == employee_id
             
             # Add message
+            payload = message_payload(msg)
             messages_list.append({
                 'id': msg.message_id,
                 'content': msg.content,
-                'sender_id': msg.sender_employer.employer_id if msg.sender_type == 'employer' else msg.sender_employee.employee_id,
+                'sender_id': payload['sender_id'],
                 'sender_type': msg.sender_type,
-                'sender_name': sender_name,
+                'sender_name': payload['sender_name'],
                 'timestamp': msg.created_at,
                 'is_edited': msg.is_edited,
                 'is_deleted': msg.is_deleted,
@@ -264,7 +270,9 @@ def chat_room(request, room_id):
             'other_user': other_user_info,
             'user_info': user_info,
             'job': job,
-            'total_messages': all_messages.count(),
+            'total_messages': chat_room_obj.message_count,
+            'has_older_messages': has_older,
+            'oldest_message_id': window[0].message_id if window else None,
             'chat_duration': chat_duration
         }
         
@@ -393,7 +401,7 @@ def start_chat(request):
                         )
                     
                     # Create initial message
-                    Message.objects.create(
+                    message = Message.objects.create(
                         room=chat_room,
                         sender_type='employer',
                         sender_employer=employer,
@@ -402,7 +410,8 @@ def start_chat(request):
                     )
                     
                     # Update chat room stats
-                    chat_room.message_count = chat_room.messages.count()
+                    chat_room.record_message(message)
+                    chat_room.message_count = chat_room.messages.filter(is_deleted=False).count()
                     chat_room.unread_employee += 1
                     chat_room.last_message_time = timezone.now()
                     chat_room.save()
@@ -437,7 +446,7 @@ def start_chat(request):
                         )
                     
                     # Create initial message
-                    Message.objects.create(
+                    message = Message.objects.create(
                         room=chat_room,
                         sender_type='employee',
                         sender_employee=employee,
@@ -446,7 +455,8 @@ def start_chat(request):
                     )
                     
                     # Update chat room stats
-                    chat_room.message_count = chat_room.messages.count()
+                    chat_room.record_message(message)
+                    chat_room.message_count = chat_room.messages.filter(is_deleted=False).count()
                     chat_room.unread_employer += 1
                     chat_room.last_message_time = timezone.now()
                     chat_room.save()
@@ -471,6 +481,32 @@ def start_chat(request):
 
 
 # Message actions
+def soft_delete_message(message):
+    with transaction.atomic():
+        chat_room = ChatRoom.objects.select_for_update().get(room_id=message.room_id)
+        # Re-read under the room lock: deleting twice must not drop the count twice
+        message.refresh_from_db(fields=['is_deleted'])
+        if message.is_deleted:
+            return
+        message.is_deleted = True
+        message.save()
+        ChatRoom.objects.filter(room_id=chat_room.room_id, message_count__gt=0).update(message_count=F('message_count') - 1)
+        if chat_room.last_message_id == message.message_id:
+            chat_room.refresh_last_message()
+        bump_room_version_on_commit(message.room_id)
+
+
+def update_message_content(message, content):
+    with transaction.atomic():
+        chat_room = ChatRoom.objects.select_for_update().get(room_id=message.room_id)
+        message.content = content
+        message.is_edited = True
+        message.save()
+        if chat_room.last_message_id == message.message_id:
+            chat_room.refresh_last_message()
+        bump_room_version_on_commit(message.room_id)
+
+
 @check_user_session
 def delete_message(request, message_id):
     """Delete a message (soft delete)"""
@@ -484,15 +520,13 @@ def delete_message(request, message_id):
         if employer_id:
             employer = get_object_or_404(Employer, employer_id=employer_id)
             if message.sender_type == 'employer' and message.sender_employer == employer:
-                message.is_deleted = True
-                message.save()
+                soft_delete_message(message)
                 return JsonResponse({'success': True, 'message': 'Message deleted'})
                 
         elif employee_id:
             employee = get_object_or_404(Employee, employee_id=employee_id)
             if message.sender_type == 'employee' and message.sender_employee == employee:
-                message.is_deleted = True
-                message.save()
+                soft_delete_message(message)
                 return JsonResponse({'success': True, 'message': 'Message deleted'})
         
         return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
@@ -521,17 +555,13 @@ def edit_message(request, message_id):
             if employer_id:
                 employer = get_object_or_404(Employer, employer_id=employer_id)
                 if message.sender_type == 'employer' and message.sender_employer == employer:
-                    message.content = new_content
-                    message.is_edited = True
-                    message.save()
+                    update_message_content(message, new_content)
                     return JsonResponse({'success': True, 'message': 'Message updated'})
                     
             elif employee_id:
                 employee = get_object_or_404(Employee, employee_id=employee_id)
                 if message.sender_type == 'employee' and message.sender_employee == employee:
-                    message.content = new_content
-                    message.is_edited = True
-                    message.save()
+                    update_message_content(message, new_content)
                     return JsonResponse({'success': True, 'message': 'Message updated'})
             
             return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
@@ -616,14 +646,22 @@ def clear_chat(request, room_id):
             employer = get_object_or_404(Employer, employer_id=employer_id)
             if chat_room.employer == employer:
                 # Soft delete all messages
-                chat_room.messages.update(is_deleted=True)
+                with transaction.atomic():
+                    chat_room.messages.update(is_deleted=True)
+                    ChatRoom.objects.filter(room_id=chat_room.room_id).update(message_count=0)
+                    chat_room.refresh_last_message()
+                bump_room_version_on_commit(chat_room.room_id)
                 messages.success(request, "Chat cleared successfully")
                 
         elif employee_id:
             employee = get_object_or_404(Employee, employee_id=employee_id)
             if chat_room.employee == employee:
                 # Soft delete all messages
-                chat_room.messages.update(is_deleted=True)
+                with transaction.atomic():
+                    chat_room.messages.update(is_deleted=True)
+                    ChatRoom.objects.filter(room_id=chat_room.room_id).update(message_count=0)
+                    chat_room.refresh_last_message()
+                bump_room_version_on_commit(chat_room.room_id)
                 messages.success(request, "Chat cleared successfully")
         else:
             messages.error(request, "Permission denied")
@@ -656,49 +694,56 @@ def send_message(request):
             if not all([room_id, content]):
                 return JsonResponse({'success': False, 'error': 'Missing required fields'})
             
-            chat_room = get_object_or_404(ChatRoom, room_id=room_id)
+            # The room row is locked until commit, so concurrent sends can't lose counts or the preview
+            with transaction.atomic():
+                chat_room = get_object_or_404(ChatRoom.objects.select_for_update(), room_id=room_id)
             
-            # Create message
-            if employer_id:
-                employer = get_object_or_404(Employer, employer_id=employer_id)
-                # Check if employer has access to this chat room
-                if chat_room.employer != employer:
-                    return JsonResponse({'success': False, 'error': 'Access denied'})
+                # Create message
+                if employer_id:
+                    employer = get_object_or_404(Employer, employer_id=employer_id)
+                    # Check if employer has access to this chat room
+                    if chat_room.employer != employer:
+                        return JsonResponse({'success': False, 'error': 'Access denied'})
                 
-                message = Message.objects.create(
-                    room=chat_room,
-                    sender_type='employer',
-                    sender_employer=employer,
-                    content=content,
-                    message_type=message_type,
-                    status='sent'
-                )
-                # Update unread count for employee
-                chat_room.unread_employee += 1
+                    message = Message.objects.create(
+                        room=chat_room,
+                        sender_type='employer',
+                        sender_employer=employer,
+                        content=content,
+                        message_type=message_type,
+                        status='sent'
+                    )
+                    # Update unread count for employee
+                    chat_room.unread_employee += 1
                 
-            elif employee_id:
-                employee = get_object_or_404(Employee, employee_id=employee_id)
-                # Check if employee has access to this chat room
-                if chat_room.employee != employee:
-                    return JsonResponse({'success': False, 'error': 'Access denied'})
+                elif employee_id:
+                    employee = get_object_or_404(Employee, employee_id=employee_id)
+                    # Check if employee has access to this chat room
+                    if chat_room.employee != employee:
+                        return JsonResponse({'success': False, 'error': 'Access denied'})
                 
-                message = Message.objects.create(
-                    room=chat_room,
-                    sender_type='employee',
-                    sender_employee=employee,
-                    content=content,
-                    message_type=message_type,
-                    status='sent'
-                )
-                # Update unread count for employer
-                chat_room.unread_employer += 1
-            else:
-                return JsonResponse({'success': False, 'error': 'Invalid user type'})
+                    message = Message.objects.create(
+                        room=chat_room,
+                        sender_type='employee',
+                        sender_employee=employee,
+                        content=content,
+                        message_type=message_type,
+                        status='sent'
+                    )
+                    # Update unread count for employer
+                    chat_room.unread_employer += 1
+                else:
+                    return JsonResponse({'success': False, 'error': 'Invalid user type'})
+            
+                # Update chat room stats
+                chat_room.record_message(message)
+                chat_room.message_count += 1
+                chat_room.last_message_time = timezone.now()
+                chat_room.save()
             
-            # Update chat room stats
-            chat_room.message_count += 1
-            chat_room.last_message_time = timezone.now()
-            chat_room.save()
+                # Push to the room's open streams (message_stream) and wake its long polls (get_new_messages)
+                publish_on_commit(chat_room.room_id, {'type': 'message', 'message': message_payload(message)})
+                bump_room_version_on_commit(chat_room.room_id)
             
             return JsonResponse({
                 'success': True,
@@ -716,64 +761,171 @@ def send_message(request):
     return JsonResponse({'success': False, 'error': 'Invalid request method'}, status=405)
 
 
-# AJAX view for fetching new messages
+def message_payload(msg):
+    """JSON shape of a message for polling, streaming and send responses"""
+    sender = msg.sender_employer if msg.sender_type == 'employer' else msg.sender_employee
+    return {
+        'id': msg.message_id,
+        'content': msg.content,
+        'sender_type': msg.sender_type,
+        'sender_id': msg.sender_employer_id if msg.sender_type == 'employer' else msg.sender_employee_id,
+        'sender_name': f"{sender.first_name} {sender.last_name}" if sender else "",
+        'timestamp': msg.created_at.isoformat(),
+        'formatted_time': msg.formatted_time,
+        'is_edited': msg.is_edited
+    }
+
+
+def new_messages_payload(room_id, last_message_id):
+    """Payloads of a room's messages after last_message_id, senders loaded in the same query"""
+    new_messages = Message.objects.filter(
+        room_id=room_id,
+        message_id__gt=last_message_id,
+        is_deleted=False
+    ).select_related('sender_employer', 'sender_employee').order_by('created_at')
+    return [message_payload(msg) for msg in new_messages]
+
+
+async def room_access_denied(request, room_id):
+    """Error response unless the session's employer/employee belongs to the room (async views)"""
+    employer_id = await request.session.aget('employer_id')
+    employee_id = await request.session.aget('employee_id')
+    if employer_id:
+        access = Q(employer_id=employer_id)
+    elif employee_id:
+        access = Q(employee_id=employee_id)
+    else:
+        return JsonResponse({'success': False, 'error': 'Please login'}, status=403)
+    if not await ChatRoom.objects.filter(access, room_id=room_id).aexists():
+        return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
+    return None
+
+
+def long_poll_wait(request):
+    """Seconds a poll may wait (?wait=N), capped lower under WSGI where a waiting poll holds a worker thread"""
+    try:
+        wait = max(0.0, float(request.GET.get('wait', 0)))
+    except ValueError:
+        return 0.0
+    if isinstance(request, ASGIRequest):
+        return min(wait, getattr(settings, 'CHAT_LONG_POLL_MAX_WAIT', 25))
+    return min(wait, getattr(settings, 'CHAT_LONG_POLL_MAX_WAIT_WSGI', 10))
+
+
+# AJAX view for fetching new messages (async, so a long poll under ASGI holds no thread)
+async def get_new_messages(request, room_id):
+    """
+    Get new messages for a chat room.
+    With ?wait=N and nothing new, the request is held until the room's version moves or N
+    seconds pass. A client sending back the previous ETag gets 304 while the room is unchanged,
+    without the messages query. Both need room versions in a cache every worker shares; with a
+    per-process cache this is plain polling.
+    """
+    try:
+        denied = await room_access_denied(request, room_id)
+        if denied:
+            return denied
+
+        try:
+            last_message_id = int(request.GET.get('last_message_id', 0))
+        except ValueError:
+            last_message_id = 0
+        shared = room_versions_shared()
+        wait = long_poll_wait(request) if shared else 0
+        deadline = time.monotonic() + wait
+
+        # Read the version before the messages: a send in between only makes the ETag stale
+        version = await aroom_version(room_id)
+        unchanged = shared and room_etag(room_id, version, last_message_id) in parse_etags(request.headers.get('If-None-Match', ''))
+        messages_data = []
+        while True:
+            if not unchanged:
+                messages_data = await sync_to_async(new_messages_payload)(room_id, last_message_id)
+                if messages_data:
+                    break
+            new_version = await wait_for_room_change(room_id, version, deadline - time.monotonic())
+            if new_version is None:
+                break
+            version, unchanged = new_version, False
+
+        # Tag with the last id the client will ask with next, so its next poll can match
+        etag = room_etag(room_id, version, max([last_message_id] + [m['id'] for m in messages_data]))
+        if unchanged:
+            response = HttpResponseNotModified()
+        else:
+            response = JsonResponse({
+                'success': True,
+                'messages': messages_data,
+                'has_new': len(messages_data) > 0
+            })
+        if shared:
+            response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+# AJAX view for loading older messages (scrollback)
 @check_user_session
-def get_new_messages(request, room_id):
-    """Get new messages for a chat room"""
+def chat_history(request, room_id):
+    """The page of messages before ?before=<message_id>, oldest first"""
     try:
-        # Check session
         employer_id = request.session.get('employer_id')
         employee_id = request.session.get('employee_id')
+        access = Q(employer_id=employer_id) if employer_id else Q(employee_id=employee_id)
+        if not ChatRoom.objects.filter(access, room_id=room_id).exists():
+            return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
         
-        if not employer_id and not employee_id:
-            return JsonResponse({'success': False, 'error': 'Please login'})
-        
-        last_message_id = request.GET.get('last_message_id', 0)
-        
-        chat_room = get_object_or_404(ChatRoom, room_id=room_id)
-        
-        # Check access
-        if employer_id:
-            employer = get_object_or_404(Employer, employer_id=employer_id)
-            if chat_room.employer != employer:
-                return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
-                
-        elif employee_id:
-            employee = get_object_or_404(Employee, employee_id=employee_id)
-            if chat_room.employee != employee:
-                return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
-        
-        # Get new messages
-        new_messages = chat_room.messages.filter(
-            message_id__gt=last_message_id,
-            is_deleted=False
-        ).order_by('created_at')
+        try:
+            before_id = int(request.GET.get('before', 0))
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'Invalid cursor'}, status=400)
         
+        page, has_more = history_page(room_id, before_id or None)
         messages_data = []
-        for msg in new_messages:
-            # Get sender name
-            sender_name = ""
-            if msg.sender_type == 'employer' and msg.sender_employer:
-                sender_name = f"{msg.sender_employer.first_name} {msg.sender_employer.last_name}"
-            elif msg.sender_type == 'employee' and msg.sender_employee:
-                sender_name = f"{msg.sender_employee.first_name} {msg.sender_employee.last_name}"
-            
-            messages_data.append({
-                'id': msg.message_id,
-                'content': msg.content,
-                'sender_type': msg.sender_type,
-                'sender_id': msg.sender_employer.employer_id if msg.sender_type == 'employer' else msg.sender_employee.employee_id,
-                'sender_name': sender_name,
-                'timestamp': msg.created_at.isoformat(),
-                'formatted_time': msg.formatted_time,
-                'is_edited': msg.is_edited
-            })
+        for msg in page:
+            payload = message_payload(msg)
+            payload['date'] = msg.created_at.date().isoformat()
+            payload['date_label'] = date_label(msg.created_at.date())
+            messages_data.append(payload)
         
         return JsonResponse({
             'success': True,
             'messages': messages_data,
-            'has_new': len(messages_data) > 0
+            'has_more': has_more,
+            'before': page[0].message_id if page else None
         })
         
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=500)
\ No newline at end of file
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+# Server-Sent Events stream for a chat room (served by the ASGI application in backend/asgi.py)
+async def message_stream(request, room_id):
+    """Push new messages of a chat room to the browser as they are sent"""
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI a stream would hold a worker thread per open tab; the page falls back to polling
+        return JsonResponse({'success': False, 'error': 'Streaming requires the ASGI server'}, status=501)
+    if not broker_shared():
+        # Messages sent through other server processes would never reach this stream
+        return JsonResponse({'success': False, 'error': 'Streaming requires a shared chat broker'}, status=501)
+
+    denied = await room_access_denied(request, room_id)
+    if denied:
+        return denied
+
+    # EventSource resends the last id it saw after a reconnect
+    try:
+        last_message_id = int(request.headers.get('Last-Event-ID') or request.GET.get('last_message_id') or 0)
+    except ValueError:
+        last_message_id = 0
+
+    response = StreamingHttpResponse(
+        room_event_stream(room_id, last_message_id, sync_to_async(new_messages_payload)),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: don't buffer the stream
+    return response
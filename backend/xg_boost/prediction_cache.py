@@ -0,0 +1,50 @@
+# xg_boost/prediction_cache.py
+# Cached raw model outputs, so dashboard loads skip inference while the inputs stand still.
+# An entry is keyed by a hash of the prediction's feature vector plus the model version that
+# produced it and expires after PREDICTION_CACHE_TTL. A new model version changes every key;
+# invalidate_predictions() (model upload / status changes) drops everything at once.
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+from home.cache_versions import bump_version, get_version
+
+PREDICTION_TTL = getattr(settings, 'PREDICTION_CACHE_TTL', 600)
+
+GENERATION_KEY = 'xgboost:predictions:generation'
+
+# Datetime features move with the clock on every request; at day resolution a cached
+# prediction is reused for the rest of the day unless the platform numbers change
+TIME_FEATURES = ('timestamp', 'registration_date', 'last_active')
+TIME_RESOLUTION = 86400
+
+
+def invalidate_predictions():
+    """Make every cached prediction stale"""
+    bump_version(GENERATION_KEY)
+
+
+def feature_hash(features):
+    values = {
+        name: int(value // TIME_RESOLUTION) if name in TIME_FEATURES else round(float(value), 6)
+        for name, value in features.items()
+    }
+    return hashlib.sha1(json.dumps(values, sort_keys=True).encode()).hexdigest()
+
+
+def cache_keys(feature_rows, model_version):
+    generation = get_version(GENERATION_KEY)
+    return [f'xgboost:predictions:g{generation}:{model_version}:{feature_hash(row)}' for row in feature_rows]
+
+
+def get_cached(keys):
+    """{key: raw predictions} for the keys that are cached"""
+    return cache.get_many(keys)
+
+
+def store(entries):
+    """entries: {key: raw predictions}"""
+    cache.set_many(entries, PREDICTION_TTL)
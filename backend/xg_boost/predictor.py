@@ -1,7 +1,5 @@
 # xg_boost/predictor.py - UPDATED VERSION
 import pickle
-import pandas as pd
-import numpy as np
 import os
 from django.conf import settings
 from datetime import datetime, timedelta
@@ -9,15 +7,68 @@ from django.utils import timezone
 from decimal import Decimal
 import traceback
 
+from . import prediction_cache, registry
+
+INTEGER_TARGETS = ['completed_bookings', 'total_bookings', 'cancelled_bookings', 'total_reviews']
+
 class XGBoostPredictor:
+    """
+    The shared predictor service. Nothing is loaded at import time: the active model is
+    loaded by the first prediction (or by warm_up()), so management commands and worker
+    boots that never predict don't pay for it.
+    """
+
     def __init__(self):
         self.model_path = os.path.join(settings.BASE_DIR, 'xg_boost', 'complete_xgboost_package.pkl')
         self.models = {}
         self.feature_names = []
         self.loaded = False
-        self.load_model()
+        self.version = None
+        self.stamp = None
 
     def load_model(self):
+        """
+        Load the active version from the model registry. The first time (empty registry) the
+        legacy pickle package is published as the initial version; if the registry cannot be
+        used at all the pickle is loaded directly.
+        """
+        try:
+            stamp = registry.active_stamp()
+            version = registry.active_version()
+            if version is None:
+                if not os.path.exists(self.model_path):
+                    print(f" Model file not found at {self.model_path}")
+                    return False
+                version = registry.publish_package(self.model_path)
+                stamp = registry.active_stamp()
+
+            self.models, manifest = registry.load_version(version)
+            self.feature_names = manifest['feature_names']
+            self.version = version
+            self.stamp = stamp
+            self.loaded = True
+            print(f" Loaded model version {version}: {list(self.models.keys())}")
+            return True
+
+        except Exception as e:
+            print(f" Model registry unavailable ({str(e)}), loading pickle package")
+            return self.load_pickle()
+
+    def ensure_current(self):
+        """Reload if another process activated a different version since our last load"""
+        stamp = registry.active_stamp()
+        if not self.loaded or (stamp is not None and stamp != self.stamp):
+            return self.load_model()
+        return True
+
+    def warm_up(self):
+        """Load the model and run one throw-away prediction, so the first request doesn't pay for either"""
+        if not self.ensure_current():
+            return False
+        self.predict({})
+        return True
+
+    def load_pickle(self):
         """Load the XGBoost model from pickle file"""
         try:
             if not os.path.exists(self.model_path):
@@ -43,6 +94,8 @@ class XGBoostPredictor:
             print(f" Feature names: {self.feature_names}")
             print(f" Available predictions: {list(self.models.keys())}")
             
+            self.version = None
+            self.stamp = registry.active_stamp()
             self.loaded = True
             return True
             
@@ -51,61 +104,67 @@ class XGBoostPredictor:
             traceback.print_exc()
             return False
 
-    def prepare_platform_features(self, platform_data):
+    def platform_features(self, platform_data):
         """
-        Prepare EXACTLY the 19 features the model expects:
+        The 19 model features for one platform_data dict, in model order:
         ['timestamp', 'user_id', 'user_type', 'registration_date', 'account_status', 
          'total_bookings', 'completed_bookings', 'cancelled_bookings', 'total_spent', 
          'total_earned', 'platform_commission', 'avg_rating', 'total_reviews', 
          'last_active', 'days_since_registration', 'days_since_last_active', 
          'completion_rate', 'cancellation_rate', 'avg_earning_per_booking']
         """
+        now = timezone.now()
+        today = now.date()
+
+        # Create next month timestamp
+        next_month = today.replace(day=28) + timedelta(days=4)  # Next month
+        next_month_timestamp = datetime.combine(next_month, datetime.min.time()).timestamp()
+
+        # Get current platform metrics
+        total_bookings = platform_data.get('total_bookings', 0)
+        completed_bookings = platform_data.get('completed_bookings', 0)
+        cancelled_bookings = platform_data.get('cancelled_bookings', 0)
+        total_revenue = platform_data.get('total_revenue', 0)
+        total_earnings = platform_data.get('total_earnings', 0)
+        platform_commission = platform_data.get('platform_commission', 0)
+        avg_rating = platform_data.get('avg_rating', 0)
+        total_reviews = platform_data.get('total_reviews', 0)
+
+        # Calculate rates
+        completion_rate = (completed_bookings / total_bookings * 100) if total_bookings > 0 else 0
+        cancellation_rate = (cancelled_bookings / total_bookings * 100) if total_bookings > 0 else 0
+        avg_earning_per_booking = (total_earnings / completed_bookings) if completed_bookings > 0 else 0
+
+        # Prepare features EXACTLY as model expects
+        features = {
+            'timestamp': next_month_timestamp,
+            'user_id': 0,  # Platform aggregate
+            'user_type': 0,  # Platform type
+            'registration_date': now.timestamp() - (180 * 24 * 3600),  # 180 days ago
+            'account_status': 1,  # Active
+            'total_bookings': total_bookings,
+            'completed_bookings': completed_bookings,
+            'cancelled_bookings': cancelled_bookings,
+            'total_spent': total_revenue,
+            'total_earned': total_earnings,
+            'platform_commission': platform_commission,
+            'avg_rating': avg_rating,
+            'total_reviews': total_reviews,
+            'last_active': now.timestamp(),
+            'days_since_registration': 180,  
+            'days_since_last_active': 1, 
+            'completion_rate': completion_rate,
+            'cancellation_rate': cancellation_rate,
+            'avg_earning_per_booking': avg_earning_per_booking
+        }
+        return features
+
+    def prepare_platform_features(self, platform_data):
+        """Prepare EXACTLY the 19 features the model expects, as a one-row DataFrame"""
+        import pandas as pd
+
         try:
-            now = timezone.now()
-            today = now.date()
-            
-            # Create next month timestamp
-            next_month = today.replace(day=28) + timedelta(days=4)  # Next month
-            next_month_timestamp = datetime.combine(next_month, datetime.min.time()).timestamp()
-            
-            # Get current platform metrics
-            total_bookings = platform_data.get('total_bookings', 0)
-            completed_bookings = platform_data.get('completed_bookings', 0)
-            cancelled_bookings = platform_data.get('cancelled_bookings', 0)
-            total_revenue = platform_data.get('total_revenue', 0)
-            total_earnings = platform_data.get('total_earnings', 0)
-            platform_commission = platform_data.get('platform_commission', 0)
-            avg_rating = platform_data.get('avg_rating', 0)
-            total_reviews = platform_data.get('total_reviews', 0)
-            
-            # Calculate rates
-            completion_rate = (completed_bookings / total_bookings * 100) if total_bookings > 0 else 0
-            cancellation_rate = (cancelled_bookings / total_bookings * 100) if total_bookings > 0 else 0
-            avg_earning_per_booking = (total_earnings / completed_bookings) if completed_bookings > 0 else 0
-            
-            # Prepare features EXACTLY as model expects
-            features = {
-                'timestamp': next_month_timestamp,
-                'user_id': 0,  # Platform aggregate
-                'user_type': 0,  # Platform type
-                'registration_date': now.timestamp() - (180 * 24 * 3600),  # 180 days ago
-                'account_status': 1,  # Active
-                'total_bookings': total_bookings,
-                'completed_bookings': completed_bookings,
-                'cancelled_bookings': cancelled_bookings,
-                'total_spent': total_revenue,
-                'total_earned': total_earnings,
-                'platform_commission': platform_commission,
-                'avg_rating': avg_rating,
-                'total_reviews': total_reviews,
-                'last_active': now.timestamp(),
-                'days_since_registration': 180,  
-                'days_since_last_active': 1, 
-                'completion_rate': completion_rate,
-                'cancellation_rate': cancellation_rate,
-                'avg_earning_per_booking': avg_earning_per_booking
-            }
-            
+            features = self.platform_features(platform_data)
             print(f" Prepared {len(features)} features for prediction")
             return pd.DataFrame([features])
             
@@ -114,77 +173,117 @@ class XGBoostPredictor:
             traceback.print_exc()
             return pd.DataFrame()
 
-    def predict(self, platform_data):
-        """Make predictions using the loaded models"""
-        if not self.loaded:
-            print(" Model not loaded")
+    def feature_matrix(self, feature_rows):
+        """N feature dicts -> (N, 19) float matrix with columns in self.feature_names order"""
+        import numpy as np
+        from .training_data import FEATURE_NAMES
+
+        names = self.feature_names or FEATURE_NAMES
+        return np.array([[row[name] for name in names] for row in feature_rows], dtype=np.float64), names
+
+    def predict_batch(self, feature_rows):
+        """
+        Run every target model once over N feature rows (dicts from platform_features, e.g. one
+        per month or per what-if scenario). Targets whose models were trained on the same input
+        columns share one sliced matrix. Returns {target: array of N constrained predictions};
+        a target whose model fails is left out, as in predict().
+        """
+        import numpy as np
+
+        self.ensure_current()
+        if not self.loaded or not feature_rows:
             return {}
-        
-        try:
-            # Prepare features
-            features_df = self.prepare_platform_features(platform_data)
-            
-            if features_df.empty:
-                print(" Features DataFrame is empty")
-                return {}
-            
-            # Initialize predictions dict
-            raw_predictions = {}
-            
-            # Make predictions for each target
-            for target_name, model_info in self.models.items():
+
+        matrix, names = self.feature_matrix(feature_rows)
+        column_index = {name: i for i, name in enumerate(names)}
+
+        # Group targets by input schema: one column selection per distinct schema
+        schemas = {}
+        for target_name, model_info in self.models.items():
+            model = model_info['model'] if isinstance(model_info, dict) and 'model' in model_info else model_info
+            if not hasattr(model, 'predict'):
+                continue
+            if hasattr(model, 'feature_names_in_'):
+                inputs = tuple(model.feature_names_in_)
+            else:
+                inputs = tuple(name for name in names if name != target_name)
+            schemas.setdefault(inputs, []).append((target_name, model))
+
+        predictions = {}
+        for inputs, targets in schemas.items():
+            try:
+                inputs_matrix = matrix[:, [column_index[name] for name in inputs]]
+            except KeyError as e:
+                print(f" Missing feature {e} for {[target for target, _ in targets]}")
+                continue
+            for target_name, model in targets:
                 try:
-                    # Extract model from the complex structure
-                    if isinstance(model_info, dict) and 'model' in model_info:
-                        model = model_info['model']
-                    else:
-                        model = model_info
-                    
-                    if hasattr(model, 'predict'):
-                        # For each model, we need to remove the target feature from input
-                        input_features = features_df.copy()
-                        
-                        # Remove the target feature if it exists in input
-                        if target_name in input_features.columns:
-                            input_features = input_features.drop(columns=[target_name])
-                        
-                        # Ensure we have all required features
-                        if hasattr(model, 'feature_names_in_'):
-                            model_features = model.feature_names_in_
-                            # Reorder columns to match model expectations
-                            input_features = input_features[model_features]
-                        
-                        # Make prediction
-                        prediction = model.predict(input_features)
-                        pred_value = float(prediction[0]) if hasattr(prediction, '__len__') else float(prediction)
-                        
-                        # Apply constraints based on target type
-                        if target_name in ['completed_bookings', 'total_bookings', 'cancelled_bookings', 'total_reviews']:
-                            pred_value = max(0, int(pred_value))  # Non-negative integers
-                        elif target_name in ['completion_rate', 'cancellation_rate']:
-                            pred_value = max(0, min(100, pred_value))  # Percentage 0-100
-                        elif target_name == 'avg_rating':
-                            pred_value = max(0, min(5, pred_value))  # Rating 0-5
-                        elif target_name in ['total_spent', 'total_earned', 'platform_commission', 'avg_earning_per_booking']:
-                            pred_value = max(0, pred_value)  # Non-negative currency
-                        
-                        raw_predictions[target_name] = pred_value
-                        print(f" Predicted {target_name}: {pred_value}")
-                        
+                    values = np.asarray(model.predict(inputs_matrix), dtype=np.float64).reshape(len(feature_rows), -1)[:, 0]
                 except Exception as e:
                     print(f" Error predicting {target_name}: {str(e)}")
                     continue
-            
-            # Format predictions for dashboard display
-            formatted_predictions = self.format_predictions(raw_predictions, platform_data)
-            
-            print(f" Generated {len(formatted_predictions)} formatted predictions")
-            return formatted_predictions
-            
+                predictions[target_name] = self.constrain(target_name, values)
+        return predictions
+
+    @staticmethod
+    def constrain(target_name, values):
+        """Apply constraints based on target type"""
+        import numpy as np
+
+        if target_name in INTEGER_TARGETS:
+            return np.maximum(0, np.trunc(values))  # Non-negative integers
+        if target_name in ['completion_rate', 'cancellation_rate']:
+            return np.clip(values, 0, 100)  # Percentage 0-100
+        if target_name == 'avg_rating':
+            return np.clip(values, 0, 5)  # Rating 0-5
+        if target_name in ['total_spent', 'total_earned', 'platform_commission', 'avg_earning_per_booking']:
+            return np.maximum(0, values)  # Non-negative currency
+        return values
+
+    def predict_many(self, platform_data_list):
+        """
+        Formatted dashboard predictions for several platform_data dicts. Rows whose feature
+        vector was predicted recently by the same model version come from the prediction
+        cache; the rest run through the model in one batch.
+        """
+        try:
+            self.ensure_current()
+            if not self.loaded:
+                print(" Model not loaded")
+                return [{} for _ in platform_data_list]
+
+            feature_rows = [self.platform_features(data) for data in platform_data_list]
+            keys = prediction_cache.cache_keys(feature_rows, self.version or 'pickle')
+            raw = prediction_cache.get_cached(keys)
+
+            missing = [i for i, key in enumerate(keys) if key not in raw]
+            if missing:
+                batch = self.predict_batch([feature_rows[i] for i in missing])
+                computed = {
+                    keys[i]: {
+                        target: int(values[j]) if target in INTEGER_TARGETS else float(values[j])
+                        for target, values in batch.items()
+                    }
+                    for j, i in enumerate(missing)
+                } if batch else {}
+                prediction_cache.store(computed)
+                raw.update(computed)
+
+            return [
+                self.format_predictions(raw[key], platform_data) if key in raw else {}
+                for key, platform_data in zip(keys, platform_data_list)
+            ]
+
         except Exception as e:
             print(f" Prediction error: {str(e)}")
             traceback.print_exc()
-            return {}
+            return [{} for _ in platform_data_list]
+
+    def predict(self, platform_data):
+        """Make predictions using the loaded models"""
+        predictions = self.predict_many([platform_data])[0]
+        print(f" Generated {len(predictions)} formatted predictions")
+        return predictions
 
     def format_predictions(self, raw_predictions, platform_data):
         """Format raw model predictions for dashboard display"""
@@ -287,5 +386,10 @@ class XGBoostPredictor:
             print(f" Error getting feature importance: {str(e)}")
             return {}
 
-# Singleton instance
-predictor = XGBoostPredictor()
\ No newline at end of file
+# Singleton instance (loads lazily)
+predictor = XGBoostPredictor()
+
+
+def warm_up():
+    """Hook for process start-up (see backend/wsgi.py and `manage.py warm_up_predictor`)"""
+    return predictor.warm_up()
\ No newline at end of file
@@ -0,0 +1,228 @@
+# xg_boost/registry.py
+# Versioned store of the deployed XGBoost models, shared by every worker process.
+# Publishing a package (the pickled dict uploaded from the admin panel) exports each
+# target's booster in XGBoost's native UBJSON format to its own version directory, then
+# points the ACTIVE file at it with an atomic os.replace. Workers compare the ACTIVE
+# file's stat stamp before predicting and reload when another process has swapped it.
+#
+#   model_registry/
+#       ACTIVE                        {"version": "model-12-1.2.0", ...}
+#       model-12-1.2.0/
+#           manifest.json             targets, estimator classes, feature names
+#           total_spent.ubj
+#           ...
+
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import re
+import shutil
+
+from django.conf import settings
+from django.utils import timezone
+
+# xgboost is imported on first publish/load, not when the registry is imported
+XGBOOST_AVAILABLE = importlib.util.find_spec('xgboost') is not None
+
+MANIFEST_NAME = 'manifest.json'
+ACTIVE_NAME = 'ACTIVE'
+BOOSTER_EXTENSION = '.ubj'
+KEEP_VERSIONS = 5
+
+
+def registry_dir():
+    return getattr(settings, 'XGBOOST_REGISTRY_DIR', os.path.join(settings.BASE_DIR, 'xg_boost', 'model_registry'))
+
+
+def version_dir(version):
+    return os.path.join(registry_dir(), version)
+
+
+def version_key(ml_model):
+    """Registry version for an MLModel row, e.g. 'model-12-1.2.0'"""
+    return 'model-{}-{}'.format(ml_model.model_id, re.sub(r'[^A-Za-z0-9._-]', '_', ml_model.version))
+
+
+def package_key(package_path):
+    """Content-addressed version for packages without an MLModel row (legacy file, restored backups)"""
+    digest = hashlib.sha256()
+    with open(package_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return 'package-' + digest.hexdigest()[:16]
+
+
+def _json_safe(value):
+    """numpy scalars/arrays and dates in package metadata -> plain JSON values"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+#****************************************************************
+# Publishing
+
+def _export_package(package, path, version):
+    """Write every target's booster plus the manifest into the (new) directory path"""
+    import xgboost as xgb
+
+    targets = {}
+    for target, model_info in package.get('all_models', {}).items():
+        if isinstance(model_info, dict) and 'model' in model_info:
+            model = model_info['model']
+        else:
+            model_info, model = {}, model_info
+        if not hasattr(model, 'save_model'):
+            print(f" Skipping {target}: {type(model).__name__} is not an XGBoost model")
+            continue
+
+        filename = re.sub(r'[^A-Za-z0-9._-]', '_', target) + BOOSTER_EXTENSION
+        model.save_model(os.path.join(path, filename))
+        label_encoder = model_info.get('label_encoder')
+        targets[target] = {
+            'file': filename,
+            'estimator': type(model).__name__,
+            'is_classification': bool(model_info.get('is_classification', False)),
+            'feature_names': list(model_info.get('feature_names') or getattr(model, 'feature_names_in_', [])),
+            'label_classes': label_encoder.classes_.tolist() if label_encoder is not None else None,
+        }
+
+    if not targets:
+        raise ValueError("Package contains no XGBoost models")
+
+    data_info = package.get('data_info', {})
+    feature_names = data_info.get('original_features') or package.get('metadata', {}).get('feature_names', [])
+    manifest = {
+        'version': version,
+        'targets': targets,
+        'feature_names': list(feature_names),
+        'data_info': data_info,
+        'xgboost_version': xgb.__version__,
+        'published_at': timezone.now().isoformat(),
+    }
+    with open(os.path.join(path, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, default=_json_safe)
+    return manifest
+
+
+def publish_package(package_path, version=None, activate=True):
+    """
+    Add a pickled model package to the registry as `version` (content hash by default) and
+    optionally make it the active version. Publishing an existing version only re-activates it.
+    Returns the version key.
+    """
+    if not XGBOOST_AVAILABLE:
+        raise ImportError("xgboost is required to publish models")
+
+    version = version or package_key(package_path)
+    target_dir = version_dir(version)
+    if not os.path.exists(os.path.join(target_dir, MANIFEST_NAME)):
+        with open(package_path, 'rb') as f:
+            package = pickle.load(f)
+
+        # Build in a private directory, then rename into place so readers never see half a version
+        os.makedirs(registry_dir(), exist_ok=True)
+        tmp_dir = os.path.join(registry_dir(), f'.tmp-{os.getpid()}-{version}')
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        try:
+            manifest = _export_package(package, tmp_dir, version)
+            shutil.rmtree(target_dir, ignore_errors=True)
+            os.rename(tmp_dir, target_dir)
+            print(f" Published model version {version} ({len(manifest['targets'])} targets)")
+        except OSError:
+            # Another process published the same version first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.exists(os.path.join(target_dir, MANIFEST_NAME)):
+                raise
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    if activate:
+        activate_version(version)
+    return version
+
+
+def activate_version(version):
+    """Atomically point ACTIVE at an already published version"""
+    if not os.path.exists(os.path.join(version_dir(version), MANIFEST_NAME)):
+        raise ValueError(f"Model version {version} is not published")
+    active_path = os.path.join(registry_dir(), ACTIVE_NAME)
+    tmp_path = f'{active_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': version, 'activated_at': timezone.now().isoformat()}, f)
+    os.replace(tmp_path, active_path)
+    prune_versions()
+
+
+def prune_versions(keep=KEEP_VERSIONS):
+    """Delete all but the newest `keep` versions; the active one is always kept"""
+    root = registry_dir()
+    active = active_version()
+    versions = [
+        name for name in os.listdir(root)
+        if os.path.exists(os.path.join(root, name, MANIFEST_NAME)) and name != active
+    ]
+    versions.sort(key=lambda name: os.path.getmtime(os.path.join(root, name)), reverse=True)
+    for name in versions[max(keep - 1, 0):]:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+#****************************************************************
+# Reading
+
+def active_stamp():
+    """
+    Cheap change marker for ACTIVE: (inode, mtime). os.replace gives the file a new inode,
+    so the stamp changes on every activation. None when nothing is published.
+    """
+    try:
+        stat = os.stat(os.path.join(registry_dir(), ACTIVE_NAME))
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns)
+
+
+def active_version():
+    try:
+        with open(os.path.join(registry_dir(), ACTIVE_NAME)) as f:
+            return json.load(f)['version']
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+
+def read_manifest(version):
+    with open(os.path.join(version_dir(version), MANIFEST_NAME)) as f:
+        return json.load(f)
+
+
+def _load_booster(path, estimator):
+    """Load one exported UBJSON booster into a fresh estimator of its recorded class"""
+    import xgboost as xgb
+
+    model = getattr(xgb, estimator, xgb.XGBRegressor)()
+    model.load_model(path)
+    return model
+
+
+def load_version(version):
+    """
+    Load a published version into the same shape as the pickled package's 'all_models':
+    {target: {'model', 'is_classification', 'feature_names', 'label_classes'}}.
+    Returns (models, manifest).
+    """
+    if not XGBOOST_AVAILABLE:
+        raise ImportError("xgboost is required to load models")
+    manifest = read_manifest(version)
+    models = {}
+    for target, info in manifest['targets'].items():
+        models[target] = {
+            'model': _load_booster(os.path.join(version_dir(version), info['file']), info['estimator']),
+            'is_classification': info['is_classification'],
+            'feature_names': info['feature_names'],
+            'label_classes': info['label_classes'],
+        }
+    return models, manifest
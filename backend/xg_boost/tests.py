@@ -1,3 +1,28 @@
+import time
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from .prediction_cache import GENERATION_KEY, cache_keys, invalidate_predictions
+
+
+class PredictionCacheKeyTests(TestCase):
+    features = [{'total_users': 10, 'timestamp': 1_700_000_000}]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidate_changes_keys(self):
+        before = cache_keys(self.features, 'v1')
+        self.assertEqual(cache_keys(self.features, 'v1'), before)
+        invalidate_predictions()
+        self.assertNotEqual(cache_keys(self.features, 'v1'), before)
+
+    def test_evicted_generation_never_reuses_an_old_one(self):
+        seen = set(cache_keys(self.features, 'v1'))
+        invalidate_predictions()
+        seen.update(cache_keys(self.features, 'v1'))
+
+        time.sleep(0.005)
+        cache.delete(GENERATION_KEY)
+        self.assertNotIn(cache_keys(self.features, 'v1')[0], seen)
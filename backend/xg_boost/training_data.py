@@ -0,0 +1,162 @@
+# xg_boost/training_data.py
+# Typed schema of the XGBoost training dataset - the same 19 columns, in the same order,
+# that XGBoostPredictor.prepare_platform_features builds for a prediction - plus loaders.
+# Exports from the admin data-collection tab are written as Parquet (or Feather) with this
+# schema, so training/validation load them with the right dtypes instead of re-parsing CSV.
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    PYARROW_AVAILABLE = False
+
+try:
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pq = None
+    PARQUET_AVAILABLE = False
+
+SCHEMA_VERSION = 1
+
+# (column, dtype) in model input order. Datetimes are POSIX timestamps (seconds), as in
+# prepare_platform_features; rates are percentages 0-100.
+FEATURE_SCHEMA = [
+    ('timestamp', 'float64'),
+    ('user_id', 'int64'),
+    ('user_type', 'int8'),
+    ('registration_date', 'float64'),
+    ('account_status', 'int8'),
+    ('total_bookings', 'int64'),
+    ('completed_bookings', 'int64'),
+    ('cancelled_bookings', 'int64'),
+    ('total_spent', 'float64'),
+    ('total_earned', 'float64'),
+    ('platform_commission', 'float64'),
+    ('avg_rating', 'float64'),
+    ('total_reviews', 'int64'),
+    ('last_active', 'float64'),
+    ('days_since_registration', 'int64'),
+    ('days_since_last_active', 'int64'),
+    ('completion_rate', 'float64'),
+    ('cancellation_rate', 'float64'),
+    ('avg_earning_per_booking', 'float64'),
+]
+FEATURE_NAMES = [name for name, _ in FEATURE_SCHEMA]
+FEATURE_DTYPES = dict(FEATURE_SCHEMA)
+
+# 0 is the platform-aggregate row used for predictions
+USER_TYPE_CODES = {'platform': 0, 'worker': 1, 'employer': 2}
+ACCOUNT_STATUS_CODES = {'Inactive': 0, 'Active': 1, 'Suspended': 2}
+
+FORMAT_EXTENSIONS = {'parquet': '.parquet', 'feather': '.feather', 'csv': '.csv'}
+
+
+def schema_metadata():
+    """Key/value metadata stored in the file footer alongside the Arrow schema"""
+    return {
+        b'skillconnect.schema_version': str(SCHEMA_VERSION).encode(),
+        b'skillconnect.feature_names': json.dumps(FEATURE_NAMES).encode(),
+        b'skillconnect.user_type_codes': json.dumps(USER_TYPE_CODES).encode(),
+        b'skillconnect.account_status_codes': json.dumps(ACCOUNT_STATUS_CODES).encode(),
+    }
+
+
+def arrow_schema():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for Parquet/Feather training data")
+    return pa.schema(
+        [pa.field(name, pa.from_numpy_dtype(np.dtype(dtype)), nullable=False) for name, dtype in FEATURE_SCHEMA],
+        metadata=schema_metadata(),
+    )
+
+
+def resolve_format(requested):
+    """Best available format for a request: parquet -> feather -> None (pyarrow missing)"""
+    if requested == 'csv':
+        return 'csv'
+    if requested == 'parquet' and PARQUET_AVAILABLE:
+        return 'parquet'
+    if PYARROW_AVAILABLE:
+        return 'feather'
+    return None
+
+
+def derived_features(row):
+    """Fill in the 5 derived columns of a training row dict (ratios and day counts)"""
+    total = row['total_bookings']
+    completed = row['completed_bookings']
+    row['days_since_registration'] = int((row['timestamp'] - row['registration_date']) // 86400)
+    row['days_since_last_active'] = int((row['timestamp'] - row['last_active']) // 86400)
+    row['completion_rate'] = completed / total * 100 if total > 0 else 0.0
+    row['cancellation_rate'] = row['cancelled_bookings'] / total * 100 if total > 0 else 0.0
+    row['avg_earning_per_booking'] = (
+        (row['total_earned'] or row['total_spent']) / completed if completed > 0 else 0.0
+    )
+    return row
+
+
+def to_feature_frame(df):
+    """Coerce a DataFrame to the training columns, order and dtypes"""
+    return df[FEATURE_NAMES].astype(FEATURE_DTYPES)
+
+
+def features_from_export_csv(df):
+    """
+    Convert a legacy 'all' CSV export (string ids, dates and statuses, 14 columns) to the
+    typed 19-column training frame.
+    """
+    def epoch(column):
+        return (pd.to_datetime(df[column]) - pd.Timestamp('1970-01-01')) / pd.Timedelta(seconds=1)
+
+    frame = pd.DataFrame({
+        'timestamp': epoch('timestamp'),
+        'user_id': df['user_id'].str[2:].astype('int64'),
+        'user_type': df['user_type'].map(USER_TYPE_CODES),
+        'registration_date': epoch('registration_date'),
+        'account_status': df['account_status'].map(ACCOUNT_STATUS_CODES).fillna(0),
+        'total_bookings': df['total_bookings'],
+        'completed_bookings': df['completed_bookings'],
+        'cancelled_bookings': df['cancelled_bookings'],
+        'total_spent': df['total_spent'],
+        'total_earned': df['total_earned'],
+        'platform_commission': df['platform_commission'],
+        'avg_rating': df['avg_rating'],
+        'total_reviews': df['total_reviews'],
+        'last_active': epoch('last_active'),
+    })
+    frame['days_since_registration'] = (frame['timestamp'] - frame['registration_date']) // 86400
+    frame['days_since_last_active'] = (frame['timestamp'] - frame['last_active']) // 86400
+    has_bookings = frame['total_bookings'] > 0
+    has_completed = frame['completed_bookings'] > 0
+    frame['completion_rate'] = np.where(
+        has_bookings, frame['completed_bookings'] / frame['total_bookings'].where(has_bookings, 1) * 100, 0.0)
+    frame['cancellation_rate'] = np.where(
+        has_bookings, frame['cancelled_bookings'] / frame['total_bookings'].where(has_bookings, 1) * 100, 0.0)
+    amount = frame['total_earned'].where(frame['total_earned'] > 0, frame['total_spent'])
+    frame['avg_earning_per_booking'] = np.where(
+        has_completed, amount / frame['completed_bookings'].where(has_completed, 1), 0.0)
+    return to_feature_frame(frame)
+
+
+def load_training_data(source, file_format=None):
+    """
+    Load a training dataset from a path or open binary file. Parquet and Feather keep their
+    stored dtypes; CSV (old 'all' exports) is parsed and converted. The format defaults to
+    the path's extension.
+    """
+    if file_format is None:
+        extension = os.path.splitext(str(source))[1].lower()
+        file_format = {'.parquet': 'parquet', '.feather': 'feather', '.arrow': 'feather'}.get(extension, 'csv')
+    if file_format == 'parquet':
+        return pd.read_parquet(source)
+    if file_format == 'feather':
+        return pd.read_feather(source)
+    return features_from_export_csv(pd.read_csv(source))